@@ -0,0 +1,140 @@
+"""
+MindMesh Context Summary Benchmark
+
+Simulates a user whose runs keep retrieving the same entities and
+episodes while new facts trickle in, and counts the LLM calls and
+prompt tokens spent on summaries when every run re-summarizes what it
+retrieved versus when the memory reader serves stored summaries and
+folds new facts in incrementally. The LLM is a stub that answers with a
+fixed-size summary, so only call counts and prompt sizes are measured.
+
+Usage (from ai_engine/):
+    python -m benchmarks.context_summaries --runs 50 --entities 40 --episodes 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from mindmesh.memory.context_packer import ContextPacker, TokenCounter
+from mindmesh.memory.summary_store import FULL_PROMPT, SummaryResolver, SummaryStore, summary_parts
+from mindmesh.nodes.memory_reader import MemoryReader
+from mindmesh.state import MindMeshState
+
+
+class StubResponse:
+    def __init__(self, content: str):
+        self.content = content
+        self.response_metadata: Dict[str, Any] = {}
+
+
+class StubLLM:
+    def __init__(self, counter: TokenCounter):
+        self.counter = counter
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    async def ainvoke(self, prompt: str) -> StubResponse:
+        self.calls += 1
+        self.prompt_tokens += self.counter.count(prompt)
+        await asyncio.sleep(0)
+        return StubResponse(" ".join(["summary"] * 80))
+
+
+class Memory:
+    """A user's entities and episodes; a few gain facts between runs"""
+
+    def __init__(self, entities: int, episodes: int, rng: random.Random):
+        self.rng = rng
+        self.words = [f"word{i}" for i in range(3000)]
+        self.entities = [
+            {"id": f"ent_{i}", "name": f"Person {i}", "type": "person", "facts": [self.fact() for _ in range(rng.randint(5, 30))]}
+            for i in range(entities)
+        ]
+        self.episodes = [
+            {"id": f"ep_{i}", "title": f"Thread {i}", "events": [self.fact() for _ in range(rng.randint(3, 20))]}
+            for i in range(episodes)
+        ]
+
+    def fact(self) -> str:
+        return " ".join(self.rng.choices(self.words, k=self.rng.randint(8, 25)))
+
+    def grow(self, updates: int) -> None:
+        for record in self.rng.sample(self.entities, updates // 2):
+            record["facts"].append(self.fact())
+        for record in self.rng.sample(self.episodes, updates - updates // 2):
+            record["events"].append(self.fact())
+
+    def retrieve(self, k: int) -> Dict[str, List[Dict[str, Any]]]:
+        # Retrieval favours the same half of the user's entities, as their runs do
+        pick = lambda records: [dict(record) for record in self.rng.sample(records, k)]
+        return {
+            "retrieved_entities": pick(self.entities[: len(self.entities) // 2]),
+            "retrieved_episodes": pick(self.episodes),
+        }
+
+
+async def rebuild_every_run(memory: Memory, runs: int, updates: int, k: int, llm: StubLLM) -> List[float]:
+    """Before: each run summarizes every retrieved entity and episode"""
+    latencies = []
+    for _ in range(runs):
+        memory.grow(updates)
+        retrieved = memory.retrieve(k)
+        start = time.perf_counter()
+        for kind, records in (("entity", retrieved["retrieved_entities"]), ("episode", retrieved["retrieved_episodes"])):
+            for record in records:
+                parts = "\n".join(f"- {part}" for part in summary_parts(record))
+                await llm.ainvoke(FULL_PROMPT.format(kind=kind, title=record.get("name") or record.get("title"), max_words=90, parts=parts))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def stored_summaries(memory: Memory, runs: int, updates: int, k: int, llm: StubLLM) -> Dict[str, Any]:
+    """After: the memory reader serves stored summaries and refreshes changed ones in the background"""
+    counter = TokenCounter()
+    resolver = SummaryResolver(SummaryStore(), counter, model="stub", max_tokens=120, llm=llm)
+    reader = MemoryReader(packer=ContextPacker(counter), summaries=resolver)
+    latencies, fresh_share = [], []
+    for _ in range(runs):
+        memory.grow(updates)
+        state = MindMeshState(tenant_id="tenant", goal_text="prepare the weekly review", **memory.retrieve(k))
+        start = time.perf_counter()
+        update = await reader(state)
+        latencies.append(time.perf_counter() - start)
+        counts = update["performance_metrics"]["memory_reader"]["summaries"]
+        served = counts["fresh"] + counts["verbatim"] + counts["stale"] + counts["missing"]
+        fresh_share.append((counts["fresh"] + counts["verbatim"]) / max(served, 1))
+        await resolver.drain()
+    return {"latencies": latencies, "fresh": fresh_share, "stats": resolver.stats()}
+
+
+async def main(runs: int, entities: int, episodes: int, updates: int, k: int) -> None:
+    counter = TokenCounter()
+    before = StubLLM(counter)
+    latencies = await rebuild_every_run(Memory(entities, episodes, random.Random(0)), runs, updates, k, before)
+    print(f"{runs} runs, {k} entities + {k} episodes retrieved per run, {updates} records updated between runs")
+    print(f"re-summarize every run: {before.calls:5d} LLM calls, {before.prompt_tokens:7d} prompt tokens "
+          f"({before.calls / runs:.1f} calls per run on the run's path)")
+
+    after = StubLLM(counter)
+    result = await stored_summaries(Memory(entities, episodes, random.Random(0)), runs, updates, k, after)
+    stats = result["stats"]
+    print(f"stored summaries:       {after.calls:5d} LLM calls, {after.prompt_tokens:7d} prompt tokens "
+          f"({stats['full_summaries']} full, {stats['incremental_updates']} incremental, none on the run's path)")
+    print(f"records served from a current summary: first run {result['fresh'][0]:.0%}, "
+          f"later runs {statistics.mean(result['fresh'][1:]):.0%}")
+    print(f"memory reader p50 {statistics.median(result['latencies']) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--entities", type=int, default=40)
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=2, help="records that gain a fact between runs")
+    parser.add_argument("--k", type=int, default=8, help="entities and episodes retrieved per run")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.entities, args.episodes, args.updates, args.k))
@@ -0,0 +1,123 @@
+"""
+MindMesh Embedding Pipeline Benchmark
+
+Simulates a mailbox backfill in which many messages repeat the same
+content (signatures, forwarded threads, newsletters) and compares
+embedding each document with its own provider call against the batched,
+deduplicated pipeline, then re-runs the backfill to show the persistent
+content-hash cache at work.
+
+Usage (from ai_engine/):
+    python -m benchmarks.embedding_pipeline --documents 5000 --unique 0.4 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from typing import List, Sequence
+
+import numpy as np
+
+from mindmesh.caching.single_flight import SingleFlight
+from mindmesh.memory.embedding_cache import EmbeddingCache
+from mindmesh.memory.embedding_pipeline import EmbeddingPipeline
+from mindmesh.memory.embeddings import HashingEmbeddingBackend, estimate_tokens
+
+COST_PER_1K_TOKENS = 0.0001
+
+
+class SimulatedProviderBackend(HashingEmbeddingBackend):
+    """Deterministic embeddings with provider-like latency: per-request overhead plus per-text time"""
+
+    def __init__(self, request_latency: float, per_text_latency: float):
+        super().__init__()
+        self.request_latency = request_latency
+        self.per_text_latency = per_text_latency
+
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        await asyncio.sleep(self.request_latency + self.per_text_latency * len(texts))
+        return await super().embed_batch(texts)
+
+
+def backfill(documents: int, unique_ratio: float, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(2000)]
+    pool = [" ".join(rng.choices(words, k=rng.randint(50, 300))) for _ in range(max(1, int(documents * unique_ratio)))]
+    return [rng.choice(pool) for _ in range(documents)]
+
+
+async def run_naive(docs: List[str], backend: SimulatedProviderBackend, concurrency: int) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(text: str) -> None:
+        async with slots:
+            await backend.embed_batch([text])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in docs))
+    return time.perf_counter() - start
+
+
+async def run_pipeline(docs: List[str], pipeline: EmbeddingPipeline, concurrency: int) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(text: str) -> None:
+        async with slots:
+            await pipeline.embed(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in docs))
+    return time.perf_counter() - start
+
+
+async def main(documents: int, unique_ratio: float, concurrency: int, batch_size: int) -> None:
+    docs = backfill(documents, unique_ratio)
+    total_tokens = sum(estimate_tokens(text) for text in docs)
+    print(f"{documents} documents, {len(set(docs))} distinct, ~{total_tokens} tokens, concurrency {concurrency}")
+
+    naive_backend = SimulatedProviderBackend(0.05, 0.0005)
+    elapsed = await run_naive(docs, naive_backend, concurrency)
+    print(f"     naive: {elapsed:6.2f}s  {naive_backend.calls:5d} calls  "
+          f"{naive_backend.texts_embedded:5d} texts  ${total_tokens * COST_PER_1K_TOKENS / 1000:.4f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SimulatedProviderBackend(0.05, 0.0005)
+        cache = EmbeddingCache(f"{directory}/embeddings.db", memory_size=100000)
+        pipeline = EmbeddingPipeline(
+            backend, cache,
+            max_batch_size=batch_size,
+            cost_per_1k_tokens=COST_PER_1K_TOKENS,
+            flights=SingleFlight("benchmark"),
+        )
+        elapsed = await run_pipeline(docs, pipeline, concurrency)
+        stats = pipeline.stats()
+        print(f"  pipeline: {elapsed:6.2f}s  {backend.calls:5d} calls  {backend.texts_embedded:5d} texts  "
+              f"${stats['cost']:.4f}  (avg batch {stats['average_batch_size']:.1f}, "
+              f"coalesced {stats['coalesced']}, cache hits {stats['cache_hits']})")
+
+        # Re-sync after a restart: fresh memory tier, same cache file
+        cache.close()
+        backend = SimulatedProviderBackend(0.05, 0.0005)
+        pipeline = EmbeddingPipeline(
+            backend, EmbeddingCache(f"{directory}/embeddings.db", memory_size=100000),
+            max_batch_size=batch_size,
+            cost_per_1k_tokens=COST_PER_1K_TOKENS,
+            flights=SingleFlight("benchmark"),
+        )
+        elapsed = await run_pipeline(docs, pipeline, concurrency)
+        stats = pipeline.stats()
+        print(f"   re-sync: {elapsed:6.2f}s  {backend.calls:5d} calls  {backend.texts_embedded:5d} texts  "
+              f"${stats['cost']:.4f}  (disk hits {stats['cache']['disk_hits']})")
+        pipeline.cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--unique", type=float, default=0.4, help="Fraction of documents with distinct content")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=128)
+    args = parser.parse_args()
+    asyncio.run(main(args.documents, args.unique, args.concurrency, args.batch_size))
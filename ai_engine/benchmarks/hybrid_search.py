@@ -0,0 +1,135 @@
+"""
+MindMesh Hybrid Search Benchmark
+
+Indexes a synthetic mailbox (Zipf-distributed vocabulary, sender
+addresses, ticket numbers) into one tenant's BM25 index and measures
+query latency for common-word, mixed and identifier queries, highlight
+extraction, and the full hybrid path fused with an IVF vector index.
+
+Usage (from ai_engine/):
+    python -m benchmarks.hybrid_search --documents 1000000
+"""
+
+import argparse
+import asyncio
+import resource
+import statistics
+import time
+
+import numpy as np
+
+from mindmesh.memory.ann_index import IVFIndex, TenantVectorIndex, _TenantState
+from mindmesh.memory.hybrid_search import HybridMemorySearch, render_highlights
+from mindmesh.memory.lexical_index import BM25Index, TenantLexicalIndex
+
+APPS = ["gmail", "drive", "slack", "notion"]
+
+
+class _FixedQueryPipeline:
+    """Stands in for the embedding pipeline with precomputed query vectors"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    async def embed(self, text):
+        return self.vectors[hash(text) % len(self.vectors)]
+
+
+def mailbox(n: int, rng: np.random.Generator):
+    words = [f"w{i}" for i in range(50000)]
+    senders = [f"user{i}@example{i % 50}.com" for i in range(5000)]
+    lengths = rng.integers(10, 60, n)
+    tokens = np.minimum(rng.zipf(1.2, int(lengths.sum())), len(words)) - 1
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    for i in range(n):
+        body = " ".join(words[t] for t in tokens[offsets[i]:offsets[i + 1]])
+        yield f"doc_{i}", {
+            "title": f"INC-{100000 + i} {words[tokens[offsets[i]]]}",
+            "content": f"From {senders[i % len(senders)]}: {body}",
+        }
+
+
+def report(label: str, latencies) -> None:
+    p50 = statistics.median(latencies) * 1000
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{label:>32}: p50 {p50:7.2f}ms  p95 {p95:7.2f}ms")
+
+
+def timed(fn, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(n: int, queries: int, dim: int) -> None:
+    rng = np.random.default_rng(0)
+    index = BM25Index()
+    start = time.perf_counter()
+    for i, (doc_id, fields) in enumerate(mailbox(n, rng)):
+        index.add(doc_id, fields, {"type": "document", "app": APPS[i % len(APPS)], "created_at": 1.6e9 + i})
+    index.flush()
+    build = time.perf_counter() - start
+    postings = sum(len(segment) for segment in index.segments)
+    print(f"{n} documents, {len(index.terms)} terms, {postings} postings in {len(index.segments)} segments")
+    print(f"build: {build:.1f}s  ({n / build:.0f} docs/s)  peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}MB")
+
+    picks = rng.integers(0, n, queries)
+    common = [f"w{a} w{b}" for a, b in rng.integers(0, 20, (queries, 2))]
+    mixed = [f"w{a} w{b} w{c}" for a, b, c in zip(rng.integers(0, 20, queries), rng.integers(100, 2000, queries), rng.integers(2000, 40000, queries))]
+    identifiers = [f"INC-{100000 + i}" for i in picks]
+    senders = [f"user{i % 5000}@example{i % 50}.com" for i in picks]
+
+    report("common words (2 terms)", timed(lambda q: index.search(q, 10), common))
+    report("mixed frequency (3 terms)", timed(lambda q: index.search(q, 10), mixed))
+    report("ticket number", timed(lambda q: index.search(q, 10), identifiers))
+    report("sender address", timed(lambda q: index.search(q, 10), senders))
+    report("mixed, filtered app=gmail", timed(lambda q: index.search(q, 10, {"app": "gmail"}), mixed))
+    hits = sum(index.search(q, 1)[0][0] == f"doc_{i}" for q, i in zip(identifiers, picks))
+    print(f"ticket number ranked first: {hits}/{queries}")
+
+    top = [index.search(q, 10) for q in mixed]
+    latencies = []
+    for query, results in zip(mixed, top):
+        start = time.perf_counter()
+        index.highlights_many([doc_id for doc_id, _ in results], query)
+        latencies.append(time.perf_counter() - start)
+    report("highlights for top 10", latencies)
+    spans = index.highlights(f"doc_{picks[0]}", identifiers[0])
+    print(f"example highlight: {spans}")
+    print("  " + " | ".join(render_highlights(f"INC-{identifiers[0][4:]} w0", spans.get("title", []))))
+
+    # Hybrid path: the same tenant with random document vectors in an IVF index
+    print(f"building {dim}-dim vector index...")
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    ann = IVFIndex(dim)
+    for offset in range(0, n, 50000):
+        ann.add_many([f"doc_{i}" for i in range(offset, min(n, offset + 50000))], vectors[offset:offset + 50000])
+    lexical = TenantLexicalIndex("/tmp/unused")
+    lexical._indexes["tenant"] = index
+    dense = TenantVectorIndex("/tmp/unused", dim)
+    dense._tenants["tenant"] = _TenantState(ann)
+    search = HybridMemorySearch(lexical, dense, _FixedQueryPipeline(vectors[:queries]))
+
+    asyncio.run(search_modes(search, mixed))
+
+
+async def search_modes(search: HybridMemorySearch, queries) -> None:
+    for mode in ("lexical", "vector", "hybrid"):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            await search.search("tenant", query, 10, mode=mode)
+            latencies.append(time.perf_counter() - start)
+        report(f"memory search, {mode}", latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=64, help="Vector dimension for the hybrid run")
+    args = parser.parse_args()
+    main(args.documents, args.queries, args.dim)
@@ -0,0 +1,150 @@
+"""
+MindMesh Streaming Ingestion Benchmark
+
+Ingests large synthetic documents (a long email thread exported to a
+file) with the streaming pipeline and with a whole-document baseline
+that normalizes, chunks and embeds the full text before writing. Reports
+wall time and peak Python memory (tracemalloc) per document size, then
+interrupts an ingestion halfway and resumes it.
+
+Usage (from ai_engine/):
+    python -m benchmarks.ingestion --sizes 4 16 64
+"""
+
+import argparse
+import asyncio
+import os
+import pathlib
+import random
+import tempfile
+import time
+import tracemalloc
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+from mindmesh.caching.single_flight import SingleFlight
+from mindmesh.memory.embedding_cache import EmbeddingCache
+from mindmesh.memory.embedding_pipeline import EmbeddingPipeline
+from mindmesh.memory.embeddings import EmbeddingBackend
+from mindmesh.memory.ingestion import (
+    IngestionPipeline, IngestionProgressStore, StreamingChunker, StreamingRedactor, TextNormalizer,
+)
+
+DIMENSION = 1536
+
+
+class SimulatedProviderBackend(EmbeddingBackend):
+    """Cheap deterministic vectors with provider-like latency per request and per text"""
+
+    model = "simulated"
+    dimension = DIMENSION
+
+    def __init__(self, request_latency: float = 0.02, per_text_latency: float = 0.0002):
+        self.request_latency = request_latency
+        self.per_text_latency = per_text_latency
+
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        await asyncio.sleep(self.request_latency + self.per_text_latency * len(texts))
+        return [
+            np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIMENSION).astype(np.float32)
+            for text in texts
+        ]
+
+
+class SimulatedStore:
+    """Writer with a fixed round trip per batch, like a database insert"""
+
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.chunks = 0
+        self.fail_after = None
+
+    async def write(self, doc_id, batch, metadata) -> None:
+        if self.fail_after is not None and self.chunks >= self.fail_after:
+            raise ConnectionError("store went away")
+        await asyncio.sleep(self.latency)
+        self.chunks += len(batch)
+
+
+def write_thread(path: str, megabytes: int) -> None:
+    """A long email thread with quoted replies, signatures and the odd card number"""
+    rng = random.Random(megabytes)
+    words = [f"word{i}" for i in range(5000)]
+    with open(path, "w") as f:
+        written = 0
+        while written < megabytes * 1024 * 1024:
+            paragraph = " ".join(rng.choices(words, k=rng.randint(20, 120)))
+            if rng.random() < 0.05:
+                paragraph += "  card 4111 1111 1111 1111\r\n"
+            block = f"> {paragraph}\r\n\r\n\r\n-- \r\nSent from my phone\r\n"
+            f.write(block)
+            written += len(block)
+
+
+def embedder() -> EmbeddingPipeline:
+    return EmbeddingPipeline(
+        SimulatedProviderBackend(), EmbeddingCache(None, memory_size=1000), flights=SingleFlight("benchmark"),
+    )
+
+
+async def whole_document(path: str, store: SimulatedStore) -> int:
+    """Baseline: the full content string through each step before the next"""
+    with open(path) as f:
+        content = f.read()
+    normalizer, redactor, chunker = TextNormalizer(), StreamingRedactor(), StreamingChunker()
+    text = normalizer.feed(content) + normalizer.finish()
+    text = redactor.feed(text) + redactor.finish()
+    chunks = chunker.feed(text) + chunker.finish()
+    vectors = await embedder().embed_many([chunk.text for chunk in chunks])
+    for start in range(0, len(chunks), 32):
+        await store.write("doc", list(zip(chunks[start:start + 32], vectors[start:start + 32])), {})
+    return len(chunks)
+
+
+async def streaming(path: str, store: SimulatedStore, progress: IngestionProgressStore = None):
+    pipeline = IngestionPipeline(store.write, embedder=embedder(), progress=progress or IngestionProgressStore())
+    return await pipeline.ingest("doc", pathlib.Path(path), version="v1")
+
+
+def measure(coroutine_factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = asyncio.run(coroutine_factory())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(sizes: Sequence[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for megabytes in sizes:
+            path = os.path.join(directory, f"thread_{megabytes}.txt")
+            write_thread(path, megabytes)
+
+            chunks, elapsed, peak = measure(lambda: whole_document(path, SimulatedStore()))
+            print(f"{megabytes:4d}MB  whole document: {elapsed:6.1f}s  peak {peak / 2**20:7.1f}MB  ({chunks} chunks)")
+            result, elapsed, peak = measure(lambda: streaming(path, SimulatedStore()))
+            print(f"{megabytes:4d}MB       streaming: {elapsed:6.1f}s  peak {peak / 2**20:7.1f}MB  ({result.chunks} chunks)")
+
+        # Interrupt halfway through the largest document, then resume
+        progress = IngestionProgressStore(os.path.join(directory, "progress.db"))
+        store = SimulatedStore()
+        store.fail_after = chunks // 2
+        try:
+            asyncio.run(streaming(path, store, progress))
+        except ConnectionError:
+            print(f"interrupted after {store.chunks} chunks; recorded {progress.get('doc')}")
+        store.fail_after = None
+        result, elapsed, _ = measure(lambda: streaming(path, store, progress))
+        print(f"resumed at chunk {result.resumed_from}: wrote {result.written} more in {elapsed:.1f}s "
+              f"(total written {store.chunks} of {result.chunks})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64], help="Document sizes in MB")
+    args = parser.parse_args()
+    main(args.sizes)
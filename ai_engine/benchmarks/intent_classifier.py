@@ -0,0 +1,142 @@
+"""
+MindMesh Intent Classifier Benchmark
+
+Trains the local intent model on synthetic labelled goals, then classifies
+unseen goals with a stub LLM fallback, reporting the fraction of goals
+short-circuited locally and the per-goal latency saved versus always
+calling the LLM.
+
+Usage (from ai_engine/):
+    python -m benchmarks.intent_classifier --train 2000 --goals 500 --llm-latency 0.8
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Tuple
+
+from mindmesh.classification.intent import IntentClassifier
+from mindmesh.classification.train_intent import train
+
+TEMPLATES = {
+    "research": [
+        "research {topic}", "find out what's new in {topic}", "look into {topic} options",
+        "gather sources on {topic}", "investigate how competitors approach {topic}",
+    ],
+    "write": [
+        "write a blog post about {topic}", "draft an email to {person} about {topic}",
+        "compose a proposal for {topic}", "write up notes on {topic} for {person}",
+    ],
+    "schedule": [
+        "schedule a meeting with {person} about {topic}", "book time with {person} next week",
+        "set up a call with {person} on {topic}", "find a slot to sync with {person}",
+    ],
+    "summarize": [
+        "summarize my emails about {topic}", "give me a summary of the {topic} thread",
+        "tl;dr the {topic} doc", "recap yesterday's meeting with {person}",
+    ],
+    "plan": [
+        "plan the {topic} launch", "make a roadmap for {topic}", "break down the {topic} project into tasks",
+        "outline next quarter's goals for {topic}",
+    ],
+    "code": [
+        "fix the bug in the {topic} service", "write a python script for {topic}",
+        "refactor the {topic} module", "implement an api endpoint for {topic}",
+    ],
+    "analyze": [
+        "analyze the {topic} metrics", "compare last month's {topic} numbers",
+        "find trends in our {topic} data", "evaluate the performance of {topic}",
+    ],
+}
+TOPICS = [
+    "vector databases", "the marketing campaign", "pricing", "onboarding", "billing", "hiring",
+    "customer churn", "the mobile app", "security audit", "q3 revenue", "the design system",
+]
+PEOPLE = ["Alex", "the sales team", "our investors", "Priya", "the design lead"]
+
+# Free-form goals phrased unlike any training template
+UNSEEN = [
+    ("what are people saying about rust for backend work", "research"),
+    ("dig up case studies on usage-based pricing", "research"),
+    ("any recent papers on retrieval augmented generation?", "research"),
+    ("who are the main vendors for observability tooling", "research"),
+    ("put together a linkedin post announcing our seed round", "write"),
+    ("reply to Jordan thanking them for the intro", "write"),
+    ("need a cover letter for the staff engineer role", "write"),
+    ("create release notes for version 2.3", "write"),
+    ("get a 30 min slot on everyone's calendar for friday", "schedule"),
+    ("move my dentist appointment to thursday", "schedule"),
+    ("remind me to call the landlord tomorrow at 9", "schedule"),
+    ("arrange interviews with the three finalists", "schedule"),
+    ("condense this 40 page report into key points", "summarize"),
+    ("what did I miss in slack while on vacation", "summarize"),
+    ("bullet points from the board deck please", "summarize"),
+    ("highlights of the customer feedback survey", "summarize"),
+    ("figure out the steps to migrate to kubernetes", "plan"),
+    ("how should we sequence the website redesign", "plan"),
+    ("milestones for moving the team to the new office", "plan"),
+    ("organize a timeline for the conference talk prep", "plan"),
+    ("the login page throws a 500, debug it", "code"),
+    ("add unit tests for the payments client", "code"),
+    ("set up ci for the monorepo", "code"),
+    ("port the cron jobs from bash to go", "code"),
+    ("why did signups drop in august", "analyze"),
+    ("crunch the a/b test results for the checkout flow", "analyze"),
+    ("which customer segment has the best retention", "analyze"),
+    ("break down cloud spend by service", "analyze"),
+]
+
+
+def generate(count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    examples = []
+    for _ in range(count):
+        intent = rng.choice(list(TEMPLATES))
+        text = rng.choice(TEMPLATES[intent]).format(topic=rng.choice(TOPICS), person=rng.choice(PEOPLE))
+        examples.append((text, intent))
+    return examples
+
+
+async def main(train_size: int, goals: int, llm_latency: float, threshold: float) -> None:
+    rng = random.Random(42)
+    model, report = train(generate(train_size, rng), threshold=threshold)
+    print(f"holdout: {report}")
+
+    test_goals = generate(goals - len(UNSEEN), rng) + UNSEEN
+    labels = dict(test_goals)
+
+    async def stub_llm(text: str) -> Tuple[str, float]:
+        await asyncio.sleep(llm_latency)
+        return labels[text], 0.95
+
+    classifier = IntentClassifier(model, confidence_threshold=threshold)
+    start = time.perf_counter()
+    # Classify concurrently so the stub LLM's sleeps overlap; latency is tracked per goal
+    results = await asyncio.gather(*(classifier.classify(text, stub_llm) for text, _ in test_goals))
+    elapsed = time.perf_counter() - start
+    correct = sum(result.intent == intent for result, (_, intent) in zip(results, test_goals))
+
+    unseen = results[-len(UNSEEN):]
+    unseen_local = [result for result, (_, intent) in zip(unseen, UNSEEN) if result.source == "local"]
+    unseen_local_correct = sum(
+        result.intent == intent for result, (_, intent) in zip(unseen, UNSEEN) if result.source == "local"
+    )
+
+    stats = classifier.stats()
+    two_stage = sum(result.latency for result in results) / len(results)
+    print(f"goals: {goals}  short-circuited: {stats['short_circuit_rate']:.1%}  accuracy: {correct / goals:.1%}")
+    print(f"unseen phrasings: {len(unseen_local)}/{len(UNSEEN)} short-circuited, "
+          f"{unseen_local_correct}/{len(unseen_local)} of those correct")
+    print(f"avg latency: LLM-only {llm_latency * 1000:.0f}ms  two-stage {two_stage * 1000:.1f}ms  "
+          f"(local model {stats['average_local_latency_seconds'] * 1e6:.0f}us)")
+    print(f"latency saved per goal: {(llm_latency - two_stage) * 1000:.0f}ms  (wall {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train", type=int, default=2000)
+    parser.add_argument("--goals", type=int, default=500)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+    asyncio.run(main(args.train, args.goals, args.llm_latency, args.threshold))
@@ -0,0 +1,119 @@
+"""
+MindMesh Shared Snapshot Benchmark
+
+Builds one tenant's vector index, compacts it into a snapshot and starts
+N worker processes that each open the tenant and answer queries. Reports
+per-worker private and shared memory (from /proc/self/smaps_rollup) when
+workers memory-map the snapshot versus when each copies it to its heap,
+then measures log replay and compaction.
+
+Usage (from ai_engine/):
+    python -m benchmarks.shared_snapshots --vectors 200000 --dim 384 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+from mindmesh.memory.ann_index import TenantVectorIndex, _InvertedList
+from benchmarks.ann_index import clustered
+
+
+def memory_mb() -> dict:
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Pss:", "Private_Clean:", "Private_Dirty:"):
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return fields
+
+
+def worker(directory: str, dim: int, quantization: str, heap_copy: bool, queries: np.ndarray, barrier, results) -> None:
+    before = memory_mb()
+    index = TenantVectorIndex(directory, dim, quantization=quantization)
+    start = time.perf_counter()
+    state = index._state("tenant")
+    opened = time.perf_counter() - start
+    if heap_copy:
+        state.index.lists = [
+            _InvertedList.view(inverted.ids, {name: np.array(column) for name, column in inverted.rows().items()})
+            for inverted in state.index.lists
+        ]
+        if state.index.store is not None:
+            state.index.store.base = np.array(state.index.store.base)
+    for query in queries:
+        index.search("tenant", query, 10)
+    # Measure while every worker has the snapshot open, so mapped pages count as shared
+    barrier.wait()
+    after = memory_mb()
+    barrier.wait()
+    results.put({
+        "open": opened,
+        "private": after["Private_Clean"] + after["Private_Dirty"] - before["Private_Clean"] - before["Private_Dirty"],
+        "pss": after["Pss"] - before["Pss"],
+    })
+
+
+def run_workers(directory: str, dim: int, quantization: str, heap_copy: bool, workers: int, queries: np.ndarray):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    barrier = context.Barrier(workers)
+    processes = [
+        context.Process(target=worker, args=(directory, dim, quantization, heap_copy, queries, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def main(n: int, dim: int, workers: int, quantization: str) -> None:
+    rng = np.random.default_rng(0)
+    vectors = clustered(n, dim, clusters=max(64, n // 2000), rng=rng)
+    queries = vectors[rng.integers(0, n, 200)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = TenantVectorIndex(directory, dim, quantization=quantization, compact_bytes=2**62)
+        start = time.perf_counter()
+        for offset in range(0, n, 10000):
+            index.upsert("tenant", [f"doc_{i}" for i in range(offset, min(n, offset + 10000))], vectors[offset:offset + 10000])
+        logged = time.perf_counter() - start
+        log_bytes = index.stats()["log_bytes"]
+        start = time.perf_counter()
+        index.compact("tenant")
+        print(f"{n} x {dim} ({quantization}): logged {log_bytes / 2**20:.0f}MB in {logged:.1f}s, "
+              f"compacted in {time.perf_counter() - start:.1f}s")
+
+        # A worker opening the tenant with an uncompacted tail to replay
+        tail = vectors[:1000] + 0.01
+        index.upsert("tenant", [f"new_{i}" for i in range(1000)], tail)
+        fresh = TenantVectorIndex(directory, dim, quantization=quantization)
+        start = time.perf_counter()
+        fresh.search("tenant", queries[0], 10)
+        print(f"open snapshot + replay 1000 logged vectors: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        for heap_copy in (True, False):
+            reports = run_workers(directory, dim, quantization, heap_copy, workers, queries)
+            label = "heap copy per worker" if heap_copy else "memory-mapped snapshot"
+            private = np.mean([report["private"] for report in reports])
+            pss = sum(report["pss"] for report in reports)
+            opened = np.mean([report["open"] for report in reports])
+            print(f"{label:>24}: {workers} workers, private {private:7.1f}MB each, "
+                  f"total PSS {pss:7.1f}MB, open {opened * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--quantization", default="none", choices=["none", "int8"])
+    args = parser.parse_args()
+    main(args.vectors, args.dim, args.workers, args.quantization)
@@ -0,0 +1,105 @@
+"""
+MindMesh Tool Executor Benchmark
+
+Executes a typical goal's tool calls (calendar, mail and drive lookups
+feeding a draft and a send) with simulated connector latencies and
+transient failures, comparing one call at a time against the dependency
+DAG with independent calls in flight together. Connector limits and
+retries are the same in both.
+
+Usage (from ai_engine/):
+    python -m benchmarks.tool_executor --runs 20 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from mindmesh.nodes.executor import Executor
+from mindmesh.tools.limits import ConnectorLimits
+from mindmesh.tools.registry import ToolRegistry
+
+# Simulated tool latencies in seconds
+LATENCIES = {
+    "calendar.list_events": 0.35,
+    "gmail.search": 0.50,
+    "gmail.get_thread": 0.25,
+    "drive.search": 0.60,
+    "drive.get_file": 0.30,
+    "slack.search": 0.40,
+    "llm.draft": 1.20,
+    "gmail.send": 0.30,
+}
+
+CALLS: List[Dict[str, Any]] = [
+    {"id": "events", "tool": "calendar.list_events"},
+    {"id": "mail", "tool": "gmail.search"},
+    {"id": "thread", "tool": "gmail.get_thread", "depends_on": ["mail"]},
+    {"id": "files", "tool": "drive.search"},
+    {"id": "doc", "tool": "drive.get_file", "depends_on": ["files"]},
+    {"id": "chat", "tool": "slack.search"},
+    {"id": "draft", "tool": "llm.draft", "depends_on": ["events", "thread", "doc", "chat"]},
+    {"id": "send", "tool": "gmail.send", "depends_on": ["draft"]},
+]
+
+
+def build_registry(rng: random.Random, failure_rate: float, scale: float) -> ToolRegistry:
+    registry = ToolRegistry()
+
+    def simulated(latency: float):
+        async def call(args: Dict[str, Any], dependencies: Dict[str, Any]) -> Any:
+            await asyncio.sleep(latency * scale * rng.uniform(0.8, 1.2))
+            if rng.random() < failure_rate:
+                raise ConnectionError("connection reset")
+            return {"items": len(dependencies)}
+        return call
+
+    for name, latency in LATENCIES.items():
+        registry.register(name, simulated(latency))
+    return registry
+
+
+async def measure(concurrent: bool, runs: int, failure_rate: float, scale: float) -> Dict[str, List[float]]:
+    rng = random.Random(0)
+    executor = Executor(
+        build_registry(rng, failure_rate, scale),
+        ConnectorLimits(max_concurrent=4, rate_per_second=0),
+        # One call at a time is the flat list processed in order
+        max_concurrent=8 if concurrent else 1,
+        timeout=10.0,
+        max_attempts=3,
+        retry_backoff=0.1 * scale,
+    )
+    timings: Dict[str, List[float]] = {"wall": [], "failed": []}
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = await executor.execute(CALLS)
+        timings["wall"].append(time.perf_counter() - start)
+        timings["failed"].append(sum(not result["ok"] for result in results))
+    return timings
+
+
+async def main(runs: int, failure_rate: float, scale: float) -> None:
+    print(f"{len(CALLS)} tool calls per goal, {runs} goals, {failure_rate:.0%} transient failures per attempt")
+    baseline = None
+    for concurrent in (False, True):
+        timings = await measure(concurrent, runs, failure_rate, scale)
+        wall = timings["wall"]
+        p50 = statistics.median(wall)
+        label = "dependency DAG, concurrent" if concurrent else "one call at a time"
+        speedup = f"  ({baseline / p50:.2f}x)" if baseline else ""
+        print(f"{label:28s} p50 {p50 * 1000:6.0f}ms  p95 {sorted(wall)[int(len(wall) * 0.95) - 1] * 1000:6.0f}ms  "
+              f"failed calls {sum(timings['failed'])}{speedup}")
+        baseline = baseline or p50
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for simulated latencies")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.failure_rate, args.scale))
@@ -0,0 +1,32 @@
+"""
+MindMesh AI Engine test configuration
+
+Tests run from ai_engine/ (python -m pytest); this file puts ai_engine/
+on sys.path so the mindmesh package imports as it does in the workers,
+and points the stores of the engine's global instances at a temporary
+directory instead of ai_engine/data/.
+"""
+
+import os
+import shutil
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="mindmesh-tests-")
+
+for name, path in {
+    "RUN_QUEUE_SQLITE_PATH": "run_queue.db",
+    "APPROVAL_STORE_PATH": "approvals.db",
+    "INTENT_MODEL_PATH": "intent_model.npz",
+    "EMBEDDING_CACHE_PATH": "embeddings.db",
+    "ANN_INDEX_DIR": "ann",
+    "LEXICAL_INDEX_DIR": "lexical",
+    "MEMORY_DOCUMENT_STORE_PATH": "memory_documents.db",
+    "SUMMARY_STORE_PATH": "summaries.db",
+    "INGEST_PROGRESS_PATH": "ingestion.db",
+    "CHECKPOINT_SQLITE_PATH": "checkpoints.db",
+}.items():
+    os.environ[name] = os.path.join(_DATA_DIR, path)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
@@ -0,0 +1,428 @@
+"""
+MindMesh LLM Response Cache
+"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from mindmesh.caching.single_flight import SingleFlight, llm_flights
+from mindmesh.config.settings import settings
+from mindmesh.memory.embedding_pipeline import embedding_pipeline
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Details two prompts must share before one may reuse the other's answer
+_ENTITY_RE = re.compile(
+    r"""(?x)
+    "[^"]+" | '[^']+'                         # quoted text
+    | [\w.+-]+@[\w-]+(?:\.[\w-]+)+            # email addresses
+    | https?://\S+                            # links
+    | [@\#]\w+                                # mentions and channels
+    | \w*\d(?:[\w:/-]|[.,]\d)*                # numbers, times, dates and codes (3pm, Q3)
+    | \b(?:mon|tues|wednes|thurs|fri|satur|sun)day\b
+    | \b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?
+         |sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b
+    | \b(?:today|tonight|tomorrow|yesterday|morning|afternoon|evening|noon|midnight
+         |week|weekend|month|quarter|year|next|last|this|before|after|am|pm|not|no|never)\b
+    """,
+    re.IGNORECASE,
+)
+_NAME_RE = re.compile(r"(?<![.!?]\s)(?<!^)\b[A-Z][a-zA-Z]+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt used for exact matching"""
+    return _WHITESPACE_RE.sub(" ", prompt.strip().lower()).rstrip(" .!?")
+
+
+def prompt_entities(text: str) -> FrozenSet[str]:
+    """
+    Dates, times, numbers, names, addresses and negations in a prompt.
+    Prompts that embed close together but differ in one of these (Monday
+    vs Tuesday, Alice vs Bob) need different answers.
+    """
+    entities = {match.lower() for match in _ENTITY_RE.findall(text)}
+    entities.update(match.lower() for match in _NAME_RE.findall(text.strip()))
+    return frozenset(entities)
+
+
+def response_cost(message: Any) -> float:
+    """Dollar cost of an LLM response from its reported token usage"""
+    metadata = getattr(message, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    input_tokens = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0))
+    return (
+        input_tokens * settings.LLM_COST_PER_1K_INPUT_TOKENS
+        + output_tokens * settings.LLM_COST_PER_1K_OUTPUT_TOKENS
+    ) / 1000
+
+
+class CachedResponse(NamedTuple):
+    """A response and where it came from"""
+    response: str
+    tier: str  # exact | semantic | coalesced | miss
+    similarity: float
+    cost: float  # cost of the original call
+    latency: float  # latency of the original call
+
+
+@dataclass
+class _Entry:
+    tenant_id: str
+    namespace: Tuple[Any, ...]
+    entities: FrozenSet[str]
+    response: str
+    cost: float
+    latency: float
+    expires_at: float
+
+
+class _SemanticIndex:
+    """Unit vectors of one namespace's cached prompts, searched by dot product"""
+
+    def __init__(self, dim: int):
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.zeros((16, dim), dtype=np.float32)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if key in self.rows:
+            self.vectors[self.rows[key]] = vector
+            return
+        if len(self.keys) == len(self.vectors):
+            self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+        self.rows[key] = len(self.keys)
+        self.vectors[len(self.keys)] = vector
+        self.keys.append(key)
+
+    def remove(self, key: str) -> None:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        # Move the last row into the hole
+        last_key = self.keys.pop()
+        if last_key != key:
+            self.keys[row] = last_key
+            self.rows[last_key] = row
+            self.vectors[row] = self.vectors[len(self.keys)]
+
+    def search(self, vector: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """Keys at or above the similarity threshold, most similar first"""
+        if not self.keys:
+            return []
+        similarities = self.vectors[:len(self.keys)] @ vector
+        candidates = np.flatnonzero(similarities >= threshold)
+        order = candidates[np.argsort(-similarities[candidates])]
+        return [(self.keys[i], float(similarities[i])) for i in order]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM responses.
+
+    The exact tier matches on the normalized prompt together with tenant,
+    calling node, model, temperature and autonomy level. On an exact miss
+    the semantic tier reuses the response of the most similar cached input
+    in the same namespace (tenant, node, model, temperature, autonomy
+    level) when its cosine similarity reaches ``semantic_threshold`` and
+    both inputs name the same entities (see prompt_entities). Inputs are
+    embedded through the embedding pipeline, so the tier is only as good
+    as the configured embedding backend; an embedding failure degrades to
+    a miss. Tenants never see each other's entries; each tenant is capped at
+    ``max_entries_per_tenant`` so one tenant can't flush the others, and
+    all entries expire after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_entries_per_tenant: int = 1000,
+        ttl_seconds: float = 86400.0,
+        semantic_threshold: float = 0.92,
+        embed: Optional[Callable[[str], Awaitable[np.ndarray]]] = None,
+        enabled: bool = True,
+        flights: Optional[SingleFlight] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_entries_per_tenant = max_entries_per_tenant
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.embed = embed or embedding_pipeline.embed
+        self.enabled = enabled
+        self.flights = flights or llm_flights
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tenant_keys: Dict[str, "OrderedDict[str, None]"] = {}
+        self._indexes: Dict[Tuple[Any, ...], _SemanticIndex] = {}
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.semantic_rejected = 0
+        self.embedding_errors = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_cost = 0.0
+        self.saved_latency = 0.0
+
+    async def lookup(
+        self,
+        tenant_id: Optional[str],
+        scope: str,
+        prompt: str,
+        model: str,
+        temperature: float,
+        autonomy_level: Optional[str] = None,
+        semantic_text: Optional[str] = None,
+    ) -> Optional[CachedResponse]:
+        """
+        Find a cached response. semantic_text is the variable part of the
+        prompt (e.g. the goal) compared by the semantic tier; it defaults to
+        the whole prompt.
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        namespace = self._namespace(tenant_id, scope, model, temperature, autonomy_level)
+        key = self._key(namespace, prompt)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                return self._hit(key, entry, "exact", 1.0)
+            self._remove(key)
+
+        index = self._indexes.get(namespace)
+        if index is not None and self.semantic_threshold < 1.0:
+            text = semantic_text or prompt
+            vector = await self._embed(text)
+            entities = prompt_entities(text)
+            candidates = index.search(vector, self.semantic_threshold) if vector is not None else []
+            for candidate, similarity in candidates:
+                entry = self._entries.get(candidate)
+                if entry is None:
+                    # Evicted while the input was being embedded
+                    continue
+                if entry.expires_at <= now:
+                    self._remove(candidate)
+                elif entry.entities != entities:
+                    self.semantic_rejected += 1
+                else:
+                    return self._hit(candidate, entry, "semantic", similarity)
+
+        self.misses += 1
+        return None
+
+    async def store(
+        self,
+        tenant_id: Optional[str],
+        scope: str,
+        prompt: str,
+        model: str,
+        temperature: float,
+        response: str,
+        autonomy_level: Optional[str] = None,
+        semantic_text: Optional[str] = None,
+        cost: float = 0.0,
+        latency: float = 0.0,
+    ) -> None:
+        """Cache a response along with what it cost to produce"""
+        if not self.enabled:
+            return
+
+        tenant = str(tenant_id)
+        namespace = self._namespace(tenant_id, scope, model, temperature, autonomy_level)
+        key = self._key(namespace, prompt)
+        text = semantic_text or prompt
+        vector = await self._embed(text) if self.semantic_threshold < 1.0 else None
+        self._remove(key)
+
+        self._entries[key] = _Entry(
+            tenant, namespace, prompt_entities(text), response, cost, latency, time.time() + self.ttl_seconds,
+        )
+        self._tenant_keys.setdefault(tenant, OrderedDict())[key] = None
+        if vector is not None:
+            index = self._indexes.get(namespace)
+            if index is None or index.dim != len(vector):
+                # Also starts over when the embedding backend changed
+                index = self._indexes[namespace] = _SemanticIndex(len(vector))
+            index.add(key, vector)
+
+        # Per-tenant cap first, then the global one
+        tenant_keys = self._tenant_keys[tenant]
+        while len(tenant_keys) > self.max_entries_per_tenant:
+            self._remove(next(iter(tenant_keys)))
+            self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_call(
+        self,
+        tenant_id: Optional[str],
+        scope: str,
+        prompt: str,
+        model: str,
+        temperature: float,
+        call: Callable[[], Awaitable[Tuple[str, float]]],
+        autonomy_level: Optional[str] = None,
+        semantic_text: Optional[str] = None,
+    ) -> CachedResponse:
+        """
+        Return a cached response, or make the call (returning response and
+        cost) and cache it. Concurrent misses for the same prompt share a
+        single upstream call.
+        """
+        cached = await self.lookup(tenant_id, scope, prompt, model, temperature, autonomy_level, semantic_text)
+        if cached is not None:
+            return cached
+
+        async def upstream() -> Tuple[str, float, float]:
+            start = time.perf_counter()
+            response, cost = await call()
+            latency = time.perf_counter() - start
+            await self.store(
+                tenant_id, scope, prompt, model, temperature, response,
+                autonomy_level=autonomy_level,
+                semantic_text=semantic_text,
+                cost=cost,
+                latency=latency,
+            )
+            return response, cost, latency
+
+        namespace = self._namespace(tenant_id, scope, model, temperature, autonomy_level)
+        (response, cost, latency), shared = await self.flights.do(self._key(namespace, prompt), upstream)
+        if shared:
+            self.saved_cost += cost
+            return CachedResponse(response, "coalesced", 1.0, cost, latency)
+        return CachedResponse(response, "miss", 0.0, cost, latency)
+
+    def invalidate_tenant(self, tenant_id: Optional[str]) -> None:
+        """Drop every cached response of a tenant"""
+        for key in list(self._tenant_keys.get(str(tenant_id), ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tenant_keys.clear()
+        self._indexes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit-rate and savings metrics"""
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "semantic_rejected": self.semantic_rejected,
+            "embedding_errors": self.embedding_errors,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "saved_cost": self.saved_cost,
+            "saved_latency_seconds": self.saved_latency,
+            "coalescing": self.flights.stats(),
+        }
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit vector of the text; None if it could not be embedded"""
+        try:
+            vector = np.asarray(await self.embed(text), dtype=np.float32)
+        except Exception:
+            self.embedding_errors += 1
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _hit(self, key: str, entry: _Entry, tier: str, similarity: float) -> CachedResponse:
+        self._entries.move_to_end(key)
+        self._tenant_keys[entry.tenant_id].move_to_end(key)
+        if tier == "exact":
+            self.exact_hits += 1
+        else:
+            self.semantic_hits += 1
+        self.saved_cost += entry.cost
+        self.saved_latency += entry.latency
+        return CachedResponse(entry.response, tier, similarity, entry.cost, entry.latency)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        tenant_keys = self._tenant_keys.get(entry.tenant_id)
+        if tenant_keys is not None:
+            tenant_keys.pop(key, None)
+            if not tenant_keys:
+                del self._tenant_keys[entry.tenant_id]
+        index = self._indexes.get(entry.namespace)
+        if index is not None:
+            index.remove(key)
+            if not len(index):
+                del self._indexes[entry.namespace]
+
+    def _namespace(
+        self,
+        tenant_id: Optional[str],
+        scope: str,
+        model: str,
+        temperature: float,
+        autonomy_level: Optional[str],
+    ) -> Tuple[Any, ...]:
+        return (str(tenant_id), scope, model, round(float(temperature), 3), autonomy_level)
+
+    def _key(self, namespace: Tuple[Any, ...], prompt: str) -> str:
+        material = "\x1f".join(str(part) for part in namespace) + "\x1f" + normalize_prompt(prompt)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+
+def record_llm_usage(state: Any, node: str, result: CachedResponse) -> Dict[str, Any]:
+    """
+    State updates accounting for one LLM call of a node: spend and savings
+    go to cost_tracking, the cache outcome to performance_metrics.
+    """
+    cost_tracking = dict(state.cost_tracking or {})
+    if result.tier == "miss":
+        cost_tracking["llm_cost"] = cost_tracking.get("llm_cost", 0.0) + result.cost
+        cost_tracking["llm_calls"] = cost_tracking.get("llm_calls", 0) + 1
+    elif result.tier == "coalesced":
+        cost_tracking["coalesced_saved_cost"] = cost_tracking.get("coalesced_saved_cost", 0.0) + result.cost
+        cost_tracking["coalesced_calls"] = cost_tracking.get("coalesced_calls", 0) + 1
+    else:
+        cost_tracking["cache_saved_cost"] = cost_tracking.get("cache_saved_cost", 0.0) + result.cost
+        cost_tracking["cache_hits"] = cost_tracking.get("cache_hits", 0) + 1
+
+    performance_metrics = dict(state.performance_metrics or {})
+    cache_metrics = dict(performance_metrics.get("llm_cache") or {})
+    cache_metrics[node] = {
+        "tier": result.tier,
+        "similarity": result.similarity,
+        "saved_latency_seconds": result.latency if result.tier in ("exact", "semantic") else 0.0,
+    }
+    performance_metrics["llm_cache"] = cache_metrics
+    return {"cost_tracking": cost_tracking, "performance_metrics": performance_metrics}
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    max_entries_per_tenant=settings.LLM_CACHE_MAX_ENTRIES_PER_TENANT,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    semantic_threshold=settings.LLM_CACHE_SEMANTIC_THRESHOLD,
+    enabled=settings.LLM_CACHE_ENABLED,
+)
@@ -0,0 +1,101 @@
+"""
+MindMesh Single-Flight Request Coalescing
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    """One upstream call and the number of callers waiting on it"""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one upstream call.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await the same task. Every waiter receives the
+    result, or the exception, of that key's call; nothing is cached once it
+    completes, so the next call after completion goes upstream again.
+
+    Cancelling a waiter only cancels that waiter. The upstream call is
+    cancelled when its last waiter goes away, so abandoned work does not
+    keep consuming provider quota.
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Run call once per concurrent key; returns the result and whether it was shared"""
+        self.calls += 1
+
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            self.upstream_calls += 1
+            flight.task.add_done_callback(lambda task, key=key: self._finish(key, task))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: a cancelled waiter must not cancel the shared call
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.task.cancelled() or flight.task.done():
+                raise
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                # Last interested caller left; stop the upstream call and let
+                # new callers start afresh instead of joining a dying flight
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+                self.abandoned += 1
+            raise
+        flight.waiters -= 1
+        return result, shared
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a completed flight so later calls go upstream again"""
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing metrics"""
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights),
+        }
+
+
+# Global coalescers for LLM and embedding provider calls
+llm_flights = SingleFlight("llm")
+embedding_flights = SingleFlight("embedding")
@@ -0,0 +1,114 @@
+"""
+MindMesh Checkpoint Store Interface and Codec
+"""
+
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+FULL = 0
+DELTA = 1
+
+
+@dataclass
+class CheckpointRecord:
+    """A stored checkpoint frame: either a full snapshot or a delta"""
+    run_id: str
+    seq: int
+    kind: int
+    payload: bytes
+    created_at: float
+
+
+class CheckpointStore(ABC):
+    """
+    Persistent storage for checkpoint frames.
+
+    Frames are grouped by run ID and ordered by sequence number. A run's
+    state is the most recent full frame with every later delta applied.
+    Frames are never overwritten: several processes may write the same run
+    (a resumed run lands on any worker), so a frame is only appended on
+    top of the frame its writer last saw.
+    """
+
+    @abstractmethod
+    def append(self, record: CheckpointRecord, previous_seq: Optional[int]) -> bool:
+        """
+        Persist a frame and touch the run's last-updated time, provided the
+        run's latest stored frame is still previous_seq (None: no frames).
+        Returns False, writing nothing, when another writer got there first.
+        """
+
+    @abstractmethod
+    def latest_seq(self, run_id: str) -> Optional[int]:
+        """Sequence number of a run's latest frame, None if it has none"""
+
+    @abstractmethod
+    def load_chain(self, run_id: str) -> List[CheckpointRecord]:
+        """Return the latest full frame for a run followed by its deltas"""
+
+    @abstractmethod
+    def prune_before(self, run_id: str, seq: int) -> None:
+        """Delete frames of a run older than seq"""
+
+    @abstractmethod
+    def delete_run(self, run_id: str) -> None:
+        """Delete every frame of a run"""
+
+    @abstractmethod
+    def evict(self, older_than: float, max_runs: int) -> int:
+        """Delete runs idle since before older_than, then the least recently updated beyond max_runs"""
+
+    def close(self) -> None:
+        """Release store resources"""
+
+
+def encode_frame(frame: Dict[str, Any]) -> bytes:
+    """Serialize a frame to compact binary (checkpoints are trusted, engine-written data)"""
+    return zlib.compress(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+
+def decode_frame(payload: bytes) -> Dict[str, Any]:
+    """Deserialize a frame produced by encode_frame"""
+    return pickle.loads(zlib.decompress(payload))
+
+
+def diff_checkpoint(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a delta frame holding only the channels whose version moved since
+    previous. Channel versions and seen-versions are small and kept whole.
+    """
+    previous_versions = previous["channel_versions"]
+    current_values = current["channel_values"]
+    changed = {
+        key: value
+        for key, value in current_values.items()
+        if current["channel_versions"].get(key) != previous_versions.get(key)
+        or key not in previous["channel_values"]
+    }
+    removed = [key for key in previous["channel_values"] if key not in current_values]
+    return {
+        "v": current["v"],
+        "ts": current["ts"],
+        "channel_versions": current["channel_versions"],
+        "versions_seen": current["versions_seen"],
+        "changed": changed,
+        "removed": removed,
+    }
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a delta frame to a full checkpoint, returning the new checkpoint"""
+    channel_values = dict(base["channel_values"])
+    channel_values.update(delta["changed"])
+    for key in delta["removed"]:
+        channel_values.pop(key, None)
+    return {
+        "v": delta["v"],
+        "ts": delta["ts"],
+        "channel_values": channel_values,
+        "channel_versions": delta["channel_versions"],
+        "versions_seen": delta["versions_seen"],
+    }
@@ -0,0 +1,120 @@
+"""
+MindMesh Postgres Checkpoint Store
+"""
+
+from contextlib import contextmanager
+from typing import List, Optional
+
+from mindmesh.checkpointing.base import FULL, CheckpointRecord, CheckpointStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint_frames (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind SMALLINT NOT NULL,
+    payload BYTEA NOT NULL,
+    created_at DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_runs (
+    run_id TEXT PRIMARY KEY,
+    updated_at DOUBLE PRECISION NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_checkpoint_runs_updated ON checkpoint_runs (updated_at);
+"""
+
+
+class PostgresCheckpointStore(CheckpointStore):
+    """Checkpoint store shared by every engine worker through Postgres"""
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 10):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection; commits on success, rolls back on error"""
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+    def append(self, record: CheckpointRecord, previous_seq: Optional[int]) -> bool:
+        with self._connection() as conn, conn.cursor() as cur:
+            # Writers racing on the same previous frame pick the same seq; the primary key lets one win
+            cur.execute(
+                "INSERT INTO checkpoint_frames (run_id, seq, kind, payload, created_at) "
+                "SELECT %s, %s, %s, %s, %s "
+                "WHERE (SELECT MAX(seq) FROM checkpoint_frames WHERE run_id = %s) IS NOT DISTINCT FROM %s "
+                "ON CONFLICT (run_id, seq) DO NOTHING",
+                (
+                    record.run_id, record.seq, record.kind, record.payload, record.created_at,
+                    record.run_id, previous_seq,
+                ),
+            )
+            if cur.rowcount != 1:
+                return False
+            cur.execute(
+                "INSERT INTO checkpoint_runs (run_id, updated_at) VALUES (%s, %s) "
+                "ON CONFLICT (run_id) DO UPDATE SET updated_at = EXCLUDED.updated_at",
+                (record.run_id, record.created_at),
+            )
+        return True
+
+    def latest_seq(self, run_id: str) -> Optional[int]:
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT MAX(seq) FROM checkpoint_frames WHERE run_id = %s", (run_id,))
+            return cur.fetchone()[0]
+
+    def load_chain(self, run_id: str) -> List[CheckpointRecord]:
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT seq, kind, payload, created_at FROM checkpoint_frames "
+                "WHERE run_id = %s AND seq >= COALESCE("
+                "  (SELECT MAX(seq) FROM checkpoint_frames WHERE run_id = %s AND kind = %s), 0"
+                ") ORDER BY seq",
+                (run_id, run_id, FULL),
+            )
+            rows = cur.fetchall()
+        return [
+            CheckpointRecord(run_id, seq, kind, bytes(payload), created_at)
+            for seq, kind, payload, created_at in rows
+        ]
+
+    def prune_before(self, run_id: str, seq: int) -> None:
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM checkpoint_frames WHERE run_id = %s AND seq < %s", (run_id, seq)
+            )
+
+    def delete_run(self, run_id: str) -> None:
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM checkpoint_frames WHERE run_id = %s", (run_id,))
+            cur.execute("DELETE FROM checkpoint_runs WHERE run_id = %s", (run_id,))
+
+    def evict(self, older_than: float, max_runs: int) -> int:
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "WITH evicted AS ("
+                "  DELETE FROM checkpoint_runs WHERE run_id IN ("
+                "    SELECT run_id FROM checkpoint_runs WHERE updated_at < %s"
+                "    UNION"
+                "    (SELECT run_id FROM checkpoint_runs ORDER BY updated_at DESC OFFSET %s)"
+                "  ) RETURNING run_id"
+                "), frames AS ("
+                "  DELETE FROM checkpoint_frames WHERE run_id IN (SELECT run_id FROM evicted)"
+                ") SELECT count(*) FROM evicted",
+                (older_than, max_runs),
+            )
+            return cur.fetchone()[0]
+
+    def close(self) -> None:
+        self._pool.closeall()
@@ -0,0 +1,194 @@
+"""
+MindMesh Durable Checkpoint Saver
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.pydantic_v1 import PrivateAttr
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.utils import ConfigurableFieldSpec
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointAt
+from langgraph.checkpoint.memory import MemorySaver
+
+from mindmesh.checkpointing.base import (
+    DELTA,
+    FULL,
+    CheckpointRecord,
+    CheckpointStore,
+    apply_delta,
+    decode_frame,
+    diff_checkpoint,
+    encode_frame,
+)
+from mindmesh.config.settings import settings
+
+# Appends of one checkpoint before giving up on a run other writers keep changing
+APPEND_ATTEMPTS = 3
+
+
+def _detach(checkpoint: Checkpoint) -> Checkpoint:
+    """Copy the mutable bookkeeping of a checkpoint; channel values are shared"""
+    return {
+        "v": checkpoint["v"],
+        "ts": checkpoint["ts"],
+        "channel_values": dict(checkpoint["channel_values"]),
+        "channel_versions": copy.deepcopy(checkpoint["channel_versions"]),
+        "versions_seen": copy.deepcopy(checkpoint["versions_seen"]),
+    }
+
+
+class DurableCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer backed by a CheckpointStore.
+
+    Each step is written as a compressed delta of the channels that changed;
+    every ``keyframe_interval`` frames a full snapshot is written and older
+    frames of that run are pruned, so a run never holds more than one chain.
+    Only the latest checkpoint of recently active runs is kept in memory;
+    the store, not that cache, decides each frame's sequence number.
+    """
+
+    store: CheckpointStore
+    keyframe_interval: int = 8
+    retention_seconds: int = 7 * 24 * 3600
+    max_runs: int = 10000
+    cache_size: int = 256
+    evict_every: int = 200
+    at: CheckpointAt = CheckpointAt.END_OF_STEP
+
+    # run_id -> (seq, frames since keyframe, checkpoint)
+    _cache: "OrderedDict[str, Tuple[int, int, Checkpoint]]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _puts: int = PrivateAttr(default=0)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def config_specs(self) -> list[ConfigurableFieldSpec]:
+        return [
+            ConfigurableFieldSpec(
+                id="thread_id",
+                annotation=str,
+                name="Run ID",
+                description=None,
+                default="",
+                is_shared=True,
+            ),
+        ]
+
+    def get(self, config: RunnableConfig) -> Optional[Checkpoint]:
+        run_id = config["configurable"]["thread_id"]
+        entry = self._load(run_id)
+        if entry is not None and self.store.latest_seq(run_id) != entry[0]:
+            # Another process wrote the run since this one cached it (a resumed run can land anywhere)
+            self._forget(run_id)
+            entry = self._load(run_id)
+        return _detach(entry[2]) if entry else None
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint) -> None:
+        run_id = config["configurable"]["thread_id"]
+        now = time.time()
+        previous = self._load(run_id)
+        keyframe = previous is None or previous[1] + 1 >= self.keyframe_interval
+
+        for _ in range(APPEND_ATTEMPTS):
+            seq = previous[0] + 1 if previous else 0
+            if keyframe:
+                record = CheckpointRecord(run_id, seq, FULL, encode_frame(dict(checkpoint)), now)
+            else:
+                record = CheckpointRecord(run_id, seq, DELTA, encode_frame(diff_checkpoint(previous[2], checkpoint)), now)
+            if self.store.append(record, previous[0] if previous else None):
+                break
+            # The cached chain is stale: another writer appended (or the run was evicted). Never
+            # overwrite its frames; append after them a keyframe that does not depend on them.
+            self._forget(run_id)
+            previous = self._load(run_id)
+            keyframe = True
+        else:
+            raise RuntimeError(f"Checkpoint of run {run_id} changed under concurrent writers")
+
+        if keyframe:
+            # The new keyframe supersedes everything before it
+            if previous is not None:
+                self.store.prune_before(run_id, seq)
+            since_keyframe = 0
+        else:
+            since_keyframe = previous[1] + 1
+
+        self._remember(run_id, (seq, since_keyframe, _detach(checkpoint)))
+
+        with self._lock:
+            self._puts += 1
+            should_evict = self._puts % self.evict_every == 0
+        if should_evict:
+            self.store.evict(now - self.retention_seconds, self.max_runs)
+
+    def delete(self, run_id: str) -> None:
+        """Drop every checkpoint of a run"""
+        self._forget(run_id)
+        self.store.delete_run(run_id)
+
+    def _load(self, run_id: str) -> Optional[Tuple[int, int, Checkpoint]]:
+        """Latest checkpoint of a run from cache, or rebuilt from its stored chain"""
+        with self._lock:
+            entry = self._cache.get(run_id)
+            if entry is not None:
+                self._cache.move_to_end(run_id)
+                return entry
+
+        chain = self.store.load_chain(run_id)
+        if not chain or chain[0].kind != FULL:
+            return None
+
+        checkpoint = decode_frame(chain[0].payload)
+        for record in chain[1:]:
+            checkpoint = apply_delta(checkpoint, decode_frame(record.payload))
+
+        entry = (chain[-1].seq, len(chain) - 1, checkpoint)
+        self._remember(run_id, entry)
+        return entry
+
+    def _forget(self, run_id: str) -> None:
+        with self._lock:
+            self._cache.pop(run_id, None)
+
+    def _remember(self, run_id: str, entry: Tuple[int, int, Checkpoint]) -> None:
+        """Cache the latest checkpoint of a run, bounded by cache_size"""
+        with self._lock:
+            self._cache[run_id] = entry
+            self._cache.move_to_end(run_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+def create_checkpoint_saver(backend: Optional[str] = None) -> BaseCheckpointSaver:
+    """Create the configured checkpointer"""
+    backend = backend or settings.CHECKPOINT_BACKEND
+
+    if backend == "memory":
+        # Every step, like the durable saver, so paused runs can be resumed
+        return MemorySaver(at=CheckpointAt.END_OF_STEP)
+
+    if backend == "sqlite":
+        from mindmesh.checkpointing.sqlite import SQLiteCheckpointStore
+
+        store = SQLiteCheckpointStore(settings.resolve_path(settings.CHECKPOINT_SQLITE_PATH))
+    elif backend == "postgres":
+        from mindmesh.checkpointing.postgres import PostgresCheckpointStore
+
+        store = PostgresCheckpointStore(settings.CHECKPOINT_DATABASE_URL)
+    else:
+        raise ValueError(f"Unknown checkpoint backend: {backend}")
+
+    return DurableCheckpointSaver(
+        store=store,
+        keyframe_interval=settings.CHECKPOINT_KEYFRAME_INTERVAL,
+        retention_seconds=settings.CHECKPOINT_RETENTION_SECONDS,
+        max_runs=settings.CHECKPOINT_MAX_RUNS,
+        cache_size=settings.CHECKPOINT_CACHE_SIZE,
+    )
@@ -0,0 +1,126 @@
+"""
+MindMesh SQLite Checkpoint Store
+"""
+
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from mindmesh.checkpointing.base import FULL, CheckpointRecord, CheckpointStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint_frames (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoint_runs (
+    run_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_checkpoint_runs_updated ON checkpoint_runs (updated_at);
+"""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Single-file checkpoint store for local development and tests"""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def append(self, record: CheckpointRecord, previous_seq: Optional[int]) -> bool:
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so the check and the insert see the same chain
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                latest = self._latest_seq(record.run_id)
+                if latest != previous_seq:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO checkpoint_frames (run_id, seq, kind, payload, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (record.run_id, record.seq, record.kind, record.payload, record.created_at),
+                )
+                self._conn.execute(
+                    "INSERT INTO checkpoint_runs (run_id, updated_at) VALUES (?, ?) "
+                    "ON CONFLICT (run_id) DO UPDATE SET updated_at = excluded.updated_at",
+                    (record.run_id, record.created_at),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def latest_seq(self, run_id: str) -> Optional[int]:
+        with self._lock:
+            return self._latest_seq(run_id)
+
+    def _latest_seq(self, run_id: str) -> Optional[int]:
+        return self._conn.execute(
+            "SELECT MAX(seq) FROM checkpoint_frames WHERE run_id = ?", (run_id,)
+        ).fetchone()[0]
+
+    def load_chain(self, run_id: str) -> List[CheckpointRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, kind, payload, created_at FROM checkpoint_frames "
+                "WHERE run_id = ? AND seq >= COALESCE("
+                "  (SELECT MAX(seq) FROM checkpoint_frames WHERE run_id = ? AND kind = ?), 0"
+                ") ORDER BY seq",
+                (run_id, run_id, FULL),
+            ).fetchall()
+        return [CheckpointRecord(run_id, seq, kind, payload, created_at) for seq, kind, payload, created_at in rows]
+
+    def prune_before(self, run_id: str, seq: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoint_frames WHERE run_id = ? AND seq < ?", (run_id, seq)
+            )
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM checkpoint_frames WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM checkpoint_runs WHERE run_id = ?", (run_id,))
+            self._conn.execute("COMMIT")
+
+    def evict(self, older_than: float, max_runs: int) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS evicted_runs (run_id TEXT PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM evicted_runs")
+            self._conn.execute(
+                "INSERT OR IGNORE INTO evicted_runs SELECT run_id FROM checkpoint_runs WHERE updated_at < ?",
+                (older_than,),
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO evicted_runs SELECT run_id FROM checkpoint_runs "
+                "ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                (max_runs,),
+            )
+            self._conn.execute(
+                "DELETE FROM checkpoint_frames WHERE run_id IN (SELECT run_id FROM evicted_runs)"
+            )
+            evicted = self._conn.execute(
+                "DELETE FROM checkpoint_runs WHERE run_id IN (SELECT run_id FROM evicted_runs)"
+            ).rowcount
+            self._conn.execute("COMMIT")
+        return evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,225 @@
+"""
+MindMesh Local Intent Classification
+"""
+
+import os
+import re
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+
+# Intents recognised by the intent router
+INTENT_LABELS = ["research", "write", "schedule", "summarize", "plan", "code", "analyze"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class IntentClassification(NamedTuple):
+    """Outcome of classifying a goal"""
+    intent: str
+    confidence: float
+    source: str  # local | llm
+    latency: float
+
+
+class HashedNgramIntentModel:
+    """
+    Multinomial logistic regression over hashed word and character n-grams.
+
+    Features are word unigrams and bigrams plus character 3-5-grams, hashed
+    into a fixed-size space, so there is no vocabulary to store and unseen
+    words still share sub-word features with known ones. Prediction is a
+    handful of sparse row lookups and runs in well under a millisecond.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        n_features: int = 2 ** 18,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+    ):
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.weights = weights if weights is not None else np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.labels), dtype=np.float32)
+
+    def featurize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed feature indices and L2-normalised counts of a text"""
+        words = _TOKEN_RE.findall(text.lower())
+        grams = [f"w:{word}" for word in words]
+        grams += [f"b:{left} {right}" for left, right in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            for n in (3, 4, 5):
+                grams += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        hashed = np.fromiter(
+            (zlib.crc32(gram.encode()) % self.n_features for gram in grams),
+            dtype=np.int64,
+            count=len(grams),
+        )
+        indices, counts = np.unique(hashed, return_counts=True)
+        values = counts.astype(np.float32)
+        values /= np.linalg.norm(values)
+        return indices, values
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        """Class probabilities for a text"""
+        indices, values = self.featurize(text)
+        return _softmax(values @ self.weights[indices] + self.bias)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely intent and its probability"""
+        probabilities = self.predict_proba(text)
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        epochs: int = 20,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> "HashedNgramIntentModel":
+        """Train with per-example SGD on the cross-entropy loss"""
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        examples = [
+            (self.featurize(text), label_index[label])
+            for text, label in zip(texts, labels)
+            if label in label_index
+        ]
+        rng = np.random.default_rng(seed)
+
+        for epoch in range(epochs):
+            step = learning_rate / (1 + epoch)
+            for i in rng.permutation(len(examples)):
+                (indices, values), target = examples[i]
+                gradient = _softmax(values @ self.weights[indices] + self.bias)
+                gradient[target] -= 1.0
+                # Lazy L2: only decay the rows this example touches
+                self.weights[indices] *= 1.0 - step * l2
+                self.weights[indices] -= step * np.outer(values, gradient)
+                self.bias -= step * gradient
+        return self
+
+    def save(self, path: str) -> None:
+        """Write the model to an .npz file (atomically replaces any existing one)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                labels=np.array(self.labels),
+                n_features=np.array(self.n_features),
+                weights=self.weights,
+                bias=self.bias,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramIntentModel":
+        """Read a model written by save"""
+        with np.load(path) as data:
+            return cls(
+                labels=[str(label) for label in data["labels"]],
+                n_features=int(data["n_features"]),
+                weights=data["weights"],
+                bias=data["bias"],
+            )
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max())
+    return exp / exp.sum()
+
+
+class IntentClassifier:
+    """
+    Two-stage intent classification: the local model answers when it is
+    confident, otherwise the LLM is consulted. Tracks how many goals were
+    short-circuited and the latency that saved.
+    """
+
+    def __init__(
+        self,
+        model: Optional[HashedNgramIntentModel],
+        confidence_threshold: float = 0.8,
+    ):
+        self.model = model
+        self.confidence_threshold = confidence_threshold
+
+        self.total = 0
+        self.short_circuited = 0
+        self.fallbacks = 0
+        self._local_time = 0.0
+        self._llm_time = 0.0
+
+    async def classify(
+        self,
+        text: str,
+        llm_fallback: Callable[[str], Awaitable[Tuple[str, float]]],
+    ) -> IntentClassification:
+        """Classify a goal, calling llm_fallback only for low-confidence predictions"""
+        self.total += 1
+
+        local_elapsed = 0.0
+        if self.model is not None:
+            start = time.perf_counter()
+            intent, confidence = self.model.predict(text)
+            local_elapsed = time.perf_counter() - start
+            self._local_time += local_elapsed
+            if confidence >= self.confidence_threshold:
+                self.short_circuited += 1
+                return IntentClassification(intent, confidence, "local", local_elapsed)
+
+        start = time.perf_counter()
+        intent, confidence = await llm_fallback(text)
+        llm_elapsed = time.perf_counter() - start
+        self.fallbacks += 1
+        self._llm_time += llm_elapsed
+        return IntentClassification(intent, confidence, "llm", local_elapsed + llm_elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get short-circuit and latency metrics"""
+        local_latency = self._local_time / self.total if self.total else 0.0
+        llm_latency = self._llm_time / self.fallbacks if self.fallbacks else 0.0
+        saved = self.short_circuited * max(llm_latency - local_latency, 0.0)
+        return {
+            "model_loaded": self.model is not None,
+            "confidence_threshold": self.confidence_threshold,
+            "total": self.total,
+            "short_circuited": self.short_circuited,
+            "fallbacks": self.fallbacks,
+            "short_circuit_rate": self.short_circuited / self.total if self.total else 0.0,
+            "average_local_latency_seconds": local_latency,
+            "average_llm_latency_seconds": llm_latency,
+            # Estimated from the observed LLM latency of fallbacks
+            "latency_saved_per_goal_seconds": saved / self.total if self.total else 0.0,
+            "latency_saved_total_seconds": saved,
+        }
+
+
+def load_intent_model(path: str) -> Optional[HashedNgramIntentModel]:
+    """Load the trained model, or None when none has been trained yet"""
+    if not path or not os.path.exists(path):
+        return None
+    return HashedNgramIntentModel.load(path)
+
+
+# Global intent classifier, loaded once at startup
+intent_classifier = IntentClassifier(
+    load_intent_model(settings.resolve_path(settings.INTENT_MODEL_PATH)),
+    confidence_threshold=settings.INTENT_CONFIDENCE_THRESHOLD,
+)
@@ -0,0 +1,125 @@
+"""
+MindMesh Intent Model Training
+
+Trains the local intent model from labelled intents of past runs, read from
+the audit log (``intent.classify`` entries) and/or JSONL files of
+``{"text": ..., "intent": ...}`` records, and reports held-out accuracy and
+how many goals would skip the LLM at the configured threshold.
+
+Usage (from ai_engine/):
+    python -m mindmesh.classification.train_intent --database-url postgresql://... --out ./data/intent_model.npz
+    python -m mindmesh.classification.train_intent --jsonl labelled_goals.jsonl
+"""
+
+import argparse
+import json
+import random
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mindmesh.classification.intent import INTENT_LABELS, HashedNgramIntentModel
+from mindmesh.config.settings import settings
+
+AUDIT_QUERY = """
+    SELECT details->>'input', details->'output'->>'intent'
+    FROM audit_logs
+    WHERE action = 'intent.classify'
+      AND details->'output'->>'intent' IS NOT NULL
+"""
+
+
+def load_audit_examples(database_url: str) -> List[Tuple[str, str]]:
+    """Labelled goals recorded by the intent router in the audit log"""
+    import psycopg2
+
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(AUDIT_QUERY)
+            return [(text, intent) for text, intent in cur.fetchall() if text]
+    finally:
+        conn.close()
+
+
+def load_jsonl_examples(path: str) -> List[Tuple[str, str]]:
+    """Labelled goals from a JSONL export"""
+    examples = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((record["text"], record["intent"]))
+    return examples
+
+
+def evaluate(
+    model: HashedNgramIntentModel,
+    examples: List[Tuple[str, str]],
+    threshold: float,
+) -> dict:
+    """Accuracy overall and on the goals the model would answer alone"""
+    predictions = [(model.predict(text), intent) for text, intent in examples]
+    confident = [(predicted, intent) for (predicted, confidence), intent in predictions if confidence >= threshold]
+    return {
+        "examples": len(examples),
+        "accuracy": float(np.mean([predicted == intent for (predicted, _), intent in predictions])),
+        "short_circuit_rate": len(confident) / len(examples),
+        "short_circuit_accuracy": (
+            float(np.mean([predicted == intent for predicted, intent in confident])) if confident else 0.0
+        ),
+    }
+
+
+def train(
+    examples: List[Tuple[str, str]],
+    n_features: int = 2 ** 18,
+    epochs: int = 20,
+    holdout: float = 0.2,
+    threshold: Optional[float] = None,
+    seed: int = 0,
+) -> Tuple[HashedNgramIntentModel, dict]:
+    """Train on all but a held-out slice, evaluate, then refit on everything"""
+    threshold = settings.INTENT_CONFIDENCE_THRESHOLD if threshold is None else threshold
+    examples = [(text, intent) for text, intent in examples if intent in INTENT_LABELS]
+    random.Random(seed).shuffle(examples)
+
+    split = int(len(examples) * (1 - holdout))
+    train_set, test_set = examples[:split], examples[split:]
+
+    report = {}
+    if test_set:
+        model = HashedNgramIntentModel(INTENT_LABELS, n_features)
+        model.fit([text for text, _ in train_set], [intent for _, intent in train_set], epochs=epochs, seed=seed)
+        report = evaluate(model, test_set, threshold)
+
+    model = HashedNgramIntentModel(INTENT_LABELS, n_features)
+    model.fit([text for text, _ in examples], [intent for _, intent in examples], epochs=epochs, seed=seed)
+    return model, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Read labelled intents from this database's audit log")
+    parser.add_argument("--jsonl", action="append", default=[], help="JSONL file of {text, intent} records")
+    parser.add_argument("--out", default=settings.resolve_path(settings.INTENT_MODEL_PATH))
+    parser.add_argument("--features", type=int, default=2 ** 18)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    args = parser.parse_args()
+
+    examples = []
+    if args.database_url:
+        examples += load_audit_examples(args.database_url)
+    for path in args.jsonl:
+        examples += load_jsonl_examples(path)
+    if not examples:
+        parser.error("no labelled examples found")
+
+    model, report = train(examples, args.features, args.epochs, args.holdout)
+    model.save(args.out)
+    print(json.dumps({"model": args.out, "trained_on": len(examples), "holdout": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+MindMesh AI Engine Configuration
+"""
+
+import os
+from typing import Dict, Optional
+from pydantic_settings import BaseSettings
+
+# Relative store paths are relative to ai_engine/, whichever process opens them
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class EngineSettings(BaseSettings):
+    """AI engine settings"""
+    
+    # LLM
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-4-turbo-preview"
+    LLM_COST_PER_1K_INPUT_TOKENS: float = 0.01
+    LLM_COST_PER_1K_OUTPUT_TOKENS: float = 0.03
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_MAX_ENTRIES_PER_TENANT: int = 1000
+    LLM_CACHE_TTL_SECONDS: int = 24 * 3600
+    LLM_CACHE_SEMANTIC_THRESHOLD: float = 0.92
+    
+    # Graph
+    GRAPH_PARALLEL_STAGES: bool = True
+    
+    # Run admission: workers claim queued runs fairly across tenants while
+    # fewer than MAX_CONCURRENT_RUNS are leased across all of them; each
+    # process's run scheduler also caps its own runs at MAX_CONCURRENT_RUNS
+    MAX_CONCURRENT_RUNS: int = 10
+    RUN_TIMEOUT_SECONDS: int = 300  # 0 disables the timeout
+    
+    # Run workers: goals started through the API are queued and execute in
+    # worker processes (python -m mindmesh.workers.worker), which record
+    # each run's status and events in the queue for the API to stream and
+    # control; sqlite is for a single host
+    RUN_QUEUE_BACKEND: str = "sqlite"  # sqlite | redis
+    RUN_QUEUE_SQLITE_PATH: str = "./data/run_queue.db"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_PASSWORD: Optional[str] = None
+    RUN_WORKER_PROCESSES: int = 2
+    RUN_WORKER_CONCURRENCY: int = 4  # runs in flight per worker process
+    RUN_WORKER_HEARTBEAT_SECONDS: int = 10
+    RUN_WORKER_POLL_SECONDS: float = 0.5
+    RUN_JOB_VISIBILITY_TIMEOUT_SECONDS: int = 60  # a job is claimable again once its lease lapses this long
+    RUN_JOB_MAX_ATTEMPTS: int = 3
+    RUN_JOB_RETRY_BACKOFF_SECONDS: float = 5.0  # doubled after each failed attempt
+    RUN_JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+    
+    # Runs waiting on a human approval stop at the approval gate until
+    # decided; approvals are kept on RUN_QUEUE_BACKEND (this file for sqlite)
+    APPROVAL_STORE_PATH: str = "./data/approvals.db"
+    
+    # Tool execution: independent tool calls of a run execute concurrently,
+    # within per-connector concurrency and rate limits shared across runs
+    TOOL_MAX_CONCURRENT_CALLS: int = 8  # per run
+    TOOL_CALL_TIMEOUT_SECONDS: float = 30.0  # per attempt
+    TOOL_CALL_MAX_ATTEMPTS: int = 3
+    TOOL_RETRY_BACKOFF_SECONDS: float = 0.5  # jittered, doubled after each failed attempt
+    CONNECTOR_MAX_CONCURRENT_CALLS: int = 4
+    CONNECTOR_RATE_LIMIT_PER_SECOND: float = 10.0  # 0 disables rate limiting
+    CONNECTOR_RATE_LIMIT_BURST: int = 10
+    # Per-connector overrides as JSON, e.g. {"gmail": {"max_concurrent": 2, "rate_per_second": 5}}
+    CONNECTOR_LIMITS: Dict[str, Dict[str, float]] = {}
+    
+    # Intent routing: local model first, LLM below the confidence threshold
+    INTENT_MODEL_PATH: str = "./data/intent_model.npz"
+    INTENT_CONFIDENCE_THRESHOLD: float = 0.8
+    INTENT_LLM_MODEL: Optional[str] = None  # defaults to OPENAI_MODEL
+    
+    # Embeddings: inputs are grouped into micro-batches of at most
+    # EMBEDDING_BATCH_SIZE texts / EMBEDDING_BATCH_MAX_TOKENS tokens, waiting
+    # at most EMBEDDING_BATCH_WAIT_MS for a batch to fill
+    EMBEDDING_BACKEND: str = "openai"  # openai | hashing
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    VECTOR_DIMENSION: int = 1536
+    EMBEDDING_BATCH_SIZE: int = 128
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000
+    EMBEDDING_BATCH_WAIT_MS: int = 20
+    EMBEDDING_MAX_CONCURRENT_BATCHES: int = 4
+    EMBEDDING_CACHE_PATH: Optional[str] = "./data/embeddings.db"
+    EMBEDDING_CACHE_MEMORY_SIZE: int = 10000
+    EMBEDDING_COST_PER_1K_TOKENS: float = 0.0001
+    
+    # Per-tenant ANN memory index
+    ANN_INDEX_DIR: str = "./data/ann"
+    ANN_NPROBE: int = 16
+    ANN_MAX_LOADED_TENANTS: int = 64
+    ANN_QUANTIZATION: str = "int8"  # int8 | none; int8 re-ranks with float32 vectors
+    ANN_RERANK_FACTOR: int = 4  # candidates re-ranked per result
+    ANN_LOG_COMPACT_BYTES: int = 64 * 1024 * 1024  # write-ahead log size that triggers a new snapshot
+    
+    # Per-tenant BM25 index, fused with ANN results by reciprocal rank
+    LEXICAL_INDEX_DIR: str = "./data/lexical"
+    LEXICAL_MAX_LOADED_TENANTS: int = 64
+    BM25_K1: float = 1.2
+    BM25_B: float = 0.75
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATES: int = 50
+    MEMORY_DOCUMENT_STORE_PATH: str = "./data/memory_documents.db"  # text of indexed items
+    MEMORY_RETRIEVAL_K: int = 20  # items the memory reader retrieves per run
+    
+    # Context packing: retrieved memory is fitted into CONTEXT_MAX_TOKENS
+    # of the prompt, scored by relevance, recency and source diversity
+    CONTEXT_MAX_TOKENS: int = 2000
+    CONTEXT_SNIPPET_TOKENS: int = 120  # long items may enter as a prefix this long
+    CONTEXT_RECENCY_WEIGHT: float = 0.3
+    CONTEXT_RECENCY_HALF_LIFE_DAYS: float = 30.0
+    CONTEXT_DIVERSITY_DECAY: float = 0.7  # value multiplier per item already taken from a group
+    CONTEXT_TOKENIZER: str = "cl100k_base"
+    CONTEXT_TOKEN_CACHE_SIZE: int = 10000
+    
+    # Entity and episode summaries, stored per content version and
+    # refreshed in the background when retrieved content has changed
+    SUMMARY_STORE_PATH: str = "./data/summaries.db"
+    SUMMARY_LLM_MODEL: Optional[str] = None  # defaults to OPENAI_MODEL
+    SUMMARY_MAX_TOKENS: int = 120  # shorter content is used verbatim
+    SUMMARY_MAX_CONCURRENT_REFRESHES: int = 4
+    
+    # Streaming ingestion: read -> normalize -> redact -> chunk -> embed -> write
+    INGEST_BLOCK_SIZE: int = 65536  # characters read per block
+    INGEST_CHUNK_SIZE: int = 2000  # characters per chunk
+    INGEST_CHUNK_OVERLAP: int = 200
+    INGEST_QUEUE_SIZE: int = 8  # items buffered between stages
+    INGEST_EMBED_BATCH_SIZE: int = 32
+    INGEST_EMBED_CONCURRENCY: int = 4  # embedding batches in flight per document
+    INGEST_REDACT_PII: bool = True
+    INGEST_PROGRESS_PATH: str = "./data/ingestion.db"
+    
+    # Checkpointing
+    CHECKPOINT_BACKEND: str = "sqlite"  # sqlite | postgres | memory
+    CHECKPOINT_SQLITE_PATH: str = "./data/checkpoints.db"
+    CHECKPOINT_DATABASE_URL: Optional[str] = None
+    CHECKPOINT_KEYFRAME_INTERVAL: int = 8
+    CHECKPOINT_RETENTION_SECONDS: int = 7 * 24 * 3600
+    CHECKPOINT_MAX_RUNS: int = 10000
+    CHECKPOINT_CACHE_SIZE: int = 256
+    
+    # Run event streaming
+    RUN_EVENTS_BUFFER_SIZE: int = 1000
+    RUN_EVENTS_MAX_RUNS: int = 1000
+    RUN_EVENTS_RETENTION_SECONDS: int = 600
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+        extra = "ignore"
+    
+    def resolve_path(self, path: str) -> str:
+        """Absolute path of a store shared by the API and worker processes"""
+        if path == ":memory:":
+            return path
+        return os.path.normpath(os.path.join(ENGINE_DIR, os.path.expanduser(path)))
+
+
+# Global settings instance
+settings = EngineSettings()
@@ -0,0 +1,306 @@
+"""
+MindMesh Approvals
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from mindmesh.config.settings import settings
+from mindmesh.graphs.run_control import AWAITING_APPROVAL, RunInterrupted
+from mindmesh.state import MindMeshState
+
+# Approval states
+PENDING = "pending"
+APPROVED = "approved"
+REJECTED = "rejected"
+EDITED = "edited"
+CANCELLED = "cancelled"
+
+# Reviewer decisions and the state each leaves an approval in
+DECISIONS = {"approve": APPROVED, "reject": REJECTED, "edit": EDITED}
+
+_COLUMNS = (
+    "approval_id, run_id, tenant_id, state, payload, decision, comments, decided_by, "
+    "created_at, decided_at, updated_at"
+)
+
+
+def _now() -> str:
+    # Fixed-width ISO timestamps sort in time order and round-trip through cursors exactly
+    return datetime.utcnow().isoformat(timespec="microseconds")
+
+
+def _row(row: Tuple) -> Dict[str, Any]:
+    approval_id, run_id, tenant_id, state, payload, decision, comments, decided_by, created_at, decided_at, updated_at = row
+    return {
+        "id": approval_id,
+        "run_id": run_id,
+        "tenant_id": tenant_id,
+        "state": state,
+        "payload": json.loads(payload),
+        "decision": decision,
+        "comments": comments,
+        "decided_by": decided_by,
+        "created_at": created_at,
+        "decided_at": decided_at,
+        "updated_at": updated_at,
+    }
+
+
+class ApprovalStore:
+    """
+    Approval requests of runs stopped at the approval gate, in SQLite.
+    The inbox (a tenant's approvals in one state, newest first) is read
+    from a composite index in that order with keyset pagination on
+    (created_at, id), so a page and the count of pending approvals stay
+    index-only however many are waiting.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS approvals (
+        approval_id TEXT PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        tenant_id TEXT,
+        state TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        decision TEXT,
+        comments TEXT,
+        decided_by TEXT,
+        created_at TEXT NOT NULL,
+        decided_at TEXT,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_approvals_tenant_state_created
+        ON approvals (tenant_id, state, created_at DESC, approval_id DESC);
+    CREATE INDEX IF NOT EXISTS ix_approvals_tenant_created
+        ON approvals (tenant_id, created_at DESC, approval_id DESC);
+    CREATE INDEX IF NOT EXISTS ix_approvals_run ON approvals (run_id, state);
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Connected on first use; callers hold the lock
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def request(self, run_id: str, tenant_id: Optional[str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """The run's pending approval, created unless one is already waiting"""
+        now = _now()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM approvals WHERE run_id = ? AND state = ?", (run_id, PENDING)
+                ).fetchone()
+                if row is None:
+                    row = (uuid.uuid4().hex, run_id, tenant_id, PENDING, json.dumps(payload, default=str),
+                           None, None, None, now, None, now)
+                    self._conn.execute(f"INSERT INTO approvals ({_COLUMNS}) VALUES ({', '.join('?' * 11)})", row)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return _row(row)
+
+    def get(self, approval_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM approvals WHERE approval_id = ?", (approval_id,)
+            ).fetchone()
+        return _row(row) if row else None
+
+    def list(
+        self,
+        tenant_id: Optional[str],
+        state: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 20,
+        before: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """A tenant's approvals newest first, after the (created_at, id) of the previous page"""
+        where, params = self._filter(tenant_id, state, run_id)
+        if before is not None:
+            # Seek past the last item of the previous page instead of OFFSET
+            where, params = where + " AND (created_at, approval_id) < (?, ?)", params + list(before)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM approvals WHERE {where} "
+                "ORDER BY created_at DESC, approval_id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [_row(row) for row in rows]
+
+    def count(self, tenant_id: Optional[str], state: Optional[str] = None, run_id: Optional[str] = None) -> int:
+        where, params = self._filter(tenant_id, state, run_id)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM approvals WHERE {where}", params).fetchone()[0]
+
+    def _filter(self, tenant_id: Optional[str], state: Optional[str], run_id: Optional[str]) -> Tuple[str, List[Any]]:
+        where, params = "tenant_id IS ?", [tenant_id]
+        if state is not None:
+            where, params = where + " AND state = ?", params + [state]
+        if run_id is not None:
+            where, params = where + " AND run_id = ?", params + [run_id]
+        return where, params
+
+    def decide(
+        self,
+        approval_id: str,
+        decision: str,
+        decided_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Record a decision on a pending approval; None if it was already decided"""
+        if decision not in DECISIONS:
+            raise ValueError(f"Unknown decision: {decision}")
+        if decision == "edit" and payload is None:
+            raise ValueError("An edit decision needs the edited payload")
+        now = _now()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE approvals SET state = ?, decision = ?, comments = ?, decided_by = ?, "
+                "payload = COALESCE(?, payload), decided_at = ?, updated_at = ? WHERE approval_id = ? AND state = ?",
+                (
+                    DECISIONS[decision], decision, comments, decided_by,
+                    json.dumps(payload, default=str) if payload is not None else None,
+                    now, now, approval_id, PENDING,
+                ),
+            )
+        return self.get(approval_id) if cursor.rowcount == 1 else None
+
+    def decided(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """The run's most recently decided approval"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM approvals WHERE run_id = ? AND state IN (?, ?, ?) "
+                "ORDER BY decided_at DESC LIMIT 1",
+                (run_id, APPROVED, REJECTED, EDITED),
+            ).fetchone()
+        return _row(row) if row else None
+
+    def cancel_run(self, run_id: str) -> int:
+        """Withdraw a cancelled run's pending approval from the inbox"""
+        now = _now()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE approvals SET state = ?, updated_at = ? WHERE run_id = ? AND state = ?",
+                (CANCELLED, now, run_id, PENDING),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM approvals GROUP BY state").fetchall()
+        return {PENDING: 0, APPROVED: 0, REJECTED: 0, EDITED: 0, CANCELLED: 0, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def approval_decision(approval: Dict[str, Any]) -> Dict[str, Any]:
+    """A decided approval as recorded in the run's state"""
+    return {
+        "approval_id": approval["id"],
+        "state": approval["state"],
+        "payload": approval["payload"],
+        "comments": approval["comments"],
+        "decided_by": approval["decided_by"],
+    }
+
+
+class ApprovalGate:
+    """
+    Graph node between guardrails and the executor for actions that need a
+    human decision. It reads the decision from the approval store by run
+    ID; without one, it files an approval request and stops the run. The
+    checkpoint taken after guardrails holds the planned tool calls and
+    approval payload, so once the approval is decided the resumed run
+    continues here and goes straight on to the executor (or to reflection
+    when rejected).
+
+    Calls a reviewer edited have not been checked, so they go back through
+    guardrails first; if guardrails still wants approval for them, the
+    reviewer's edit is that approval.
+    """
+
+    def __init__(self, store: "ApprovalStore"):
+        self.store = store
+
+    async def __call__(self, state: MindMeshState) -> Dict[str, Any]:
+        approval = self.store.decided(state.run_id)
+        if approval is None:
+            payload = state.approval_payload or {"tool_calls": state.tool_calls}
+            approval = self.store.request(state.run_id, state.tenant_id, payload)
+            raise RunInterrupted(state.run_id, AWAITING_APPROVAL, {
+                "approval_id": approval["id"],
+                "approval_payload": approval["payload"],
+            })
+
+        decision = approval_decision(approval)
+        update: Dict[str, Any] = {
+            "approval_id": decision["approval_id"],
+            "approval_decision": decision,
+            "approval_required": False,
+            "current_step": "approval_gate",
+        }
+        if decision["state"] == REJECTED:
+            reason = f": {decision['comments']}" if decision.get("comments") else ""
+            update["guardrails_status"] = "rejected"
+            update["errors"] = (state.errors or []) + [f"Approval rejected{reason}"]
+            return update
+
+        update["guardrails_status"] = "approved"
+        rechecked = (state.approval_decision or {}).get("approval_id") == decision["approval_id"]
+        if decision["state"] == EDITED and not rechecked:
+            # The reviewer's payload replaces the proposed one, tool calls included
+            update["guardrails_status"] = "recheck"
+            update["approval_payload"] = decision["payload"]
+            if "tool_calls" in decision["payload"]:
+                update["tool_calls"] = decision["payload"]["tool_calls"]
+        return update
+
+
+def create_approval_store(backend: Optional[str] = None) -> ApprovalStore:
+    """Create the approval store on the run queue's backend, so it is shared wherever runs are"""
+    backend = backend or settings.RUN_QUEUE_BACKEND
+
+    if backend == "sqlite":
+        return ApprovalStore(settings.resolve_path(settings.APPROVAL_STORE_PATH))
+    if backend == "redis":
+        from mindmesh.graphs.redis_approvals import RedisApprovalStore
+
+        return RedisApprovalStore(url=settings.REDIS_URL, password=settings.REDIS_PASSWORD)
+    raise ValueError(f"Unknown approval store backend: {backend}")
+
+
+_approval_store: Optional[ApprovalStore] = None
+_approval_store_lock = threading.Lock()
+
+
+def get_approval_store() -> ApprovalStore:
+    """The process's approval store, opened on first use"""
+    global _approval_store
+    with _approval_store_lock:
+        if _approval_store is None:
+            _approval_store = create_approval_store()
+        return _approval_store
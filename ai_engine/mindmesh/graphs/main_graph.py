@@ -2,9 +2,14 @@
 MindMesh Main LangGraph Orchestration
 """
 
-from typing import Dict, Any, List
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from mindmesh.nodes.intent_router import IntentRouter
 from mindmesh.nodes.planner import Planner
@@ -15,45 +20,136 @@ from mindmesh.nodes.guardrails import Guardrails
 from mindmesh.nodes.reflector import Reflector
 from mindmesh.nodes.scheduler import Scheduler
 from mindmesh.nodes.audit import AuditLogger
+from mindmesh.checkpointing.saver import create_checkpoint_saver
+from mindmesh.config.settings import settings
+from mindmesh.graphs.approvals import ApprovalGate, ApprovalStore, get_approval_store
+from mindmesh.graphs.parallel import ParallelStage, as_runnable
+from mindmesh.graphs.run_control import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUSPENDED,
+    RunControls,
+    RunInterrupted,
+    run_controls,
+)
+from mindmesh.graphs.run_scheduler import RunScheduler, run_scheduler
 from mindmesh.state import MindMeshState
+from mindmesh.streaming.events import run_events
+
+
+def _jsonable(value: Any) -> Any:
+    """Coerce state values (datetimes, models) into JSON-safe data for events"""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _uncancel() -> None:
+    """Withdraw a handled cancellation of the current task (Python 3.11+)"""
+    uncancel = getattr(asyncio.current_task(), "uncancel", None)
+    if uncancel is not None:
+        uncancel()
+
+
+def _guarded(node: Any, controls: RunControls) -> Runnable:
+    """A graph node that first honours pause and cancel requests of its run"""
+    runnable = as_runnable(node)
+    
+    async def guarded(state: Any, config: RunnableConfig) -> Any:
+        controls.check(config["configurable"]["thread_id"])
+        return await runnable.ainvoke(state, config)
+    
+    return RunnableLambda(guarded, name=runnable.get_name())
 
 
 class MindMeshGraph:
     """Main orchestration graph for MindMesh"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        nodes: Optional[Dict[str, Any]] = None,
+        parallel: Optional[bool] = None,
+        scheduler: Optional[RunScheduler] = None,
+        controls: Optional[RunControls] = None,
+        approvals: Optional[ApprovalStore] = None,
+    ):
+        self.approvals = approvals or get_approval_store()
+        # The approval gate belongs to the graph, not to the pluggable steps
+        self.nodes = {"approval_gate": ApprovalGate(self.approvals), **(nodes or self._default_nodes())}
+        self.parallel = settings.GRAPH_PARALLEL_STAGES if parallel is None else parallel
+        self.scheduler = scheduler or run_scheduler
+        self.controls = controls or run_controls
         self.graph = self._build_graph()
-        self.memory = MemorySaver()
+        self.memory = checkpointer or create_checkpoint_saver()
         self.app = self.graph.compile(checkpointer=self.memory)
     
+    def _default_nodes(self) -> Dict[str, Any]:
+        """Node implementations keyed by node name"""
+        return {
+            "intent_router": IntentRouter(),
+            "planner": Planner(),
+            "memory_reader": MemoryReader(),
+            "tool_router": ToolRouter(),
+            "executor": Executor(),
+            "guardrails": Guardrails(),
+            "reflector": Reflector(),
+            "scheduler": Scheduler(),
+            "audit_logger": AuditLogger(),
+        }
+    
     def _build_graph(self) -> StateGraph:
         """Build the main orchestration graph"""
         
         # Create the graph
         workflow = StateGraph(MindMeshState)
         
-        # Add nodes
-        workflow.add_node("intent_router", IntentRouter())
-        workflow.add_node("planner", Planner())
-        workflow.add_node("memory_reader", MemoryReader())
-        workflow.add_node("tool_router", ToolRouter())
-        workflow.add_node("executor", Executor())
-        workflow.add_node("guardrails", Guardrails())
-        workflow.add_node("reflector", Reflector())
-        workflow.add_node("scheduler", Scheduler())
-        workflow.add_node("audit_logger", AuditLogger())
+        # Add nodes; each checks for pause and cancel requests before it starts
+        if self.parallel:
+            # Retrieval only needs the goal and tenant, so it runs alongside
+            # intent classification and planning and joins before tool routing
+            workflow.add_node("gather_context", _guarded(ParallelStage({
+                "planning": [
+                    ("intent_router", self.nodes["intent_router"]),
+                    ("planner", self.nodes["planner"]),
+                ],
+                "retrieval": [
+                    ("memory_reader", self.nodes["memory_reader"]),
+                ],
+            },
+                before_node=self._branch_node_starting,
+                after_node=self._branch_node_finished,
+            ), self.controls))
+        else:
+            workflow.add_node("intent_router", _guarded(self.nodes["intent_router"], self.controls))
+            workflow.add_node("planner", _guarded(self.nodes["planner"], self.controls))
+            workflow.add_node("memory_reader", _guarded(self.nodes["memory_reader"], self.controls))
+        workflow.add_node("tool_router", _guarded(self.nodes["tool_router"], self.controls))
+        workflow.add_node("executor", _guarded(self.nodes["executor"], self.controls))
+        workflow.add_node("guardrails", _guarded(self.nodes["guardrails"], self.controls))
+        workflow.add_node("approval_gate", _guarded(self.nodes["approval_gate"], self.controls))
+        workflow.add_node("reflector", _guarded(self.nodes["reflector"], self.controls))
+        workflow.add_node("scheduler", _guarded(self.nodes["scheduler"], self.controls))
+        workflow.add_node("audit_logger", _guarded(self.nodes["audit_logger"], self.controls))
         
         # Define edges
-        workflow.set_entry_point("intent_router")
-        
-        # Intent routing
-        workflow.add_edge("intent_router", "planner")
-        
-        # Planning phase
-        workflow.add_edge("planner", "memory_reader")
-        
-        # Memory retrieval
-        workflow.add_edge("memory_reader", "tool_router")
+        if self.parallel:
+            workflow.set_entry_point("gather_context")
+            
+            # Context gathering (intent, planning and memory retrieval)
+            workflow.add_edge("gather_context", "tool_router")
+        else:
+            workflow.set_entry_point("intent_router")
+            
+            # Intent routing
+            workflow.add_edge("intent_router", "planner")
+            
+            # Planning phase
+            workflow.add_edge("planner", "memory_reader")
+            
+            # Memory retrieval
+            workflow.add_edge("memory_reader", "tool_router")
         
         # Tool routing
         workflow.add_edge("tool_router", "guardrails")
@@ -64,7 +160,19 @@ class MindMeshGraph:
             self._check_guardrails,
             {
                 "approved": "executor",
-                "needs_approval": "audit_logger",
+                "needs_approval": "approval_gate",
+                "rejected": "reflector"
+            }
+        )
+        
+        # Approval (the run waits at the gate until a reviewer decides;
+        # calls the reviewer edited are checked by guardrails again)
+        workflow.add_conditional_edges(
+            "approval_gate",
+            self._check_guardrails,
+            {
+                "approved": "executor",
+                "recheck": "guardrails",
                 "rejected": "reflector"
             }
         )
@@ -83,18 +191,40 @@ class MindMeshGraph:
         
         return workflow
     
-    def _check_guardrails(self, state: MindMeshState) -> str:
+    def _branch_node_starting(self, node: str, config: RunnableConfig) -> None:
+        """Pause and cancel requests also stop a parallel stage between its nodes"""
+        self.controls.check(config["configurable"]["thread_id"])
+    
+    def _branch_node_finished(self, branch: str, node: str, update: Dict[str, Any], config: RunnableConfig) -> None:
+        """Report a node of a parallel stage as it finishes, not when the whole stage joins"""
+        run_id = config["configurable"]["thread_id"]
+        run_events.publish(run_id, "run.update", {
+            "run_id": run_id,
+            "status": "running",
+            "current_node": node,
+            "current_step": update.get("current_step", node),
+            "branch": branch,
+        })
+    
+    def _check_guardrails(self, state: Dict[str, Any]) -> str:
         """Check guardrails and determine next step"""
-        if state.guardrails_status == "approved":
+        # Branch conditions receive the raw channel values, not the schema
+        guardrails_status = state.get("guardrails_status")
+        if guardrails_status == "approved":
             return "approved"
-        elif state.guardrails_status == "needs_approval":
+        elif guardrails_status == "needs_approval":
             return "needs_approval"
+        elif guardrails_status == "recheck":
+            return "recheck"
         else:
             return "rejected"
     
     async def run(self, goal_text: str, autonomy_level: str = "L1", **kwargs) -> Dict[str, Any]:
         """Run the MindMesh workflow"""
         
+        # Every run is checkpointed under its own run ID
+        kwargs.setdefault("run_id", uuid.uuid4().hex)
+        
         # Initialize state
         initial_state = MindMeshState(
             goal_text=goal_text,
@@ -102,21 +232,156 @@ class MindMeshGraph:
             **kwargs
         )
         
-        # Run the graph
-        config = {"configurable": {"thread_id": f"goal_{hash(goal_text)}"}}
-        result = await self.app.ainvoke(initial_state, config)
+        # Run the graph (state channels are fed from a plain dict)
+        return await self._schedule(initial_state.model_dump(), initial_state.run_id, initial_state.tenant_id)
+    
+    def get_checkpoint(self, run_id: str) -> Dict[str, Any]:
+        """Get the latest checkpoint for a run"""
+        return self.memory.get(config=self._config(run_id))
+    
+    def pause(self, run_id: str) -> bool:
+        """Stop a queued or running run before its next node; its state stays checkpointed"""
+        return self.controls.pause(run_id)
+    
+    def cancel(self, run_id: str) -> bool:
+        """Stop a run now, releasing its slot and in-flight LLM and tool calls"""
+        suspended = self.controls.status(run_id) in SUSPENDED
+        if not self.controls.cancel(run_id):
+            return False
+        self.approvals.cancel_run(run_id)
+        if suspended:
+            # Nothing is executing to report it
+            run_events.open(run_id, run_events.tenant_of(run_id))
+            run_events.publish(run_id, "run.cancelled", {"run_id": run_id, "status": CANCELLED})
+            run_events.close(run_id)
+        return True
+    
+    def resumable(self, run_id: str) -> bool:
+        """Whether a run is paused with a checkpoint to continue from"""
+        # A run paused in another process is only known by its checkpoint
+        if self.controls.status(run_id) in (QUEUED, RUNNING, COMPLETED, CANCELLED):
+            return False
+        return self.get_checkpoint(run_id) is not None
+    
+    async def resume(self, run_id: str, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Continue a paused run from its checkpoint with the node after the
+        last one it finished; nodes that already ran are not repeated.
+        The run is scheduled under tenant_id, by default the tenant in its
+        checkpoint. A run waiting at the approval gate reads its decision
+        from the approval store when it gets there.
+        """
+        if not self.resumable(run_id):
+            raise ValueError(f"Run {run_id} is not paused")
+        if tenant_id is None:
+            tenant_id = (self.get_checkpoint(run_id).get("channel_values") or {}).get("tenant_id")
+        return await self._schedule(None, run_id, tenant_id)
+    
+    async def _schedule(self, graph_input: Any, run_id: str, tenant_id: Optional[str]) -> Dict[str, Any]:
+        """Execute once the run scheduler admits the run, within its timeout"""
+        # Subscribers may attach while the run is still queued
+        run_events.open(run_id, tenant_id)
+        control = self.controls.open(run_id)
+        control.attach(QUEUED)
+        queued_at = time.perf_counter()
+        
+        async def execute() -> Dict[str, Any]:
+            return await self._execute(graph_input, run_id, tenant_id, time.perf_counter() - queued_at)
         
-        return result
+        try:
+            return await self.scheduler.submit(execute, tenant_id)
+        except asyncio.CancelledError:
+            if control.requested != CANCELLED:
+                raise
+            # Cancelled while queued
+            _uncancel()
+            return self._interrupted(run_id, CANCELLED)
     
-    def get_checkpoint(self, thread_id: str) -> Dict[str, Any]:
-        """Get checkpoint for a specific thread"""
-        return self.memory.get(config={"configurable": {"thread_id": thread_id}})
+    async def _execute(
+        self,
+        graph_input: Any,
+        run_id: str,
+        tenant_id: Optional[str],
+        queue_wait: float = 0.0,
+    ) -> Dict[str, Any]:
+        """Drive the graph step by step, publishing progress events as nodes finish"""
+        control = self.controls.get(run_id) or self.controls.open(run_id)
+        control.attach(RUNNING)
+        run_events.open(run_id, tenant_id)
+        run_events.publish(run_id, "run.started", {"run_id": run_id, "queue_wait_seconds": queue_wait})
+        
+        result = None
+        completed = 0
+        try:
+            async for chunk in self.app.astream(graph_input, self._config(run_id)):
+                for node, update in chunk.items():
+                    if node == END:
+                        result = update
+                        continue
+                    
+                    update = update or {}
+                    completed += 1
+                    run_events.publish(run_id, "run.update", {
+                        "run_id": run_id,
+                        "status": "running",
+                        "current_node": node,
+                        "current_step": update.get("current_step", node),
+                        "progress": min(1.0, completed / len(self.graph.nodes)),
+                    })
+                    
+                    if node == "guardrails":
+                        run_events.publish(run_id, "guardrails.decision", {
+                            "run_id": run_id,
+                            "status": update.get("guardrails_status"),
+                            "checks": _jsonable(update.get("guardrails_checks")),
+                            "approval_required": update.get("approval_required", False),
+                            "approval_payload": _jsonable(update.get("approval_payload")),
+                        })
+            
+            final = result or {}
+            run_events.publish(run_id, "run.completed", {
+                "run_id": run_id,
+                "status": "completed",
+                "guardrails_status": final.get("guardrails_status"),
+                "reflection": final.get("reflection"),
+                "tool_results": _jsonable(final.get("tool_results")),
+                "errors": final.get("errors"),
+            })
+            control.finish(COMPLETED)
+        except RunInterrupted as e:
+            # Raised before a node started; everything before it is checkpointed
+            return self._interrupted(run_id, e.status, e.data)
+        except Exception as e:
+            control.finish(FAILED)
+            run_events.publish(run_id, "run.failed", {"run_id": run_id, "error": str(e)})
+            raise
+        except asyncio.CancelledError:
+            if control.requested == CANCELLED:
+                # Cancelled through the run's control: the run ends here, its caller is not cancelled
+                _uncancel()
+                return self._interrupted(run_id, CANCELLED)
+            # Also how the run scheduler stops a run that exceeds its timeout
+            control.finish(FAILED)
+            run_events.publish(run_id, "run.failed", {"run_id": run_id, "error": "Run cancelled or timed out"})
+            raise
+        finally:
+            run_events.close(run_id)
+        
+        return result
     
-    async def resume(self, thread_id: str, **kwargs) -> Dict[str, Any]:
-        """Resume execution from checkpoint"""
-        config = {"configurable": {"thread_id": thread_id}}
-        result = await self.app.ainvoke(kwargs, config)
+    def _interrupted(self, run_id: str, status: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Record a paused, cancelled or waiting run and report where it stopped"""
+        self.controls.get(run_id).finish(status)
+        checkpoint = self.get_checkpoint(run_id) or {}
+        current_step = (checkpoint.get("channel_values") or {}).get("current_step")
+        result = {"run_id": run_id, "status": status, "current_step": current_step, **_jsonable(data or {})}
+        run_events.publish(run_id, f"run.{status}", result)
+        run_events.close(run_id)
         return result
+    
+    def _config(self, run_id: str) -> Dict[str, Any]:
+        """Runnable config addressing a run's checkpoints"""
+        return {"configurable": {"thread_id": run_id}}
 
 
 # Global graph instance
@@ -0,0 +1,118 @@
+"""
+MindMesh Parallel Graph Stages
+"""
+
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.runnables.base import coerce_to_runnable
+from langgraph.channels.base import InvalidUpdateError
+
+from mindmesh.state import STATE_MERGE_RULES, MindMeshState
+
+
+def as_runnable(node: Any) -> Runnable:
+    """Wrap a graph node, treating node objects with an async __call__ as coroutines"""
+    if not isinstance(node, Runnable) and inspect.iscoroutinefunction(getattr(node, "__call__", None)):
+        return RunnableLambda(node.__call__, name=type(node).__name__)
+    return coerce_to_runnable(node)
+
+
+class ParallelStage:
+    """
+    Graph node that fans out into independent branches and joins them.
+
+    Each branch is a sequence of nodes run in order against its own copy of
+    the incoming state; branches run concurrently, so the stage takes as
+    long as its slowest branch instead of the sum of all nodes. When every
+    branch has finished, the fields they changed are merged into a single
+    state update: a field changed by one branch is taken as-is, a field
+    changed by several is combined with its merge rule, and a field changed
+    by several branches without a rule is a conflict.
+
+    ``before_node(node, config)`` runs before every node of a branch and
+    may raise to stop the stage (a pause point; the stage reruns from its
+    start when the run resumes). ``after_node(branch, node, update,
+    config)`` runs as each node finishes, so progress is reported per node
+    rather than once for the whole stage.
+    """
+
+    def __init__(
+        self,
+        branches: Dict[str, Sequence[Tuple[str, Any]]],
+        merge_rules: Optional[Dict[str, Callable[[Any, List[Any]], Any]]] = None,
+        before_node: Optional[Callable[[str, RunnableConfig], None]] = None,
+        after_node: Optional[Callable[[str, str, Dict[str, Any], RunnableConfig], None]] = None,
+    ):
+        self.branches = {
+            name: [(node_name, as_runnable(node)) for node_name, node in nodes]
+            for name, nodes in branches.items()
+        }
+        self.merge_rules = STATE_MERGE_RULES if merge_rules is None else merge_rules
+        self.before_node = before_node
+        self.after_node = after_node
+
+    async def __call__(self, state: MindMeshState, config: RunnableConfig) -> Dict[str, Any]:
+        tasks = [
+            asyncio.create_task(self._run_branch(branch, nodes, state, config))
+            for branch, nodes in self.branches.items()
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed branch fails the stage; don't leave the others running
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return self._merge(state, dict(zip(self.branches, results)))
+
+    async def _run_branch(
+        self,
+        branch: str,
+        nodes: Sequence[Tuple[str, Any]],
+        state: MindMeshState,
+        config: RunnableConfig,
+    ) -> MindMeshState:
+        """Run a branch's nodes in order, each seeing the updates of the previous"""
+        for node_name, node in nodes:
+            if self.before_node is not None:
+                self.before_node(node_name, config)
+            update = await node.ainvoke(state, config)
+            if update:
+                if not isinstance(update, dict):
+                    raise InvalidUpdateError(
+                        f"Invalid state update from node {node_name}, expected dict, got {update}"
+                    )
+                state = state.model_copy(update=update)
+            if self.after_node is not None:
+                self.after_node(branch, node_name, update or {}, config)
+        return state
+
+    def _merge(self, base: MindMeshState, results: Dict[str, MindMeshState]) -> Dict[str, Any]:
+        """Join branch states into one update holding only the changed fields"""
+        writes: Dict[str, List[Tuple[str, Any]]] = {}
+        for branch, result in results.items():
+            for field in MindMeshState.model_fields:
+                value = getattr(result, field)
+                if value != getattr(base, field):
+                    writes.setdefault(field, []).append((branch, value))
+
+        update: Dict[str, Any] = {}
+        for field, branch_values in writes.items():
+            if len(branch_values) == 1:
+                update[field] = branch_values[0][1]
+                continue
+
+            rule = self.merge_rules.get(field)
+            if rule is None:
+                branches = ", ".join(branch for branch, _ in branch_values)
+                raise InvalidUpdateError(
+                    f"Field {field} was changed by parallel branches {branches} "
+                    f"and has no merge rule"
+                )
+            update[field] = rule(getattr(base, field), [value for _, value in branch_values])
+
+        return update
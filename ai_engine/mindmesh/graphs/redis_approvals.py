@@ -0,0 +1,215 @@
+"""
+MindMesh Redis Approval Store
+"""
+
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from mindmesh.graphs.approvals import APPROVED, CANCELLED, DECISIONS, EDITED, PENDING, REJECTED, _now
+
+# Approvals are hashes at {prefix}:approval:{id}. A tenant's inbox is a
+# sorted set at {prefix}:inbox:{tenant}, and one per state at
+# {prefix}:inbox:{tenant}:{state}, whose members "created_at|id" all score
+# 0: fixed-width timestamps make their lexical order (created_at, id), so
+# a page is one ZREVRANGEBYLEX seeking past the previous page's last item.
+# Per run, {prefix}:runs:{run_id} holds its approval IDs,
+# {prefix}:pending:{run_id} the one waiting and {prefix}:decided:{run_id}
+# the last decided; {prefix}:counts holds the number per state. Every
+# transition is one script, so it is atomic on the server.
+
+_MOVE = """
+local function move(prefix, key, id, to, now)
+    local fields = redis.call('HMGET', key, 'tenant_id', 'created_at', 'state')
+    local tenant, from = fields[1], fields[3]
+    local member = fields[2] .. '|' .. id
+    redis.call('ZREM', prefix .. ':inbox:' .. tenant .. ':' .. from, member)
+    redis.call('ZADD', prefix .. ':inbox:' .. tenant .. ':' .. to, 0, member)
+    redis.call('HINCRBY', prefix .. ':counts', from, -1)
+    redis.call('HINCRBY', prefix .. ':counts', to, 1)
+    redis.call('HSET', key, 'state', to, 'updated_at', now)
+end
+"""
+
+REQUEST = """
+local prefix, run_id, tenant, payload, id, now = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6]
+local pending = redis.call('GET', prefix .. ':pending:' .. run_id)
+if pending then
+    return pending
+end
+redis.call('HSET', prefix .. ':approval:' .. id, 'run_id', run_id, 'tenant_id', tenant, 'state', 'pending',
+    'payload', payload, 'decision', '', 'comments', '', 'decided_by', '', 'created_at', now, 'decided_at', '',
+    'updated_at', now)
+local member = now .. '|' .. id
+redis.call('ZADD', prefix .. ':inbox:' .. tenant, 0, member)
+redis.call('ZADD', prefix .. ':inbox:' .. tenant .. ':pending', 0, member)
+redis.call('SET', prefix .. ':pending:' .. run_id, id)
+redis.call('SADD', prefix .. ':runs:' .. run_id, id)
+redis.call('HINCRBY', prefix .. ':counts', 'pending', 1)
+return id
+"""
+
+DECIDE = _MOVE + """
+local prefix, id, now = ARGV[1], ARGV[2], ARGV[8]
+local key = prefix .. ':approval:' .. id
+if redis.call('HGET', key, 'state') ~= 'pending' then
+    return 0
+end
+move(prefix, key, id, ARGV[3], now)
+redis.call('HSET', key, 'decision', ARGV[4], 'comments', ARGV[5], 'decided_by', ARGV[6], 'decided_at', now)
+if ARGV[7] ~= '' then
+    redis.call('HSET', key, 'payload', ARGV[7])
+end
+local run_id = redis.call('HGET', key, 'run_id')
+redis.call('DEL', prefix .. ':pending:' .. run_id)
+redis.call('SET', prefix .. ':decided:' .. run_id, id)
+return 1
+"""
+
+CANCEL_RUN = _MOVE + """
+local prefix, run_id, now = ARGV[1], ARGV[2], ARGV[3]
+local id = redis.call('GET', prefix .. ':pending:' .. run_id)
+if not id then
+    return 0
+end
+move(prefix, prefix .. ':approval:' .. id, id, 'cancelled', now)
+redis.call('DEL', prefix .. ':pending:' .. run_id)
+return 1
+"""
+
+
+class RedisApprovalStore:
+    """
+    Approval requests of runs stopped at the approval gate, in any
+    Redis-protocol server with Lua scripting, so API and worker processes
+    on every host share them. Same interface as ApprovalStore; the inbox
+    is read newest first with keyset pagination on (created_at, id).
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: Optional[str] = None,
+        password: Optional[str] = None,
+        prefix: str = "approvals",
+    ):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, password=password, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self._request = client.register_script(REQUEST)
+        self._decide = client.register_script(DECIDE)
+        self._cancel_run = client.register_script(CANCEL_RUN)
+
+    def request(self, run_id: str, tenant_id: Optional[str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """The run's pending approval, created unless one is already waiting"""
+        approval_id = self._request(
+            keys=[],
+            args=[self.prefix, run_id, tenant_id or "", json.dumps(payload, default=str), uuid.uuid4().hex, _now()],
+        )
+        return self.get(approval_id)
+
+    def get(self, approval_id: str) -> Optional[Dict[str, Any]]:
+        return self._approval(approval_id, self.client.hgetall(f"{self.prefix}:approval:{approval_id}"))
+
+    def _approval(self, approval_id: str, fields: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        return {
+            "id": approval_id,
+            "run_id": fields["run_id"],
+            "tenant_id": fields["tenant_id"] or None,
+            "state": fields["state"],
+            "payload": json.loads(fields["payload"]),
+            "decision": fields["decision"] or None,
+            "comments": fields["comments"] or None,
+            "decided_by": fields["decided_by"] or None,
+            "created_at": fields["created_at"],
+            "decided_at": fields["decided_at"] or None,
+            "updated_at": fields["updated_at"],
+        }
+
+    def _many(self, approval_ids: List[str]) -> List[Dict[str, Any]]:
+        with self.client.pipeline(transaction=False) as pipe:
+            for approval_id in approval_ids:
+                pipe.hgetall(f"{self.prefix}:approval:{approval_id}")
+            rows = pipe.execute()
+        approvals = [self._approval(approval_id, fields) for approval_id, fields in zip(approval_ids, rows)]
+        return [approval for approval in approvals if approval is not None]
+
+    def list(
+        self,
+        tenant_id: Optional[str],
+        state: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 20,
+        before: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """A tenant's approvals newest first, after the (created_at, id) of the previous page"""
+        if run_id is not None:
+            approvals = [
+                approval for approval in self._of_run(tenant_id, state, run_id)
+                if before is None or (approval["created_at"], approval["id"]) < tuple(before)
+            ]
+            return approvals[:limit]
+        # Seek past the last item of the previous page instead of OFFSET
+        start = f"({before[0]}|{before[1]}" if before is not None else "+"
+        members = self.client.zrevrangebylex(self._inbox(tenant_id, state), start, "-", start=0, num=limit)
+        return self._many([member.split("|", 1)[1] for member in members])
+
+    def count(self, tenant_id: Optional[str], state: Optional[str] = None, run_id: Optional[str] = None) -> int:
+        if run_id is not None:
+            return len(self._of_run(tenant_id, state, run_id))
+        return self.client.zcard(self._inbox(tenant_id, state))
+
+    def _inbox(self, tenant_id: Optional[str], state: Optional[str]) -> str:
+        inbox = f"{self.prefix}:inbox:{tenant_id or ''}"
+        return f"{inbox}:{state}" if state is not None else inbox
+
+    def _of_run(self, tenant_id: Optional[str], state: Optional[str], run_id: str) -> List[Dict[str, Any]]:
+        # A run files a handful of approvals, so they are filtered here
+        approvals = [
+            approval for approval in self._many(sorted(self.client.smembers(f"{self.prefix}:runs:{run_id}")))
+            if approval["tenant_id"] == tenant_id and (state is None or approval["state"] == state)
+        ]
+        return sorted(approvals, key=lambda approval: (approval["created_at"], approval["id"]), reverse=True)
+
+    def decide(
+        self,
+        approval_id: str,
+        decision: str,
+        decided_by: Optional[str] = None,
+        comments: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Record a decision on a pending approval; None if it was already decided"""
+        if decision not in DECISIONS:
+            raise ValueError(f"Unknown decision: {decision}")
+        if decision == "edit" and payload is None:
+            raise ValueError("An edit decision needs the edited payload")
+        decided = self._decide(
+            keys=[],
+            args=[
+                self.prefix, approval_id, DECISIONS[decision], decision, comments or "", decided_by or "",
+                json.dumps(payload, default=str) if payload is not None else "", _now(),
+            ],
+        )
+        return self.get(approval_id) if decided else None
+
+    def decided(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """The run's most recently decided approval"""
+        approval_id = self.client.get(f"{self.prefix}:decided:{run_id}")
+        return self.get(approval_id) if approval_id else None
+
+    def cancel_run(self, run_id: str) -> int:
+        """Withdraw a cancelled run's pending approval from the inbox"""
+        return int(self._cancel_run(keys=[], args=[self.prefix, run_id, _now()]))
+
+    def counts(self) -> Dict[str, int]:
+        counts = self.client.hgetall(f"{self.prefix}:counts")
+        return {state: int(counts.get(state, 0)) for state in (PENDING, APPROVED, REJECTED, EDITED, CANCELLED)}
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,138 @@
+"""
+MindMesh Run Control
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Run statuses
+QUEUED = "queued"
+RUNNING = "running"
+PAUSED = "paused"
+AWAITING_APPROVAL = "awaiting_approval"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+FAILED = "failed"
+
+ACTIVE = (QUEUED, RUNNING)
+SUSPENDED = (PAUSED, AWAITING_APPROVAL)
+
+
+class RunInterrupted(Exception):
+    """Raised at a node boundary of a run asked to pause or cancel, or by a node that must wait"""
+
+    def __init__(self, run_id: str, status: str, data: Optional[Dict[str, Any]] = None):
+        super().__init__(f"Run {run_id} {status}")
+        self.run_id = run_id
+        self.status = status
+        self.data = data or {}
+
+
+class RunControl:
+    """
+    Pause and cancel requests for one run, checked by the graph before
+    each node starts. Cancelling also cancels the task driving the run, so
+    LLM calls, tool calls and the run's scheduler slot are released at
+    once rather than when the node would have finished.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.status = QUEUED
+        self.requested: Optional[str] = None  # PAUSED | CANCELLED
+        self.task: Optional[asyncio.Task] = None
+        self.updated_at = time.time()
+
+    def attach(self, status: str) -> None:
+        """Bind the run to the task now driving it"""
+        self.task = asyncio.current_task()
+        self._set(status)
+
+    def check(self) -> None:
+        if self.requested is not None:
+            raise RunInterrupted(self.run_id, self.requested)
+
+    def finish(self, status: str) -> None:
+        self.requested = None
+        self.task = None
+        self._set(status)
+
+    def _set(self, status: str) -> None:
+        self.status = status
+        self.updated_at = time.time()
+
+
+class RunControls:
+    """Controls of recent runs in this process, keyed by run ID"""
+
+    def __init__(self, max_runs: int = 10000):
+        self.max_runs = max_runs
+        self._controls: "OrderedDict[str, RunControl]" = OrderedDict()
+
+        self.paused = 0
+        self.cancelled = 0
+
+    def open(self, run_id: str) -> RunControl:
+        """The run's control, created for a new run or reset for a resumed one"""
+        control = self._controls.get(run_id)
+        if control is None:
+            control = RunControl(run_id)
+            self._controls[run_id] = control
+        control.requested = None
+        self._controls.move_to_end(run_id)
+        # Finished runs are forgotten first; active ones are never evicted
+        if len(self._controls) > self.max_runs:
+            for stale_id, stale in list(self._controls.items()):
+                if len(self._controls) <= self.max_runs:
+                    break
+                if stale.status not in ACTIVE:
+                    del self._controls[stale_id]
+        return control
+
+    def get(self, run_id: str) -> Optional[RunControl]:
+        return self._controls.get(run_id)
+
+    def status(self, run_id: str) -> Optional[str]:
+        control = self._controls.get(run_id)
+        return control.status if control else None
+
+    def check(self, run_id: str) -> None:
+        """Raise RunInterrupted if the run was asked to pause or cancel"""
+        control = self._controls.get(run_id)
+        if control is not None:
+            control.check()
+
+    def pause(self, run_id: str) -> bool:
+        """Ask a run to stop before its next node; False unless it is queued or running"""
+        control = self._controls.get(run_id)
+        if control is None or control.status not in ACTIVE or control.requested == CANCELLED:
+            return False
+        control.requested = PAUSED
+        self.paused += 1
+        return True
+
+    def cancel(self, run_id: str) -> bool:
+        """Stop a run now; a suspended run is simply marked cancelled. False if it already finished"""
+        control = self._controls.get(run_id)
+        if control is None or control.status not in ACTIVE + SUSPENDED:
+            return False
+        self.cancelled += 1
+        if control.status in SUSPENDED:
+            control.finish(CANCELLED)
+            return True
+        control.requested = CANCELLED
+        if control.task is not None and not control.task.done():
+            control.task.cancel()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for control in self._controls.values():
+            statuses[control.status] = statuses.get(control.status, 0) + 1
+        return {"runs": statuses, "pause_requests": self.paused, "cancel_requests": self.cancelled}
+
+
+# Global run controls instance
+run_controls = RunControls()
@@ -0,0 +1,194 @@
+"""
+MindMesh Run Scheduler
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from mindmesh.config.settings import settings
+
+T = TypeVar("T")
+
+# Recent queue waits and run durations kept for the percentiles in stats()
+_SAMPLES = 1000
+
+
+class _Ticket:
+    """A run waiting for a slot, ordered by its virtual finish time"""
+
+    def __init__(self, tenant: str, start: float, finish: float):
+        self.tenant = tenant
+        self.start = start
+        self.finish = finish
+        self.granted: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class RunScheduler:
+    """
+    Admission control for graph runs: at most ``max_concurrent`` runs at
+    once, each stopped after ``timeout`` seconds.
+
+    Runs that find every slot taken queue up and are admitted by weighted
+    fair queuing across tenants (start-time fair queuing): a run is tagged
+    with a virtual finish time of max(virtual now, its tenant's last
+    finish) + cost / weight, and the queued run with the earliest tag goes
+    next. A tenant with hundreds of queued runs only advances its own
+    tags, so a tenant submitting its first run is admitted ahead of that
+    backlog, and busy tenants share slots in proportion to their weights.
+    Within a tenant runs keep their submission order.
+    """
+
+    def __init__(self, max_concurrent: int = 10, timeout: Optional[float] = 300.0, default_weight: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.default_weight = default_weight
+        self._weights: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, _Ticket]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._queued: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self.active = 0
+        self.waiting = 0
+
+        self.admitted = 0
+        self.queued_runs = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.abandoned = 0
+        self._waits: Deque[float] = deque(maxlen=_SAMPLES)
+        self._durations: Deque[float] = deque(maxlen=_SAMPLES)
+
+    def set_weight(self, tenant_id: Optional[str], weight: float) -> None:
+        """Share of contended slots a tenant gets relative to others (default 1)"""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[str(tenant_id)] = weight
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[T]],
+        tenant_id: Optional[str] = None,
+        cost: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Run call once a slot is free. Raises asyncio.TimeoutError when the
+        run exceeds its timeout (the scheduler's unless given); time spent
+        queued does not count against it.
+        """
+        tenant = str(tenant_id)
+        queued_at = time.perf_counter()
+        start = max(self._virtual_time, self._last_finish.get(tenant, 0.0))
+        ticket = _Ticket(tenant, start, start + cost / self._weights.get(tenant, self.default_weight))
+        self._last_finish[tenant] = ticket.finish
+
+        if self.active < self.max_concurrent and not self.waiting:
+            self._grant(ticket)
+        else:
+            heapq.heappush(self._queue, (ticket.finish, next(self._sequence), ticket))
+            self._queued[tenant] = self._queued.get(tenant, 0) + 1
+            self.waiting += 1
+            self.queued_runs += 1
+            try:
+                await ticket.granted
+            except asyncio.CancelledError:
+                if ticket.granted.done() and not ticket.granted.cancelled():
+                    # Cancelled just after being granted: hand the slot on
+                    self._release(tenant)
+                else:
+                    ticket.granted.cancel()
+                    self._queued[tenant] -= 1
+                    self.waiting -= 1
+                    self._forget(tenant)
+                    self.abandoned += 1
+                raise
+
+        started = time.perf_counter()
+        self._waits.append(started - queued_at)
+        try:
+            result = await asyncio.wait_for(call(), timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._durations.append(time.perf_counter() - started)
+            self._release(tenant)
+        self.completed += 1
+        return result
+
+    def _grant(self, ticket: _Ticket) -> None:
+        self._virtual_time = max(self._virtual_time, ticket.start)
+        self.active += 1
+        self._running[ticket.tenant] = self._running.get(ticket.tenant, 0) + 1
+        self.admitted += 1
+        ticket.granted.set_result(None)
+
+    def _release(self, tenant: str) -> None:
+        self.active -= 1
+        self._running[tenant] -= 1
+        self._forget(tenant)
+        while self._queue and self.active < self.max_concurrent:
+            _, _, ticket = heapq.heappop(self._queue)
+            if ticket.granted.done():
+                # Its waiter was cancelled while queued
+                continue
+            self._queued[ticket.tenant] -= 1
+            self.waiting -= 1
+            self._grant(ticket)
+        if not self.active and not self.waiting:
+            self._queue.clear()
+            # Nothing left to be fair against: every tenant starts level again
+            self._last_finish.clear()
+
+    def _forget(self, tenant: str) -> None:
+        # An idle tenant's tags restart from virtual now, so nothing is lost dropping them
+        if not self._queued.get(tenant) and not self._running.get(tenant):
+            self._queued.pop(tenant, None)
+            self._running.pop(tenant, None)
+            if self._last_finish.get(tenant, 0.0) <= self._virtual_time:
+                self._last_finish.pop(tenant, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self.active,
+            "queued": self.waiting,
+            "tenants_queued": sum(1 for count in self._queued.values() if count),
+            "admitted": self.admitted,
+            "queued_runs": self.queued_runs,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "abandoned": self.abandoned,
+            "queue_wait_seconds": _percentiles(self._waits),
+            "run_seconds": _percentiles(self._durations),
+        }
+
+
+# Global run scheduler instance: it admits the runs of its own process;
+# across run workers the job queue's claims cap runs and share them out
+run_scheduler = RunScheduler(
+    max_concurrent=settings.MAX_CONCURRENT_RUNS,
+    timeout=settings.RUN_TIMEOUT_SECONDS or None,
+)
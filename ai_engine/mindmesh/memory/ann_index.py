@@ -0,0 +1,993 @@
+"""
+MindMesh Approximate Nearest-Neighbour Index
+"""
+
+import fcntl
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+
+# Metadata fields stored as integer codes for vectorised filtering
+CATEGORICAL_FIELDS = ("app", "sensitivity", "owner", "type")
+
+QUANTIZATION_MODES = ("none", "int8")
+
+# Cell number in locations of rows held by an index's delta list
+_DELTA = -1
+
+Rows = Union[slice, np.ndarray]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-vector int8 codes and the scales that restore them"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class _FullPrecisionStore:
+    """
+    Float32 vectors addressed by slot, used to re-rank quantized
+    candidates. Vectors written by the last save are memory-mapped from
+    disk, so they cost page cache rather than heap; vectors added since
+    stay in memory until the next save. Slots of deleted vectors are
+    reclaimed when the index is saved.
+    """
+
+    def __init__(self, dim: int, base: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.base = base if base is not None else np.zeros((0, dim), dtype=np.float32)
+        self.extra = np.zeros((0, dim), dtype=np.float32)
+        self.extra_size = 0
+
+    def append(self, vectors: np.ndarray) -> np.ndarray:
+        """Store vectors; returns their slots"""
+        first = self.extra_size
+        needed = first + len(vectors)
+        if needed > len(self.extra):
+            capacity = max(needed, 2 * len(self.extra), 16)
+            self.extra = np.concatenate([self.extra[:first], np.zeros((capacity - first, self.dim), dtype=np.float32)])
+        self.extra[first:needed] = vectors
+        self.extra_size = needed
+        return np.arange(len(self.base) + first, len(self.base) + needed, dtype=np.int64)
+
+    def get(self, slots: np.ndarray) -> np.ndarray:
+        slots = np.asarray(slots, dtype=np.int64)
+        mapped = len(self.base)
+        in_base = slots < mapped
+        if in_base.all():
+            return np.asarray(self.base[slots])
+        vectors = np.empty((len(slots), self.dim), dtype=np.float32)
+        vectors[in_base] = self.base[slots[in_base]]
+        vectors[~in_base] = self.extra[slots[~in_base] - mapped]
+        return vectors
+
+
+class _InvertedList:
+    """
+    Vectors and metadata columns of one IVF cell, stored contiguously.
+    Quantized lists hold int8 codes with a scale per row and the row's
+    slot in the full-precision store instead of float32 vectors.
+
+    Lists loaded from a snapshot are read-only views of memory-mapped
+    files: removing a row only marks it dead, and new rows go to the
+    index's delta list instead.
+    """
+
+    def __init__(self, dim: int, quantized: bool = False, capacity: int = 16):
+        self.size = 0
+        self.ids: List[str] = []
+        self.vectors = np.zeros((capacity, dim), dtype=np.int8 if quantized else np.float32)
+        self.codes = np.zeros((capacity, len(CATEGORICAL_FIELDS)), dtype=np.int32)
+        self.created_at = np.zeros(capacity, dtype=np.float64)
+        self.columns: Tuple[str, ...] = ("vectors", "codes", "created_at")
+        if quantized:
+            self.scales = np.zeros(capacity, dtype=np.float32)
+            self.slots = np.zeros(capacity, dtype=np.int64)
+            self.columns += ("scales", "slots")
+        self.mapped = False
+        self.dead: Optional[np.ndarray] = None
+
+    @classmethod
+    def view(cls, doc_ids: List[str], columns: Dict[str, np.ndarray]) -> "_InvertedList":
+        """A read-only list over memory-mapped column arrays"""
+        inverted = cls.__new__(cls)
+        inverted.size = len(doc_ids)
+        inverted.ids = doc_ids
+        inverted.columns = tuple(columns)
+        for name, column in columns.items():
+            setattr(inverted, name, column)
+        inverted.mapped = True
+        inverted.dead = None
+        return inverted
+
+    def extend(self, doc_ids: List[str], rows: Dict[str, np.ndarray]) -> int:
+        """Append rows in bulk; returns the row of the first one"""
+        first = self.size
+        needed = first + len(doc_ids)
+        for name in self.columns:
+            column = getattr(self, name)
+            if needed > len(column):
+                capacity = max(needed, 2 * len(column))
+                grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+                grown[:first] = column[:first]
+                setattr(self, name, grown)
+            getattr(self, name)[first:needed] = rows[name]
+        self.ids.extend(doc_ids)
+        self.size = needed
+        return first
+
+    def remove(self, row: int) -> Optional[str]:
+        """Remove a row by moving the last row into it; returns the moved ID"""
+        if self.mapped:
+            if self.dead is None:
+                self.dead = np.zeros(self.size, dtype=bool)
+            self.dead[row] = True
+            return None
+        last = self.size - 1
+        moved = None
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            for name in self.columns:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.ids.pop()
+        self.size -= 1
+        return moved
+
+    def live(self) -> Rows:
+        """Selector of the rows not marked dead"""
+        if self.dead is None:
+            return slice(0, self.size)
+        return np.flatnonzero(~self.dead)
+
+    def rows(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.columns}
+
+    def nbytes(self) -> int:
+        """Heap bytes; views of mapped files only cost their dead-row marks"""
+        if self.mapped:
+            return self.dead.nbytes if self.dead is not None else 0
+        return sum(getattr(self, name).nbytes for name in self.columns)
+
+
+class IVFIndex:
+    """
+    Inverted-file index over unit-normalised embeddings (cosine similarity).
+
+    A spherical k-means quantizer splits vectors into ``nlist`` cells and a
+    query only scans the ``nprobe`` cells whose centroids are closest,
+    touching a small fraction of the vectors. Metadata (app, sensitivity,
+    owner, type, created_at) lives in columns next to the vectors and is applied
+    as a mask before scoring. When a filter leaves fewer than k candidates
+    in the probed cells, further cells are probed until k are found.
+
+    With ``quantization="int8"`` the cells hold int8 codes (a quarter of
+    the float32 size) that score candidates in a first pass; the best
+    ``rerank * k`` are then re-scored with the full-precision vectors, so
+    returned scores are exact cosine similarities.
+
+    An index loaded from a snapshot keeps the snapshot's cells as
+    memory-mapped views. Deletes mark their rows dead; inserts go to a
+    heap delta list that every query scans in full. Saving merges both
+    into new cells.
+
+    Until enough vectors exist to train the quantizer the index is a
+    single cell searched exhaustively. It retrains itself once it has
+    grown ``retrain_growth`` times past the size it was trained at.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        min_train_size: int = 4096,
+        retrain_growth: float = 4.0,
+        seed: int = 0,
+        quantization: str = "none",
+        rerank: int = 4,
+    ):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {quantization}")
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.seed = seed
+        self.quantized = quantization == "int8"
+        self.rerank = rerank
+
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self.store = _FullPrecisionStore(dim) if self.quantized else None
+        self.lists: List[_InvertedList] = [self._new_list()]
+        self.delta: Optional[_InvertedList] = None  # inserts since the snapshot, when loaded from one
+        self.locations: Dict[str, Tuple[int, int]] = {}
+        self.vocab: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def add(self, doc_id: str, vector: np.ndarray, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Insert or replace a document's vector"""
+        self.add_many([doc_id], np.asarray(vector, dtype=np.float32)[None, :], [metadata or {}])
+
+    def add_many(
+        self,
+        doc_ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace many vectors at once"""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(doc_ids), self.dim))
+        metadata = metadata or [{}] * len(doc_ids)
+
+        # Last write wins for IDs repeated within the batch
+        latest = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        keep = np.fromiter(sorted(latest.values()), dtype=np.int64, count=len(latest))
+        for doc_id in latest:
+            self.delete(doc_id)
+        if not len(keep):
+            return
+
+        doc_ids = [doc_ids[i] for i in keep]
+        codes = np.stack([self._encode(metadata[i]) for i in keep])
+        created_at = np.array([self._timestamp(metadata[i].get("created_at")) for i in keep], dtype=np.float64)
+        vectors = vectors[keep]
+        self._insert(doc_ids, self._rows(vectors, codes, created_at), self._assign(vectors))
+
+        if self._needs_training():
+            self.train()
+
+    def _rows(self, vectors: np.ndarray, codes: np.ndarray, created_at: np.ndarray) -> Dict[str, np.ndarray]:
+        """Column values for new float32 vectors, quantizing them if needed"""
+        if not self.quantized:
+            return {"vectors": vectors, "codes": codes, "created_at": created_at}
+        quantized, scales = quantize_int8(vectors)
+        return {
+            "vectors": quantized,
+            "codes": codes,
+            "created_at": created_at,
+            "scales": scales,
+            "slots": self.store.append(vectors),
+        }
+
+    def _insert(self, doc_ids: List[str], rows: Dict[str, np.ndarray], cells: np.ndarray) -> None:
+        """Append rows grouped by cell, one bulk copy per cell"""
+        if not len(doc_ids):
+            return
+        if self.delta is not None:
+            first = self.delta.extend(doc_ids, rows)
+            for offset, doc_id in enumerate(doc_ids):
+                self.locations[doc_id] = (_DELTA, first + offset)
+            return
+        order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        boundaries = np.flatnonzero(np.diff(sorted_cells)) + 1
+        for group in np.split(order, boundaries):
+            cell = int(cells[group[0]])
+            group_ids = [doc_ids[i] for i in group]
+            first = self.lists[cell].extend(group_ids, {name: column[group] for name, column in rows.items()})
+            for offset, doc_id in enumerate(group_ids):
+                self.locations[doc_id] = (cell, first + offset)
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document; returns whether it was present"""
+        location = self.locations.pop(doc_id, None)
+        if location is None:
+            return False
+        cell, row = location
+        moved = (self.delta if cell == _DELTA else self.lists[cell]).remove(row)
+        if moved is not None:
+            self.locations[moved] = (cell, row)
+        return True
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, cosine similarity) matching the filters, best first"""
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(self.dim))
+        masker = self._masker(filters)
+        if masker is False:
+            return []
+
+        if self.centroids is None:
+            probes = [self.lists[0]]
+            nprobe = 1
+        else:
+            probes = [self.lists[cell] for cell in np.argsort(-(self.centroids @ query))]
+            nprobe = min(nprobe or self.nprobe, len(probes))
+        if self.delta is not None:
+            probes.insert(0, self.delta)
+            nprobe += 1
+
+        # Quantized scores are approximate, so min_score waits for re-ranking
+        threshold = None if self.quantized else min_score
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+        slots: List[np.ndarray] = []
+        found = 0
+        for probed, inverted in enumerate(probes):
+            # Past the requested probes, continue only while the filter starves us
+            if probed >= nprobe and found >= k:
+                break
+            if not inverted.size:
+                continue
+            rows = masker(inverted) if masker is not None else None
+            if inverted.dead is not None:
+                rows = np.flatnonzero(~inverted.dead) if rows is None else rows[~inverted.dead[rows]]
+            if rows is None:
+                rows = slice(0, inverted.size)
+                cell_ids = inverted.ids
+            elif not len(rows):
+                continue
+            else:
+                cell_ids = [inverted.ids[row] for row in rows]
+            cell_scores = inverted.vectors[rows] @ query
+            if self.quantized:
+                cell_scores *= inverted.scales[rows]
+                slots.append(inverted.slots[rows])
+            if threshold is not None:
+                keep = np.flatnonzero(cell_scores >= threshold)
+                cell_scores = cell_scores[keep]
+                cell_ids = [cell_ids[i] for i in keep]
+            ids.extend(cell_ids)
+            scores.append(cell_scores)
+            found += len(cell_ids)
+
+        if not found:
+            return []
+        all_scores = np.concatenate(scores)
+        if self.quantized:
+            # Re-score the best approximate candidates with full precision
+            candidates = _top(all_scores, k * self.rerank)
+            all_slots = np.concatenate(slots)[candidates]
+            exact = self.store.get(all_slots) @ query
+            ids = [ids[i] for i in candidates]
+            all_scores = exact
+            if min_score is not None:
+                keep = np.flatnonzero(exact >= min_score)
+                ids = [ids[i] for i in keep]
+                all_scores = exact[keep]
+        top = _top(all_scores, k)
+        return [(ids[i], float(all_scores[i])) for i in top]
+
+    def train(self, iterations: int = 10) -> None:
+        """(Re)build the quantizer from the current vectors and reassign them"""
+        doc_ids, rows = self._export()
+        if not len(doc_ids):
+            return
+
+        nlist = self.nlist or int(min(4096, max(16, 4 * math.sqrt(len(doc_ids)))))
+        nlist = min(nlist, len(doc_ids))
+        rng = np.random.default_rng(self.seed)
+        picks = np.sort(rng.choice(len(doc_ids), size=min(len(doc_ids), nlist * 64), replace=False))
+        sample = self._float_rows(rows, picks)
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            empty = counts == 0
+            # Reseed empty cells from random sample points
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        # Assign in blocks so a quantized index never materialises all its float vectors
+        cells = np.empty(len(doc_ids), dtype=np.int64)
+        for start in range(0, len(doc_ids), 65536):
+            block = slice(start, start + 65536)
+            cells[block] = self._nearest(self._float_rows(rows, block), centroids)
+
+        self.centroids = centroids
+        self.trained_size = len(doc_ids)
+        self.lists = [self._new_list() for _ in range(nlist)]
+        self.delta = None
+        self.locations = {}
+        self._insert(doc_ids, rows, cells)
+
+    def save(self, path: str) -> None:
+        """
+        Write a snapshot directory: one .npy file per column with every
+        cell's rows back to back, cell offsets, IDs and a JSON header. All
+        of it can be memory-mapped by load. The directory is written
+        beside ``path`` and renamed into place.
+        """
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        # Each cell of the snapshot: the old cell's live rows plus the delta rows nearest to it
+        parts: List[List[Tuple[_InvertedList, Rows]]] = [[(inverted, inverted.live())] for inverted in self.lists]
+        if self.delta is not None and self.delta.size:
+            delta_cells = self._assign(self._float_rows(self.delta.rows(), slice(0, self.delta.size)))
+            for cell, cell_parts in enumerate(parts):
+                cell_parts.append((self.delta, np.flatnonzero(delta_cells == cell)))
+        sizes = [
+            sum(selection.stop - selection.start if isinstance(selection, slice) else len(selection) for _, selection in cell_parts)
+            for cell_parts in parts
+        ]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        total = int(offsets[-1])
+        template = self._new_list()
+        names = list(template.columns) + (["full"] if self.quantized else [])
+        files = {}
+        for name in names:
+            column = template.vectors if name == "full" else getattr(template, name)
+            dtype = np.float32 if name == "full" else column.dtype
+            files[name] = np.lib.format.open_memmap(
+                os.path.join(tmp_path, f"{name}.npy"), mode="w+", dtype=dtype, shape=(total,) + column.shape[1:],
+            )
+        doc_ids: List[str] = []
+        start = 0
+        for cell_parts in parts:
+            for inverted, selection in cell_parts:
+                ids = inverted.ids[selection] if isinstance(selection, slice) else [inverted.ids[i] for i in selection]
+                end = start + len(ids)
+                for name in template.columns:
+                    files[name][start:end] = getattr(inverted, name)[selection]
+                if self.quantized:
+                    files["full"][start:end] = self.store.get(inverted.slots[selection])
+                    # Rows of the snapshot are the slots of its full-precision file
+                    files["slots"][start:end] = np.arange(start, end)
+                doc_ids.extend(ids)
+                start = end
+        for mapped in files.values():
+            mapped.flush()
+        del files
+
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        np.save(os.path.join(tmp_path, "ids.npy"), np.array(doc_ids, dtype=str))
+        np.save(
+            os.path.join(tmp_path, "centroids.npy"),
+            self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+        )
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump({
+                "dim": self.dim,
+                "trained_size": self.trained_size,
+                "quantization": "int8" if self.quantized else "none",
+                "vocab": self.vocab,
+            }, f)
+
+        if os.path.exists(path):
+            shutil.rmtree(f"{path}.old", ignore_errors=True)
+            os.rename(path, f"{path}.old")
+            os.rename(tmp_path, path)
+            shutil.rmtree(f"{path}.old")
+        else:
+            os.rename(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "IVFIndex":
+        """
+        Open a snapshot written by save. Columns stay memory-mapped unless
+        the snapshot's quantization differs from the index's, in which
+        case the vectors are converted into heap lists.
+        """
+        if os.path.isfile(path):
+            return cls._load_npz(path, **kwargs)
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls(meta["dim"], **kwargs)
+        index.vocab = meta["vocab"]
+        centroids = np.load(os.path.join(path, "centroids.npy"))
+        if len(centroids):
+            index.centroids = centroids
+            index.trained_size = meta["trained_size"]
+        offsets = np.load(os.path.join(path, "offsets.npy"))
+        doc_ids = np.load(os.path.join(path, "ids.npy")).tolist()
+        snapshot_quantized = meta["quantization"] == "int8"
+        names = _InvertedList(index.dim, snapshot_quantized, capacity=0).columns + (("full",) if snapshot_quantized else ())
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+
+        if snapshot_quantized == index.quantized:
+            if index.quantized:
+                index.store = _FullPrecisionStore(index.dim, columns.pop("full"))
+            index.lists = [
+                _InvertedList.view(doc_ids[start:end], {name: column[start:end] for name, column in columns.items()})
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+            index.locations = {
+                doc_id: (cell, row)
+                for cell, inverted in enumerate(index.lists)
+                for row, doc_id in enumerate(inverted.ids)
+            }
+            index.delta = index._new_list()
+        else:
+            index.lists = [index._new_list() for _ in range(len(offsets) - 1)]
+            vectors = np.asarray(columns["full"] if snapshot_quantized else columns["vectors"])
+            cells = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+            index._insert(doc_ids, index._rows(vectors, np.asarray(columns["codes"]), np.asarray(columns["created_at"])), cells)
+        return index
+
+    @classmethod
+    def _load_npz(cls, path: str, **kwargs: Any) -> "IVFIndex":
+        """Read the single-file format used before snapshots"""
+        with np.load(path) as data:
+            index = cls(int(data["dim"]), **kwargs)
+            index.vocab = json.loads(str(data["vocab"]))
+            doc_ids = [str(doc_id) for doc_id in data["ids"]]
+            vectors, codes, created_at = data["vectors"], data["codes"], data["created_at"]
+            centroids = data["centroids"]
+            trained_size = int(data["trained_size"])
+            cells = data["cells"]
+            vectors_file = str(data["vectors_file"]) if "vectors_file" in data else None
+
+        if vectors_file is not None:
+            vectors = np.load(os.path.join(os.path.dirname(os.path.abspath(path)), vectors_file))
+        if len(centroids):
+            index.centroids = centroids
+            index.trained_size = trained_size
+            index.lists = [index._new_list() for _ in range(len(centroids))]
+        index._insert(doc_ids, index._rows(vectors, codes, created_at), cells)
+        return index
+
+    def memory_bytes(self) -> int:
+        """Heap held by vectors and metadata columns, excluding memory-mapped vectors"""
+        total = sum(inverted.nbytes() for inverted in self.lists)
+        if self.delta is not None:
+            total += self.delta.nbytes()
+        if self.store is not None:
+            total += self.store.extra.nbytes
+        return total
+
+    def _new_list(self) -> _InvertedList:
+        return _InvertedList(self.dim, self.quantized)
+
+    def _float_rows(self, rows: Dict[str, np.ndarray], selection: Rows) -> np.ndarray:
+        """Full-precision vectors of exported rows"""
+        if self.quantized:
+            return self.store.get(rows["slots"][selection])
+        return rows["vectors"][selection]
+
+    def _needs_training(self) -> bool:
+        if self.centroids is None:
+            return len(self) >= self.min_train_size
+        return len(self) >= self.trained_size * self.retrain_growth
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return self._nearest(vectors, self.centroids)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 8192):
+            assignment[start:start + 8192] = np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+        return assignment
+
+    def _export(self) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """All live rows as flat column arrays, in cell order with the delta last"""
+        lists = [inverted for inverted in self.lists + [self.delta] if inverted is not None and inverted.size]
+        selections = [inverted.live() for inverted in lists]
+        template = self._new_list()
+        rows = {
+            name: np.concatenate(
+                [getattr(template, name)[:0]]
+                + [getattr(inverted, name)[selection] for inverted, selection in zip(lists, selections)]
+            )
+            for name in template.columns
+        }
+        doc_ids = [
+            doc_id
+            for inverted, selection in zip(lists, selections)
+            for doc_id in (inverted.ids[selection] if isinstance(selection, slice) else [inverted.ids[i] for i in selection])
+        ]
+        return doc_ids, rows
+
+    def _encode(self, metadata: Dict[str, Any]) -> np.ndarray:
+        codes = np.zeros(len(CATEGORICAL_FIELDS), dtype=np.int32)
+        for i, field in enumerate(CATEGORICAL_FIELDS):
+            value = metadata.get(field)
+            if value is not None:
+                vocab = self.vocab[field]
+                # Code 0 means "no value"
+                codes[i] = vocab.setdefault(str(value), len(vocab) + 1)
+        return codes
+
+    @staticmethod
+    def _timestamp(value: Any) -> float:
+        if value is None:
+            return 0.0
+        if isinstance(value, (int, float)):
+            return float(value)
+        return value.timestamp()
+
+    def _masker(self, filters: Optional[Dict[str, Any]]) -> Any:
+        """
+        Row selector for the filters: None when unfiltered, False when the
+        filters can't match anything.
+        """
+        if not filters:
+            return None
+
+        allowed: List[Tuple[int, np.ndarray]] = []
+        for i, field in enumerate(CATEGORICAL_FIELDS):
+            value = filters.get(field)
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            codes = [self.vocab[field][str(v)] for v in values if str(v) in self.vocab[field]]
+            if not codes:
+                return False
+            allowed.append((i, np.array(codes, dtype=np.int32)))
+
+        date_from = filters.get("date_from")
+        date_to = filters.get("date_to")
+        date_from = self._timestamp(date_from) if date_from is not None else None
+        date_to = self._timestamp(date_to) if date_to is not None else None
+
+        def rows(inverted: _InvertedList) -> np.ndarray:
+            mask = np.ones(inverted.size, dtype=bool)
+            for column, codes in allowed:
+                mask &= np.isin(inverted.codes[:inverted.size, column], codes)
+            if date_from is not None:
+                mask &= inverted.created_at[:inverted.size] >= date_from
+            if date_to is not None:
+                mask &= inverted.created_at[:inverted.size] <= date_to
+            return np.flatnonzero(mask)
+
+        return rows
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first"""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top])]
+
+
+# Log record framing: payload length, CRC32 of the payload
+_RECORD_HEADER = struct.Struct("<II")
+
+
+def _encode_record(header: Dict[str, Any], vectors: Optional[np.ndarray] = None) -> bytes:
+    body = json.dumps(header).encode()
+    payload = struct.pack("<I", len(body)) + body
+    if vectors is not None:
+        payload += np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode_records(data: bytes) -> Iterator[Tuple[Dict[str, Any], np.ndarray, int]]:
+    """(header, vectors, record length) for each complete record; stops at a torn or corrupt one"""
+    position = 0
+    while position + _RECORD_HEADER.size <= len(data):
+        length, checksum = _RECORD_HEADER.unpack_from(data, position)
+        end = position + _RECORD_HEADER.size + length
+        if end > len(data):
+            return
+        payload = data[position + _RECORD_HEADER.size:end]
+        if zlib.crc32(payload) != checksum:
+            return
+        body_length = struct.unpack_from("<I", payload)[0]
+        header = json.loads(payload[4:4 + body_length])
+        yield header, np.frombuffer(payload, dtype=np.float32, offset=4 + body_length), end - position
+        position = end
+
+
+def _loggable(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """The indexed metadata fields in JSON form"""
+    logged: Dict[str, Any] = {field: str(metadata[field]) for field in CATEGORICAL_FIELDS if metadata.get(field) is not None}
+    if metadata.get("created_at") is not None:
+        logged["created_at"] = IVFIndex._timestamp(metadata["created_at"])
+    return logged
+
+
+def _apply(index: IVFIndex, header: Dict[str, Any], vectors: np.ndarray) -> int:
+    doc_ids = header["ids"]
+    if header["op"] == "upsert":
+        index.add_many(doc_ids, vectors.reshape(len(doc_ids), index.dim), header["metadata"])
+        return len(doc_ids)
+    return sum(index.delete(doc_id) for doc_id in doc_ids)
+
+
+class _TenantState:
+    """A loaded tenant index and how far into its generation's log it has replayed"""
+
+    def __init__(self, index: IVFIndex, generation: int = 0, log_offset: int = 0):
+        self.index = index
+        self.generation = generation
+        self.log_offset = log_offset
+        # Held by every operation on the tenant; writes may retrain or compact for seconds
+        self.lock = threading.RLock()
+
+
+class TenantVectorIndex:
+    """
+    Per-tenant IVF indexes shared by every worker process through one
+    directory. A tenant's directory holds numbered snapshot generations,
+    a write-ahead log of the changes made since each, and a CURRENT file
+    naming the live generation.
+
+    Workers memory-map the snapshot, so N processes share one page-cache
+    copy of the vectors and only the cells changed since the snapshot
+    are copied to a worker's heap. Writes append to the log under a file
+    lock; every operation first replays records other workers appended.
+    Once a log passes ``compact_bytes`` it is folded into a new snapshot
+    and CURRENT is switched to it atomically. The log is written through
+    the page cache without fsync: it survives worker crashes, not host
+    crashes.
+
+    Operations are thread-safe, one tenant at a time, so async callers
+    run them in a thread: an upsert may retrain the tenant's quantizer
+    or compact its log, which takes far longer than an event loop tick.
+    Tenant directories are named by a hash of the tenant ID, so no two
+    tenants can map to the same files.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        dim: int,
+        nprobe: int = 16,
+        max_loaded: int = 64,
+        quantization: str = "none",
+        rerank: int = 4,
+        compact_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self.dim = dim
+        self.nprobe = nprobe
+        self.max_loaded = max_loaded
+        self.quantization = quantization
+        self.rerank = rerank
+        self.compact_bytes = compact_bytes
+        self._tenants: "OrderedDict[str, _TenantState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.searches = 0
+        self.compactions = 0
+        self._search_time = 0.0
+
+    def upsert(
+        self,
+        tenant_id: str,
+        doc_ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace documents in a tenant's index"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(doc_ids), self.dim)
+        metadata = [_loggable(item) for item in (metadata or [{}] * len(doc_ids))]
+        self._write(str(tenant_id), {"op": "upsert", "ids": list(doc_ids), "metadata": metadata}, vectors)
+
+    def delete(self, tenant_id: str, doc_ids: Iterable[str]) -> int:
+        """Remove documents from a tenant's index"""
+        tenant = str(tenant_id)
+        state = self._state(tenant)
+        with state.lock:
+            doc_ids = [doc_id for doc_id in doc_ids if doc_id in state.index.locations]
+            if not doc_ids:
+                return 0
+            return self._write(tenant, {"op": "delete", "ids": doc_ids})
+
+    def search(
+        self,
+        tenant_id: str,
+        query: np.ndarray,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """Nearest documents of a tenant"""
+        start = time.perf_counter()
+        state = self._state(str(tenant_id))
+        with state.lock:
+            results = state.index.search(query, k, filters, min_score=min_score)
+        self.searches += 1
+        self._search_time += time.perf_counter() - start
+        return results
+
+    def compact(self, tenant_id: str) -> bool:
+        """
+        Fold a tenant's log into a new snapshot. Other workers keep
+        logging while it is written; their records are carried over to
+        the new generation's log at the switch. Returns False when
+        another worker is already compacting the tenant.
+        """
+        tenant = str(tenant_id)
+        os.makedirs(self._tenant_dir(tenant), exist_ok=True)
+        with open(os.path.join(self._tenant_dir(tenant), "COMPACT"), "a") as guard:
+            try:
+                fcntl.flock(guard, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+            state = self._state(tenant)
+            with state.lock:
+                return self._compact(tenant, state)
+
+    def _compact(self, tenant: str, state: _TenantState) -> bool:
+        with self._locked(tenant):
+            self._catch_up(tenant, state)
+            generation, offset = state.generation, state.log_offset
+        state.index.save(self._snapshot_path(tenant, generation + 1))
+
+        with self._locked(tenant):
+            tail = b""
+            if os.path.exists(self._log_path(tenant, generation)):
+                with open(self._log_path(tenant, generation), "rb") as f:
+                    f.seek(offset)
+                    tail = f.read()
+            with open(self._log_path(tenant, generation + 1), "wb") as f:
+                f.write(tail)
+            current = os.path.join(self._tenant_dir(tenant), "CURRENT")
+            with open(f"{current}.tmp", "w") as f:
+                f.write(str(generation + 1))
+            os.replace(f"{current}.tmp", current)
+
+        # Keep the previous generation for workers still opening it
+        shutil.rmtree(self._snapshot_path(tenant, generation - 1), ignore_errors=True)
+        if os.path.exists(self._log_path(tenant, generation - 1)):
+            os.remove(self._log_path(tenant, generation - 1))
+        legacy = self._legacy_path(tenant)
+        if legacy is not None and os.path.exists(legacy):
+            os.remove(legacy)
+
+        # Reopen from the snapshot to drop the delta and dead-row marks
+        state.index, state.generation, state.log_offset = self._open(tenant, generation + 1), generation + 1, 0
+        self._catch_up(tenant, state)
+        self.compactions += 1
+        return True
+
+    def save(self, tenant_id: Optional[str] = None) -> None:
+        """Compact one tenant's log, or every loaded tenant's non-empty log"""
+        tenants = [str(tenant_id)] if tenant_id is not None else list(self._tenants)
+        for tenant in tenants:
+            state = self._tenants.get(tenant)
+            if tenant_id is not None or (state is not None and state.log_offset):
+                self.compact(tenant)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded_tenants": len(self._tenants),
+            "vectors_loaded": sum(len(state.index) for state in self._tenants.values()),
+            "quantization": self.quantization,
+            "vector_memory_bytes": sum(state.index.memory_bytes() for state in self._tenants.values()),
+            "log_bytes": sum(state.log_offset for state in self._tenants.values()),
+            "compactions": self.compactions,
+            "searches": self.searches,
+            "average_search_seconds": self._search_time / self.searches if self.searches else 0.0,
+        }
+
+    def _write(self, tenant: str, header: Dict[str, Any], vectors: Optional[np.ndarray] = None) -> int:
+        state = self._state(tenant)
+        with state.lock:
+            with self._locked(tenant):
+                self._catch_up(tenant, state)
+                path = self._log_path(tenant, state.generation)
+                record = _encode_record(header, vectors)
+                with open(path, "ab") as f:
+                    # Bytes past what replayed cleanly are a torn record from a crashed writer
+                    if f.tell() > state.log_offset:
+                        f.truncate(state.log_offset)
+                    f.write(record)
+                state.log_offset += len(record)
+                result = _apply(state.index, header, vectors)
+            if state.log_offset >= self.compact_bytes:
+                self.compact(tenant)
+        return result
+
+    def _state(self, tenant: str) -> _TenantState:
+        with self._lock:
+            state = self._tenants.get(tenant)
+            if state is None:
+                state = _TenantState(None, -1)
+                self._tenants[tenant] = state
+                while len(self._tenants) > self.max_loaded:
+                    # Everything is in the snapshot and log already, so unloading is free
+                    self._tenants.popitem(last=False)
+            self._tenants.move_to_end(tenant)
+        with state.lock:
+            self._catch_up(tenant, state)
+        return state
+
+    def _catch_up(self, tenant: str, state: _TenantState) -> None:
+        """Switch to the live generation if it changed, then replay new log records"""
+        generation = self._current(tenant)
+        if generation != state.generation:
+            state.index, state.generation, state.log_offset = self._open(tenant, generation), generation, 0
+        path = self._log_path(tenant, state.generation)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size <= state.log_offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(state.log_offset)
+            data = f.read(size - state.log_offset)
+        for header, vectors, length in _decode_records(data):
+            _apply(state.index, header, vectors)
+            state.log_offset += length
+
+    def _open(self, tenant: str, generation: int) -> IVFIndex:
+        options = {"nprobe": self.nprobe, "quantization": self.quantization, "rerank": self.rerank}
+        if generation:
+            return IVFIndex.load(self._snapshot_path(tenant, generation), **options)
+        # Before the first compaction: a file from the single-file format, or nothing
+        legacy = self._legacy_path(tenant)
+        if legacy is not None and os.path.exists(legacy):
+            return IVFIndex.load(legacy, **options)
+        return IVFIndex(self.dim, **options)
+
+    def _current(self, tenant: str) -> int:
+        try:
+            with open(os.path.join(self._tenant_dir(tenant), "CURRENT")) as f:
+                return int(f.read())
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def _locked(self, tenant: str) -> Iterator[None]:
+        os.makedirs(self._tenant_dir(tenant), exist_ok=True)
+        with open(os.path.join(self._tenant_dir(tenant), "LOCK"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _tenant_dir(self, tenant: str) -> str:
+        # A digest, not a sanitised ID: "a.b", "a/b" and "a_b" must never share files
+        return os.path.join(self.directory, hashlib.sha256(tenant.encode("utf-8")).hexdigest()[:32])
+
+    def _snapshot_path(self, tenant: str, generation: int) -> str:
+        return os.path.join(self._tenant_dir(tenant), f"snapshot-{generation:08d}")
+
+    def _log_path(self, tenant: str, generation: int) -> str:
+        return os.path.join(self._tenant_dir(tenant), f"log-{generation:08d}.wal")
+
+    def _legacy_path(self, tenant: str) -> Optional[str]:
+        # The single-file format sanitised IDs into file names, so only IDs it left unchanged
+        # name their own file; the others may hold another tenant's vectors and are reindexed
+        if not tenant or not all(c.isalnum() or c in "-_" for c in tenant):
+            return None
+        return os.path.join(self.directory, f"{tenant}.npz")
+
+
+# Global per-tenant memory index
+memory_index = TenantVectorIndex(
+    settings.resolve_path(settings.ANN_INDEX_DIR),
+    dim=settings.VECTOR_DIMENSION,
+    nprobe=settings.ANN_NPROBE,
+    max_loaded=settings.ANN_MAX_LOADED_TENANTS,
+    quantization=settings.ANN_QUANTIZATION,
+    rerank=settings.ANN_RERANK_FACTOR,
+    compact_bytes=settings.ANN_LOG_COMPACT_BYTES,
+)
@@ -0,0 +1,369 @@
+"""
+MindMesh Context Packer
+"""
+
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from mindmesh.config.settings import settings
+from mindmesh.memory.embeddings import estimate_tokens
+
+# Section order and heading of each retrieved list in the packed context
+SOURCES = (
+    ("entities", "Entities"),
+    ("documents", "Documents"),
+    ("episodes", "Past episodes"),
+)
+
+
+class TokenCounter:
+    """
+    Token counts with the model's tokenizer (tiktoken, when installed)
+    and an LRU cache, since the same memory items are counted on every
+    run that retrieves them. Falls back to the four-characters-per-token
+    estimate.
+    """
+
+    def __init__(self, encoding: str = "cl100k_base", cache_size: int = 10000):
+        self.encoding_name = encoding
+        self.cache_size = cache_size
+        self._encoding: Any = None
+        self._loaded = False
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._prefixes: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def encoding(self) -> Any:
+        if not self._loaded:
+            self._loaded = True
+            try:
+                import tiktoken
+
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception:
+                self._encoding = None
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        encoding = self.encoding
+        tokens = len(encoding.encode(text, disallowed_special=())) if encoding is not None else estimate_tokens(text)
+        self._cache[text] = tokens
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """The longest prefix of text within max_tokens, cut at a word boundary"""
+        key = (text, max_tokens)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            prefix = self._prefixes[key] = self._truncate(text, max_tokens)
+            if len(self._prefixes) > self.cache_size:
+                self._prefixes.popitem(last=False)
+        else:
+            self._prefixes.move_to_end(key)
+        return prefix
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        encoding = self.encoding
+        if encoding is not None:
+            tokens = encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            prefix = encoding.decode(tokens[:max_tokens])
+        else:
+            if estimate_tokens(text) <= max_tokens:
+                return text
+            prefix = text[:max(0, (max_tokens - 1) * 4)]
+        space = prefix.rfind(" ")
+        return prefix[:space] if space > len(prefix) // 2 else prefix
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokenizer": self.encoding_name if self.encoding is not None else "estimate",
+            "cached_texts": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class ContextItem(NamedTuple):
+    """A retrieved memory item normalised for packing"""
+    source: str  # documents | episodes | entities
+    item_id: str
+    title: str
+    text: str
+    relevance: float
+    created_at: Optional[float]  # POSIX timestamp
+    group: str  # items sharing a group (app, thread, entity type) count against diversity
+
+
+class PackedItem(NamedTuple):
+    item: ContextItem
+    line: str  # rendered text in the packed context
+    tokens: int
+    truncated: bool
+    score: float
+
+
+class PackedContext(NamedTuple):
+    text: str
+    items: List[PackedItem]
+    tokens: int
+    budget: int
+    candidates: int
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def context_items(source: str, records: Optional[Sequence[Dict[str, Any]]]) -> List[ContextItem]:
+    """Normalise the dicts of one retrieved_* state list"""
+    items = []
+    for position, record in enumerate(records or []):
+        text = record.get("content") or record.get("text") or record.get("summary") or record.get("description") or ""
+        title = record.get("title") or record.get("name") or ""
+        if not (text or title):
+            continue
+        relevance = record.get("score", record.get("relevance", record.get("similarity")))
+        items.append(ContextItem(
+            source=source,
+            item_id=str(record.get("id") or record.get("doc_id") or f"{source}:{position}"),
+            title=str(title),
+            text=" ".join(str(text).split()),
+            # Unscored lists keep their retrieval order
+            relevance=float(relevance) if relevance is not None else 1.0 / (1 + position),
+            created_at=_timestamp(record.get("created_at") or record.get("occurred_at") or record.get("updated_at")),
+            group=f"{source}:{record.get('app') or record.get('source') or record.get('type') or ''}",
+        ))
+    return items
+
+
+class ContextPacker:
+    """
+    Picks the retrieved memory that fits a prompt's token budget.
+
+    Each item's value is its relevance (normalised within its list),
+    discounted by age with a half-life, and by diversity: every item
+    already taken from the same group multiplies the value of the next
+    one by ``diversity_decay``. The text carries that value with
+    diminishing returns, 1 - exp(-tokens / snippet_tokens), so a short
+    entity is not worth as much as a long document, and a long item can
+    enter as a ``snippet_tokens`` prefix that keeps most of its value.
+    Items are priced at the tokens of their rendered line. Selection is
+    the greedy value-per-token heuristic for knapsack, re-scoring
+    diversity after each pick and comparing with the single most
+    valuable item that fits; a final pass restores full text where
+    budget is left.
+    """
+
+    def __init__(
+        self,
+        counter: Optional[TokenCounter] = None,
+        budget: int = 2000,
+        snippet_tokens: int = 120,
+        recency_weight: float = 0.3,
+        recency_half_life_days: float = 30.0,
+        diversity_decay: float = 0.7,
+    ):
+        self.counter = counter or TokenCounter()
+        self.budget = budget
+        self.snippet_tokens = snippet_tokens
+        self.recency_weight = recency_weight
+        self.recency_half_life = recency_half_life_days * 86400
+        self.diversity_decay = diversity_decay
+
+        self.packs = 0
+        self.candidates = 0
+        self.selected = 0
+        self.tokens_packed = 0
+        self.tokens_dropped = 0
+        self._seconds = 0.0
+
+    def pack(
+        self,
+        sources: Dict[str, Optional[Sequence[Dict[str, Any]]]],
+        budget: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> PackedContext:
+        """Best subset of the retrieved lists (keyed documents/episodes/entities) within budget"""
+        start = time.perf_counter()
+        budget = self.budget if budget is None else budget
+        now = time.time() if now is None else now
+        items = [item for source, _ in SOURCES for item in context_items(source, sources.get(source))]
+
+        headers = {source: self.counter.count(f"{heading}:\n") for source, heading in SOURCES}
+        values = self._values(items, now)
+        options = [self._options(item, value) for item, value in zip(items, values)]
+        chosen = self._select(items, options, budget, headers)
+
+        # Render in section order, most valuable first within a section
+        sections = []
+        packed: List[PackedItem] = []
+        for source, heading in SOURCES:
+            lines = sorted((entry for entry in chosen if entry.item.source == source), key=lambda entry: -entry.score)
+            if lines:
+                sections.append(f"{heading}:\n" + "\n".join(entry.line for entry in lines))
+                packed.extend(lines)
+        text = "\n\n".join(sections)
+        tokens = self.counter.count(text) if text else 0
+
+        self.packs += 1
+        self.candidates += len(items)
+        self.selected += len(packed)
+        self.tokens_packed += tokens
+        self.tokens_dropped += sum(item_options[0][1] for item_options in options) - sum(entry.tokens for entry in packed)
+        self._seconds += time.perf_counter() - start
+        return PackedContext(text, packed, tokens, budget, len(items))
+
+    def _values(self, items: List[ContextItem], now: float) -> List[float]:
+        # Relevance scales differ per list (RRF, cosine, graph scores), so normalise each
+        ranges: Dict[str, Tuple[float, float]] = {}
+        for item in items:
+            low, high = ranges.get(item.source, (item.relevance, item.relevance))
+            ranges[item.source] = (min(low, item.relevance), max(high, item.relevance))
+        values = []
+        for item in items:
+            low, high = ranges[item.source]
+            relevance = (item.relevance - low) / (high - low) * 0.9 + 0.1 if high > low else 1.0
+            recency = 0.5
+            if item.created_at is not None:
+                recency = 0.5 ** (max(0.0, now - item.created_at) / self.recency_half_life)
+            values.append(relevance * (1 - self.recency_weight + self.recency_weight * recency))
+        return values
+
+    def _options(self, item: ContextItem, value: float) -> List[Tuple[str, int, float, bool]]:
+        """(line, tokens, value, truncated) for the full item and, if long, its snippet"""
+        full = self._line(item, item.text)
+        full_tokens = self.counter.count(full)
+        text_tokens = self.counter.count(item.text) if item.text else 0
+        options = [(full, full_tokens, value * self._information(text_tokens), False)]
+        if text_tokens > self.snippet_tokens:
+            snippet = self.counter.truncate(item.text, self.snippet_tokens)
+            line = self._line(item, snippet + "…")
+            tokens = self.counter.count(line)
+            if tokens < full_tokens:
+                options.append((line, tokens, value * self._information(self.counter.count(snippet)), True))
+        return options
+
+    def _information(self, tokens: int) -> float:
+        """Share of an item's value carried by its first ``tokens`` tokens of text"""
+        return 1.0 - math.exp(-max(tokens, 1) / self.snippet_tokens)
+
+    @staticmethod
+    def _line(item: ContextItem, text: str) -> str:
+        label = item.title
+        if item.created_at is not None:
+            label = f"{label} ({datetime.fromtimestamp(item.created_at, timezone.utc):%Y-%m-%d})".strip()
+        if label and text:
+            return f"- [{item.item_id}] {label}: {text}"
+        return f"- [{item.item_id}] {label or text}"
+
+    def _select(
+        self,
+        items: List[ContextItem],
+        options: List[List[Tuple[str, int, float, bool]]],
+        budget: int,
+        headers: Dict[str, int],
+    ) -> List[PackedItem]:
+        remaining = budget
+        taken: Dict[int, int] = {}  # item -> option
+        per_group: Dict[str, int] = {}
+        sections: set = set()
+
+        def cost(index: int, option: int) -> int:
+            # A section's heading is paid by its first item; +1 for the joining newline
+            return options[index][option][1] + 1 + (0 if items[index].source in sections else headers[items[index].source] + 1)
+
+        def gain(index: int, option: int) -> float:
+            return options[index][option][2] * self.diversity_decay ** per_group.get(items[index].group, 0)
+
+        # Greedy by value per token, re-scoring after each pick (a few hundred options at most)
+        while True:
+            best = None
+            for index, item_options in enumerate(options):
+                if index in taken:
+                    continue
+                for option in range(len(item_options)):
+                    price = cost(index, option)
+                    if price <= remaining:
+                        density = gain(index, option) / price
+                        if best is None or density > best[0]:
+                            best = (density, index, option)
+            if best is None:
+                break
+            _, index, option = best
+            remaining -= cost(index, option)
+            taken[index] = option
+            per_group[items[index].group] = per_group.get(items[index].group, 0) + 1
+            sections.add(items[index].source)
+
+        # Knapsack greedy can lose to one large valuable item; keep whichever is better
+        total = sum(options[i][o][2] for i, o in taken.items())
+        fits = [
+            (options[i][o][2], i, o) for i in range(len(items)) for o in range(len(options[i]))
+            if options[i][o][1] + headers[items[i].source] + 2 <= budget
+        ]
+        if fits:
+            best_value, best_index, best_option = max(fits)
+            if best_value > total:
+                taken = {best_index: best_option}
+                remaining = budget - options[best_index][best_option][1] - headers[items[best_index].source] - 2
+
+        # Upgrade snippets to full text, most valuable first, while budget remains
+        for index in sorted(taken, key=lambda i: -options[i][0][2]):
+            if taken[index] and options[index][0][1] - options[index][taken[index]][1] <= remaining:
+                remaining -= options[index][0][1] - options[index][taken[index]][1]
+                taken[index] = 0
+
+        return [
+            PackedItem(items[i], options[i][o][0], options[i][o][1], options[i][o][3], options[i][o][2])
+            for i, o in taken.items()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "packs": self.packs,
+            "candidates": self.candidates,
+            "selected": self.selected,
+            "tokens_packed": self.tokens_packed,
+            "tokens_dropped": self.tokens_dropped,
+            "average_pack_seconds": self._seconds / self.packs if self.packs else 0.0,
+            "tokenizer": self.counter.stats(),
+        }
+
+
+# Global context packer instance
+context_packer = ContextPacker(
+    TokenCounter(settings.CONTEXT_TOKENIZER, settings.CONTEXT_TOKEN_CACHE_SIZE),
+    budget=settings.CONTEXT_MAX_TOKENS,
+    snippet_tokens=settings.CONTEXT_SNIPPET_TOKENS,
+    recency_weight=settings.CONTEXT_RECENCY_WEIGHT,
+    recency_half_life_days=settings.CONTEXT_RECENCY_HALF_LIFE_DAYS,
+    diversity_decay=settings.CONTEXT_DIVERSITY_DECAY,
+)
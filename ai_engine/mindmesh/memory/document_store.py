@@ -0,0 +1,89 @@
+"""
+MindMesh Memory Document Store
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from mindmesh.config.settings import settings
+
+
+class MemoryDocumentStore:
+    """
+    Text fields and metadata of indexed memory items, per tenant, in
+    SQLite. The search indexes only keep postings and vectors; a search
+    hit is turned back into the record a prompt can use from here.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS memory_documents (
+        tenant_id TEXT NOT NULL,
+        doc_id TEXT NOT NULL,
+        fields TEXT NOT NULL,
+        metadata TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (tenant_id, doc_id)
+    );
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Connected when first read or written, under the caller's lock
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def put(self, tenant_id: str, doc_id: str, fields: Dict[str, str], metadata: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO memory_documents VALUES (?, ?, ?, ?, ?)",
+                (str(tenant_id), doc_id, json.dumps(fields), json.dumps(metadata or {}, default=str), time.time()),
+            )
+
+    def delete(self, tenant_id: str, doc_ids: Sequence[str]) -> int:
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM memory_documents WHERE tenant_id = ? AND doc_id = ?",
+                [(str(tenant_id), doc_id) for doc_id in doc_ids],
+            )
+        return cursor.rowcount
+
+    def get_many(self, tenant_id: str, doc_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Fields and metadata of the items that exist, keyed by doc_id"""
+        if not doc_ids:
+            return {}
+        placeholders = ", ".join("?" * len(doc_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT doc_id, fields, metadata FROM memory_documents "
+                f"WHERE tenant_id = ? AND doc_id IN ({placeholders})",
+                (str(tenant_id), *doc_ids),
+            ).fetchall()
+        return {doc_id: {"fields": json.loads(fields), "metadata": json.loads(metadata)} for doc_id, fields, metadata in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory_documents").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global memory document store instance
+memory_documents = MemoryDocumentStore(settings.resolve_path(settings.MEMORY_DOCUMENT_STORE_PATH))
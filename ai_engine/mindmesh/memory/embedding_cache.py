@@ -0,0 +1,128 @@
+"""
+MindMesh Embedding Cache
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, content_hash)
+) WITHOUT ROWID;
+"""
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    """
+    Content-hash to vector cache: a bounded in-memory LRU in front of an
+    optional SQLite file, so vectors survive restarts and are shared by
+    every ingestion of identical content. Keys include the model, since
+    vectors from different models are not interchangeable.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 10000):
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        # Opened on first use (callers hold the lock), so importing the
+        # module's global instance creates no file
+        if self._db is None and self.path:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for whichever of the hashes are known"""
+        found: Dict[str, np.ndarray] = {}
+        missing = []
+        with self._lock:
+            for content_hash in hashes:
+                vector = self._memory.get((model, content_hash))
+                if vector is None:
+                    missing.append(content_hash)
+                else:
+                    self._memory.move_to_end((model, content_hash))
+                    found[content_hash] = vector
+            self.memory_hits += len(found)
+
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), _LOOKUP_CHUNK):
+                    chunk = missing[start:start + _LOOKUP_CHUNK]
+                    rows = self._conn.execute(
+                        f"SELECT content_hash, vector FROM embedding_cache "
+                        f"WHERE model = ? AND content_hash IN ({','.join('?' * len(chunk))})",
+                        (model, *chunk),
+                    ).fetchall()
+                    for content_hash, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[content_hash] = vector
+                        self._remember(model, content_hash, vector)
+                        self.disk_hits += 1
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        """Store vectors by content hash"""
+        if not vectors:
+            return
+        with self._lock:
+            for content_hash, vector in vectors.items():
+                self._remember(model, content_hash, vector)
+            if self._conn is not None:
+                now = time.time()
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (model, content_hash, vector, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (model, content_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                        for content_hash, vector in vectors.items()
+                    ],
+                )
+                self._conn.execute("COMMIT")
+
+    def _remember(self, model: str, content_hash: str, vector: np.ndarray) -> None:
+        self._memory[(model, content_hash)] = vector
+        self._memory.move_to_end((model, content_hash))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,279 @@
+"""
+MindMesh Embedding Pipeline
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from mindmesh.caching.single_flight import SingleFlight, embedding_flights
+from mindmesh.config.settings import settings
+from mindmesh.memory.embedding_cache import EmbeddingCache
+from mindmesh.memory.embeddings import EmbeddingBackend, create_embedding_backend, estimate_tokens
+
+
+def content_hash(text: str) -> str:
+    """Content hash in the memory API's ``sha256:<hex>`` format"""
+    return "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingResult(NamedTuple):
+    """Outcome of ingesting one piece of content"""
+    content_hash: str
+    vector: Optional[np.ndarray]  # None when skipped
+    source: str  # indexed | cache | embedded
+
+
+class _Pending(NamedTuple):
+    content_hash: str
+    text: str
+    future: "asyncio.Future[np.ndarray]"
+
+
+class EmbeddingPipeline:
+    """
+    Embeds content through size- and time-bounded micro-batches.
+
+    Every text is addressed by its content hash. Hashes already stored in
+    the vector cache are answered from it, concurrent requests for the same
+    hash share one embedding, and the remaining texts are queued and sent
+    to the backend in batches. A batch is sent when it reaches
+    ``max_batch_size`` texts or ``max_batch_tokens`` estimated tokens, or
+    ``max_wait`` seconds after its first text arrived, whichever comes
+    first. At most ``max_concurrent_batches`` batches are in flight.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        cache: EmbeddingCache,
+        max_batch_size: int = 128,
+        max_batch_tokens: int = 100000,
+        max_wait: float = 0.02,
+        max_concurrent_batches: int = 4,
+        cost_per_1k_tokens: float = 0.0,
+        flights: Optional[SingleFlight] = None,
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait
+        self.max_concurrent_batches = max_concurrent_batches
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.flights = flights or embedding_flights
+
+        self._pending: List[_Pending] = []
+        self._pending_tokens = 0
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._batches: Set[asyncio.Task] = set()
+
+        self.requested = 0
+        self.skipped_indexed = 0
+        self.cache_hits = 0
+        self.embedded = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.failed_cache_writes = 0
+        self.tokens_embedded = 0
+        self.tokens_saved = 0
+        self._backend_time = 0.0
+
+    async def embed(self, text: str, hash_: Optional[str] = None) -> np.ndarray:
+        """Embed one text"""
+        return (await self.embed_many([text], [hash_] if hash_ else None))[0]
+
+    async def embed_many(
+        self,
+        texts: Sequence[str],
+        hashes: Optional[Sequence[str]] = None,
+    ) -> List[np.ndarray]:
+        """Embed texts, returning vectors in input order"""
+        results = await self.ingest(list(zip(texts, hashes or [None] * len(texts))))
+        return [result.vector for result in results]
+
+    async def ingest(
+        self,
+        items: Sequence[Tuple[str, Optional[str]]],
+        indexed: Optional[Callable[[Sequence[str]], Awaitable[Set[str]]]] = None,
+    ) -> List[EmbeddingResult]:
+        """
+        Embed (text, content_hash) pairs for indexing. Hashes ``indexed``
+        reports as already in the index are skipped without embedding.
+
+        Hashes are always computed here: cached vectors are shared by every
+        tenant, so a caller-supplied hash is only checked against the text,
+        and a mismatch raises ValueError before anything is looked up.
+        """
+        hashes = []
+        for text, supplied in items:
+            hash_ = content_hash(text)
+            if supplied is not None and supplied != hash_:
+                raise ValueError(f"Content hash {supplied} does not match its text ({hash_})")
+            hashes.append(hash_)
+        texts = dict(zip(hashes, (text for text, _ in items)))
+        self.requested += len(hashes)
+
+        skip: Set[str] = set()
+        if indexed is not None and texts:
+            skip = set(await indexed(list(texts)))
+
+        wanted = [hash_ for hash_ in texts if hash_ not in skip]
+        vectors: Dict[str, np.ndarray] = {}
+        if wanted:
+            vectors = await asyncio.to_thread(self.cache.get_many, self.backend.model, wanted)
+
+        sources = {hash_: "indexed" for hash_ in skip}
+        sources.update({hash_: "cache" for hash_ in vectors})
+        missing = [hash_ for hash_ in wanted if hash_ not in vectors]
+        sent_tokens = 0
+        if missing:
+            embedded = await asyncio.gather(*(
+                self.flights.do(
+                    (self.backend.model, hash_),
+                    lambda hash_=hash_: self._enqueue(hash_, texts[hash_]),
+                )
+                for hash_ in missing
+            ))
+            for hash_, (vector, shared) in zip(missing, embedded):
+                vectors[hash_] = vector
+                sources[hash_] = "embedded"
+                if not shared:
+                    sent_tokens += estimate_tokens(texts[hash_])
+
+        for hash_ in hashes:
+            if sources[hash_] == "indexed":
+                self.skipped_indexed += 1
+            elif sources[hash_] == "cache":
+                self.cache_hits += 1
+        # Everything not sent upstream by this call was saved: indexed and
+        # cached content, duplicates within the call and coalesced requests
+        self.tokens_saved += sum(estimate_tokens(texts[hash_]) for hash_ in hashes) - sent_tokens
+
+        return [EmbeddingResult(hash_, vectors.get(hash_), sources[hash_]) for hash_ in hashes]
+
+    async def flush(self) -> None:
+        """Send whatever is queued now and wait for every in-flight batch"""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*list(self._batches), return_exceptions=True)
+
+    async def _enqueue(self, hash_: str, text: str) -> np.ndarray:
+        """Queue a text for the next batch and wait for its vector"""
+        tokens = estimate_tokens(text)
+        if self._pending and self._pending_tokens + tokens > self.max_batch_tokens:
+            self._flush()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Pending(hash_, text, future))
+        self._pending_tokens += tokens
+
+        if len(self._pending) >= self.max_batch_size or self._pending_tokens >= self.max_batch_tokens:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the queued texts to a batch task"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[_Pending]) -> None:
+        """Embed a batch, resolve the waiters and cache the vectors"""
+        if self._batch_slots is None:
+            self._batch_slots = asyncio.Semaphore(self.max_concurrent_batches)
+
+        error: Optional[BaseException] = None
+        try:
+            async with self._batch_slots:
+                # Waiters that gave up while queued don't need their text embedded
+                wanted = [item for item in batch if not item.future.done()]
+                if not wanted:
+                    return
+
+                start = time.perf_counter()
+                try:
+                    vectors = await self.backend.embed_batch([item.text for item in wanted])
+                finally:
+                    self._backend_time += time.perf_counter() - start
+                if len(vectors) != len(wanted):
+                    raise ValueError(f"Embedding backend returned {len(vectors)} vectors for {len(wanted)} texts")
+
+                self.batches += 1
+                self.embedded += len(wanted)
+                self.tokens_embedded += sum(estimate_tokens(item.text) for item in wanted)
+                for item, vector in zip(wanted, vectors):
+                    if not item.future.done():
+                        item.future.set_result(vector)
+
+                try:
+                    await asyncio.to_thread(
+                        self.cache.put_many,
+                        self.backend.model,
+                        {item.content_hash: vector for item, vector in zip(wanted, vectors)},
+                    )
+                except Exception:
+                    # The waiters have their vectors; only later requests miss the cache
+                    self.failed_cache_writes += 1
+        except Exception as e:
+            self.failed_batches += 1
+            error = e
+        finally:
+            # Every waiter (and every single-flight follower behind it) gets an outcome, whatever went wrong
+            for item in batch:
+                if not item.future.done():
+                    if error is not None:
+                        item.future.set_exception(error)
+                    else:
+                        item.future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching, dedup and cost metrics"""
+        return {
+            "model": self.backend.model,
+            "requested": self.requested,
+            "skipped_indexed": self.skipped_indexed,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.flights.coalesced,
+            "embedded": self.embedded,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "failed_cache_writes": self.failed_cache_writes,
+            "average_batch_size": self.embedded / self.batches if self.batches else 0.0,
+            "queued": len(self._pending),
+            "tokens_embedded": self.tokens_embedded,
+            "tokens_saved": self.tokens_saved,
+            "cost": self.tokens_embedded * self.cost_per_1k_tokens / 1000,
+            "cost_saved": self.tokens_saved * self.cost_per_1k_tokens / 1000,
+            "backend_seconds": self._backend_time,
+            "cache": self.cache.stats(),
+        }
+
+
+# Global embedding pipeline instance
+embedding_pipeline = EmbeddingPipeline(
+    create_embedding_backend(),
+    EmbeddingCache(
+        settings.EMBEDDING_CACHE_PATH and settings.resolve_path(settings.EMBEDDING_CACHE_PATH),
+        settings.EMBEDDING_CACHE_MEMORY_SIZE,
+    ),
+    max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+    max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+    max_wait=settings.EMBEDDING_BATCH_WAIT_MS / 1000,
+    max_concurrent_batches=settings.EMBEDDING_MAX_CONCURRENT_BATCHES,
+    cost_per_1k_tokens=settings.EMBEDDING_COST_PER_1K_TOKENS,
+)
@@ -0,0 +1,90 @@
+"""
+MindMesh Embedding Backends
+"""
+
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def hashed_ngram_embedding(text: str, dim: int = 1024) -> np.ndarray:
+    """Unit vector of hashed word and character 3-grams; cheap, local and deterministic"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in _TOKEN_RE.findall(text.lower()):
+        vector[zlib.crc32(f"w:{word}".encode()) % dim] += 1.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(f"c:{padded[i:i + 3]}".encode()) % dim] += 0.5
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English)"""
+    return len(text) // 4 + 1
+
+
+class EmbeddingBackend(ABC):
+    """Provider that turns a batch of texts into vectors"""
+
+    model: str
+    dimension: int
+
+    @abstractmethod
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """Embed texts, returning one float32 vector per text in order"""
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """OpenAI embeddings API"""
+
+    def __init__(self, model: str, dimension: int, api_key: Optional[str] = None):
+        self.model = model
+        self.dimension = dimension
+        self.api_key = api_key
+        self._client = None
+
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self.api_key)
+        response = await self._client.embeddings.create(model=self.model, input=list(texts))
+        data = sorted(response.data, key=lambda item: item.index)
+        return [np.asarray(item.embedding, dtype=np.float32) for item in data]
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local embeddings from hashed n-grams. Used for tests,
+    benchmarks and offline development; similar texts get similar vectors.
+    """
+
+    def __init__(self, dimension: int = 1536, model: str = "hashing-ngram-v1"):
+        self.model = model
+        self.dimension = dimension
+        self.calls = 0
+        self.texts_embedded = 0
+
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        self.calls += 1
+        self.texts_embedded += len(texts)
+        return [hashed_ngram_embedding(text, self.dimension) for text in texts]
+
+
+def create_embedding_backend(backend: Optional[str] = None) -> EmbeddingBackend:
+    """Create the configured embedding backend"""
+    backend = backend or settings.EMBEDDING_BACKEND
+
+    if backend == "openai":
+        return OpenAIEmbeddingBackend(settings.EMBEDDING_MODEL, settings.VECTOR_DIMENSION, settings.OPENAI_API_KEY)
+    if backend == "hashing":
+        return HashingEmbeddingBackend(settings.VECTOR_DIMENSION)
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -0,0 +1,235 @@
+"""
+MindMesh Hybrid Memory Search
+"""
+
+import asyncio
+import html
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+from mindmesh.memory.ann_index import TenantVectorIndex, memory_index
+from mindmesh.memory.document_store import MemoryDocumentStore, memory_documents
+from mindmesh.memory.embedding_pipeline import EmbeddingPipeline, embedding_pipeline
+from mindmesh.memory.lexical_index import TenantLexicalIndex, lexical_index
+
+SEARCH_MODES = ("hybrid", "lexical", "vector")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists: each list contributes weight / (k + rank) to the
+    IDs it contains. Only ranks matter, so BM25 and cosine scores need no
+    calibration against each other.
+    """
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights or [1.0] * len(rankings)):
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def render_highlights(
+    text: str,
+    spans: Sequence[Tuple[int, int]],
+    context: int = 60,
+    max_snippets: int = 3,
+) -> List[str]:
+    """Snippets around highlight spans with matches wrapped in <em>"""
+    snippets: List[str] = []
+    i = 0
+    while i < len(spans) and len(snippets) < max_snippets:
+        start = max(0, spans[i][0] - context)
+        end = min(len(text), spans[i][1] + context)
+        # Pull following spans that fall inside this snippet into it
+        j = i
+        while j + 1 < len(spans) and spans[j + 1][1] <= end:
+            j += 1
+        parts = ["..." if start else ""]
+        cursor = start
+        for span_start, span_end in spans[i:j + 1]:
+            parts.append(html.escape(text[cursor:span_start], quote=False))
+            parts.append(f"<em>{html.escape(text[span_start:span_end], quote=False)}</em>")
+            cursor = span_end
+        parts.append(html.escape(text[cursor:end], quote=False))
+        parts.append("..." if end < len(text) else "")
+        snippets.append("".join(parts))
+        i = j + 1
+    return snippets
+
+
+class SearchHit(NamedTuple):
+    """One fused search result"""
+    doc_id: str
+    score: float  # reciprocal-rank fusion score
+    lexical_score: Optional[float]  # BM25, None when not a lexical match
+    vector_score: Optional[float]  # cosine similarity, None when not retrieved
+    highlights: Dict[str, List[Tuple[int, int]]]  # field -> character spans
+
+
+class HybridMemorySearch:
+    """
+    Memory search over a tenant's documents, episodes and entities.
+
+    The BM25 index finds exact names, ticket numbers and addresses that
+    embeddings blur; the ANN index finds paraphrases. Each returns its top
+    ``candidates`` and the lists are fused by reciprocal rank. Highlights
+    for every hit come from the lexical postings, including hits that
+    only the vector side retrieved. Index reads and writes run in worker
+    threads, so scoring a large tenant never stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        lexical: TenantLexicalIndex,
+        vectors: TenantVectorIndex,
+        pipeline: EmbeddingPipeline,
+        rrf_k: int = 60,
+        candidates: int = 50,
+        documents: Optional[MemoryDocumentStore] = None,
+    ):
+        self.lexical = lexical
+        self.vectors = vectors
+        self.pipeline = pipeline
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.documents = documents
+
+    async def index(
+        self,
+        tenant_id: str,
+        doc_id: str,
+        fields: Dict[str, str],
+        metadata: Optional[Dict[str, Any]] = None,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        """Add or replace an item in both indexes, embedding it if no vector is given"""
+        if vector is None:
+            vector = await self.pipeline.embed("\n".join(text for text in fields.values() if text))
+        # May retrain the tenant's quantizer or compact its log: keep it off the event loop
+        await asyncio.to_thread(self._index, tenant_id, doc_id, fields, metadata, np.asarray(vector))
+
+    def _index(
+        self,
+        tenant_id: str,
+        doc_id: str,
+        fields: Dict[str, str],
+        metadata: Optional[Dict[str, Any]],
+        vector: np.ndarray,
+    ) -> None:
+        self.lexical.upsert(tenant_id, doc_id, fields, metadata)
+        self.vectors.upsert(tenant_id, [doc_id], vector[None, :], [metadata or {}])
+        if self.documents is not None:
+            self.documents.put(tenant_id, doc_id, fields, metadata)
+
+    async def delete(self, tenant_id: str, doc_ids: Sequence[str]) -> int:
+        """Remove items from both indexes"""
+        return await asyncio.to_thread(self._delete, tenant_id, list(doc_ids))
+
+    def _delete(self, tenant_id: str, doc_ids: List[str]) -> int:
+        removed = self.lexical.delete(tenant_id, doc_ids)
+        self.vectors.delete(tenant_id, doc_ids)
+        if self.documents is not None:
+            self.documents.delete(tenant_id, doc_ids)
+        return removed
+
+    async def search(
+        self,
+        tenant_id: str,
+        query: str,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "hybrid",
+    ) -> List[SearchHit]:
+        """Best k items for a query; ``mode`` restricts retrieval to one side"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        query_vector = await self.pipeline.embed(query) if mode != "lexical" else None
+        # BM25 scoring, the ANN probe (which waits for the tenant's lock while
+        # a write retrains or compacts), fusion and highlighting all run in a thread
+        return await asyncio.to_thread(self._search, tenant_id, query, query_vector, k, filters, mode != "vector")
+
+    def _search(
+        self,
+        tenant_id: str,
+        query: str,
+        query_vector: Optional[np.ndarray],
+        k: int,
+        filters: Optional[Dict[str, Any]],
+        lexical: bool = True,
+    ) -> List[SearchHit]:
+        depth = max(k, self.candidates)
+        lexical_hits: List[Tuple[str, float]] = []
+        vector_hits: List[Tuple[str, float]] = []
+        if lexical:
+            lexical_hits = self.lexical.search(tenant_id, query, depth, filters)
+        if query_vector is not None:
+            vector_hits = self.vectors.search(tenant_id, query_vector, depth, filters)
+
+        lexical_scores = dict(lexical_hits)
+        vector_scores = dict(vector_hits)
+        fused = reciprocal_rank_fusion(
+            [[doc_id for doc_id, _ in lexical_hits], [doc_id for doc_id, _ in vector_hits]],
+            k=self.rrf_k,
+        )[:k]
+        highlights = self.lexical.highlights(tenant_id, [doc_id for doc_id, _ in fused], query)
+        return [
+            SearchHit(doc_id, score, lexical_scores.get(doc_id), vector_scores.get(doc_id), spans)
+            for (doc_id, score), spans in zip(fused, highlights)
+        ]
+
+    async def retrieve(
+        self,
+        tenant_id: str,
+        query: str,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Best k items as records (stored fields and metadata, score, rendered highlights)"""
+        hits = await self.search(tenant_id, query, k, filters)
+        stored: Dict[str, Dict[str, Any]] = {}
+        if self.documents is not None and hits:
+            stored = await asyncio.to_thread(self.documents.get_many, tenant_id, [hit.doc_id for hit in hits])
+
+        records = []
+        for hit in hits:
+            item = stored.get(hit.doc_id)
+            if self.documents is not None and item is None:
+                # Indexed before its text was stored, or deleted meanwhile
+                continue
+            fields = item["fields"] if item else {}
+            records.append({
+                **(item["metadata"] if item else {}),
+                "id": hit.doc_id,
+                "title": fields.get("title", ""),
+                "content": fields.get("content") or "\n".join(text for text in fields.values() if text),
+                "score": hit.score,
+                "highlights": {
+                    field: render_highlights(fields.get(field, ""), spans)
+                    for field, spans in hit.highlights.items() if fields.get(field)
+                },
+            })
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lexical": self.lexical.stats(),
+            "vector": self.vectors.stats(),
+            "documents": self.documents.count() if self.documents is not None else None,
+        }
+
+
+# Global hybrid memory search instance
+memory_search = HybridMemorySearch(
+    lexical_index,
+    memory_index,
+    embedding_pipeline,
+    rrf_k=settings.HYBRID_RRF_K,
+    candidates=settings.HYBRID_CANDIDATES,
+    documents=memory_documents,
+)
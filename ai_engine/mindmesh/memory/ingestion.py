@@ -0,0 +1,561 @@
+"""
+MindMesh Streaming Ingestion Pipeline
+"""
+
+import asyncio
+import codecs
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import deque
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional,
+    Tuple, Union,
+)
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+from mindmesh.memory.embedding_pipeline import EmbeddingPipeline, embedding_pipeline
+from mindmesh.memory.hybrid_search import memory_search
+
+# Text content, a file path, a binary or text file object, or an async
+# stream of str/bytes blocks (e.g. a connector download)
+Source = Union[str, bytes, os.PathLike, Any, AsyncIterable[Union[str, bytes]]]
+
+_DONE = object()
+
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n[ \t]*\n(?:[ \t]*\n)+")
+
+# Sensitive values removed before text is chunked, embedded or indexed.
+# Email addresses are kept: they are how people search their memory.
+PII_PATTERNS = {
+    "card": r"(?<!\d)(?:\d{4}[ -]?){3}\d{1,7}(?!\d)|(?<!\d)\d{4}[ -]?\d{6}[ -]?\d{5}(?!\d)",
+    "ssn": r"(?<!\d)\d{3}-\d{2}-\d{4}(?!\d)",
+    "iban": r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){3,7}(?: ?[A-Z0-9]{1,3})?\b",
+}
+
+
+class Chunk(NamedTuple):
+    """A window of a document's normalized, redacted text"""
+    index: int
+    start: int  # character offsets into the normalized text
+    end: int
+    text: str
+
+
+class IngestionResult(NamedTuple):
+    doc_id: str
+    chunks: int  # chunks in the document
+    written: int  # chunks embedded and written by this run
+    resumed_from: int  # first chunk this run wrote
+    seconds: float
+
+
+class TextNormalizer:
+    """
+    Incremental text normalization: NFKC, newline and control-character
+    cleanup, runs of spaces collapsed to one and blank-line runs to one
+    blank line. Feeding text in any split yields the same output as
+    normalizing it whole, because the end of each block that might still
+    combine with the next one is held back.
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        text = self._pending + text
+        # Hold back trailing whitespace (it may merge with what follows) and
+        # the last base character with its combining marks (more may follow)
+        keep = len(text.rstrip())
+        while keep and unicodedata.combining(text[keep - 1]):
+            keep -= 1
+        keep = max(0, keep - 1)
+        self._pending = text[keep:]
+        return self._normalize(text[:keep])
+
+    def finish(self) -> str:
+        text, self._pending = self._pending, ""
+        return self._normalize(text)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        text = unicodedata.normalize("NFKC", text.replace("\r\n", "\n").replace("\r", "\n"))
+        text = _CONTROL_RE.sub("", text)
+        text = _SPACES_RE.sub(" ", text)
+        return _BLANK_LINES_RE.sub("\n\n", text)
+
+
+class StreamingRedactor:
+    """
+    Replaces PII matches in a text stream. The last ``holdback`` characters
+    are kept back until more text arrives, so a value split across blocks
+    is still caught; no pattern may match more than ``holdback`` characters.
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, str]] = None, holdback: int = 64):
+        patterns = patterns if patterns is not None else PII_PATTERNS
+        self.pattern = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in patterns.items())) if patterns else None
+        self.holdback = holdback
+        self._buffer = ""
+        self.redacted: Dict[str, int] = {}
+
+    def feed(self, text: str) -> str:
+        self._buffer += text
+        return self._emit(len(self._buffer) - self.holdback)
+
+    def finish(self) -> str:
+        return self._emit(len(self._buffer))
+
+    def _emit(self, cut: int) -> str:
+        if cut <= 0:
+            return ""
+        if self.pattern is None:
+            out, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            return out
+
+        parts: List[str] = []
+        last = 0
+        for match in self.pattern.finditer(self._buffer):
+            if match.end() > cut:
+                # Might grow with the next block; decide once it has arrived
+                if match.start() < cut:
+                    cut = match.start()
+                break
+            parts.append(self._buffer[last:match.start()])
+            parts.append(self._replace(match))
+            last = match.end()
+        parts.append(self._buffer[last:cut])
+        self._buffer = self._buffer[cut:]
+        return "".join(parts)
+
+    def _replace(self, match: "re.Match") -> str:
+        kind = match.lastgroup
+        if kind == "card" and not _luhn_valid(re.sub(r"\D", "", match.group())):
+            return match.group()
+        self.redacted[kind] = self.redacted.get(kind, 0) + 1
+        return f"[REDACTED:{kind}]"
+
+
+def _luhn_valid(digits: str) -> bool:
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        value = int(digit) * (2 if i % 2 else 1)
+        total += value - 9 if value > 9 else value
+    return total % 10 == 0
+
+
+class StreamingChunker:
+    """
+    Splits a text stream into overlapping chunks of at most ``chunk_size``
+    characters, preferring to end on a paragraph, sentence or word
+    boundary in the last fifth of the window. Boundaries depend only on the
+    text, never on how it was split into blocks, so chunk N of a document
+    is the same on every run, which is what makes resuming possible.
+    """
+
+    def __init__(self, chunk_size: int = 2000, overlap: int = 200):
+        if not 0 <= overlap < chunk_size // 2:
+            raise ValueError("overlap must be smaller than half the chunk size")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._buffer = ""
+        self._offset = 0
+        self._index = 0
+        self._carried = 0  # overlap already emitted with the previous chunk
+
+    def feed(self, text: str) -> List[Chunk]:
+        self._buffer += text
+        chunks = []
+        while len(self._buffer) > self.chunk_size:
+            chunks.append(self._cut(self._boundary()))
+        return chunks
+
+    def finish(self) -> List[Chunk]:
+        chunks = self.feed("")
+        if len(self._buffer) > self._carried and self._buffer[self._carried:].strip():
+            chunks.append(self._cut(len(self._buffer), last=True))
+        return chunks
+
+    def _boundary(self) -> int:
+        window = self._buffer[:self.chunk_size]
+        floor = self.chunk_size * 4 // 5
+        for separator in ("\n\n", "\n", ". ", " "):
+            position = window.rfind(separator, floor)
+            if position != -1:
+                return position + len(separator)
+        return self.chunk_size
+
+    def _cut(self, end: int, last: bool = False) -> Chunk:
+        chunk = Chunk(self._index, self._offset, self._offset + end, self._buffer[:end])
+        self._index += 1
+        if last:
+            self._buffer = ""
+            return chunk
+        # Start the next chunk ``overlap`` characters back, at a word start
+        start = end - self.overlap
+        if self.overlap:
+            space = self._buffer.find(" ", start, end)
+            start = space + 1 if space != -1 else start
+        self._buffer = self._buffer[start:]
+        self._offset += start
+        self._carried = end - start
+        return chunk
+
+
+class IngestionProgress(NamedTuple):
+    version: Optional[str]
+    next_chunk: int
+    completed: bool
+    chunk_count: int  # chunks written by the last completed ingestion
+
+
+class IngestionProgressStore:
+    """
+    Per-document ingestion progress in SQLite: the source version being
+    ingested, the next chunk to write, and how many chunks the last
+    completed ingestion wrote (to remove leftovers when a new version is
+    shorter).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ingestion_progress (
+        doc_id TEXT PRIMARY KEY,
+        version TEXT,
+        next_chunk INTEGER NOT NULL,
+        completed INTEGER NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened by the first ingestion (callers hold the lock), not on import
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def get(self, doc_id: str) -> Optional[IngestionProgress]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, next_chunk, completed, chunk_count FROM ingestion_progress WHERE doc_id = ?",
+                (doc_id,),
+            ).fetchone()
+        return IngestionProgress(row[0], row[1], bool(row[2]), row[3]) if row else None
+
+    def advance(self, doc_id: str, version: Optional[str], next_chunk: int) -> None:
+        """Record chunks written so far by an ingestion in progress"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO ingestion_progress VALUES (?, ?, ?, 0, 0, ?)
+                ON CONFLICT (doc_id) DO UPDATE SET
+                    version = excluded.version,
+                    next_chunk = excluded.next_chunk,
+                    completed = 0,
+                    updated_at = excluded.updated_at
+                """,
+                (doc_id, version, next_chunk, time.time()),
+            )
+
+    def complete(self, doc_id: str, version: Optional[str], chunk_count: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingestion_progress VALUES (?, ?, ?, 1, ?, ?)",
+                (doc_id, version, chunk_count, chunk_count, time.time()),
+            )
+
+
+Writer = Callable[[str, List[Tuple[Chunk, np.ndarray]], Dict[str, Any]], Awaitable[None]]
+Remover = Callable[[str, range, Dict[str, Any]], Awaitable[None]]
+
+
+class IngestionPipeline:
+    """
+    Streams a document through read -> normalize -> redact -> chunk ->
+    embed -> write. Each stage is a task connected to the next by a
+    bounded queue, so stages overlap and at most ``queue_size`` items wait
+    between any two of them: peak memory depends on the block and chunk
+    sizes, not on the document.
+
+    Progress is recorded after every written batch. An interrupted
+    ingestion resumes at the first unwritten chunk when it is run again
+    with the same source version; earlier chunks are re-read and re-chunked
+    (to find the boundaries) but not embedded or written again.
+
+    Redaction runs on the stream before chunking rather than per chunk,
+    so a value can never be split across two overlapping chunks and leak
+    half of itself into one of them.
+    """
+
+    def __init__(
+        self,
+        writer: Writer,
+        remover: Optional[Remover] = None,
+        embedder: Optional[EmbeddingPipeline] = None,
+        progress: Optional[IngestionProgressStore] = None,
+        block_size: int = 65536,
+        chunk_size: int = 2000,
+        chunk_overlap: int = 200,
+        queue_size: int = 8,
+        embed_batch_size: int = 32,
+        embed_concurrency: int = 4,
+        redact: bool = True,
+    ):
+        self.writer = writer
+        self.remover = remover
+        self.embedder = embedder or embedding_pipeline
+        self.progress = progress or IngestionProgressStore()
+        self.block_size = block_size
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.queue_size = queue_size
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.redact = redact
+
+        self.documents = 0
+        self.unchanged = 0
+        self.resumed = 0
+        self.chunks_written = 0
+        self.chunks_skipped = 0
+        self.redactions: Dict[str, int] = {}
+
+    async def ingest(
+        self,
+        doc_id: str,
+        source: Source,
+        version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        start_chunk: Optional[int] = None,
+    ) -> IngestionResult:
+        """
+        Ingest one document. ``version`` (a content hash, etag or modified
+        time) identifies the source; progress recorded for another version
+        is discarded. ``start_chunk`` overrides the recorded resume point.
+        """
+        started = time.perf_counter()
+        metadata = dict(metadata or {})
+        recorded = await asyncio.to_thread(self.progress.get, doc_id)
+        same_version = recorded is not None and version is not None and recorded.version == version
+        if start_chunk is None:
+            if same_version and recorded.completed:
+                self.unchanged += 1
+                return IngestionResult(doc_id, recorded.chunk_count, 0, recorded.chunk_count, time.perf_counter() - started)
+            start_chunk = recorded.next_chunk if same_version else 0
+        if start_chunk:
+            self.resumed += 1
+
+        normalizer = TextNormalizer()
+        redactor = StreamingRedactor(None if self.redact else {})
+        chunker = StreamingChunker(self.chunk_size, self.chunk_overlap)
+        counts = {"chunks": 0, "written": 0}
+
+        async def normalize(blocks: AsyncIterator[str]) -> AsyncIterator[str]:
+            async for block in blocks:
+                yield normalizer.feed(block)
+            yield normalizer.finish()
+
+        async def redact(blocks: AsyncIterator[str]) -> AsyncIterator[str]:
+            async for block in blocks:
+                yield redactor.feed(block)
+            yield redactor.finish()
+
+        async def chunk(blocks: AsyncIterator[str]) -> AsyncIterator[Chunk]:
+            async for block in blocks:
+                for item in chunker.feed(block):
+                    counts["chunks"] += 1
+                    if item.index >= start_chunk:
+                        yield item
+            for item in chunker.finish():
+                counts["chunks"] += 1
+                if item.index >= start_chunk:
+                    yield item
+
+        async def embed(chunks: AsyncIterator[Chunk]) -> AsyncIterator[List[Tuple[Chunk, np.ndarray]]]:
+            # Up to embed_concurrency batches in flight, yielded in order
+            in_flight: Deque[Tuple[List[Chunk], asyncio.Task]] = deque()
+            try:
+                async for batch in _batches(chunks, self.embed_batch_size):
+                    in_flight.append((batch, asyncio.create_task(
+                        self.embedder.embed_many([item.text for item in batch])
+                    )))
+                    if len(in_flight) >= self.embed_concurrency:
+                        done, task = in_flight.popleft()
+                        yield list(zip(done, await task))
+                while in_flight:
+                    done, task = in_flight.popleft()
+                    yield list(zip(done, await task))
+            finally:
+                for _, task in in_flight:
+                    task.cancel()
+
+        async def write(batches: AsyncIterator[List[Tuple[Chunk, np.ndarray]]]) -> None:
+            async for batch in batches:
+                await self.writer(doc_id, batch, metadata)
+                counts["written"] += len(batch)
+                await asyncio.to_thread(self.progress.advance, doc_id, version, batch[-1][0].index + 1)
+
+        stages = [normalize, redact, chunk, embed]
+        await _run_stages(self._read(source), stages, write, self.queue_size)
+
+        previous = recorded.chunk_count if recorded else 0
+        if self.remover is not None and previous > counts["chunks"]:
+            await self.remover(doc_id, range(counts["chunks"], previous), metadata)
+        await asyncio.to_thread(self.progress.complete, doc_id, version, counts["chunks"])
+        self.documents += 1
+        self.chunks_written += counts["written"]
+        self.chunks_skipped += min(start_chunk, counts["chunks"])
+        for kind, count in redactor.redacted.items():
+            self.redactions[kind] = self.redactions.get(kind, 0) + count
+        return IngestionResult(doc_id, counts["chunks"], counts["written"], start_chunk, time.perf_counter() - started)
+
+    async def _read(self, source: Source) -> AsyncIterator[str]:
+        """Yield text blocks of at most block_size characters from any supported source"""
+        size = self.block_size
+        if isinstance(source, str):
+            for start in range(0, len(source), size):
+                yield source[start:start + size]
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        if isinstance(source, bytes):
+            for start in range(0, len(source), size):
+                yield decoder.decode(source[start:start + size])
+            yield decoder.decode(b"", final=True)
+            return
+
+        if hasattr(source, "__aiter__"):
+            async for block in source:
+                yield decoder.decode(block) if isinstance(block, bytes) else block
+            yield decoder.decode(b"", final=True)
+            return
+
+        opened = None
+        if isinstance(source, (os.PathLike,)):
+            source = opened = open(source, "rb")
+        try:
+            while True:
+                block = await asyncio.to_thread(source.read, size)
+                if not block:
+                    break
+                yield decoder.decode(block) if isinstance(block, bytes) else block
+            yield decoder.decode(b"", final=True)
+        finally:
+            if opened is not None:
+                opened.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "unchanged": self.unchanged,
+            "resumed": self.resumed,
+            "chunks_written": self.chunks_written,
+            "chunks_skipped": self.chunks_skipped,
+            "redactions": dict(self.redactions),
+        }
+
+
+async def _batches(items: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    batch: List[Any] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _run_stages(
+    source: AsyncIterator[Any],
+    stages: Iterable[Callable[[AsyncIterator[Any]], AsyncIterator[Any]]],
+    sink: Callable[[AsyncIterator[Any]], Awaitable[None]],
+    queue_size: int,
+) -> None:
+    """
+    Run each stage as its own task reading from the previous stage's
+    bounded queue. The first failure cancels every other stage and is
+    re-raised.
+    """
+
+    async def pump(items: AsyncIterator[Any], queue: asyncio.Queue) -> None:
+        async for item in items:
+            await queue.put(item)
+        await queue.put(_DONE)
+
+    async def drain(queue: asyncio.Queue) -> AsyncIterator[Any]:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    tasks = []
+    upstream = source
+    for stage in stages:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        tasks.append(asyncio.create_task(pump(upstream, queue)))
+        upstream = stage(drain(queue))
+    tasks.append(asyncio.create_task(sink(upstream)))
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def write_to_memory_index(
+    doc_id: str,
+    batch: List[Tuple[Chunk, np.ndarray]],
+    metadata: Dict[str, Any],
+) -> None:
+    """Default writer: index chunks as ``<doc_id>#<n>`` in the hybrid memory search"""
+    tenant_id = metadata.get("tenant_id", "default")
+    for item, vector in batch:
+        await memory_search.index(
+            tenant_id,
+            f"{doc_id}#{item.index}",
+            {"title": metadata.get("title", ""), "content": item.text},
+            {**metadata, "parent_id": doc_id, "chunk": item.index, "start": item.start, "end": item.end},
+            vector=vector,
+        )
+
+
+async def remove_from_memory_index(doc_id: str, chunks: range, metadata: Dict[str, Any]) -> None:
+    """Default remover: drop chunks a shorter new version no longer has"""
+    await memory_search.delete(metadata.get("tenant_id", "default"), [f"{doc_id}#{index}" for index in chunks])
+
+
+# Global ingestion pipeline instance
+ingestion_pipeline = IngestionPipeline(
+    write_to_memory_index,
+    remove_from_memory_index,
+    progress=IngestionProgressStore(settings.resolve_path(settings.INGEST_PROGRESS_PATH)),
+    block_size=settings.INGEST_BLOCK_SIZE,
+    chunk_size=settings.INGEST_CHUNK_SIZE,
+    chunk_overlap=settings.INGEST_CHUNK_OVERLAP,
+    queue_size=settings.INGEST_QUEUE_SIZE,
+    embed_batch_size=settings.INGEST_EMBED_BATCH_SIZE,
+    embed_concurrency=settings.INGEST_EMBED_CONCURRENCY,
+    redact=settings.INGEST_REDACT_PII,
+)
@@ -0,0 +1,642 @@
+"""
+MindMesh Lexical (BM25) Index
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mindmesh.config.settings import settings
+
+# Identifiers (emails, ticket numbers, paths, versions) are indexed whole
+# and as their word parts, so "INC-4711" matches exactly and by "4711"
+_TOKEN_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|\w+(?:[-./:#]\w+)+|\w+")
+_WORD_RE = re.compile(r"\w+")
+
+# Metadata fields stored as integer codes for filtering
+CATEGORICAL_FIELDS = ("type", "app", "sensitivity", "owner")
+
+# Positions are packed as (field << 27) | char offset
+_FIELD_SHIFT = 27
+_OFFSET_MASK = (1 << _FIELD_SHIFT) - 1
+MAX_FIELDS = 32
+
+# Occurrences kept per (term, document) for highlighting
+MAX_POSITIONS = 8
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int]]:
+    """Yield (lower-cased term, character offset) pairs"""
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        yield token.lower(), match.start()
+        if not _WORD_RE.fullmatch(token):
+            for part in _WORD_RE.finditer(token):
+                yield part.group().lower(), match.start() + part.start()
+
+
+def _timestamp(value: Any) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value.timestamp()
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    if needed <= len(array):
+        return array
+    grown = np.zeros((max(needed, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _Segment:
+    """Immutable postings in CSR layout, ordered by (term id, doc number)"""
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        pos_offsets: np.ndarray,
+        positions: np.ndarray,
+    ):
+        self.indptr = indptr  # term id -> first posting
+        self.docs = docs
+        self.tfs = tfs
+        self.pos_offsets = pos_offsets  # posting -> first position
+        self.positions = positions
+
+    @classmethod
+    def build(
+        cls,
+        terms: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        npos: np.ndarray,
+        pos_start: np.ndarray,
+        positions: np.ndarray,
+        vocab_size: int,
+    ) -> "_Segment":
+        """Sort postings by (term, doc) and gather their positions to match"""
+        order = np.lexsort((docs, terms))
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+        counts = npos[order].astype(np.int64)
+
+        pos_offsets = np.zeros(len(docs) + 1, dtype=np.int64)
+        np.cumsum(counts, out=pos_offsets[1:])
+        gather = np.repeat(pos_start[order] - pos_offsets[:-1], counts) + np.arange(pos_offsets[-1])
+
+        indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(terms, minlength=vocab_size))
+        if pos_offsets[-1] < 2 ** 32:
+            pos_offsets = pos_offsets.astype(np.uint32)
+        return cls(indptr, docs, tfs, pos_offsets, positions[gather])
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        if term_id >= len(self.indptr) - 1:
+            return self.docs[:0], self.tfs[:0]
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def positions_of(self, term_id: int, docs: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """(index into docs, packed positions) for each of the docs containing the term"""
+        if term_id >= len(self.indptr) - 1:
+            return
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        if start == end:
+            return
+        term_docs = self.docs[start:end]
+        rows = np.minimum(np.searchsorted(term_docs, docs), end - start - 1)
+        for i in np.flatnonzero(term_docs[rows] == docs):
+            posting = start + rows[i]
+            yield int(i), self.positions[self.pos_offsets[posting]:self.pos_offsets[posting + 1]]
+
+    def flat(self) -> Tuple[np.ndarray, ...]:
+        """Postings as flat arrays with term ids and position starts, for merging"""
+        vocab_size = len(self.indptr) - 1
+        terms = np.repeat(np.arange(vocab_size, dtype=np.int64), np.diff(self.indptr))
+        pos_offsets = self.pos_offsets.astype(np.int64)
+        return terms, self.docs, self.tfs, np.diff(pos_offsets), pos_offsets[:-1], self.positions
+
+
+class BM25Index:
+    """
+    Incremental inverted index with BM25 ranking and highlight offsets.
+
+    Documents are buffered in a memtable and frozen into immutable
+    segments (postings in CSR arrays) when it fills or a search needs
+    them. Small segments are merged into larger ones so a search touches
+    at most ``max_segments`` of them. Deletes and replacements tombstone
+    the old document number; its postings are dropped when segments are
+    merged, and a full compaction runs once a quarter of the documents
+    are dead. Document frequencies count tombstoned postings until then,
+    as in most segment-based engines.
+
+    Query terms found in more than ``common_cutoff`` of the documents only
+    add to the scores of documents matched by the query's rarer terms, so
+    "INC-4711" doesn't walk the postings of every "inc".
+
+    Each posting keeps the character offsets of up to MAX_POSITIONS
+    occurrences, so highlights come straight from the index without
+    re-reading the document.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        segment_size: int = 65536,
+        max_segments: int = 8,
+        common_cutoff: float = 0.1,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.common_cutoff = common_cutoff
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+
+        self.terms: List[str] = []
+        self.term_ids: Dict[str, int] = {}
+        self.fields: List[str] = []
+        self.vocab: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_numbers: Dict[str, int] = {}
+        self.live = np.zeros(1024, dtype=bool)
+        self.lengths = np.zeros(1024, dtype=np.uint32)
+        self.codes = np.zeros((1024, len(CATEGORICAL_FIELDS)), dtype=np.int32)
+        self.created_at = np.zeros(1024, dtype=np.float64)
+        self.total_length = 0
+
+        self.segments: List[_Segment] = []
+        self._reset_memtable()
+
+    def __len__(self) -> int:
+        return len(self.doc_numbers)
+
+    def add(self, doc_id: str, fields: Dict[str, str], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Index or re-index a document's text fields"""
+        self.delete(doc_id)
+        metadata = metadata or {}
+        doc = len(self.doc_ids)
+
+        occurrences: Dict[int, List[int]] = {}
+        length = 0
+        for name, text in fields.items():
+            if not text:
+                continue
+            field = self._field(name)
+            for term, offset in tokenize(text):
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = self.term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                occurrences.setdefault(term_id, []).append((field << _FIELD_SHIFT) | min(offset, _OFFSET_MASK))
+                length += 1
+
+        for term_id, positions in occurrences.items():
+            kept = positions[:MAX_POSITIONS]
+            self._mem_terms.append(term_id)
+            self._mem_tfs.append(min(len(positions), 65535))
+            self._mem_npos.append(len(kept))
+            self._mem_positions.extend(kept)
+        self._mem_docs.extend([doc] * len(occurrences))
+
+        needed = doc + 1
+        self.live = _grow(self.live, needed)
+        self.lengths = _grow(self.lengths, needed)
+        self.codes = _grow(self.codes, needed)
+        self.created_at = _grow(self.created_at, needed)
+        self.live[doc] = True
+        self.lengths[doc] = length
+        self.codes[doc] = self._encode(metadata)
+        self.created_at[doc] = _timestamp(metadata.get("created_at"))
+        self.total_length += length
+        self.doc_ids.append(doc_id)
+        self.doc_numbers[doc_id] = doc
+        self._mem_count += 1
+
+        if self._mem_count >= self.segment_size:
+            self.flush()
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document; returns whether it was present"""
+        doc = self.doc_numbers.pop(doc_id, None)
+        if doc is None:
+            return False
+        self.live[doc] = False
+        self.doc_ids[doc] = None
+        self.total_length -= int(self.lengths[doc])
+        if len(self.doc_ids) >= 1024 and len(self) < 0.75 * len(self.doc_ids):
+            self.compact()
+        return True
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, BM25 score) matching the filters, best first"""
+        self.flush()
+        term_ids = {self.term_ids[term] for term, _ in tokenize(query) if term in self.term_ids}
+        if not term_ids or not len(self):
+            return []
+        allowed = self._filter(filters)
+        if allowed is False:
+            return []
+
+        n = len(self)
+        average_length = self.total_length / n
+        postings: Dict[int, Tuple[List[Tuple[np.ndarray, np.ndarray]], int]] = {}
+        for term_id in term_ids:
+            parts = [segment.postings(term_id) for segment in self.segments]
+            # Tombstoned postings still count until a merge; cap at the live count
+            df = min(sum(len(docs) for docs, _ in parts), n)
+            if df:
+                postings[term_id] = (parts, df)
+        if not postings:
+            return []
+
+        # Common terms only score documents that rarer query terms matched,
+        # unless the query has nothing rarer (a common-terms query)
+        rare = {term_id for term_id, (_, df) in postings.items() if df <= self.common_cutoff * n} or set(postings)
+
+        doc_parts: List[np.ndarray] = []
+        weight_parts: List[np.ndarray] = []
+        for term_id in rare:
+            parts, df = postings[term_id]
+            docs = np.concatenate([docs for docs, _ in parts])
+            doc_parts.append(docs)
+            weight_parts.append(self._bm25(np.concatenate([tfs for _, tfs in parts]), docs, df, n, average_length))
+
+        docs = np.concatenate(doc_parts)
+        weights = np.concatenate(weight_parts)
+        if len(doc_parts) > 1:
+            # Sum per document; a dense accumulator beats sorting for long postings
+            if len(docs) * 8 > len(self.doc_ids):
+                dense = np.zeros(len(self.doc_ids), dtype=np.float32)
+                for part, weight in zip(doc_parts, weight_parts):
+                    dense[part] += weight
+                docs = np.flatnonzero(dense)
+                weights = dense[docs]
+            else:
+                docs, inverse = np.unique(docs, return_inverse=True)
+                weights = np.bincount(inverse, weights=weights).astype(np.float32)
+
+        for term_id in postings.keys() - rare:
+            parts, df = postings[term_id]
+            for part_docs, part_tfs in parts:
+                if not len(part_docs):
+                    continue
+                rows = np.minimum(np.searchsorted(part_docs, docs), len(part_docs) - 1)
+                found = part_docs[rows] == docs
+                if found.any():
+                    weights[found] += self._bm25(part_tfs[rows[found]], docs[found], df, n, average_length)
+
+        mask = self.live[docs]
+        if allowed is not None:
+            mask &= allowed(docs)
+        docs, weights = docs[mask], weights[mask]
+        if not len(docs):
+            return []
+        top = np.argpartition(-weights, k - 1)[:k] if len(docs) > k else np.arange(len(docs))
+        top = top[np.argsort(-weights[top])]
+        return [(self.doc_ids[docs[i]], float(weights[i])) for i in top]
+
+    def _bm25(self, tfs: np.ndarray, docs: np.ndarray, df: int, n: int, average_length: float) -> np.ndarray:
+        tfs = tfs.astype(np.float32)
+        idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1.0 - self.b + self.b * self.lengths[docs] / average_length)
+        return (idf * tfs * (self.k1 + 1.0) / (tfs + norm)).astype(np.float32)
+
+    def highlights(self, doc_id: str, query: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Character spans of the query's terms in a document, per field"""
+        return self.highlights_many([doc_id], query)[0]
+
+    def highlights_many(self, doc_ids: Sequence[str], query: str) -> List[Dict[str, List[Tuple[int, int]]]]:
+        """Highlight spans for several documents, looking each term up once per segment"""
+        self.flush()
+        known = [(i, self.doc_numbers[doc_id]) for i, doc_id in enumerate(doc_ids) if doc_id in self.doc_numbers]
+        spans: List[Dict[str, List[Tuple[int, int]]]] = [{} for _ in doc_ids]
+        if not known:
+            return spans
+        slots = [i for i, _ in known]
+        docs = np.array([doc for _, doc in known], dtype=np.uint32)
+
+        for term in {term for term, _ in tokenize(query)}:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            for segment in self.segments:
+                for i, positions in segment.positions_of(term_id, docs):
+                    found = spans[slots[i]]
+                    for packed in positions.tolist():
+                        start = packed & _OFFSET_MASK
+                        # Offsets index the original text; lower-casing keeps lengths for all but a few scripts
+                        found.setdefault(self.fields[packed >> _FIELD_SHIFT], []).append((start, start + len(term)))
+        return [{field: _merge_spans(found) for field, found in fields.items()} for fields in spans]
+
+    def flush(self) -> None:
+        """Freeze the memtable into a segment"""
+        if not self._mem_terms:
+            self._mem_count = 0
+            return
+        counts = np.array(self._mem_npos, dtype=np.uint8)
+        segment = _Segment.build(
+            np.array(self._mem_terms, dtype=np.int64),
+            np.array(self._mem_docs, dtype=np.uint32),
+            np.array(self._mem_tfs, dtype=np.uint16),
+            counts,
+            np.cumsum(counts, dtype=np.int64) - counts,
+            np.array(self._mem_positions, dtype=np.uint32),
+            len(self.terms),
+        )
+        self._reset_memtable()
+        self.segments.append(segment)
+        if len(self.segments) > self.max_segments:
+            # Merge the smallest segments, keeping merges proportional to their size
+            self.segments.sort(key=len, reverse=True)
+            keep = self.max_segments // 2
+            self.segments = self.segments[:keep] + [self._merge(self.segments[keep:])]
+
+    def compact(self) -> None:
+        """Merge all segments, dropping dead postings and renumbering documents"""
+        self.flush()
+        alive = np.flatnonzero(self.live[:len(self.doc_ids)])
+        renumber = np.zeros(len(self.doc_ids), dtype=np.uint32)
+        renumber[alive] = np.arange(len(alive), dtype=np.uint32)
+
+        merged = self._merge(self.segments) if self.segments else None
+        if merged is not None:
+            merged.docs = renumber[merged.docs]
+
+        self.doc_ids = [self.doc_ids[doc] for doc in alive]
+        self.doc_numbers = {doc_id: doc for doc, doc_id in enumerate(self.doc_ids)}
+        self.live = self.live[alive]
+        self.lengths = self.lengths[alive]
+        self.codes = self.codes[alive]
+        self.created_at = self.created_at[alive]
+        self.segments = [merged] if merged is not None and len(merged) else []
+
+    def save(self, path: str) -> None:
+        """Write the index to disk, atomically replacing any previous file"""
+        self.compact()
+        segment = self.segments[0] if self.segments else _Segment.build(
+            *(np.zeros(0, dtype=dtype) for dtype in (np.int64, np.uint32, np.uint16, np.uint8, np.int64, np.uint32)),
+            len(self.terms),
+        )
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                terms=np.array(self.terms, dtype=str),
+                doc_ids=np.array(self.doc_ids, dtype=str),
+                lengths=self.lengths,
+                codes=self.codes,
+                created_at=self.created_at,
+                indptr=segment.indptr,
+                docs=segment.docs,
+                tfs=segment.tfs,
+                pos_offsets=segment.pos_offsets,
+                positions=segment.positions,
+                meta=np.array(json.dumps({"fields": self.fields, "vocab": self.vocab})),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "BM25Index":
+        """Read an index written by save"""
+        index = cls(**kwargs)
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            index.fields = meta["fields"]
+            index.vocab = meta["vocab"]
+            index.terms = data["terms"].tolist()
+            index.doc_ids = data["doc_ids"].tolist()
+            index.lengths = data["lengths"]
+            index.codes = data["codes"]
+            index.created_at = data["created_at"]
+            segment = _Segment(*(data[name] for name in ("indptr", "docs", "tfs", "pos_offsets", "positions")))
+        index.term_ids = {term: term_id for term_id, term in enumerate(index.terms)}
+        index.doc_numbers = {doc_id: doc for doc, doc_id in enumerate(index.doc_ids)}
+        index.live = np.ones(len(index.doc_ids), dtype=bool)
+        index.total_length = int(index.lengths.sum())
+        index.segments = [segment] if len(segment) else []
+        return index
+
+    def _merge(self, segments: Sequence[_Segment]) -> _Segment:
+        flat = [segment.flat() for segment in segments]
+        position_offsets = np.cumsum([0] + [len(parts[5]) for parts in flat[:-1]])
+        terms, docs, tfs, npos, pos_start, positions = (
+            np.concatenate([parts[i] + (position_offsets[n] if i == 4 else 0) for n, parts in enumerate(flat)])
+            for i in range(6)
+        )
+        keep = self.live[docs]
+        return _Segment.build(
+            terms[keep], docs[keep], tfs[keep], npos[keep], pos_start[keep], positions, len(self.terms),
+        )
+
+    def _reset_memtable(self) -> None:
+        self._mem_terms: List[int] = []
+        self._mem_docs: List[int] = []
+        self._mem_tfs: List[int] = []
+        self._mem_npos: List[int] = []
+        self._mem_positions: List[int] = []
+        self._mem_count = 0
+
+    def _field(self, name: str) -> int:
+        if name not in self.fields:
+            if len(self.fields) == MAX_FIELDS:
+                raise ValueError(f"At most {MAX_FIELDS} distinct fields can be indexed")
+            self.fields.append(name)
+        return self.fields.index(name)
+
+    def _encode(self, metadata: Dict[str, Any]) -> np.ndarray:
+        codes = np.zeros(len(CATEGORICAL_FIELDS), dtype=np.int32)
+        for i, field in enumerate(CATEGORICAL_FIELDS):
+            value = metadata.get(field)
+            if value is not None:
+                vocab = self.vocab[field]
+                # Code 0 means "no value"
+                codes[i] = vocab.setdefault(str(value), len(vocab) + 1)
+        return codes
+
+    def _filter(self, filters: Optional[Dict[str, Any]]) -> Any:
+        """
+        Document selector for the filters: None when unfiltered, False when
+        the filters can't match anything.
+        """
+        if not filters:
+            return None
+
+        allowed: List[Tuple[int, np.ndarray]] = []
+        for i, field in enumerate(CATEGORICAL_FIELDS):
+            value = filters.get(field)
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            codes = [self.vocab[field][str(v)] for v in values if str(v) in self.vocab[field]]
+            if not codes:
+                return False
+            allowed.append((i, np.array(codes, dtype=np.int32)))
+
+        date_from = filters.get("date_from")
+        date_to = filters.get("date_to")
+        date_from = _timestamp(date_from) if date_from is not None else None
+        date_to = _timestamp(date_to) if date_to is not None else None
+
+        def select(docs: np.ndarray) -> np.ndarray:
+            mask = np.ones(len(docs), dtype=bool)
+            for column, codes in allowed:
+                mask &= np.isin(self.codes[docs, column], codes)
+            if date_from is not None:
+                mask &= self.created_at[docs] >= date_from
+            if date_to is not None:
+                mask &= self.created_at[docs] <= date_to
+            return mask
+
+        return select
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort spans and merge overlapping ones (identifiers overlap their parts)"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class TenantLexicalIndex:
+    """
+    Per-tenant BM25 indexes persisted under one directory. Indexes load on
+    first use; the least recently used ones are saved and unloaded beyond
+    ``max_loaded`` tenants. Every operation holds the instance's lock, so
+    searches may run in worker threads while writes come in.
+    """
+
+    def __init__(self, directory: str, k1: float = 1.2, b: float = 0.75, max_loaded: int = 64):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.max_loaded = max_loaded
+        self._indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+        self._dirty: set = set()
+        self._lock = threading.RLock()
+
+        self.searches = 0
+        self._search_time = 0.0
+
+    def upsert(
+        self,
+        tenant_id: str,
+        doc_id: str,
+        fields: Dict[str, str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Index or re-index a document of a tenant"""
+        with self._lock:
+            self._index(tenant_id).add(doc_id, fields, metadata)
+            self._dirty.add(str(tenant_id))
+
+    def delete(self, tenant_id: str, doc_ids: Iterable[str]) -> int:
+        """Remove documents from a tenant's index"""
+        with self._lock:
+            index = self._index(tenant_id)
+            removed = sum(index.delete(doc_id) for doc_id in doc_ids)
+            if removed:
+                self._dirty.add(str(tenant_id))
+        return removed
+
+    def search(
+        self,
+        tenant_id: str,
+        query: str,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Best BM25 matches among a tenant's documents"""
+        with self._lock:
+            start = time.perf_counter()
+            results = self._index(tenant_id).search(query, k, filters)
+            self.searches += 1
+            self._search_time += time.perf_counter() - start
+        return results
+
+    def highlights(
+        self,
+        tenant_id: str,
+        doc_ids: Sequence[str],
+        query: str,
+    ) -> List[Dict[str, List[Tuple[int, int]]]]:
+        """Character spans of the query's terms in some of a tenant's documents"""
+        with self._lock:
+            return self._index(tenant_id).highlights_many(doc_ids, query)
+
+    def save(self, tenant_id: Optional[str] = None) -> None:
+        """Persist one tenant's index, or every modified one"""
+        with self._lock:
+            tenants = [str(tenant_id)] if tenant_id is not None else list(self._dirty)
+            for tenant in tenants:
+                index = self._indexes.get(tenant)
+                if index is not None:
+                    index.save(self._path(tenant))
+                self._dirty.discard(tenant)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded_tenants": len(self._indexes),
+                "documents_loaded": sum(len(index) for index in self._indexes.values()),
+                "unsaved_tenants": len(self._dirty),
+                "searches": self.searches,
+                "average_search_seconds": self._search_time / self.searches if self.searches else 0.0,
+            }
+
+    def _index(self, tenant_id: str) -> BM25Index:
+        tenant = str(tenant_id)
+        index = self._indexes.get(tenant)
+        if index is None:
+            path = self._path(tenant)
+            if os.path.exists(path):
+                index = BM25Index.load(path, k1=self.k1, b=self.b)
+            else:
+                index = BM25Index(k1=self.k1, b=self.b)
+            self._indexes[tenant] = index
+            while len(self._indexes) > self.max_loaded:
+                evicted, _ = next(iter(self._indexes.items()))
+                if evicted in self._dirty:
+                    self.save(evicted)
+                del self._indexes[evicted]
+        self._indexes.move_to_end(tenant)
+        return index
+
+    def _path(self, tenant: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in tenant)
+        return os.path.join(self.directory, f"{safe}.npz")
+
+
+# Global per-tenant lexical index
+lexical_index = TenantLexicalIndex(
+    settings.resolve_path(settings.LEXICAL_INDEX_DIR),
+    k1=settings.BM25_K1,
+    b=settings.BM25_B,
+    max_loaded=settings.LEXICAL_MAX_LOADED_TENANTS,
+)
@@ -0,0 +1,330 @@
+"""
+MindMesh Context Summaries
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from mindmesh.caching.llm_cache import response_cost
+from mindmesh.config.settings import settings
+from mindmesh.memory.context_packer import TokenCounter, context_packer
+
+# Record fields holding an entity's facts or an episode's events, in order of preference
+PART_FIELDS = ("facts", "observations", "events", "messages")
+TEXT_FIELDS = ("content", "text", "summary", "description")
+
+FULL_PROMPT = """Summarize what is known about this {kind} for use as context in later tasks.
+Keep names, dates, amounts and decisions. Use at most {max_words} words.
+
+{kind} {title}:
+{parts}
+
+Summary:"""
+
+UPDATE_PROMPT = """Update the summary of this {kind} with the new information.
+Keep names, dates, amounts and decisions; drop details the new information supersedes.
+Use at most {max_words} words.
+
+Current summary of {kind} {title}:
+{summary}
+
+New information:
+{parts}
+
+Updated summary:"""
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def _part_text(part: Any) -> str:
+    if isinstance(part, dict):
+        for field in TEXT_FIELDS:
+            if part.get(field):
+                return " ".join(str(part[field]).split())
+        return json.dumps(part, sort_keys=True, default=str)
+    return " ".join(str(part).split())
+
+
+def summary_parts(record: Dict[str, Any]) -> List[str]:
+    """The pieces of content a summary covers: listed facts or events, else the record's text"""
+    for field in PART_FIELDS:
+        values = record.get(field)
+        if values:
+            return [text for text in (_part_text(value) for value in values) if text]
+    for field in TEXT_FIELDS:
+        if record.get(field):
+            return [_part_text(record[field])]
+    return []
+
+
+def part_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def content_version(hashes: Sequence[str]) -> str:
+    """Version of a record's content: independent of the order parts arrive in"""
+    return hashlib.sha256("\n".join(sorted(hashes)).encode("utf-8")).hexdigest()
+
+
+class StoredSummary(NamedTuple):
+    version: str
+    part_hashes: Tuple[str, ...]
+    summary: str
+    tokens: int
+    updated_at: float
+
+
+class SummaryStore:
+    """
+    Summaries of entities and episodes in SQLite, keyed by tenant, kind and
+    item id, with the content version each summary was written for and
+    the hashes of the parts it covers, so a summary can be extended with
+    only the parts added since.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS context_summaries (
+        tenant_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        version TEXT NOT NULL,
+        part_hashes TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        tokens INTEGER NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (tenant_id, kind, item_id)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use, under the caller's lock
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def get_many(self, tenant_id: str, kind: str, item_ids: Sequence[str]) -> Dict[str, StoredSummary]:
+        found: Dict[str, StoredSummary] = {}
+        item_ids = list(dict.fromkeys(item_ids))
+        with self._lock:
+            for start in range(0, len(item_ids), _LOOKUP_CHUNK):
+                chunk = item_ids[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT item_id, version, part_hashes, summary, tokens, updated_at FROM context_summaries "
+                    f"WHERE tenant_id = ? AND kind = ? AND item_id IN ({','.join('?' * len(chunk))})",
+                    (tenant_id, kind, *chunk),
+                ).fetchall()
+                for item_id, version, hashes, summary, tokens, updated_at in rows:
+                    found[item_id] = StoredSummary(version, tuple(json.loads(hashes)), summary, tokens, updated_at)
+        return found
+
+    def put(self, tenant_id: str, kind: str, item_id: str, summary: StoredSummary) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO context_summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    tenant_id, kind, item_id, summary.version, json.dumps(list(summary.part_hashes)),
+                    summary.summary, summary.tokens, summary.updated_at,
+                ),
+            )
+
+    def delete(self, tenant_id: str, kind: Optional[str] = None, item_id: Optional[str] = None) -> None:
+        """Forget a tenant's summaries, optionally only one kind or item"""
+        query, params = "DELETE FROM context_summaries WHERE tenant_id = ?", [tenant_id]
+        if kind is not None:
+            query, params = query + " AND kind = ?", params + [kind]
+        if item_id is not None:
+            query, params = query + " AND item_id = ?", params + [item_id]
+        with self._lock:
+            self._conn.execute(query, params)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class ContextSummary(NamedTuple):
+    """The text to show for one record now, and whether it needs a refresh"""
+    text: str
+    status: str  # fresh | verbatim | stale | missing
+    parts: Tuple[str, ...]
+    part_hashes: Tuple[str, ...]
+    stored: Optional[StoredSummary]
+
+
+class SummaryResolver:
+    """
+    Serves entity and episode summaries from the store and keeps them
+    current. A summary whose content version matches is used as is;
+    content short enough needs no summary. Otherwise the record is shown
+    from what is at hand (the stored summary followed by the parts added
+    since, or the raw parts) and refreshed in the background: parts added
+    to a summarized item are folded into its summary by one small LLM
+    call, and only items whose earlier content changed or disappeared
+    are summarized again from scratch. No LLM call sits in a run's path.
+    """
+
+    def __init__(
+        self,
+        store: SummaryStore,
+        counter: Optional[TokenCounter] = None,
+        model: Optional[str] = None,
+        max_tokens: int = 120,
+        max_concurrent_refreshes: int = 4,
+        llm: Any = None,
+    ):
+        self.store = store
+        self.counter = counter or TokenCounter()
+        self.model = model or settings.OPENAI_MODEL
+        self.max_tokens = max_tokens
+        self._llm = llm
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._max_concurrent = max_concurrent_refreshes
+        self._refreshing: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+        self.counts = {"fresh": 0, "verbatim": 0, "stale": 0, "missing": 0}
+        self.full_summaries = 0
+        self.incremental_updates = 0
+        self.failed_refreshes = 0
+        self.llm_calls = 0
+        self.llm_cost = 0.0
+
+    def resolve(self, tenant_id: str, kind: str, records: Sequence[Dict[str, Any]]) -> Dict[str, ContextSummary]:
+        """Summaries for records keyed by their id, from one store lookup"""
+        pending = {}
+        for record in records:
+            item_id = record.get("id")
+            parts = summary_parts(record)
+            if item_id is not None and parts:
+                pending[str(item_id)] = tuple(parts)
+        stored = self.store.get_many(tenant_id, kind, list(pending))
+
+        resolved = {}
+        for item_id, parts in pending.items():
+            hashes = tuple(part_hash(part) for part in parts)
+            previous = stored.get(item_id)
+            if previous is not None and previous.version == content_version(hashes):
+                summary = ContextSummary(previous.summary, "fresh", parts, hashes, previous)
+            elif self.counter.count(" ".join(parts)) <= self.max_tokens:
+                summary = ContextSummary(" ".join(parts), "verbatim", parts, hashes, previous)
+            elif previous is not None and set(previous.part_hashes) <= set(hashes):
+                known = set(previous.part_hashes)
+                added = [part for part, digest in zip(parts, hashes) if digest not in known]
+                summary = ContextSummary(" ".join([previous.summary, *added]), "stale", parts, hashes, previous)
+            else:
+                summary = ContextSummary(" ".join(parts), "missing", parts, hashes, previous)
+            self.counts[summary.status] += 1
+            resolved[item_id] = summary
+        return resolved
+
+    def schedule(self, tenant_id: str, kind: str, item_id: str, title: str, summary: ContextSummary) -> bool:
+        """Refresh a stale or missing summary in the background; False if one is already running"""
+        key = (tenant_id, kind, item_id)
+        if summary.status in ("fresh", "verbatim") or key in self._refreshing:
+            return False
+        task = asyncio.get_running_loop().create_task(self.refresh(tenant_id, kind, item_id, title, summary))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return True
+
+    async def refresh(self, tenant_id: str, kind: str, item_id: str, title: str, summary: ContextSummary) -> Optional[str]:
+        """Write the summary for the record's current content"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        async with self._semaphore:
+            # Another worker may have caught up with this version meanwhile
+            current = self.store.get_many(tenant_id, kind, [item_id]).get(item_id)
+            version = content_version(summary.part_hashes)
+            if current is not None and current.version == version:
+                return current.summary
+
+            max_words = max(10, self.max_tokens * 3 // 4)
+            if current is not None and set(current.part_hashes) <= set(summary.part_hashes):
+                known = set(current.part_hashes)
+                added = [part for part, digest in zip(summary.parts, summary.part_hashes) if digest not in known]
+                prompt = UPDATE_PROMPT.format(
+                    kind=kind, title=title, max_words=max_words,
+                    summary=current.summary, parts=self._bullets(added),
+                )
+                self.incremental_updates += 1
+            else:
+                prompt = FULL_PROMPT.format(kind=kind, title=title, max_words=max_words, parts=self._bullets(summary.parts))
+                self.full_summaries += 1
+
+            # Not through the LLM response cache: its semantic tier would match
+            # near-identical prompts about different items, and the store
+            # already keeps each item's answer
+            try:
+                response = await self.llm.ainvoke(prompt)
+            except Exception:
+                # The record keeps showing from its parts; the next run that retrieves it retries
+                self.failed_refreshes += 1
+                return None
+            self.llm_calls += 1
+            self.llm_cost += response_cost(response)
+            text = " ".join(str(response.content).split())
+            self.store.put(tenant_id, kind, item_id, StoredSummary(
+                version, summary.part_hashes, text, self.counter.count(text), time.time(),
+            ))
+            return text
+
+    async def drain(self) -> None:
+        """Wait for the refreshes in flight"""
+        while self._refreshing:
+            await asyncio.gather(*list(self._refreshing.values()), return_exceptions=True)
+
+    def _bullets(self, parts: Sequence[str]) -> str:
+        return "\n".join(f"- {part}" for part in parts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "refreshing": len(self._refreshing),
+            "full_summaries": self.full_summaries,
+            "incremental_updates": self.incremental_updates,
+            "failed_refreshes": self.failed_refreshes,
+            "llm_calls": self.llm_calls,
+            "llm_cost": self.llm_cost,
+        }
+
+    @property
+    def llm(self) -> Any:
+        # Created on the first refresh so runs served from the store never need it
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+
+            self._llm = ChatOpenAI(
+                model=self.model,
+                api_key=settings.OPENAI_API_KEY,
+                temperature=0,
+            )
+        return self._llm
+
+
+# Global summary resolver instance
+summary_resolver = SummaryResolver(
+    SummaryStore(settings.resolve_path(settings.SUMMARY_STORE_PATH)),
+    context_packer.counter,
+    model=settings.SUMMARY_LLM_MODEL,
+    max_tokens=settings.SUMMARY_MAX_TOKENS,
+    max_concurrent_refreshes=settings.SUMMARY_MAX_CONCURRENT_REFRESHES,
+)
@@ -0,0 +1,247 @@
+"""
+MindMesh Executor Node
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from mindmesh.config.settings import settings
+from mindmesh.state import MindMeshState
+from mindmesh.streaming.events import run_events
+from mindmesh.tools.limits import ConnectorLimits, connector_limits
+from mindmesh.tools.registry import ToolError, ToolRegistry, tool_registry
+
+# Outcomes of a tool call
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"  # a call it depends on did not succeed
+
+
+class ToolCallGraph:
+    """
+    Tool calls as a dependency DAG. A call names the calls whose results
+    it needs in ``depends_on``; the rest may run at any time. Calls that
+    cannot be ordered (duplicate IDs, unknown dependencies, cycles) are
+    reported as failed instead of being run.
+    """
+
+    def __init__(self, calls: List[Dict[str, Any]]):
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.invalid: Dict[str, str] = {}
+        for index, call in enumerate(calls):
+            call_id = str(call.get("id") or f"call_{index}")
+            if call_id in self.calls:
+                self.invalid[f"{call_id}#{index}"] = f"Duplicate tool call id {call_id}"
+                continue
+            self.calls[call_id] = {**call, "id": call_id}
+
+        self.dependents: Dict[str, List[str]] = {call_id: [] for call_id in self.calls}
+        self.waiting_on: Dict[str, int] = {}
+        for call_id, call in self.calls.items():
+            depends_on = [str(dep) for dep in call.get("depends_on") or []]
+            unknown = [dep for dep in depends_on if dep not in self.calls]
+            if unknown:
+                self.invalid[call_id] = f"Unknown dependencies: {', '.join(unknown)}"
+            call["depends_on"] = depends_on
+            self.waiting_on[call_id] = len(depends_on)
+            for dep in depends_on:
+                if dep in self.dependents:
+                    self.dependents[dep].append(call_id)
+
+    def ready(self) -> List[str]:
+        return [call_id for call_id, count in self.waiting_on.items() if count == 0 and call_id not in self.invalid]
+
+
+class Executor:
+    """
+    Execute the run's tool calls, each as soon as the calls it depends on
+    have succeeded, so independent calls (calendar, mail and drive
+    lookups) run concurrently instead of one after another. Every call
+    runs within its connector's concurrency and rate limits, with a
+    timeout per attempt and retries after a jittered exponential backoff.
+    Results are appended to ``tool_results`` and published as
+    ``tool.result`` events in the order the calls finish.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[ToolRegistry] = None,
+        limits: Optional[ConnectorLimits] = None,
+        max_concurrent: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        self.registry = registry or tool_registry
+        self.limits = limits or connector_limits
+        self.max_concurrent = max_concurrent or settings.TOOL_MAX_CONCURRENT_CALLS
+        self.timeout = settings.TOOL_CALL_TIMEOUT_SECONDS if timeout is None else timeout
+        self.max_attempts = max_attempts or settings.TOOL_CALL_MAX_ATTEMPTS
+        self.retry_backoff = settings.TOOL_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+
+    async def __call__(self, state: MindMeshState) -> Dict[str, Any]:
+        start = time.perf_counter()
+        tool_results = list(state.tool_results or [])
+        errors = list(state.errors or [])
+
+        def on_result(result: Dict[str, Any]) -> None:
+            tool_results.append(result)
+            if result["status"] != SUCCEEDED:
+                errors.append(f"Tool call {result['id']} ({result['tool']}) {result['status']}: {result['error']}")
+            if state.run_id is not None:
+                # Tool output may hold datetimes and other values JSON cannot carry as-is
+                event = json.loads(json.dumps(result, default=str))
+                run_events.publish(state.run_id, "tool.result", {"run_id": state.run_id, "result": event})
+
+        results = await self.execute(state.tool_calls or [], on_result)
+
+        performance_metrics = dict(state.performance_metrics or {})
+        performance_metrics["executor"] = {
+            "calls": len(results),
+            "succeeded": sum(result["status"] == SUCCEEDED for result in results),
+            "failed": sum(result["status"] == FAILED for result in results),
+            "skipped": sum(result["status"] == SKIPPED for result in results),
+            "retries": sum(max(0, result["attempts"] - 1) for result in results),
+            # Time the calls would have taken one after another
+            "serial_seconds": sum(result["latency_seconds"] for result in results),
+            "latency_seconds": time.perf_counter() - start,
+        }
+        return {
+            "tool_results": tool_results,
+            "errors": errors or None,
+            "current_step": "executor",
+            "performance_metrics": performance_metrics,
+        }
+
+    async def execute(
+        self,
+        calls: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run the calls in dependency order, independent ones concurrently; results in completion order"""
+        graph = ToolCallGraph(calls)
+        results: List[Dict[str, Any]] = []
+        outputs: Dict[str, Any] = {}
+        finished: Set[str] = set()
+        slots = asyncio.Semaphore(self.max_concurrent)
+        running: Dict[asyncio.Task, str] = {}
+
+        def report(result: Dict[str, Any]) -> None:
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        def finish(call_id: str, result: Dict[str, Any]) -> None:
+            finished.add(call_id)
+            report(result)
+            if result["status"] == SUCCEEDED:
+                outputs[call_id] = result["result"]
+                for dependent in graph.dependents[call_id]:
+                    graph.waiting_on[dependent] -= 1
+                    if graph.waiting_on[dependent] == 0 and dependent not in graph.invalid and dependent not in finished:
+                        start(dependent)
+            else:
+                # Nothing that needs this result can run
+                for dependent in graph.dependents[call_id]:
+                    if dependent not in finished:
+                        error = f"Dependency {call_id} {result['status']}"
+                        finish(dependent, self._result(graph.calls[dependent], SKIPPED, error=error))
+
+        def start(call_id: str) -> None:
+            call = graph.calls[call_id]
+            dependencies = {dep: outputs[dep] for dep in call["depends_on"]}
+            running[asyncio.create_task(self._run_call(call, dependencies, slots))] = call_id
+
+        for key, error in graph.invalid.items():
+            if key in finished:
+                # Already skipped, as a dependent of an invalid call
+                continue
+            if key in graph.calls:
+                finish(key, self._result(graph.calls[key], FAILED, error=error))
+            else:
+                # A duplicate, kept out of the graph
+                report(self._result({"id": key.split("#")[0], "tool": None}, FAILED, error=error))
+        for call_id in graph.ready():
+            if call_id not in finished:
+                start(call_id)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    call_id = running.pop(task)
+                    finish(call_id, task.result())
+        finally:
+            # A cancelled run abandons its in-flight calls; they release their connector slots before it returns
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        # Whatever never became ready waits on a cycle
+        stuck = [call_id for call_id in graph.calls if call_id not in finished]
+        finished.update(stuck)
+        for call_id in stuck:
+            report(self._result(graph.calls[call_id], FAILED, error="Dependency cycle"))
+        return results
+
+    async def _run_call(
+        self,
+        call: Dict[str, Any],
+        dependencies: Dict[str, Any],
+        slots: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        tool = self.registry.get(call.get("tool") or "")
+        if tool is None:
+            return self._result(call, FAILED, error=f"Unknown tool {call.get('tool')}")
+        connector = call.get("connector") or tool.connector
+
+        start = time.perf_counter()
+        error = None
+        attempts = 0
+        while attempts < self.max_attempts:
+            attempts += 1
+            try:
+                # Each attempt takes a run slot and a connector slot; neither is held through the backoff
+                async with slots, self.limits.slot(connector):
+                    output = await asyncio.wait_for(
+                        tool.function(call.get("args") or {}, dependencies),
+                        self.timeout or None,
+                    )
+                return self._result(call, SUCCEEDED, connector, output, attempts=attempts, start=start)
+            except asyncio.TimeoutError:
+                error = f"Timed out after {self.timeout}s"
+            except ToolError as e:
+                error = str(e)
+                if not e.retryable:
+                    break
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if attempts < self.max_attempts:
+                # Full jitter keeps retries of calls that failed together from retrying together
+                await asyncio.sleep(random.uniform(0, self.retry_backoff * 2 ** (attempts - 1)))
+        return self._result(call, FAILED, connector, error=error, attempts=attempts, start=start)
+
+    def _result(
+        self,
+        call: Dict[str, Any],
+        status: str,
+        connector: Optional[str] = None,
+        output: Any = None,
+        error: Optional[str] = None,
+        attempts: int = 0,
+        start: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "id": call["id"],
+            "tool": call.get("tool"),
+            "connector": connector,
+            "status": status,
+            "ok": status == SUCCEEDED,
+            "result": output,
+            "error": error,
+            "attempts": attempts,
+            "latency_seconds": time.perf_counter() - start if start is not None else 0.0,
+        }
@@ -0,0 +1,104 @@
+"""
+MindMesh Intent Router Node
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from mindmesh.caching.llm_cache import CachedResponse, LLMResponseCache, llm_cache, record_llm_usage, response_cost
+from mindmesh.classification.intent import INTENT_LABELS, IntentClassifier, intent_classifier
+from mindmesh.config.settings import settings
+from mindmesh.state import MindMeshState
+
+INTENT_PROMPT = (
+    "Classify the user's goal into exactly one intent from: {labels}.\n"
+    'Respond with JSON only: {{"intent": "<intent>", "confidence": <0-1>}}\n\n'
+    "Goal: {goal}"
+)
+
+
+class IntentRouter:
+    """Classify the goal's intent, asking the LLM only when the local model is unsure"""
+
+    def __init__(
+        self,
+        classifier: Optional[IntentClassifier] = None,
+        llm: Any = None,
+        cache: Optional[LLMResponseCache] = None,
+    ):
+        self.classifier = classifier or intent_classifier
+        self.cache = cache or llm_cache
+        self.model = settings.INTENT_LLM_MODEL or settings.OPENAI_MODEL
+        self._llm = llm
+
+    async def __call__(self, state: MindMeshState) -> Dict[str, Any]:
+        llm_results: List[CachedResponse] = []
+
+        async def classify_with_llm(goal_text: str) -> Tuple[str, float]:
+            result = await self._classify_with_llm(state, goal_text)
+            llm_results.append(result)
+            return self._parse(result.response)
+
+        result = await self.classifier.classify(state.goal_text, classify_with_llm)
+
+        update: Dict[str, Any] = {"performance_metrics": state.performance_metrics}
+        if llm_results:
+            update = record_llm_usage(state, "intent_router", llm_results[-1])
+
+        performance_metrics = dict(update["performance_metrics"] or {})
+        performance_metrics["intent_router"] = {
+            "source": result.source,
+            "latency_seconds": result.latency,
+        }
+        return {
+            **update,
+            "intent": result.intent,
+            "intent_confidence": result.confidence,
+            "current_step": "intent_router",
+            "performance_metrics": performance_metrics,
+        }
+
+    async def _classify_with_llm(self, state: MindMeshState, goal_text: str) -> CachedResponse:
+        """Ask the LLM for the intent, reusing answers to the same or near-identical goals"""
+        prompt = INTENT_PROMPT.format(labels=", ".join(INTENT_LABELS), goal=goal_text)
+
+        async def call() -> Tuple[str, float]:
+            response = await self.llm.ainvoke(prompt)
+            return response.content, response_cost(response)
+
+        return await self.cache.get_or_call(
+            state.tenant_id,
+            "intent_router",
+            prompt,
+            self.model,
+            0.0,
+            call,
+            autonomy_level=state.autonomy_level,
+            semantic_text=goal_text,
+        )
+
+    def _parse(self, content: str) -> Tuple[str, float]:
+        """Intent and confidence from the LLM's JSON answer"""
+        # Unusable answers route to generic planning with zero confidence
+        try:
+            parsed = json.loads(content)
+            intent = parsed["intent"]
+            confidence = float(parsed.get("confidence", 0.5))
+        except (ValueError, KeyError, TypeError):
+            return "plan", 0.0
+        if intent not in INTENT_LABELS:
+            return "plan", 0.0
+        return intent, confidence
+
+    @property
+    def llm(self) -> Any:
+        # Created on first fallback so goals the local model handles never need it
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+
+            self._llm = ChatOpenAI(
+                model=self.model,
+                api_key=settings.OPENAI_API_KEY,
+                temperature=0,
+            )
+        return self._llm
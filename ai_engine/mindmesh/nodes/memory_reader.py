@@ -0,0 +1,114 @@
+"""
+MindMesh Memory Reader Node
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from mindmesh.config.settings import settings
+from mindmesh.memory.context_packer import ContextPacker, context_packer
+from mindmesh.memory.hybrid_search import memory_search
+from mindmesh.memory.summary_store import SummaryResolver, summary_resolver
+from mindmesh.state import MindMeshState
+
+# Fills retrieved_documents / retrieved_episodes / retrieved_entities for a run
+Retriever = Callable[[MindMeshState], Awaitable[Dict[str, Any]]]
+
+RETRIEVED_FIELDS = {
+    "documents": "retrieved_documents",
+    "episodes": "retrieved_episodes",
+    "entities": "retrieved_entities",
+}
+
+# Sources shown by their stored summary rather than their full content
+SUMMARIZED_KINDS = {"entities": "entity", "episodes": "episode"}
+SOURCE_OF_KIND = {kind: source for source, kind in SUMMARIZED_KINDS.items()}
+
+
+async def search_memory(state: MindMeshState) -> Dict[str, Any]:
+    """
+    Default retriever: the tenant's best hybrid search matches for the
+    goal, filed under documents, episodes or entities by their ``kind``
+    metadata (documents when absent).
+    """
+    if state.tenant_id is None:
+        return {}
+    found: Dict[str, Any] = {field: [] for field in RETRIEVED_FIELDS.values()}
+    for record in await memory_search.retrieve(state.tenant_id, state.goal_text, k=settings.MEMORY_RETRIEVAL_K):
+        source = SOURCE_OF_KIND.get(record.get("kind"), "documents")
+        found[RETRIEVED_FIELDS[source]].append(record)
+    return found
+
+
+class MemoryReader:
+    """
+    Gather the run's memory (from the hybrid memory search unless the
+    state already carries retrieved items) and pack it into
+    ``context_summary`` within the prompt's token budget. Entities and
+    episodes enter by their stored summaries, which are refreshed in the
+    background when their content has changed. The retrieved lists stay
+    complete in the state; only the packed summary goes into downstream
+    prompts.
+    """
+
+    def __init__(
+        self,
+        retriever: Optional[Retriever] = None,
+        packer: Optional[ContextPacker] = None,
+        summaries: Optional[SummaryResolver] = None,
+    ):
+        self.retriever = retriever or search_memory
+        self.packer = packer or context_packer
+        self.summaries = summaries or summary_resolver
+
+    async def __call__(self, state: MindMeshState) -> Dict[str, Any]:
+        start = time.perf_counter()
+        update: Dict[str, Any] = {}
+        retrieved = {source: getattr(state, field) for source, field in RETRIEVED_FIELDS.items()}
+        if self.retriever is not None and not any(retrieved.values()):
+            found = await self.retriever(state)
+            for source, field in RETRIEVED_FIELDS.items():
+                if found.get(field) is not None:
+                    retrieved[source] = update[field] = found[field]
+
+        summary_counts: Dict[str, int] = {"fresh": 0, "verbatim": 0, "stale": 0, "missing": 0, "scheduled": 0}
+        if state.tenant_id is not None:
+            for source, kind in SUMMARIZED_KINDS.items():
+                retrieved[source] = self._summarized(state.tenant_id, kind, retrieved[source] or [], summary_counts)
+
+        budget = (state.constraints or {}).get("context_max_tokens")
+        packed = self.packer.pack(retrieved, budget=budget)
+
+        performance_metrics = dict(state.performance_metrics or {})
+        performance_metrics["memory_reader"] = {
+            "candidates": packed.candidates,
+            "selected": len(packed.items),
+            "truncated": sum(item.truncated for item in packed.items),
+            "context_tokens": packed.tokens,
+            "budget_tokens": packed.budget,
+            "summaries": summary_counts,
+            "latency_seconds": time.perf_counter() - start,
+        }
+        return {
+            **update,
+            "context_summary": packed.text or None,
+            "current_step": "memory_reader",
+            "performance_metrics": performance_metrics,
+        }
+
+    def _summarized(
+        self, tenant_id: str, kind: str, records: List[Dict[str, Any]], counts: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """Records with their content replaced by the text of their summary"""
+        resolved = self.summaries.resolve(tenant_id, kind, records)
+        summarized = []
+        for record in records:
+            summary = resolved.get(str(record.get("id")))
+            if summary is None:
+                summarized.append(record)
+                continue
+            counts[summary.status] += 1
+            title = str(record.get("title") or record.get("name") or "")
+            counts["scheduled"] += self.summaries.schedule(tenant_id, kind, str(record["id"]), title, summary)
+            summarized.append({**record, "content": summary.text})
+        return summarized
@@ -2,7 +2,7 @@
 MindMesh State Management
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -39,6 +39,8 @@ class MindMeshState(BaseModel):
     guardrails_checks: Optional[List[Dict[str, Any]]] = Field(default=None, description="Guardrails check results")
     approval_required: bool = Field(default=False, description="Whether approval is required")
     approval_payload: Optional[Dict[str, Any]] = Field(default=None, description="Approval payload")
+    approval_id: Optional[str] = Field(default=None, description="Pending or decided approval request")
+    approval_decision: Optional[Dict[str, Any]] = Field(default=None, description="Reviewer's decision on the approval")
     
     # Execution tracking
     current_step: Optional[str] = Field(default=None, description="Current execution step")
@@ -68,3 +70,68 @@ class MindMeshState(BaseModel):
     
     class Config:
         arbitrary_types_allowed = True
+
+
+def extend_lists(base: Optional[List[Any]], values: List[Optional[List[Any]]]) -> List[Any]:
+    """Append what each branch added on top of the shared base list"""
+    base = base or []
+    merged = list(base)
+    for value in values:
+        value = value or []
+        merged.extend(value[len(base):] if value[:len(base)] == base else value)
+    return merged
+
+
+def merge_dicts(base: Optional[Dict[str, Any]], values: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Combine the keys each branch set, nested dicts key by key, later branches winning on overlap"""
+    merged = dict(base or {})
+    for value in values:
+        for key, item in (value or {}).items():
+            current = merged.get(key)
+            merged[key] = merge_dicts(current, [item]) if isinstance(item, dict) and isinstance(current, dict) else item
+    return merged
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def sum_counters(base: Optional[Dict[str, Any]], values: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Add what each branch added to numeric counters on top of the shared base; other keys as merge_dicts"""
+    base = base or {}
+    values = [value or {} for value in values]
+    merged = merge_dicts(base, values)
+    for key in merged:
+        before = base.get(key)
+        if any(_is_number(value.get(key)) for value in values):
+            start = before if _is_number(before) else 0
+            merged[key] = start + sum(value[key] - start for value in values if _is_number(value.get(key)))
+        elif any(isinstance(value.get(key), dict) for value in values):
+            merged[key] = sum_counters(
+                before if isinstance(before, dict) else None,
+                [value[key] for value in values if isinstance(value.get(key), dict)],
+            )
+    return merged
+
+
+def last_value(base: Any, values: List[Any]) -> Any:
+    """Take the value written by the last branch in declaration order"""
+    return values[-1]
+
+
+def latest(base: Any, values: List[Any]) -> Any:
+    """Take the greatest value, e.g. the newest timestamp"""
+    return max(values)
+
+
+# How writes from concurrent graph branches to the same field are combined.
+# A field missing here may only be changed by one branch of a parallel stage.
+STATE_MERGE_RULES: Dict[str, Callable[[Any, List[Any]], Any]] = {
+    "current_step": last_value,
+    "execution_log": extend_lists,
+    "errors": extend_lists,
+    "audit_log": extend_lists,
+    "cost_tracking": sum_counters,
+    "performance_metrics": merge_dicts,
+    "updated_at": latest,
+}
@@ -0,0 +1,175 @@
+"""
+MindMesh Run Event Streaming
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+from mindmesh.config.settings import settings
+
+
+@dataclass
+class RunEvent:
+    """A single progress event of a run"""
+    id: int
+    type: str
+    data: Dict[str, Any]
+    ts: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.type, "data": self.data, "ts": self.ts}
+
+
+class _RunStream:
+    """Bounded event log of one run"""
+
+    def __init__(self, run_id: str, tenant_id: Optional[str], max_events: int):
+        self.run_id = run_id
+        self.tenant_id = tenant_id
+        self.events: Deque[RunEvent] = deque(maxlen=max_events)
+        self.last_id = 0
+        self.closed = False
+        self.closed_at: Optional[float] = None
+        self.changed = asyncio.Event()
+
+
+class RunEventBroker:
+    """
+    In-process fan-out of run events to any number of subscribers.
+
+    Each run keeps a bounded ring of its most recent events. Publishing never
+    blocks: subscribers read from the ring at their own pace, so a slow
+    client only delays itself. A subscriber that falls further behind than
+    the ring holds receives a ``stream.gap`` event and continues from the
+    oldest retained event. Reconnecting clients pass the last event ID they
+    saw and resume right after it. Listeners are called with every
+    published event, e.g. to forward it out of the process.
+    """
+
+    def __init__(self, max_events_per_run: int = 1000, max_runs: int = 1000, retention_seconds: float = 600.0):
+        self.max_events_per_run = max_events_per_run
+        self.max_runs = max_runs
+        self.retention_seconds = retention_seconds
+        self._streams: "OrderedDict[str, _RunStream]" = OrderedDict()
+        self._listeners: List[Callable[[str, RunEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[str, RunEvent], None]) -> None:
+        """Call listener(run_id, event) for every event published from now on; it must not block"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, RunEvent], None]) -> None:
+        self._listeners.remove(listener)
+
+    def open(self, run_id: str, tenant_id: Optional[str] = None) -> None:
+        """Start (or restart) the event log of a run"""
+        self._expire()
+        stream = self._streams.get(run_id)
+        if stream is None:
+            stream = _RunStream(run_id, tenant_id, self.max_events_per_run)
+            self._streams[run_id] = stream
+        else:
+            # A resumed run keeps its event IDs monotonic
+            stream.closed = False
+            stream.closed_at = None
+        self._streams.move_to_end(run_id)
+        while len(self._streams) > self.max_runs:
+            self._streams.popitem(last=False)
+
+    def publish(self, run_id: str, event_type: str, data: Dict[str, Any]) -> Optional[RunEvent]:
+        """Append an event to a run's log and wake its subscribers"""
+        stream = self._streams.get(run_id)
+        if stream is None:
+            return None
+        stream.last_id += 1
+        event = RunEvent(id=stream.last_id, type=event_type, data=data)
+        stream.events.append(event)
+        self._wake(stream)
+        for listener in self._listeners:
+            listener(run_id, event)
+        return event
+
+    def close(self, run_id: str) -> None:
+        """Mark a run's log complete; subscribers drain it and finish"""
+        stream = self._streams.get(run_id)
+        if stream is None:
+            return
+        stream.closed = True
+        stream.closed_at = time.time()
+        self._wake(stream)
+
+    def tenant_of(self, run_id: str) -> Optional[str]:
+        """Tenant that owns a run's stream"""
+        stream = self._streams.get(run_id)
+        return stream.tenant_id if stream else None
+
+    def has_run(self, run_id: str) -> bool:
+        return run_id in self._streams
+
+    async def subscribe(
+        self,
+        run_id: str,
+        last_event_id: int = 0,
+        heartbeat_seconds: Optional[float] = None,
+    ) -> AsyncIterator[Optional[RunEvent]]:
+        """
+        Yield events after last_event_id until the run closes. When
+        heartbeat_seconds is set, None is yielded after that much idle time
+        so transports can send keep-alives.
+        """
+        cursor = last_event_id
+        while True:
+            stream = self._streams.get(run_id)
+            if stream is None:
+                return
+
+            if stream.last_id > cursor:
+                first_id = stream.events[0].id
+                if cursor + 1 < first_id:
+                    missed = first_id - 1 - cursor
+                    cursor = first_id - 1
+                    yield RunEvent(
+                        id=cursor,
+                        type="stream.gap",
+                        data={"run_id": run_id, "missed": missed},
+                    )
+                    continue
+                # Snapshot the pending slice; the ring may move while we yield
+                pending = list(stream.events)[cursor + 1 - first_id:]
+                for event in pending:
+                    cursor = event.id
+                    yield event
+                continue
+
+            if stream.closed:
+                return
+
+            waiter = stream.changed
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield None
+
+    def _wake(self, stream: _RunStream) -> None:
+        """Release everyone waiting on the stream and arm a fresh waiter"""
+        stream.changed.set()
+        stream.changed = asyncio.Event()
+
+    def _expire(self) -> None:
+        """Drop logs of runs that finished longer ago than the retention window"""
+        cutoff = time.time() - self.retention_seconds
+        for run_id in [
+            run_id for run_id, stream in self._streams.items()
+            if stream.closed and stream.closed_at < cutoff
+        ]:
+            del self._streams[run_id]
+
+
+# Global run event broker
+run_events = RunEventBroker(
+    max_events_per_run=settings.RUN_EVENTS_BUFFER_SIZE,
+    max_runs=settings.RUN_EVENTS_MAX_RUNS,
+    retention_seconds=settings.RUN_EVENTS_RETENTION_SECONDS,
+)
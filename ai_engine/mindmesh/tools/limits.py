@@ -0,0 +1,117 @@
+"""
+MindMesh Connector Limits
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from mindmesh.config.settings import settings
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, up to ``burst`` at once"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> float:
+        """Take a token, waiting for one if needed; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class _ConnectorLimit:
+    def __init__(self, max_concurrent: int, rate_per_second: float, burst: int):
+        self.max_concurrent = max_concurrent
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.bucket = TokenBucket(rate_per_second, burst) if rate_per_second > 0 else None
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+
+
+class ConnectorLimits:
+    """
+    Concurrency and rate limits per connector, shared by every run in the
+    process, so parallel tool calls cannot overrun a provider's quota.
+    A call holds one of the connector's slots and takes a token from its
+    bucket before it starts; retries wait for their backoff outside the
+    slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        rate_per_second: float = 10.0,
+        burst: int = 10,
+        overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.overrides = overrides or {}
+        self._limits: Dict[str, _ConnectorLimit] = {}
+
+    def _limit(self, connector: str) -> _ConnectorLimit:
+        limit = self._limits.get(connector)
+        if limit is None:
+            override = self.overrides.get(connector, {})
+            limit = _ConnectorLimit(
+                int(override.get("max_concurrent", self.max_concurrent)),
+                float(override.get("rate_per_second", self.rate_per_second)),
+                int(override.get("burst", self.burst)),
+            )
+            self._limits[connector] = limit
+        return limit
+
+    @asynccontextmanager
+    async def slot(self, connector: str) -> AsyncIterator[None]:
+        limit = self._limit(connector)
+        async with limit.semaphore:
+            if limit.bucket is not None:
+                waited = await limit.bucket.acquire()
+                if waited:
+                    limit.throttled += 1
+                    limit.throttle_seconds += waited
+            limit.in_flight += 1
+            limit.calls += 1
+            try:
+                yield
+            finally:
+                limit.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            connector: {
+                "max_concurrent": limit.max_concurrent,
+                "in_flight": limit.in_flight,
+                "calls": limit.calls,
+                "throttled": limit.throttled,
+                "throttle_seconds": round(limit.throttle_seconds, 3),
+            }
+            for connector, limit in self._limits.items()
+        }
+
+
+# Global connector limits instance
+connector_limits = ConnectorLimits(
+    max_concurrent=settings.CONNECTOR_MAX_CONCURRENT_CALLS,
+    rate_per_second=settings.CONNECTOR_RATE_LIMIT_PER_SECOND,
+    burst=settings.CONNECTOR_RATE_LIMIT_BURST,
+    overrides=settings.CONNECTOR_LIMITS,
+)
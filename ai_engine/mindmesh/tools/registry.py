@@ -0,0 +1,50 @@
+"""
+MindMesh Tool Registry
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+# A tool takes its call's arguments and the results of the calls it depends on, keyed by call ID
+ToolFunction = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+class ToolError(Exception):
+    """A tool call failed; retryable=False for errors a retry cannot fix (bad arguments, denied scope)"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class Tool(NamedTuple):
+    name: str
+    connector: str
+    function: ToolFunction
+
+
+class ToolRegistry:
+    """Tools by name, each with the connector whose concurrency and rate limits it counts against"""
+
+    def __init__(self):
+        self._tools: Dict[str, Tool] = {}
+
+    def register(self, name: str, function: ToolFunction, connector: Optional[str] = None) -> None:
+        # "gmail.search" counts against the gmail connector unless told otherwise
+        self._tools[name] = Tool(name, connector or name.split(".", 1)[0], function)
+
+    def tool(self, name: str, connector: Optional[str] = None) -> Callable[[ToolFunction], ToolFunction]:
+        """Decorator form of register"""
+        def decorator(function: ToolFunction) -> ToolFunction:
+            self.register(name, function, connector)
+            return function
+        return decorator
+
+    def get(self, name: str) -> Optional[Tool]:
+        return self._tools.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._tools)
+
+
+# Global tool registry instance
+tool_registry = ToolRegistry()
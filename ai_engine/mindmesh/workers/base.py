@@ -0,0 +1,149 @@
+"""
+MindMesh Run Job Queue Interface
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Error of a job whose lease ran out on its last attempt
+LEASE_EXPIRED = "visibility timeout expired"
+
+
+@dataclass
+class Job:
+    """A graph run to execute, as claimed by a worker"""
+    job_id: str
+    run_id: str
+    tenant_id: Optional[str]
+    payload: Dict[str, Any]
+    attempts: int  # claims so far, including this one
+    max_attempts: int
+    created_at: float
+
+
+class JobQueue(ABC):
+    """
+    Durable queue of run jobs shared by the API and worker processes.
+
+    A claimed job is leased to one worker until its visibility timeout
+    passes; the worker extends the lease while it works. A job whose lease
+    runs out (its worker died or hung) becomes claimable again, and so
+    does a failed job until it has used ``max_attempts`` claims. Workers
+    also record heartbeats so live capacity can be observed.
+
+    The queue also keeps a record of every queued run (its tenant, status,
+    current step and any pause or cancel request) and the run's event
+    log, so API processes can check, control and stream runs that execute
+    in a worker. Statuses are those of mindmesh.graphs.run_control. When
+    a job fails for good, on its last attempt or when that attempt's lease
+    runs out, a run that has not stopped yet is recorded as failed with a
+    ``run.failed`` event in the same transaction.
+    """
+
+    @abstractmethod
+    def enqueue(
+        self,
+        run_id: str,
+        tenant_id: Optional[str],
+        payload: Dict[str, Any],
+        max_attempts: int = 3,
+        only_if: Optional[Sequence[str]] = None,
+    ) -> Optional[str]:
+        """
+        Queue a run, marking its record queued, and return the job ID.
+        With only_if, nothing is queued (and None returned) unless the
+        run's recorded status is one of those.
+        """
+
+    @abstractmethod
+    def claim(self, worker_id: str, visibility_timeout: float, max_running: Optional[int] = None) -> Optional[Job]:
+        """
+        Lease the next available job to a worker, or None if there is none
+        or max_running jobs are leased across all workers. Tenants take
+        turns: the next job is the oldest of the tenant holding the fewest
+        leases, among tenants with jobs ready, so a tenant with a backlog
+        cannot hold every worker while others wait.
+        """
+
+    @abstractmethod
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        """Push back a leased job's timeout; False once the worker no longer holds it"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        """Record a job's result; False if the lease was lost first"""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float) -> bool:
+        """Release a failed job for a retry after retry_delay, or fail it for good after its last attempt"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's state, attempts, result and error"""
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, info: Dict[str, Any]) -> None:
+        """Record that a worker is alive"""
+
+    @abstractmethod
+    def workers(self, since: float) -> List[Dict[str, Any]]:
+        """Workers with a heartbeat after since"""
+
+    @abstractmethod
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """A run's tenant, status, requested control, current step and last event ID"""
+
+    @abstractmethod
+    def request(self, run_id: str, control: str) -> Optional[str]:
+        """
+        Ask a queued or running run to pause or cancel; returns the status
+        it had, or None if the request does not apply. A suspended run
+        asked to cancel is cancelled at once, with a run.cancelled event.
+        """
+
+    @abstractmethod
+    def requests(self, run_ids: Sequence[str]) -> Dict[str, str]:
+        """Pending pause or cancel requests of some runs"""
+
+    @abstractmethod
+    def append_event(
+        self,
+        run_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Add an event to a run's log, optionally recording the run's new
+        status (which drops its request once it is no longer queued or
+        running) and step; returns the event ID, None for an unknown run.
+        """
+
+    @abstractmethod
+    def events(self, run_id: str, after: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """A run's events after the given event ID, oldest first"""
+
+    @abstractmethod
+    def prune(self, older_than: float) -> int:
+        """Delete finished jobs and runs and silent workers last updated before older_than"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Jobs per state"""
+
+    def close(self) -> None:
+        """Release queue resources"""
+
+
+def encode_payload(value: Any) -> str:
+    """Job payloads and results are JSON, readable by any worker"""
+    return json.dumps(value, default=str)
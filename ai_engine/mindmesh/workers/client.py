@@ -0,0 +1,180 @@
+"""
+MindMesh Run Queue Client
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from mindmesh.config.settings import settings
+from mindmesh.graphs.run_control import ACTIVE, AWAITING_APPROVAL, CANCELLED, PAUSED, SUSPENDED
+from mindmesh.workers.base import JobQueue
+
+# What the API needs to start, follow and control runs executed by the
+# workers; it imports no graph, model or index code
+
+_run_queue: Optional[JobQueue] = None
+_run_queue_lock = threading.Lock()
+
+
+def create_job_queue(backend: Optional[str] = None) -> JobQueue:
+    """Create the configured run job queue"""
+    backend = backend or settings.RUN_QUEUE_BACKEND
+
+    if backend == "sqlite":
+        from mindmesh.workers.sqlite import SQLiteJobQueue
+
+        return SQLiteJobQueue(
+            settings.resolve_path(settings.RUN_QUEUE_SQLITE_PATH),
+            max_events_per_run=settings.RUN_EVENTS_BUFFER_SIZE,
+        )
+    if backend == "redis":
+        from mindmesh.workers.redis import RedisJobQueue
+
+        return RedisJobQueue(
+            url=settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD,
+            max_events_per_run=settings.RUN_EVENTS_BUFFER_SIZE,
+        )
+    raise ValueError(f"Unknown run queue backend: {backend}")
+
+
+def get_run_queue() -> JobQueue:
+    """The process's run job queue, opened on first use"""
+    global _run_queue
+    with _run_queue_lock:
+        if _run_queue is None:
+            _run_queue = create_job_queue()
+        return _run_queue
+
+
+def enqueue_run(queue: JobQueue, goal_text: str, autonomy_level: str = "L1", **kwargs) -> Tuple[str, str]:
+    """Queue a graph run for the workers; returns the run ID and job ID"""
+    # Every run is checkpointed under its own run ID, fixed before it is queued
+    run_id = kwargs.setdefault("run_id", uuid.uuid4().hex)
+    job_id = queue.enqueue(
+        run_id,
+        kwargs.get("tenant_id"),
+        {"goal_text": goal_text, "autonomy_level": autonomy_level, "kwargs": kwargs},
+        max_attempts=settings.RUN_JOB_MAX_ATTEMPTS,
+    )
+    return run_id, job_id
+
+
+def enqueue_resume(queue: JobQueue, run_id: str, statuses: Sequence[str] = SUSPENDED) -> Optional[str]:
+    """Queue a suspended run to continue in a worker; None unless its status is one of statuses"""
+    run = queue.run(run_id)
+    if run is None:
+        return None
+    # Resumed under the tenant recorded when it was started, for fair scheduling
+    return queue.enqueue(
+        run_id,
+        run["tenant_id"],
+        {"resume": True},
+        max_attempts=settings.RUN_JOB_MAX_ATTEMPTS,
+        only_if=statuses,
+    )
+
+
+def pause_run(queue: JobQueue, run_id: str) -> bool:
+    """Ask the worker holding a queued or running run to pause it before its next node"""
+    return queue.request(run_id, PAUSED) is not None
+
+
+def cancel_run(queue: JobQueue, run_id: str) -> bool:
+    """
+    Cancel a run: the worker holding a queued or running run stops it,
+    a paused or waiting run is cancelled at once with its pending approvals
+    """
+    previous = queue.request(run_id, CANCELLED)
+    if previous in SUSPENDED:
+        from mindmesh.graphs.approvals import get_approval_store
+
+        get_approval_store().cancel_run(run_id)
+    return previous is not None
+
+
+def decide_approval(
+    queue: JobQueue,
+    approval_id: str,
+    decision: str,
+    decided_by: Optional[str] = None,
+    comments: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Decide a pending approval of a run waiting at the approval gate and
+    queue the run to continue in a worker, where the gate reads the
+    decision. Raises ValueError if no run waits on the approval.
+    """
+    from mindmesh.graphs.approvals import get_approval_store
+
+    approval_store = get_approval_store()
+    approval = approval_store.get(approval_id)
+    run = queue.run(approval["run_id"]) if approval is not None else None
+    if run is None or run["status"] != AWAITING_APPROVAL:
+        raise ValueError(f"Approval {approval_id} has no run waiting on it")
+    approval = approval_store.decide(approval_id, decision, decided_by, comments, payload)
+    if approval is None:
+        raise ValueError(f"Approval {approval_id} was already decided")
+    if enqueue_resume(queue, approval["run_id"], (AWAITING_APPROVAL,)) is None:
+        raise ValueError(f"Run {approval['run_id']} is no longer waiting on approval {approval_id}")
+    return approval
+
+
+def run_queue_stats(queue: JobQueue) -> Dict[str, Any]:
+    """
+    Jobs per state and the workers heard from within three heartbeats,
+    with the stats each reported (its engine's included)
+    """
+    live = queue.workers(time.time() - 3 * settings.RUN_WORKER_HEARTBEAT_SECONDS)
+    return {
+        "jobs": queue.counts(),
+        "workers": len(live),
+        "active_runs": sum(worker.get("active", 0) for worker in live),
+        "capacity": sum(worker.get("concurrency", 0) for worker in live),
+        "live_workers": live,
+    }
+
+
+async def follow_events(
+    queue: JobQueue,
+    run_id: str,
+    last_event_id: int = 0,
+    poll_seconds: float = 0.5,
+    heartbeat_seconds: Optional[float] = None,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield a run's events after last_event_id from the queue's event log
+    until the run stops (finishes, pauses or waits for approval). Like
+    RunEventBroker.subscribe, a reader that fell behind the retained log
+    gets a ``stream.gap`` event, and None is yielded after
+    heartbeat_seconds without events.
+    """
+    cursor = last_event_id
+    idle = 0.0
+    while True:
+        events = await asyncio.to_thread(queue.events, run_id, cursor)
+        if events:
+            idle = 0.0
+            if events[0]["id"] > cursor + 1:
+                missed = events[0]["id"] - 1 - cursor
+                cursor = events[0]["id"] - 1
+                yield {"id": cursor, "type": "stream.gap", "data": {"run_id": run_id, "missed": missed}, "ts": time.time()}
+            for event in events:
+                cursor = event["id"]
+                yield event
+            continue
+
+        # Read after the events, so an event recorded with the final status is never missed
+        run = await asyncio.to_thread(queue.run, run_id)
+        if run is None or (run["status"] not in ACTIVE and run["last_event_id"] <= cursor):
+            return
+
+        await asyncio.sleep(poll_seconds)
+        idle += poll_seconds
+        if heartbeat_seconds is not None and idle >= heartbeat_seconds:
+            idle = 0.0
+            yield None
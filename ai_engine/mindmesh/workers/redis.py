@@ -0,0 +1,447 @@
+"""
+MindMesh Redis Job Queue
+"""
+
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from mindmesh.graphs.run_control import CANCELLED
+from mindmesh.workers.base import COMPLETED, FAILED, LEASE_EXPIRED, QUEUED, RUNNING, Job, JobQueue, encode_payload
+
+# Jobs are hashes at {prefix}:job:{id}. Per tenant, {prefix}:visible:{tenant}
+# scores its queued and running jobs by when they may next be claimed
+# (retry time or lease expiry) and {prefix}:leases:{tenant} its running
+# jobs by lease expiry; {prefix}:tenants holds the tenants with jobs.
+# {prefix}:finished scores finished jobs by completion time and
+# {prefix}:counts holds the number of jobs per state. Run records are
+# hashes at {prefix}:run:{run_id}, with their events in a sorted set at
+# {prefix}:events:{run_id} scored by event ID; {prefix}:finished_runs
+# scores finished runs by when they finished. Every transition is one
+# script, so it is atomic on the server; a job failing for good records
+# its run as failed in the same script.
+
+_MOVE = """
+local function move(counts, key, from, to)
+    redis.call('HINCRBY', counts, from, -1)
+    redis.call('HINCRBY', counts, to, 1)
+    redis.call('HSET', key, 'state', to)
+end
+"""
+
+_APPEND = """
+local function append(prefix, finished, run_id, event, status, step, now, max_events)
+    local run_key = prefix .. ':run:' .. run_id
+    local id = redis.call('HINCRBY', run_key, 'last_event_id', 1)
+    if status ~= '' then
+        redis.call('HSET', run_key, 'status', status)
+        if status ~= 'queued' and status ~= 'running' then
+            redis.call('HSET', run_key, 'requested', '')
+        end
+        if status == 'completed' or status == 'failed' or status == 'cancelled' then
+            redis.call('ZADD', finished, now, run_id)
+        end
+    end
+    if step ~= '' then
+        redis.call('HSET', run_key, 'current_step', step)
+    end
+    redis.call('HSET', run_key, 'updated_at', now)
+    local events = prefix .. ':events:' .. run_id
+    redis.call('ZADD', events, id, id .. '|' .. event)
+    redis.call('ZREMRANGEBYSCORE', events, '-inf', id - tonumber(max_events))
+    return id
+end
+"""
+
+_FAIL_RUN = _APPEND + """
+local function fail_run(prefix, finished, run_id, error, now, max_events)
+    local status = redis.call('HGET', prefix .. ':run:' .. run_id, 'status')
+    if status == 'queued' or status == 'running' then
+        local data = {run_id = run_id, status = 'failed', error = error}
+        local event = cjson.encode({type = 'run.failed', data = data, ts = tonumber(now)})
+        append(prefix, finished, run_id, event, 'failed', '', now, max_events)
+    end
+end
+"""
+
+ENQUEUE = """
+local prefix, id, run_id, tenant, now = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[7]
+local run_key = prefix .. ':run:' .. run_id
+if ARGV[8] == '1' then
+    local status = redis.call('HGET', run_key, 'status')
+    local allowed = false
+    for i = 9, #ARGV do
+        if ARGV[i] == status then
+            allowed = true
+        end
+    end
+    if not allowed then
+        return false
+    end
+end
+if redis.call('EXISTS', run_key) == 0 then
+    redis.call('HSET', run_key, 'tenant_id', tenant, 'last_event_id', 0, 'current_step', '', 'created_at', now)
+elseif tenant ~= '' then
+    redis.call('HSET', run_key, 'tenant_id', tenant)
+end
+redis.call('HSET', run_key, 'status', 'queued', 'requested', '', 'updated_at', now)
+redis.call('ZREM', KEYS[3], run_id)
+-- A job is scheduled under its run's tenant, recorded when the run was first queued
+tenant = redis.call('HGET', run_key, 'tenant_id')
+redis.call('HSET', prefix .. ':job:' .. id, 'run_id', run_id, 'tenant_id', tenant, 'payload', ARGV[5],
+    'state', 'queued', 'attempts', 0, 'max_attempts', ARGV[6], 'worker_id', '', 'created_at', now, 'updated_at', now)
+redis.call('HINCRBY', KEYS[2], 'queued', 1)
+redis.call('ZADD', prefix .. ':visible:' .. tenant, now, id)
+redis.call('SADD', KEYS[1], tenant)
+return 1
+"""
+
+REQUEST = _APPEND + """
+local run_key = ARGV[1] .. ':run:' .. ARGV[2]
+local status = redis.call('HGET', run_key, 'status')
+if not status then
+    return false
+end
+if (status == 'queued' or status == 'running') and redis.call('HGET', run_key, 'requested') ~= 'cancelled' then
+    redis.call('HSET', run_key, 'requested', ARGV[3], 'updated_at', ARGV[4])
+    return status
+end
+if ARGV[3] == 'cancelled' and (status == 'paused' or status == 'awaiting_approval') then
+    append(ARGV[1], KEYS[1], ARGV[2], ARGV[6], 'cancelled', '', ARGV[4], ARGV[5])
+    return status
+end
+return false
+"""
+
+APPEND = _APPEND + """
+if redis.call('EXISTS', ARGV[1] .. ':run:' .. ARGV[2]) == 0 then
+    return false
+end
+return append(ARGV[1], KEYS[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6], ARGV[7])
+"""
+
+CLAIM = _MOVE + _FAIL_RUN + """
+local tenants, finished, counts = KEYS[1], KEYS[2], KEYS[3]
+local now, worker, lease_until, prefix = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local max_running = tonumber(ARGV[7])
+while true do
+    -- The tenant holding the fewest leases goes next, then the one waiting longest
+    local best, best_leases, best_at
+    local leased = 0
+    for _, tenant in ipairs(redis.call('SMEMBERS', tenants)) do
+        local leases = redis.call('ZCOUNT', prefix .. ':leases:' .. tenant, '(' .. now, '+inf')
+        leased = leased + leases
+        local head = redis.call('ZRANGEBYSCORE', prefix .. ':visible:' .. tenant, '-inf', now, 'WITHSCORES', 'LIMIT', 0, 1)
+        if #head > 0 then
+            local at = tonumber(head[2])
+            if not best or leases < best_leases or (leases == best_leases and at < best_at) then
+                best, best_leases, best_at = tenant, leases, at
+            end
+        elseif redis.call('EXISTS', prefix .. ':visible:' .. tenant) == 0 then
+            redis.call('SREM', tenants, tenant)
+        end
+    end
+    if not best or (max_running >= 0 and leased >= max_running) then
+        return false
+    end
+    local visible, leases = prefix .. ':visible:' .. best, prefix .. ':leases:' .. best
+    local id = redis.call('ZRANGEBYSCORE', visible, '-inf', now, 'LIMIT', 0, 1)[1]
+    local key = prefix .. ':job:' .. id
+    local state = redis.call('HGET', key, 'state')
+    if not state then
+        redis.call('ZREM', visible, id)
+        redis.call('ZREM', leases, id)
+    elseif state == 'running' and tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+        -- A lease that ran out on the last attempt fails the job, and its run, for good
+        move(counts, key, state, 'failed')
+        redis.call('HSET', key, 'error', ARGV[6], 'worker_id', '', 'updated_at', now)
+        redis.call('ZREM', visible, id)
+        redis.call('ZREM', leases, id)
+        redis.call('ZADD', finished, now, id)
+        fail_run(prefix, KEYS[4], redis.call('HGET', key, 'run_id'), ARGV[6], now, ARGV[5])
+    else
+        move(counts, key, state, 'running')
+        redis.call('HSET', key, 'worker_id', worker, 'updated_at', now)
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('ZADD', visible, lease_until, id)
+        redis.call('ZADD', leases, lease_until, id)
+        local job = redis.call('HMGET', key, 'run_id', 'tenant_id', 'payload', 'attempts', 'max_attempts', 'created_at')
+        table.insert(job, 1, id)
+        return job
+    end
+end
+"""
+
+EXTEND = """
+local key = ARGV[1] .. ':job:' .. ARGV[2]
+if redis.call('HGET', key, 'state') ~= 'running' or redis.call('HGET', key, 'worker_id') ~= ARGV[3] then
+    return 0
+end
+local tenant = redis.call('HGET', key, 'tenant_id')
+redis.call('ZADD', ARGV[1] .. ':visible:' .. tenant, ARGV[4], ARGV[2])
+redis.call('ZADD', ARGV[1] .. ':leases:' .. tenant, ARGV[4], ARGV[2])
+redis.call('HSET', key, 'updated_at', ARGV[5])
+return 1
+"""
+
+COMPLETE = _MOVE + """
+local key = ARGV[1] .. ':job:' .. ARGV[2]
+if redis.call('HGET', key, 'state') ~= 'running' or redis.call('HGET', key, 'worker_id') ~= ARGV[3] then
+    return 0
+end
+local tenant = redis.call('HGET', key, 'tenant_id')
+move(KEYS[2], key, 'running', 'completed')
+redis.call('HSET', key, 'result', ARGV[4], 'error', '', 'worker_id', '', 'updated_at', ARGV[5])
+redis.call('ZREM', ARGV[1] .. ':visible:' .. tenant, ARGV[2])
+redis.call('ZREM', ARGV[1] .. ':leases:' .. tenant, ARGV[2])
+redis.call('ZADD', KEYS[1], ARGV[5], ARGV[2])
+return 1
+"""
+
+FAIL = _MOVE + _FAIL_RUN + """
+local key = ARGV[1] .. ':job:' .. ARGV[2]
+if redis.call('HGET', key, 'state') ~= 'running' or redis.call('HGET', key, 'worker_id') ~= ARGV[3] then
+    return 0
+end
+local tenant = redis.call('HGET', key, 'tenant_id')
+local visible = ARGV[1] .. ':visible:' .. tenant
+redis.call('HSET', key, 'error', ARGV[4], 'worker_id', '', 'updated_at', ARGV[5])
+redis.call('ZREM', ARGV[1] .. ':leases:' .. tenant, ARGV[2])
+if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+    move(KEYS[2], key, 'running', 'failed')
+    redis.call('ZREM', visible, ARGV[2])
+    redis.call('ZADD', KEYS[1], ARGV[5], ARGV[2])
+    fail_run(ARGV[1], KEYS[3], redis.call('HGET', key, 'run_id'), ARGV[4], ARGV[5], ARGV[7])
+else
+    move(KEYS[2], key, 'running', 'queued')
+    redis.call('ZADD', visible, ARGV[6], ARGV[2])
+end
+return 1
+"""
+
+PRUNE = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+for _, id in ipairs(ids) do
+    local key = ARGV[1] .. ':job:' .. id
+    local state = redis.call('HGET', key, 'state')
+    if state then
+        redis.call('HINCRBY', KEYS[2], state, -1)
+    end
+    redis.call('DEL', key)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local silent = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[2])
+if #silent > 0 then
+    redis.call('HDEL', KEYS[4], unpack(silent))
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[2])
+local runs = redis.call('ZRANGEBYSCORE', KEYS[5], '-inf', ARGV[2])
+for _, run_id in ipairs(runs) do
+    redis.call('DEL', ARGV[1] .. ':run:' .. run_id, ARGV[1] .. ':events:' .. run_id)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[5], '-inf', ARGV[2])
+return #ids
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue shared by API and worker processes across hosts through any
+    Redis-protocol server with Lua scripting (Redis, KeyDB, Dragonfly).
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: Optional[str] = None,
+        password: Optional[str] = None,
+        prefix: str = "runjobs",
+        max_events_per_run: int = 1000,
+    ):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, password=password, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self.max_events_per_run = max_events_per_run
+        self._tenants = f"{prefix}:tenants"
+        self._finished = f"{prefix}:finished"
+        self._counts = f"{prefix}:counts"
+        self._workers = f"{prefix}:workers"
+        self._worker_info = f"{prefix}:worker_info"
+        self._finished_runs = f"{prefix}:finished_runs"
+        self._enqueue = client.register_script(ENQUEUE)
+        self._request = client.register_script(REQUEST)
+        self._append = client.register_script(APPEND)
+        self._claim = client.register_script(CLAIM)
+        self._extend = client.register_script(EXTEND)
+        self._complete = client.register_script(COMPLETE)
+        self._fail = client.register_script(FAIL)
+        self._prune = client.register_script(PRUNE)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def enqueue(
+        self,
+        run_id: str,
+        tenant_id: Optional[str],
+        payload: Dict[str, Any],
+        max_attempts: int = 3,
+        only_if: Optional[Sequence[str]] = None,
+    ) -> Optional[str]:
+        job_id = uuid.uuid4().hex
+        queued = self._enqueue(
+            keys=[self._tenants, self._counts, self._finished_runs],
+            args=[
+                self.prefix, job_id, run_id, tenant_id or "", encode_payload(payload), max_attempts, time.time(),
+                "0" if only_if is None else "1", *(only_if or ()),
+            ],
+        )
+        return job_id if queued else None
+
+    def claim(self, worker_id: str, visibility_timeout: float, max_running: Optional[int] = None) -> Optional[Job]:
+        now = time.time()
+        row = self._claim(
+            keys=[self._tenants, self._finished, self._counts, self._finished_runs],
+            args=[
+                now, worker_id, now + visibility_timeout, self.prefix, self.max_events_per_run, LEASE_EXPIRED,
+                -1 if max_running is None else max_running,
+            ],
+        )
+        if not row:
+            return None
+        job_id, run_id, tenant_id, payload, attempts, max_attempts, created_at = row
+        return Job(job_id, run_id, tenant_id or None, json.loads(payload), int(attempts), int(max_attempts), float(created_at))
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        return bool(self._extend(
+            keys=[],
+            args=[self.prefix, job_id, worker_id, now + visibility_timeout, now],
+        ))
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        return bool(self._complete(
+            keys=[self._finished, self._counts],
+            args=[self.prefix, job_id, worker_id, encode_payload(result), time.time()],
+        ))
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float) -> bool:
+        now = time.time()
+        return bool(self._fail(
+            keys=[self._finished, self._counts, self._finished_runs],
+            args=[self.prefix, job_id, worker_id, error, now, now + retry_delay, self.max_events_per_run],
+        ))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        fields = self.client.hgetall(self._job_key(job_id))
+        if not fields:
+            return None
+        return {
+            "job_id": job_id,
+            "run_id": fields["run_id"],
+            "tenant_id": fields.get("tenant_id") or None,
+            "state": fields["state"],
+            "attempts": int(fields["attempts"]),
+            "max_attempts": int(fields["max_attempts"]),
+            "worker_id": fields.get("worker_id") or None,
+            "result": json.loads(fields["result"]) if fields.get("result") else None,
+            "error": fields.get("error") or None,
+            "created_at": float(fields["created_at"]),
+            "updated_at": float(fields["updated_at"]),
+        }
+
+    def heartbeat(self, worker_id: str, info: Dict[str, Any]) -> None:
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._workers, {worker_id: time.time()})
+            pipe.hset(self._worker_info, worker_id, encode_payload(info))
+            pipe.execute()
+
+    def workers(self, since: float) -> List[Dict[str, Any]]:
+        beats = self.client.zrangebyscore(self._workers, f"({since}", "+inf", withscores=True)
+        if not beats:
+            return []
+        infos = self.client.hmget(self._worker_info, [worker_id for worker_id, _ in beats])
+        return [
+            {"worker_id": worker_id, "heartbeat_at": at, **json.loads(info or "{}")}
+            for (worker_id, at), info in zip(beats, infos)
+        ]
+
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        fields = self.client.hgetall(f"{self.prefix}:run:{run_id}")
+        if not fields:
+            return None
+        return {
+            "run_id": run_id,
+            "tenant_id": fields.get("tenant_id") or None,
+            "status": fields["status"],
+            "requested": fields.get("requested") or None,
+            "current_step": fields.get("current_step") or None,
+            "last_event_id": int(fields["last_event_id"]),
+            "created_at": float(fields["created_at"]),
+            "updated_at": float(fields["updated_at"]),
+        }
+
+    def request(self, run_id: str, control: str) -> Optional[str]:
+        now = time.time()
+        event = self._event("run.cancelled", {"run_id": run_id, "status": CANCELLED}, now)
+        status = self._request(
+            keys=[self._finished_runs],
+            args=[self.prefix, run_id, control, now, self.max_events_per_run, event],
+        )
+        return status or None
+
+    def requests(self, run_ids: Sequence[str]) -> Dict[str, str]:
+        if not run_ids:
+            return {}
+        with self.client.pipeline(transaction=False) as pipe:
+            for run_id in run_ids:
+                pipe.hget(f"{self.prefix}:run:{run_id}", "requested")
+            requested = pipe.execute()
+        return {run_id: control for run_id, control in zip(run_ids, requested) if control}
+
+    def append_event(
+        self,
+        run_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+    ) -> Optional[int]:
+        now = time.time()
+        event_id = self._append(
+            keys=[self._finished_runs],
+            args=[
+                self.prefix, run_id, self._event(event_type, data, now), status or "", current_step or "",
+                now, self.max_events_per_run,
+            ],
+        )
+        return int(event_id) if event_id else None
+
+    def events(self, run_id: str, after: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        members = self.client.zrangebyscore(f"{self.prefix}:events:{run_id}", f"({after}", "+inf", start=0, num=limit)
+        events = []
+        for member in members:
+            event_id, event = member.split("|", 1)
+            events.append({"id": int(event_id), **json.loads(event)})
+        return events
+
+    @staticmethod
+    def _event(event_type: str, data: Dict[str, Any], now: float) -> str:
+        return encode_payload({"type": event_type, "data": data, "ts": now})
+
+    def prune(self, older_than: float) -> int:
+        return int(self._prune(
+            keys=[self._finished, self._counts, self._workers, self._worker_info, self._finished_runs],
+            args=[self.prefix, older_than],
+        ))
+
+    def counts(self) -> Dict[str, int]:
+        counts = self.client.hgetall(self._counts)
+        return {state: int(counts.get(state, 0)) for state in (QUEUED, RUNNING, COMPLETED, FAILED)}
+
+    def close(self) -> None:
+        self.client.close()
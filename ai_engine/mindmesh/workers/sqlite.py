@@ -0,0 +1,388 @@
+"""
+MindMesh SQLite Job Queue
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from mindmesh.graphs.run_control import ACTIVE, CANCELLED, SUSPENDED
+from mindmesh.workers.base import COMPLETED, FAILED, LEASE_EXPIRED, QUEUED, RUNNING, Job, JobQueue, encode_payload
+
+# visible_at is when a job may next be claimed: its retry time while
+# queued, its lease expiry while running
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run_jobs (
+    job_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    tenant_id TEXT,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    max_attempts INTEGER NOT NULL,
+    visible_at REAL NOT NULL,
+    worker_id TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_run_jobs_claimable ON run_jobs (state, visible_at);
+CREATE INDEX IF NOT EXISTS ix_run_jobs_tenant ON run_jobs (tenant_id, state, visible_at);
+CREATE TABLE IF NOT EXISTS run_workers (
+    worker_id TEXT PRIMARY KEY,
+    info TEXT NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    tenant_id TEXT,
+    status TEXT NOT NULL,
+    requested TEXT,
+    current_step TEXT,
+    last_event_id INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_runs_finished ON runs (status, updated_at);
+CREATE TABLE IF NOT EXISTS run_events (
+    run_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (run_id, event_id)
+);
+"""
+
+FINISHED_RUN_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Single-file job queue for local development and tests. Worker
+    processes on the same host share it; claims take SQLite's write lock,
+    so a job is leased to exactly one of them.
+    """
+
+    def __init__(self, path: str, max_events_per_run: int = 1000):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.max_events_per_run = max_events_per_run
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def enqueue(
+        self,
+        run_id: str,
+        tenant_id: Optional[str],
+        payload: Dict[str, Any],
+        max_attempts: int = 3,
+        only_if: Optional[Sequence[str]] = None,
+    ) -> Optional[str]:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            if only_if is not None:
+                row = conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+                if row is None or row[0] not in only_if:
+                    return None
+            conn.execute(
+                "INSERT INTO runs (run_id, tenant_id, status, last_event_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, 0, ?, ?) ON CONFLICT (run_id) DO UPDATE SET "
+                "tenant_id = COALESCE(excluded.tenant_id, tenant_id), status = excluded.status, "
+                "requested = NULL, updated_at = excluded.updated_at",
+                (run_id, tenant_id, QUEUED, now, now),
+            )
+            # A job is scheduled under its run's tenant, recorded when the run was first queued
+            tenant_id = conn.execute("SELECT tenant_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO run_jobs (job_id, run_id, tenant_id, payload, state, attempts, max_attempts, "
+                "visible_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?)",
+                (job_id, run_id, tenant_id, encode_payload(payload), QUEUED, max_attempts, now, now, now),
+            )
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout: float, max_running: Optional[int] = None) -> Optional[Job]:
+        now = time.time()
+        with self._transaction() as conn:
+            # A lease that ran out on the last attempt fails the job, and its run, for good
+            expired = conn.execute(
+                "SELECT job_id, run_id FROM run_jobs WHERE state = ? AND visible_at <= ? AND attempts >= max_attempts",
+                (RUNNING, now),
+            ).fetchall()
+            for job_id, run_id in expired:
+                conn.execute(
+                    "UPDATE run_jobs SET state = ?, error = ?, worker_id = NULL, updated_at = ? WHERE job_id = ?",
+                    (FAILED, LEASE_EXPIRED, now, job_id),
+                )
+                self._fail_run(conn, run_id, LEASE_EXPIRED)
+            leases = dict(conn.execute(
+                "SELECT tenant_id, COUNT(*) FROM run_jobs WHERE state = ? AND visible_at > ? GROUP BY tenant_id",
+                (RUNNING, now),
+            ).fetchall())
+            if max_running is not None and sum(leases.values()) >= max_running:
+                return None
+            # The tenant holding the fewest leases goes next, then the one waiting longest
+            ready = conn.execute(
+                "SELECT tenant_id, MIN(visible_at) FROM run_jobs WHERE state IN (?, ?) AND visible_at <= ? "
+                "GROUP BY tenant_id",
+                (QUEUED, RUNNING, now),
+            ).fetchall()
+            row = None
+            if ready:
+                tenant_id, _ = min(ready, key=lambda tenant: (leases.get(tenant[0], 0), tenant[1]))
+                row = conn.execute(
+                    "SELECT job_id, run_id, tenant_id, payload, attempts, max_attempts, created_at FROM run_jobs "
+                    "WHERE tenant_id IS ? AND state IN (?, ?) AND visible_at <= ? ORDER BY visible_at LIMIT 1",
+                    (tenant_id, QUEUED, RUNNING, now),
+                ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE run_jobs SET state = ?, attempts = attempts + 1, worker_id = ?, visible_at = ?, "
+                    "updated_at = ? WHERE job_id = ?",
+                    (RUNNING, worker_id, now + visibility_timeout, now, row[0]),
+                )
+        if row is None:
+            return None
+        job_id, run_id, tenant_id, payload, attempts, max_attempts, created_at = row
+        return Job(job_id, run_id, tenant_id, json.loads(payload), attempts + 1, max_attempts, created_at)
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE run_jobs SET visible_at = ?, updated_at = ? WHERE job_id = ? AND worker_id = ? AND state = ?",
+                (now + visibility_timeout, now, job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE run_jobs SET state = ?, result = ?, error = NULL, worker_id = NULL, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND state = ?",
+                (COMPLETED, encode_payload(result), time.time(), job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT run_id, attempts >= max_attempts FROM run_jobs WHERE job_id = ? AND worker_id = ? AND state = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            run_id, final = row
+            conn.execute(
+                "UPDATE run_jobs SET state = ?, visible_at = ?, error = ?, worker_id = NULL, updated_at = ? "
+                "WHERE job_id = ?",
+                (FAILED if final else QUEUED, now + retry_delay, error, now, job_id),
+            )
+            if final:
+                self._fail_run(conn, run_id, error)
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, tenant_id, state, attempts, max_attempts, worker_id, result, error, "
+                "created_at, updated_at FROM run_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        run_id, tenant_id, state, attempts, max_attempts, worker_id, result, error, created_at, updated_at = row
+        return {
+            "job_id": job_id,
+            "run_id": run_id,
+            "tenant_id": tenant_id,
+            "state": state,
+            "attempts": attempts,
+            "max_attempts": max_attempts,
+            "worker_id": worker_id,
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def heartbeat(self, worker_id: str, info: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_workers (worker_id, info, heartbeat_at) VALUES (?, ?, ?)",
+                (worker_id, encode_payload(info), time.time()),
+            )
+
+    def workers(self, since: float) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id, info, heartbeat_at FROM run_workers WHERE heartbeat_at > ? ORDER BY worker_id",
+                (since,),
+            ).fetchall()
+        return [{"worker_id": worker_id, "heartbeat_at": at, **json.loads(info)} for worker_id, info, at in rows]
+
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tenant_id, status, requested, current_step, last_event_id, created_at, updated_at "
+                "FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        tenant_id, status, requested, current_step, last_event_id, created_at, updated_at = row
+        return {
+            "run_id": run_id,
+            "tenant_id": tenant_id,
+            "status": status,
+            "requested": requested,
+            "current_step": current_step,
+            "last_event_id": last_event_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def request(self, run_id: str, control: str) -> Optional[str]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status, requested FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            status, requested = row
+            if status in ACTIVE and requested != CANCELLED:
+                conn.execute(
+                    "UPDATE runs SET requested = ?, updated_at = ? WHERE run_id = ?", (control, time.time(), run_id)
+                )
+                return status
+            if control == CANCELLED and status in SUSPENDED:
+                self._append(conn, run_id, "run.cancelled", {"run_id": run_id, "status": CANCELLED}, CANCELLED, None)
+                return status
+        return None
+
+    def requests(self, run_ids: Sequence[str]) -> Dict[str, str]:
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT run_id, requested FROM runs WHERE run_id IN ({placeholders}) AND requested IS NOT NULL",
+                tuple(run_ids),
+            ).fetchall()
+        return dict(rows)
+
+    def append_event(
+        self,
+        run_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+    ) -> Optional[int]:
+        with self._transaction() as conn:
+            return self._append(conn, run_id, event_type, data, status, current_step)
+
+    def _append(
+        self,
+        conn: sqlite3.Connection,
+        run_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        status: Optional[str],
+        current_step: Optional[str],
+    ) -> Optional[int]:
+        now = time.time()
+        cursor = conn.execute(
+            "UPDATE runs SET last_event_id = last_event_id + 1, status = COALESCE(?, status), "
+            "requested = CASE WHEN COALESCE(?, status) IN (?, ?) THEN requested END, "
+            "current_step = COALESCE(?, current_step), updated_at = ? WHERE run_id = ?",
+            (status, status, *ACTIVE, current_step, now, run_id),
+        )
+        if cursor.rowcount == 0:
+            return None
+        event_id = conn.execute("SELECT last_event_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+        conn.execute(
+            "INSERT INTO run_events (run_id, event_id, type, data, ts) VALUES (?, ?, ?, ?, ?)",
+            (run_id, event_id, event_type, encode_payload(data), now),
+        )
+        conn.execute(
+            "DELETE FROM run_events WHERE run_id = ? AND event_id <= ?",
+            (run_id, event_id - self.max_events_per_run),
+        )
+        return event_id
+
+    def _fail_run(self, conn: sqlite3.Connection, run_id: str, error: str) -> None:
+        """Record the run of a job out of attempts as failed, unless it already stopped"""
+        row = conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is not None and row[0] in ACTIVE:
+            self._append(conn, run_id, "run.failed", {"run_id": run_id, "status": FAILED, "error": error}, FAILED, None)
+
+    def events(self, run_id: str, after: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_id, type, data, ts FROM run_events WHERE run_id = ? AND event_id > ? "
+                "ORDER BY event_id LIMIT ?",
+                (run_id, after, limit),
+            ).fetchall()
+        return [{"id": event_id, "type": type_, "data": json.loads(data), "ts": ts} for event_id, type_, data, ts in rows]
+
+    def prune(self, older_than: float) -> int:
+        placeholders = ", ".join("?" * len(FINISHED_RUN_STATUSES))
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM run_jobs WHERE state IN (?, ?) AND updated_at < ?", (COMPLETED, FAILED, older_than)
+            )
+            conn.execute(
+                f"DELETE FROM run_events WHERE run_id IN (SELECT run_id FROM runs "
+                f"WHERE status IN ({placeholders}) AND updated_at < ?)",
+                (*FINISHED_RUN_STATUSES, older_than),
+            )
+            conn.execute(
+                f"DELETE FROM runs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*FINISHED_RUN_STATUSES, older_than),
+            )
+            conn.execute("DELETE FROM run_workers WHERE heartbeat_at < ?", (older_than,))
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM run_jobs GROUP BY state").fetchall()
+        return {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    """Holds the queue's lock and SQLite's write lock for one transaction"""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
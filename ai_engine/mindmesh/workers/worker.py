@@ -0,0 +1,367 @@
+"""
+MindMesh Run Workers
+
+Usage (from ai_engine/):
+    python -m mindmesh.workers.worker --processes 4
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from mindmesh.config.settings import settings
+from mindmesh.graphs.run_control import AWAITING_APPROVAL, CANCELLED, COMPLETED, FAILED, PAUSED, QUEUED, RUNNING
+from mindmesh.streaming.events import RunEvent, RunEventBroker, run_events
+from mindmesh.workers.base import Job, JobQueue
+from mindmesh.workers.client import create_job_queue
+
+logger = logging.getLogger(__name__)
+
+
+# Run events that move a run to a new status
+EVENT_STATUSES = {
+    "run.started": RUNNING,
+    "run.paused": PAUSED,
+    "run.awaiting_approval": AWAITING_APPROVAL,
+    "run.cancelled": CANCELLED,
+    "run.completed": COMPLETED,
+    "run.failed": FAILED,
+}
+
+
+def engine_stats() -> Dict[str, Any]:
+    """Stats of the process's caches, indexes and pools, reported with its heartbeats"""
+    from mindmesh.caching.llm_cache import llm_cache
+    from mindmesh.classification.intent import intent_classifier
+    from mindmesh.graphs.run_control import run_controls
+    from mindmesh.graphs.run_scheduler import run_scheduler
+    from mindmesh.memory.ann_index import memory_index
+    from mindmesh.memory.context_packer import context_packer
+    from mindmesh.memory.embedding_pipeline import embedding_pipeline
+    from mindmesh.memory.ingestion import ingestion_pipeline
+    from mindmesh.memory.lexical_index import lexical_index
+    from mindmesh.memory.summary_store import summary_resolver
+    from mindmesh.tools.limits import connector_limits
+
+    return {
+        "intent_classifier": intent_classifier.stats(),
+        "llm_cache": llm_cache.stats(),
+        "embedding_pipeline": embedding_pipeline.stats(),
+        "memory_index": memory_index.stats(),
+        "lexical_index": lexical_index.stats(),
+        "ingestion": ingestion_pipeline.stats(),
+        "context_packer": context_packer.stats(),
+        "context_summaries": summary_resolver.stats(),
+        "run_scheduler": run_scheduler.stats(),
+        "run_controls": run_controls.stats(),
+        "tool_connectors": connector_limits.stats(),
+    }
+
+
+class RunWorker:
+    """
+    Pulls run jobs from the queue and executes them on the graph, up to
+    ``concurrency`` at a time and while fewer than ``max_running`` jobs are
+    leased across all workers; the queue picks the job fairly across
+    tenants. Every ``heartbeat_interval`` the worker
+    records a heartbeat and extends the lease of each job it holds; a job
+    whose lease was lost meanwhile (the worker stalled past the visibility
+    timeout and another worker claimed it) is cancelled here. Failed runs
+    are released for a retry after an exponential backoff.
+
+    The worker records the events its runs publish, and the status they
+    imply, in the queue's run log, and applies the pause and cancel
+    requests the API records there for runs it holds. Its heartbeats carry
+    its own stats and, with engine_stats, those of the engine in its process.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        graph: Any = None,
+        worker_id: Optional[str] = None,
+        concurrency: int = 4,
+        max_running: Optional[int] = None,
+        visibility_timeout: float = 60.0,
+        heartbeat_interval: float = 10.0,
+        poll_interval: float = 0.5,
+        retry_backoff: float = 5.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        events: Optional[RunEventBroker] = None,
+        engine_stats: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        self.queue = queue
+        self._graph = graph
+        self.events = events or run_events
+        self.engine_stats = engine_stats
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.max_running = max_running
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.retention_seconds = retention_seconds
+        self._active: Dict[str, Tuple[Job, asyncio.Task]] = {}
+        self._runs: Dict[str, Job] = {}  # by run ID, while the worker holds the job
+        self._applied: Dict[str, str] = {}  # controls applied to runs in progress
+        self._outbox: "asyncio.Queue[Tuple[Any, ...]]" = asyncio.Queue()
+        self.started_at = time.time()
+
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.lost_leases = 0
+
+    @property
+    def graph(self) -> Any:
+        # Built in the worker process, not in the API process that imports this module
+        if self._graph is None:
+            from mindmesh.graphs.main_graph import mindmesh_graph
+
+            self._graph = mindmesh_graph
+        return self._graph
+
+    async def serve(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until stop is set, then finish the runs in progress"""
+        self.events.add_listener(self._forward)
+        forwarder = asyncio.create_task(self._record_events())
+        heartbeat = asyncio.create_task(self._heartbeats())
+        controls = asyncio.create_task(self._apply_controls())
+        stopping = asyncio.create_task(stop.wait())
+        try:
+            while not stop.is_set():
+                if len(self._active) < self.concurrency:
+                    job = await asyncio.to_thread(
+                        self.queue.claim, self.worker_id, self.visibility_timeout, self.max_running
+                    )
+                    if job is not None:
+                        self._active[job.job_id] = (job, asyncio.create_task(self._execute(job)))
+                        continue
+                # Idle or full: wake on a finished run, the poll interval or stop
+                await asyncio.wait(
+                    [stopping, *(task for _, task in self._active.values())],
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            if self._active:
+                await asyncio.wait([task for _, task in self._active.values()])
+            await self._outbox.join()
+        finally:
+            self.events.remove_listener(self._forward)
+            stopping.cancel()
+            heartbeat.cancel()
+            controls.cancel()
+            forwarder.cancel()
+
+    async def _execute(self, job: Job) -> None:
+        payload = job.payload
+        self._runs[job.run_id] = job
+        try:
+            run = await asyncio.to_thread(self.queue.run, job.run_id)
+            if run is not None and run["requested"] == CANCELLED:
+                # Cancelled while it waited in the queue
+                result = {"run_id": job.run_id, "status": CANCELLED}
+                self._record(job.run_id, "run.cancelled", result, CANCELLED)
+            elif payload.get("resume"):
+                result = await self.graph.resume(job.run_id, job.tenant_id)
+            else:
+                result = await self.graph.run(payload["goal_text"], payload.get("autonomy_level", "L1"), **payload.get("kwargs", {}))
+        except asyncio.CancelledError:
+            # Lease lost: the job now belongs to another worker
+            raise
+        except Exception as e:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            # On the last attempt the queue records the run as failed unless
+            # the run's own events already did, so they are recorded first
+            await self._flush()
+            await asyncio.to_thread(self.queue.fail, job.job_id, self.worker_id, f"{type(e).__name__}: {e}", delay)
+            if job.attempts < job.max_attempts:
+                self.retried += 1
+                self._record(job.run_id, "run.retrying", {
+                    "run_id": job.run_id,
+                    "attempt": job.attempts,
+                    "retry_in_seconds": delay,
+                }, QUEUED)
+            else:
+                self.failed += 1
+        else:
+            await asyncio.to_thread(self.queue.complete, job.job_id, self.worker_id, result)
+            self.completed += 1
+        finally:
+            self._active.pop(job.job_id, None)
+            if self._runs.get(job.run_id) is job:
+                del self._runs[job.run_id]
+            self._applied.pop(job.run_id, None)
+
+    def _forward(self, run_id: str, event: RunEvent) -> None:
+        """Broker listener: queue an event of a run this worker holds for recording"""
+        job = self._runs.get(run_id)
+        if job is None:
+            return
+        status = EVENT_STATUSES.get(event.type)
+        if status == FAILED and job.attempts < job.max_attempts:
+            # The job will be retried, so the run is not over
+            status = None
+        self._record(run_id, event.type, event.data, status, event.data.get("current_step"))
+
+    def _record(
+        self,
+        run_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+    ) -> None:
+        self._outbox.put_nowait((run_id, event_type, data, status, current_step))
+
+    async def _flush(self) -> None:
+        """Wait until the events queued so far are recorded"""
+        recorded = asyncio.get_running_loop().create_future()
+        self._outbox.put_nowait((recorded,))
+        await recorded
+
+    async def _record_events(self) -> None:
+        """Write queued run events to the queue's run log, in publishing order"""
+        while True:
+            item = await self._outbox.get()
+            try:
+                if len(item) == 1:
+                    # A _flush marker; its waiter is gone if the run's lease was lost
+                    if not item[0].done():
+                        item[0].set_result(None)
+                    continue
+                run_id, event_type, data, status, current_step = item
+                await asyncio.to_thread(self.queue.append_event, run_id, event_type, data, status, current_step)
+            except Exception:
+                logger.exception("Could not record %s event of run %s", event_type, run_id)
+            finally:
+                self._outbox.task_done()
+
+    async def _apply_controls(self) -> None:
+        """Pause or cancel runs in progress when the API requests it through the queue"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._runs:
+                continue
+            try:
+                requested = await asyncio.to_thread(self.queue.requests, list(self._runs))
+            except Exception:
+                logger.exception("Could not read run control requests")
+                continue
+            for run_id, control in requested.items():
+                if run_id not in self._runs or self._applied.get(run_id) == control:
+                    continue
+                # False until the graph has opened the run's control; tried again on the next poll
+                applied = self.graph.cancel(run_id) if control == CANCELLED else self.graph.pause(run_id)
+                if applied:
+                    self._applied[run_id] = control
+
+    async def _heartbeats(self) -> None:
+        beats = 0
+        while True:
+            await asyncio.to_thread(self.queue.heartbeat, self.worker_id, self.stats())
+            for job, task in list(self._active.values()):
+                held = await asyncio.to_thread(self.queue.extend, job.job_id, self.worker_id, self.visibility_timeout)
+                if not held and not task.done():
+                    self.lost_leases += 1
+                    # Its events are no longer this worker's to record
+                    self._runs.pop(job.run_id, None)
+                    task.cancel()
+            beats += 1
+            if beats % 100 == 1:
+                await asyncio.to_thread(self.queue.prune, time.time() - self.retention_seconds)
+            await asyncio.sleep(self.heartbeat_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "started_at": self.started_at,
+            "concurrency": self.concurrency,
+            "active": len(self._active),
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "lost_leases": self.lost_leases,
+        }
+        if self.engine_stats is not None:
+            stats["engine"] = self.engine_stats()
+        return stats
+
+
+def create_run_worker(queue: Optional[JobQueue] = None, graph: Any = None) -> RunWorker:
+    """A worker configured from settings"""
+    return RunWorker(
+        queue or create_job_queue(),
+        graph,
+        concurrency=settings.RUN_WORKER_CONCURRENCY,
+        max_running=settings.MAX_CONCURRENT_RUNS,
+        visibility_timeout=settings.RUN_JOB_VISIBILITY_TIMEOUT_SECONDS,
+        heartbeat_interval=settings.RUN_WORKER_HEARTBEAT_SECONDS,
+        poll_interval=settings.RUN_WORKER_POLL_SECONDS,
+        retry_backoff=settings.RUN_JOB_RETRY_BACKOFF_SECONDS,
+        retention_seconds=settings.RUN_JOB_RETENTION_SECONDS,
+        engine_stats=engine_stats,
+    )
+
+
+async def _serve_process() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+    await create_run_worker().serve(stop)
+
+    # Summary refreshes the runs started finish before the process exits
+    from mindmesh.memory.summary_store import summary_resolver
+
+    await summary_resolver.drain()
+
+
+def _worker_process() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(_serve_process())
+
+
+def main(processes: int) -> None:
+    """Run worker processes, replacing any that exit, until SIGTERM or SIGINT"""
+    context = multiprocessing.get_context("spawn")
+    stopping = False
+
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    workers: Set[Any] = set()
+    while not stopping:
+        for process in [process for process in workers if not process.is_alive()]:
+            workers.discard(process)
+        while len(workers) < processes:
+            process = context.Process(target=_worker_process, name="mindmesh-run-worker")
+            process.start()
+            workers.add(process)
+        time.sleep(1.0)
+
+    # Workers finish their runs in progress; unfinished jobs are retried elsewhere once their lease expires
+    for process in workers:
+        process.terminate()
+    for process in workers:
+        process.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=settings.RUN_WORKER_PROCESSES)
+    args = parser.parse_args()
+    main(args.processes)
@@ -0,0 +1,112 @@
+"""
+Tests for the per-tenant vector index
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+from mindmesh.memory.ann_index import IVFIndex, TenantVectorIndex
+
+
+def vectors(count: int, dim: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+def test_tenants_with_similar_ids_never_share_files(tmp_path):
+    index = TenantVectorIndex(str(tmp_path), dim=8)
+    tenants = ["a.b", "a/b", "a_b", ".."]
+    for seed, tenant in enumerate(tenants):
+        index.upsert(tenant, [f"doc-{tenant}"], vectors(1, 8, seed))
+        index.compact(tenant)
+
+    assert len({index._tenant_dir(tenant) for tenant in tenants}) == len(tenants)
+    assert all(os.path.dirname(index._tenant_dir(tenant)) == str(tmp_path) for tenant in tenants)
+
+    # A fresh process reads each tenant back from its own snapshot
+    fresh = TenantVectorIndex(str(tmp_path), dim=8)
+    for seed, tenant in enumerate(tenants):
+        hits = fresh.search(tenant, vectors(1, 8, seed)[0], k=5)
+        assert [doc_id for doc_id, _ in hits] == [f"doc-{tenant}"]
+
+
+def test_log_is_compacted_once_past_the_threshold(tmp_path):
+    index = TenantVectorIndex(str(tmp_path), dim=8, compact_bytes=1024)
+    for batch in range(4):
+        index.upsert("tenant", [f"doc-{batch}-{i}" for i in range(8)], vectors(8, 8, batch))
+
+    assert index.compactions >= 1
+    assert len(TenantVectorIndex(str(tmp_path), dim=8)._state("tenant").index) == 32
+
+
+def recall_and_error(index: IVFIndex, corpus: np.ndarray, queries: np.ndarray, k: int) -> Tuple[float, float]:
+    """Recall@k against exact cosine search, and the largest error of a returned score"""
+    unit = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    found = error = 0.0
+    for query in queries:
+        exact = unit @ (query / np.linalg.norm(query))
+        hits = index.search(query, k=k)
+        found += len({int(doc_id) for doc_id, _ in hits} & set(np.argsort(-exact)[:k].tolist()))
+        error = max(error, max(abs(score - exact[int(doc_id)]) for doc_id, score in hits))
+    return found / (k * len(queries)), error
+
+
+def test_int8_cells_re_ranked_at_full_precision_keep_recall_and_exact_scores():
+    corpus, queries = vectors(3000, 32, 0), vectors(50, 32, 1)
+    indexes = {}
+    for rerank in (1, 4):
+        index = IVFIndex(dim=32, nlist=16, nprobe=16, min_train_size=1000, quantization="int8", rerank=rerank)
+        index.add_many([str(i) for i in range(len(corpus))], corpus)
+        index.train()
+        indexes[rerank] = index
+
+    first_pass, _ = recall_and_error(indexes[1], corpus, queries, k=10)
+    recall, error = recall_and_error(indexes[4], corpus, queries, k=10)
+
+    assert recall >= 0.98
+    assert recall >= first_pass
+    assert error < 1e-5
+
+
+def doc_ids(index: TenantVectorIndex, tenant: str = "tenant") -> set:
+    return {doc_id for doc_id, _ in index.search(tenant, vectors(1, 8, 99)[0], k=100)}
+
+
+def test_workers_sharing_a_directory_replay_each_others_log_records(tmp_path):
+    first, second = TenantVectorIndex(str(tmp_path), dim=8), TenantVectorIndex(str(tmp_path), dim=8)
+    first.upsert("tenant", ["a", "b"], vectors(2, 8, 0))
+    assert doc_ids(second) == {"a", "b"}
+
+    second.delete("tenant", ["a"])
+    second.upsert("tenant", ["c"], vectors(1, 8, 1))
+
+    assert doc_ids(first) == {"b", "c"}
+
+
+def test_readers_switch_to_a_compacted_snapshot_and_its_log(tmp_path):
+    first, second = TenantVectorIndex(str(tmp_path), dim=8), TenantVectorIndex(str(tmp_path), dim=8)
+    first.upsert("tenant", ["a", "b"], vectors(2, 8, 0))
+    assert doc_ids(second) == {"a", "b"}
+
+    assert first.compact("tenant")
+    # Written after the switch, so it goes to the new generation's log
+    second.upsert("tenant", ["c"], vectors(1, 8, 1))
+    first.delete("tenant", ["b"])
+
+    assert doc_ids(first) == doc_ids(second) == {"a", "c"}
+    assert doc_ids(TenantVectorIndex(str(tmp_path), dim=8)) == {"a", "c"}
+    assert os.path.getsize(first._log_path("tenant", 1)) > 0
+
+
+def test_a_torn_record_left_by_a_crashed_writer_is_skipped_and_overwritten(tmp_path):
+    index = TenantVectorIndex(str(tmp_path), dim=8)
+    index.upsert("tenant", ["a"], vectors(1, 8, 0))
+    with open(index._log_path("tenant", 0), "ab") as log:
+        log.write(b"\x00\x00\x01\x00half a record")
+
+    recovered = TenantVectorIndex(str(tmp_path), dim=8)
+    assert doc_ids(recovered) == {"a"}
+    recovered.upsert("tenant", ["b"], vectors(1, 8, 1))
+
+    assert doc_ids(TenantVectorIndex(str(tmp_path), dim=8)) == {"a", "b"}
@@ -0,0 +1,125 @@
+"""
+Tests for the approval gate and its store
+"""
+
+import fakeredis
+import pytest
+
+from mindmesh.graphs import approvals
+from mindmesh.graphs.approvals import APPROVED, CANCELLED, EDITED, PENDING, ApprovalGate, ApprovalStore
+from mindmesh.graphs.redis_approvals import RedisApprovalStore
+from mindmesh.graphs.run_control import AWAITING_APPROVAL, QUEUED, RunInterrupted
+from mindmesh.state import MindMeshState
+from mindmesh.workers.client import decide_approval
+from mindmesh.workers.sqlite import SQLiteJobQueue
+
+TOOL_CALLS = [{"tool": "gmail.send", "args": {"to": "client@example.com"}}]
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def store(request):
+    if request.param == "sqlite":
+        store = ApprovalStore()
+    else:
+        store = RedisApprovalStore(client=fakeredis.FakeStrictRedis(decode_responses=True))
+    yield store
+    store.close()
+
+
+def waiting_state() -> MindMeshState:
+    return MindMeshState(goal_text="email the client", run_id="run-1", tenant_id="t1", tool_calls=TOOL_CALLS)
+
+
+async def stop_at_gate(gate: ApprovalGate) -> str:
+    with pytest.raises(RunInterrupted) as interrupted:
+        await gate(waiting_state())
+    assert interrupted.value.status == AWAITING_APPROVAL
+    return interrupted.value.data["approval_id"]
+
+
+@pytest.mark.asyncio
+async def test_gate_files_one_request_until_decided(store):
+    gate = ApprovalGate(store)
+
+    approval_id = await stop_at_gate(gate)
+
+    assert await stop_at_gate(gate) == approval_id
+    assert store.get(approval_id)["state"] == PENDING
+    assert store.get(approval_id)["payload"] == {"tool_calls": TOOL_CALLS}
+
+
+@pytest.mark.asyncio
+async def test_resumed_gate_reads_the_decision_from_the_store(store):
+    gate = ApprovalGate(store)
+    approval_id = await stop_at_gate(gate)
+    edited = [{"tool": "gmail.send", "args": {"to": "team@example.com"}}]
+    store.decide(approval_id, "edit", decided_by="u1", payload={"tool_calls": edited})
+
+    update = await gate(waiting_state())
+
+    assert update["guardrails_status"] == "recheck"
+    assert update["tool_calls"] == edited
+    assert update["approval_decision"]["decided_by"] == "u1"
+
+
+@pytest.mark.asyncio
+async def test_edited_calls_are_approved_once_guardrails_checked_them(store):
+    gate = ApprovalGate(store)
+    edited = [{"tool": "gmail.send", "args": {"to": "team@example.com"}}]
+    store.decide(await stop_at_gate(gate), "edit", payload={"tool_calls": edited})
+    update = await gate(waiting_state())
+
+    # Guardrails still wants approval for the edited calls: the edit is it
+    rechecked = MindMeshState(
+        goal_text="email the client", run_id="run-1", tenant_id="t1", tool_calls=edited,
+        approval_decision=update["approval_decision"],
+    )
+
+    assert (await gate(rechecked))["guardrails_status"] == "approved"
+
+
+@pytest.mark.asyncio
+async def test_rejection_is_recorded_as_an_error(store):
+    gate = ApprovalGate(store)
+    store.decide(await stop_at_gate(gate), "reject", comments="wrong recipient")
+
+    update = await gate(waiting_state())
+
+    assert update["guardrails_status"] == "rejected"
+    assert update["errors"] == ["Approval rejected: wrong recipient"]
+
+
+@pytest.mark.asyncio
+async def test_deciding_queues_the_waiting_run_to_continue(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(approvals, "_approval_store", store)
+    queue = SQLiteJobQueue(str(tmp_path / "run_queue.db"))
+    queue.enqueue("run-1", "t1", {})
+    queue.complete(queue.claim("w1", visibility_timeout=60).job_id, "w1", {})
+    approval_id = await stop_at_gate(ApprovalGate(store))
+    queue.append_event("run-1", "run.awaiting_approval", {"approval_id": approval_id}, status=AWAITING_APPROVAL)
+
+    approval = decide_approval(queue, approval_id, "approve", decided_by="u1")
+
+    assert approval["state"] == APPROVED
+    assert queue.run("run-1")["status"] == QUEUED
+    assert queue.claim("w1", visibility_timeout=60).payload == {"resume": True}
+    with pytest.raises(ValueError):
+        decide_approval(queue, approval_id, "reject")
+    queue.close()
+
+
+def test_inbox_pages_newest_first_and_counts_by_state(store):
+    for n in range(3):
+        store.request(f"run-{n}", "t1", {"n": n})
+    store.request("run-9", "t2", {})
+    store.decide(store.list("t1", PENDING, "run-0")[0]["id"], "edit", payload={"n": 10})
+    store.cancel_run("run-1")
+
+    first = store.list("t1", limit=2)
+    second = store.list("t1", limit=2, before=(first[-1]["created_at"], first[-1]["id"]))
+
+    assert [approval["run_id"] for approval in first + second] == ["run-2", "run-1", "run-0"]
+    assert [approval["run_id"] for approval in store.list("t1", PENDING)] == ["run-2"]
+    assert (store.count("t1"), store.count("t1", PENDING), store.count("t1", EDITED, "run-0")) == (3, 1, 1)
+    assert store.decided("run-0")["payload"] == {"n": 10}
+    assert store.counts()[CANCELLED] == 1
@@ -0,0 +1,90 @@
+"""
+Tests for the durable checkpoint saver
+"""
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from mindmesh.checkpointing.base import DELTA, FULL, CheckpointRecord, encode_frame
+from mindmesh.checkpointing.saver import DurableCheckpointSaver
+from mindmesh.checkpointing.sqlite import SQLiteCheckpointStore
+
+
+def config(run_id: str):
+    return {"configurable": {"thread_id": run_id}}
+
+
+def step(checkpoint, **values):
+    """The checkpoint after a step that wrote values"""
+    checkpoint = {
+        **checkpoint,
+        "channel_values": {**checkpoint["channel_values"], **values},
+        "channel_versions": dict(checkpoint["channel_versions"]),
+    }
+    for key in values:
+        checkpoint["channel_versions"][key] = checkpoint["channel_versions"].get(key, 0) + 1
+    return checkpoint
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    yield store
+    store.close()
+
+
+def saver(store, **kwargs):
+    return DurableCheckpointSaver(store=store, keyframe_interval=4, **kwargs)
+
+
+def test_delta_chain_round_trips_across_keyframes(store):
+    writer = saver(store)
+    checkpoint = empty_checkpoint()
+    for index in range(10):
+        checkpoint = step(checkpoint, current_step=f"node_{index}", **{f"output_{index}": [index] * 3})
+        writer.put(config("run"), checkpoint)
+
+    chain = store.load_chain("run")
+    assert [record.kind for record in chain] == [FULL, DELTA]
+    assert [record.seq for record in chain] == [8, 9]
+
+    # A process with nothing cached rebuilds the latest checkpoint from the chain
+    restored = saver(store).get(config("run"))
+    assert restored["channel_values"] == checkpoint["channel_values"]
+    assert restored["channel_versions"] == checkpoint["channel_versions"]
+    assert saver(store).get(config("missing")) is None
+
+
+def test_stale_writer_never_overwrites_frames(store):
+    first, second = saver(store), saver(store)
+    checkpoint = step(empty_checkpoint(), current_step="planner")
+    first.put(config("run"), checkpoint)
+
+    # The run moves to another process, which continues it
+    resumed = step(second.get(config("run")), current_step="executor", tool_results=["sent"])
+    second.put(config("run"), resumed)
+
+    # The first process still caches seq 0; its next write must not take seq 1 again
+    late = step(checkpoint, current_step="reflector")
+    first.put(config("run"), late)
+
+    chain = store.load_chain("run")
+    assert [record.seq for record in chain] == [2]
+    assert chain[0].kind == FULL
+    assert saver(store).get(config("run"))["channel_values"]["current_step"] == "reflector"
+
+
+def test_get_refreshes_a_cache_another_process_made_stale(store):
+    first, second = saver(store), saver(store)
+    first.put(config("run"), step(empty_checkpoint(), current_step="planner"))
+    second.put(config("run"), step(second.get(config("run")), current_step="executor"))
+
+    assert first.get(config("run"))["channel_values"]["current_step"] == "executor"
+
+
+def test_append_only_on_top_of_the_expected_frame(store):
+    record = CheckpointRecord("run", 0, FULL, encode_frame(empty_checkpoint()), 0.0)
+    assert store.append(record, None)
+    assert not store.append(record, None)
+    assert not store.append(CheckpointRecord("run", 1, DELTA, b"", 0.0), 5)
+    assert store.latest_seq("run") == 0
@@ -0,0 +1,65 @@
+"""
+Tests for packing retrieved memory into a token budget
+"""
+
+import random
+
+import pytest
+
+from mindmesh.memory.context_packer import ContextPacker, TokenCounter
+
+NOW = 1_700_000_000.0
+
+
+def packer(**kwargs) -> ContextPacker:
+    # No tokenizer by that name, so counts use the deterministic estimate
+    return ContextPacker(TokenCounter(encoding="estimate"), snippet_tokens=20, **kwargs)
+
+
+def retrieved(seed: int) -> dict:
+    rng = random.Random(seed)
+
+    def text() -> str:
+        return " ".join(f"word{rng.randrange(1000)}" for _ in range(rng.randrange(1, 80)))
+
+    return {
+        "documents": [
+            {"id": f"d{n}", "title": f"Doc {n}", "content": text(), "score": rng.random(), "app": rng.choice("ab")}
+            for n in range(8)
+        ],
+        "episodes": [{"id": f"e{n}", "summary": text(), "occurred_at": NOW - n * 86400} for n in range(5)],
+        "entities": [{"id": f"n{n}", "name": f"Entity {n}", "description": text()} for n in range(5)],
+    }
+
+
+@pytest.mark.parametrize("budget", [0, 5, 20, 60, 150, 400, 2000])
+def test_packed_context_never_exceeds_the_budget(budget):
+    context_packer = packer()
+    for seed in range(5):
+        packed = context_packer.pack(retrieved(seed), budget=budget, now=NOW)
+
+        assert packed.tokens == (context_packer.counter.count(packed.text) if packed.text else 0)
+        assert packed.tokens <= budget
+        assert len({entry.item.item_id for entry in packed.items}) == len(packed.items)
+
+
+def test_a_long_item_enters_as_a_snippet_and_gets_its_full_text_when_it_fits():
+    context_packer = packer()
+    long_text = " ".join(f"word{n}" for n in range(100))
+    sources = {"documents": [{"id": "d1", "title": "Plan", "content": long_text}]}
+    full = context_packer.counter.count(f"- [d1] Plan: {long_text}")
+
+    tight = context_packer.pack(sources, budget=full // 2, now=NOW)
+    roomy = context_packer.pack(sources, budget=full + 20, now=NOW)
+
+    assert [entry.truncated for entry in tight.items] == [True]
+    assert tight.items[0].line.endswith("…")
+    assert [entry.truncated for entry in roomy.items] == [False]
+    assert roomy.text == f"Documents:\n- [d1] Plan: {long_text}"
+
+
+def test_nothing_is_packed_when_no_item_fits():
+    packed = packer().pack(retrieved(0), budget=3, now=NOW)
+
+    assert (packed.text, packed.items, packed.tokens) == ("", [], 0)
+    assert packed.candidates == 18
@@ -0,0 +1,124 @@
+"""
+Tests for the embedding pipeline's batching, cache and failure handling
+"""
+
+import asyncio
+from typing import List, Sequence
+
+import numpy as np
+import pytest
+
+from mindmesh.caching.single_flight import SingleFlight
+from mindmesh.memory.embedding_cache import EmbeddingCache
+from mindmesh.memory.embedding_pipeline import EmbeddingPipeline, content_hash
+from mindmesh.memory.embeddings import EmbeddingBackend
+
+
+class StubBackend(EmbeddingBackend):
+    """Returns each text's length as its vector and records the batches it was sent"""
+
+    model = "stub"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False, short: bool = False):
+        self.batches: List[List[str]] = []
+        self.delay = delay
+        self.fail = fail
+        self.short = short
+
+    async def embed_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        self.batches.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("embedding service unavailable")
+        vectors = [np.array([len(text)], dtype=np.float32) for text in texts]
+        return vectors[:-1] if self.short else vectors
+
+
+class BrokenCache(EmbeddingCache):
+    def put_many(self, model, vectors):
+        raise OSError("disk full")
+
+
+def pipeline(backend: EmbeddingBackend, cache: EmbeddingCache = None, **kwargs) -> EmbeddingPipeline:
+    options = {"max_batch_size": 4, "max_wait": 0.01, **kwargs}
+    return EmbeddingPipeline(backend, cache or EmbeddingCache(), flights=SingleFlight("test"), **options)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_batches_and_the_cache():
+    # Cache lookups finish in any order; a slow backend keeps the first
+    # "text 0" in flight until its duplicate arrives
+    backend = StubBackend(delay=0.05)
+    embedder = pipeline(backend)
+
+    texts = [f"text {index}" for index in range(6)]
+    vectors = await asyncio.gather(*(embedder.embed(text) for text in texts), embedder.embed("text 0"))
+
+    assert [vector[0] for vector in vectors] == [len(text) for text in texts] + [6]
+    assert sorted(len(batch) for batch in backend.batches) == [2, 4]
+    assert embedder.stats()["coalesced"] == 1
+
+    results = await embedder.ingest([(text, None) for text in texts[:2]])
+    assert [result.source for result in results] == ["cache", "cache"]
+    assert len(backend.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_indexed_hashes_are_skipped():
+    backend = StubBackend()
+    embedder = pipeline(backend)
+
+    async def indexed(hashes):
+        return {content_hash("known")}
+
+    results = await embedder.ingest([("known", None), ("new", None)], indexed)
+
+    assert [result.source for result in results] == ["indexed", "embedded"]
+    assert results[0].vector is None
+    assert backend.batches == [["new"]]
+
+
+@pytest.mark.asyncio
+async def test_supplied_hash_must_match_the_text():
+    embedder = pipeline(StubBackend())
+
+    assert (await embedder.embed("hello", content_hash("hello")))[0] == 5
+    with pytest.raises(ValueError):
+        await embedder.embed("goodbye", content_hash("hello"))
+    # The rejected text did not poison the entry of the hash it claimed
+    assert (await embedder.embed("hello"))[0] == 5
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_reaches_every_waiter():
+    embedder = pipeline(StubBackend(fail=True))
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(embedder.embed(f"text {index}") for index in range(3)), return_exceptions=True),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert embedder.stats()["failed_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_short_backend_response_fails_the_batch_instead_of_hanging():
+    embedder = pipeline(StubBackend(short=True))
+
+    results = await asyncio.wait_for(
+        asyncio.gather(embedder.embed("a"), embedder.embed("bb"), embedder.embed("a"), return_exceptions=True),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cache_write_failure_still_resolves_waiters():
+    embedder = pipeline(StubBackend(), BrokenCache())
+
+    vectors = await asyncio.wait_for(asyncio.gather(embedder.embed("a"), embedder.embed("bb")), timeout=1)
+
+    assert [vector[0] for vector in vectors] == [1, 2]
+    assert embedder.stats()["failed_cache_writes"] == 1
@@ -0,0 +1,176 @@
+"""
+Tests for the tool DAG executor
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from mindmesh.nodes.executor import FAILED, SKIPPED, SUCCEEDED, Executor
+from mindmesh.tools.limits import ConnectorLimits
+from mindmesh.tools.registry import ToolError, ToolRegistry
+
+
+def make_executor(registry: ToolRegistry, **kwargs) -> Executor:
+    options = {"max_concurrent": 8, "timeout": 1.0, "max_attempts": 3, "retry_backoff": 0.0, **kwargs}
+    return Executor(registry, ConnectorLimits(max_concurrent=4, rate_per_second=0), **options)
+
+
+def by_id(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {result["id"]: result for result in results}
+
+
+@pytest.mark.asyncio
+async def test_dependencies_receive_results_and_independent_calls_overlap():
+    registry = ToolRegistry()
+    in_flight = {"now": 0, "max": 0}
+
+    @registry.tool("mail.search")
+    @registry.tool("drive.search")
+    async def search(args, dependencies):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return args["q"]
+
+    @registry.tool("llm.draft")
+    async def draft(args, dependencies):
+        return sorted(dependencies.values())
+
+    results = by_id(await make_executor(registry).execute([
+        {"id": "mail", "tool": "mail.search", "args": {"q": "a"}},
+        {"id": "files", "tool": "drive.search", "args": {"q": "b"}},
+        {"id": "draft", "tool": "llm.draft", "depends_on": ["mail", "files"]},
+    ]))
+
+    assert all(result["status"] == SUCCEEDED for result in results.values())
+    assert results["draft"]["result"] == ["a", "b"]
+    assert in_flight["max"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_call_skips_its_dependents_transitively():
+    registry = ToolRegistry()
+
+    @registry.tool("mail.search")
+    async def broken(args, dependencies):
+        raise ToolError("bad query", retryable=False)
+
+    @registry.tool("llm.draft")
+    async def draft(args, dependencies):
+        return "draft"
+
+    results = by_id(await make_executor(registry).execute([
+        {"id": "mail", "tool": "mail.search"},
+        {"id": "draft", "tool": "llm.draft", "depends_on": ["mail"]},
+        {"id": "send", "tool": "llm.draft", "depends_on": ["draft"]},
+        {"id": "other", "tool": "llm.draft"},
+    ]))
+
+    assert results["mail"]["status"] == FAILED
+    assert results["mail"]["attempts"] == 1
+    assert results["draft"]["status"] == SKIPPED
+    assert results["send"]["status"] == SKIPPED
+    assert results["other"]["status"] == SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_cycles_unknown_dependencies_and_duplicates_fail_without_running():
+    registry = ToolRegistry()
+    calls = []
+
+    @registry.tool("llm.draft")
+    async def draft(args, dependencies):
+        calls.append(args)
+        return "ok"
+
+    results = await make_executor(registry).execute([
+        {"id": "a", "tool": "llm.draft", "depends_on": ["b"]},
+        {"id": "b", "tool": "llm.draft", "depends_on": ["a"]},
+        {"id": "c", "tool": "llm.draft", "depends_on": ["missing"]},
+        {"id": "d", "tool": "llm.draft"},
+        {"id": "d", "tool": "llm.draft"},
+    ])
+    statuses = [(result["id"], result["status"], result["error"]) for result in results]
+
+    assert ("a", FAILED, "Dependency cycle") in statuses
+    assert ("b", FAILED, "Dependency cycle") in statuses
+    assert ("c", FAILED, "Unknown dependencies: missing") in statuses
+    assert ("d", FAILED, "Duplicate tool call id d") in statuses
+    assert ("d", SUCCEEDED, None) in statuses
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_call_depending_on_an_invalid_call_is_reported_once():
+    registry = ToolRegistry()
+
+    @registry.tool("llm.draft")
+    async def draft(args, dependencies):
+        return "ok"
+
+    results = await make_executor(registry).execute([
+        {"id": "a", "tool": "llm.draft", "depends_on": ["zz"]},
+        {"id": "b", "tool": "llm.draft", "depends_on": ["a", "yy"]},
+    ])
+
+    assert sorted(result["id"] for result in results) == ["a", "b"]
+    assert all(result["status"] in (FAILED, SKIPPED) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_and_timeouts_are_retried():
+    registry = ToolRegistry()
+    attempts = {"flaky": 0, "slow": 0}
+
+    @registry.tool("mail.flaky")
+    async def flaky(args, dependencies):
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            raise ConnectionError("connection reset")
+        return "ok"
+
+    @registry.tool("mail.slow")
+    async def slow(args, dependencies):
+        attempts["slow"] += 1
+        await asyncio.sleep(1)
+
+    results = by_id(await make_executor(registry, timeout=0.01, max_attempts=3).execute([
+        {"id": "flaky", "tool": "mail.flaky"},
+        {"id": "slow", "tool": "mail.slow"},
+    ]))
+
+    assert results["flaky"]["status"] == SUCCEEDED
+    assert results["flaky"]["attempts"] == 3
+    assert results["slow"]["status"] == FAILED
+    assert results["slow"]["attempts"] == 3
+    assert results["slow"]["error"] == "Timed out after 0.01s"
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_hold_a_run_slot():
+    registry = ToolRegistry()
+    attempts = {"flaky": 0}
+    finished = []
+
+    @registry.tool("mail.flaky")
+    async def flaky(args, dependencies):
+        attempts["flaky"] += 1
+        if attempts["flaky"] == 1:
+            raise ConnectionError("connection reset")
+        finished.append("flaky")
+
+    @registry.tool("drive.search")
+    async def search(args, dependencies):
+        finished.append("search")
+
+    # One run slot and a long backoff: the second call runs while the first waits to retry
+    results = by_id(await make_executor(registry, max_concurrent=1, retry_backoff=0.2).execute([
+        {"id": "flaky", "tool": "mail.flaky"},
+        {"id": "search", "tool": "drive.search"},
+    ]))
+
+    assert results["flaky"]["status"] == SUCCEEDED
+    assert finished[0] == "search"
@@ -0,0 +1,88 @@
+"""
+Tests for hybrid memory search and the memory reader's default retrieval
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from mindmesh.memory.ann_index import TenantVectorIndex
+from mindmesh.memory.document_store import MemoryDocumentStore
+from mindmesh.memory.embeddings import hashed_ngram_embedding
+from mindmesh.memory.hybrid_search import HybridMemorySearch
+from mindmesh.memory.lexical_index import TenantLexicalIndex
+from mindmesh.nodes import memory_reader
+from mindmesh.state import MindMeshState
+
+DIM = 64
+
+
+class StubPipeline:
+    async def embed(self, text: str) -> np.ndarray:
+        return hashed_ngram_embedding(text, DIM)
+
+
+@pytest.fixture
+def search(tmp_path):
+    return HybridMemorySearch(
+        TenantLexicalIndex(str(tmp_path / "lexical")),
+        TenantVectorIndex(str(tmp_path / "ann"), DIM),
+        StubPipeline(),
+        documents=MemoryDocumentStore(),
+    )
+
+
+async def seed(search: HybridMemorySearch) -> None:
+    await search.index("t1", "inc#0", {"title": "INC-4711 outage", "content": "Checkout failed for EU customers"})
+    await search.index("t1", "alice", {"title": "Alice Chen", "content": "Head of payments"}, {"kind": "entity"})
+    await search.index("t2", "other#0", {"title": "INC-4711 elsewhere", "content": "Another tenant's incident"})
+
+
+@pytest.mark.asyncio
+async def test_retrieve_returns_stored_text_and_highlights(search):
+    await seed(search)
+
+    records = await search.retrieve("t1", "INC-4711 checkout", k=5)
+
+    assert records[0]["id"] == "inc#0"
+    assert records[0]["content"] == "Checkout failed for EU customers"
+    assert records[0]["highlights"]["title"] == ["<em>INC-4711</em> outage"]
+    assert all(record["id"] != "other#0" for record in records)
+
+
+@pytest.mark.asyncio
+async def test_deleted_items_are_not_retrieved(search):
+    await seed(search)
+
+    assert await search.delete("t1", ["inc#0"]) == 1
+    assert all(record["id"] != "inc#0" for record in await search.retrieve("t1", "INC-4711", k=5))
+    assert search.documents.get_many("t1", ["inc#0"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_scoring_runs_off_the_event_loop(search):
+    await seed(search)
+    threads = []
+    lexical_search = search.lexical.search
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return lexical_search(*args, **kwargs)
+
+    search.lexical.search = recording
+    await search.search("t1", "outage")
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_memory_reader_retrieves_from_memory_search_by_default(search, monkeypatch):
+    await seed(search)
+    monkeypatch.setattr(memory_reader, "memory_search", search)
+
+    found = await memory_reader.search_memory(MindMeshState(goal_text="Who handles the INC-4711 payments outage?", tenant_id="t1"))
+
+    assert [record["id"] for record in found["retrieved_documents"]] == ["inc#0"]
+    assert [record["id"] for record in found["retrieved_entities"]] == ["alice"]
+    assert memory_reader.MemoryReader().retriever is memory_reader.search_memory
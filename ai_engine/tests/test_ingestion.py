@@ -0,0 +1,90 @@
+"""
+Tests for resuming and re-ingesting documents in the streaming ingestion pipeline
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from mindmesh.memory.ingestion import Chunk, IngestionPipeline, IngestionProgressStore, StreamingChunker
+
+TEXT = " ".join(f"word{n:03d}" for n in range(120))
+
+
+class StubEmbedder:
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return [np.array([len(text)], dtype=np.float32) for text in texts]
+
+
+class RecordingIndex:
+    """Records written and removed chunk indexes; fails the write call numbered fail_on"""
+
+    def __init__(self, fail_on: Optional[int] = None):
+        self.fail_on = fail_on
+        self.calls = 0
+        self.written: List[int] = []
+        self.removed: List[int] = []
+
+    async def write(self, doc_id: str, batch: List[Tuple[Chunk, np.ndarray]], metadata: Dict[str, Any]) -> None:
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError("index unavailable")
+        self.written += [chunk.index for chunk, _ in batch]
+
+    async def remove(self, doc_id: str, chunks: range, metadata: Dict[str, Any]) -> None:
+        self.removed += list(chunks)
+
+
+def chunk_count(text: str) -> int:
+    chunker = StreamingChunker(chunk_size=100, overlap=20)
+    return len(chunker.feed(text) + chunker.finish())
+
+
+def pipeline(index: RecordingIndex, progress: IngestionProgressStore) -> IngestionPipeline:
+    return IngestionPipeline(
+        index.write, index.remove, embedder=StubEmbedder(), progress=progress,
+        block_size=64, chunk_size=100, chunk_overlap=20, queue_size=1, embed_batch_size=2, embed_concurrency=1,
+    )
+
+
+@pytest.fixture
+def progress():
+    return IngestionProgressStore()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_ingestion_resumes_at_the_first_unwritten_chunk(progress):
+    index = RecordingIndex(fail_on=3)
+    with pytest.raises(ConnectionError):
+        await pipeline(index, progress).ingest("doc-1", TEXT, version="v1")
+    assert index.written == [0, 1, 2, 3]
+    assert progress.get("doc-1").next_chunk == 4
+
+    # A new process picks the document up from the recorded progress
+    index.fail_on = None
+    result = await pipeline(index, progress).ingest("doc-1", TEXT, version="v1")
+
+    chunks = chunk_count(TEXT)
+    assert result.resumed_from == 4
+    assert (result.chunks, result.written) == (chunks, chunks - 4)
+    assert index.written == list(range(chunks))
+    assert progress.get("doc-1").completed
+
+
+@pytest.mark.asyncio
+async def test_progress_of_another_version_is_discarded(progress):
+    index = RecordingIndex()
+    ingestion = pipeline(index, progress)
+    await ingestion.ingest("doc-1", TEXT, version="v1")
+
+    unchanged = await ingestion.ingest("doc-1", TEXT, version="v1")
+    index.written.clear()
+    shorter = TEXT[:len(TEXT) // 2]
+    rewritten = await ingestion.ingest("doc-1", shorter, version="v2")
+
+    assert unchanged.written == 0
+    assert (rewritten.resumed_from, rewritten.written) == (0, chunk_count(shorter))
+    assert index.written == list(range(chunk_count(shorter)))
+    assert index.removed == list(range(chunk_count(shorter), chunk_count(TEXT)))
+    assert ingestion.stats()["unchanged"] == 1
@@ -0,0 +1,195 @@
+"""
+Tests for the run job queue backends
+"""
+
+import time
+
+import fakeredis
+import pytest
+
+from mindmesh.graphs.run_control import AWAITING_APPROVAL, CANCELLED, COMPLETED, PAUSED, RUNNING, SUSPENDED
+from mindmesh.workers.base import FAILED, QUEUED
+from mindmesh.workers.redis import RedisJobQueue
+from mindmesh.workers.sqlite import SQLiteJobQueue
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def queue(request, tmp_path):
+    if request.param == "sqlite":
+        queue = SQLiteJobQueue(str(tmp_path / "run_queue.db"), max_events_per_run=3)
+    else:
+        queue = RedisJobQueue(client=fakeredis.FakeStrictRedis(decode_responses=True), max_events_per_run=3)
+    yield queue
+    queue.close()
+
+
+def test_a_job_is_leased_to_one_worker(queue):
+    job_id = queue.enqueue("run-1", "t1", {"goal_text": "plan the offsite"})
+
+    job = queue.claim("w1", visibility_timeout=60)
+
+    assert (job.job_id, job.run_id, job.tenant_id, job.attempts) == (job_id, "run-1", "t1", 1)
+    assert job.payload == {"goal_text": "plan the offsite"}
+    assert queue.claim("w2", visibility_timeout=60) is None
+    assert not queue.complete(job_id, "w2", {})
+    assert queue.complete(job_id, "w1", {"status": "completed"})
+    assert queue.get(job_id)["result"] == {"status": "completed"}
+    assert queue.counts() == {QUEUED: 0, RUNNING: 0, COMPLETED: 1, FAILED: 0}
+
+
+def test_claims_take_turns_across_tenants(queue):
+    for n in range(3):
+        queue.enqueue(f"busy-{n}", "busy", {})
+    queue.enqueue("quiet-0", "quiet", {})
+    queue.enqueue("quiet-1", "quiet", {})
+
+    claimed = [queue.claim("w1", visibility_timeout=60).run_id for _ in range(5)]
+
+    assert claimed == ["busy-0", "quiet-0", "busy-1", "quiet-1", "busy-2"]
+
+
+def test_claims_stop_at_max_running_across_workers(queue):
+    for n in range(3):
+        queue.enqueue(f"run-{n}", "t1", {})
+    first = queue.claim("w1", visibility_timeout=60, max_running=2)
+    queue.claim("w2", visibility_timeout=60, max_running=2)
+
+    assert queue.claim("w3", visibility_timeout=60, max_running=2) is None
+    queue.complete(first.job_id, "w1", {})
+    assert queue.claim("w3", visibility_timeout=60, max_running=2).run_id == "run-2"
+
+
+def test_a_resumed_run_is_claimed_under_its_tenant(queue):
+    queue.enqueue("run-1", "t1", {})
+    queue.complete(queue.claim("w1", visibility_timeout=60).job_id, "w1", {})
+    queue.append_event("run-1", "run.paused", {}, status=PAUSED)
+
+    queue.enqueue("run-1", None, {"resume": True}, only_if=SUSPENDED)
+
+    assert queue.claim("w1", visibility_timeout=60).tenant_id == "t1"
+
+
+def test_an_expired_lease_is_claimed_again_until_attempts_run_out(queue):
+    job_id = queue.enqueue("run-1", "t1", {}, max_attempts=2)
+
+    assert queue.claim("w1", visibility_timeout=0).attempts == 1
+    assert queue.claim("w2", visibility_timeout=0).attempts == 2
+    assert not queue.extend(job_id, "w1", 60)
+    assert queue.claim("w3", visibility_timeout=60) is None
+    assert queue.get(job_id)["state"] == FAILED
+
+
+def test_a_lease_expiring_on_the_last_attempt_fails_the_run(queue):
+    job_id = queue.enqueue("run-1", "t1", {}, max_attempts=1)
+    queue.claim("w1", visibility_timeout=0)
+    queue.append_event("run-1", "run.started", {}, status=RUNNING)
+
+    assert queue.claim("w2", visibility_timeout=60) is None
+
+    assert queue.get(job_id)["error"] == "visibility timeout expired"
+    assert queue.run("run-1")["status"] == FAILED
+    event = queue.events("run-1")[-1]
+    assert (event["type"], event["data"]["error"]) == ("run.failed", "visibility timeout expired")
+
+
+def test_failing_the_last_attempt_fails_the_run_once(queue):
+    queue.enqueue("run-1", "t1", {}, max_attempts=2)
+    queue.enqueue("run-2", "t1", {}, max_attempts=1)
+    first = queue.claim("w1", visibility_timeout=60)
+    second = queue.claim("w1", visibility_timeout=60)
+    queue.append_event("run-2", "run.failed", {}, status=FAILED)
+
+    queue.fail(first.job_id, "w1", "boom", retry_delay=0)
+    assert queue.run("run-1")["status"] == QUEUED
+    queue.fail(queue.claim("w1", visibility_timeout=60).job_id, "w1", "boom again", retry_delay=0)
+    queue.fail(second.job_id, "w1", "boom", retry_delay=0)
+
+    assert queue.run("run-1")["status"] == FAILED
+    assert [event["data"].get("error") for event in queue.events("run-1")] == ["boom again"]
+    assert [event["type"] for event in queue.events("run-2")] == ["run.failed"]
+
+
+def test_a_failed_job_is_retried_after_its_delay(queue):
+    job_id = queue.enqueue("run-1", "t1", {}, max_attempts=2)
+    queue.claim("w1", visibility_timeout=60)
+
+    assert queue.fail(job_id, "w1", "boom", retry_delay=60)
+    assert queue.claim("w1", visibility_timeout=60) is None
+    assert queue.get(job_id)["state"] == QUEUED
+    assert queue.get(job_id)["error"] == "boom"
+
+
+def test_enqueue_records_the_run(queue):
+    queue.enqueue("run-1", "t1", {})
+
+    run = queue.run("run-1")
+
+    assert (run["tenant_id"], run["status"], run["requested"], run["last_event_id"]) == ("t1", QUEUED, None, 0)
+    assert queue.run("missing") is None
+
+
+def test_enqueue_only_if_checks_the_recorded_status(queue):
+    queue.enqueue("run-1", "t1", {})
+
+    assert queue.enqueue("run-1", None, {"resume": True}, only_if=SUSPENDED) is None
+    queue.append_event("run-1", "run.paused", {}, status=PAUSED)
+    assert queue.enqueue("run-1", None, {"resume": True}, only_if=SUSPENDED) is not None
+    assert queue.run("run-1")["tenant_id"] == "t1"
+    assert queue.run("run-1")["status"] == QUEUED
+    assert queue.enqueue("missing", None, {}, only_if=SUSPENDED) is None
+
+
+def test_events_are_numbered_and_trimmed_per_run(queue):
+    queue.enqueue("run-1", "t1", {})
+
+    ids = [queue.append_event("run-1", "run.update", {"step": step}, current_step=step) for step in "abcd"]
+
+    assert ids == [1, 2, 3, 4]
+    assert [event["data"]["step"] for event in queue.events("run-1", after=0)] == ["b", "c", "d"]
+    assert [event["id"] for event in queue.events("run-1", after=3)] == [4]
+    assert queue.run("run-1")["current_step"] == "d"
+    assert queue.append_event("missing", "run.update", {}) is None
+
+
+def test_a_pause_request_is_dropped_once_the_run_is_suspended(queue):
+    queue.enqueue("run-1", "t1", {})
+    queue.append_event("run-1", "run.started", {}, status=RUNNING)
+
+    assert queue.request("run-1", PAUSED) == RUNNING
+    assert queue.requests(["run-1", "missing"]) == {"run-1": PAUSED}
+
+    queue.append_event("run-1", "run.paused", {}, status=PAUSED)
+
+    assert queue.requests(["run-1"]) == {}
+    assert queue.request("run-1", PAUSED) is None
+
+
+def test_cancel_wins_over_pause(queue):
+    queue.enqueue("run-1", "t1", {})
+
+    assert queue.request("run-1", CANCELLED) == QUEUED
+    assert queue.request("run-1", PAUSED) is None
+    assert queue.run("run-1")["requested"] == CANCELLED
+
+
+def test_cancelling_a_suspended_run_cancels_it_at_once(queue):
+    queue.enqueue("run-1", "t1", {})
+    queue.append_event("run-1", "approval.requested", {}, status=AWAITING_APPROVAL)
+
+    assert queue.request("run-1", CANCELLED) == AWAITING_APPROVAL
+
+    assert queue.run("run-1")["status"] == CANCELLED
+    assert queue.events("run-1")[-1]["type"] == "run.cancelled"
+    assert queue.request("run-1", CANCELLED) is None
+
+
+def test_prune_drops_finished_runs_and_their_events(queue):
+    queue.enqueue("run-1", "t1", {})
+    queue.enqueue("run-2", "t1", {})
+    queue.append_event("run-1", "run.completed", {}, status=COMPLETED)
+    queue.append_event("run-2", "run.started", {}, status=RUNNING)
+
+    queue.prune(time.time() + 1)
+
+    assert queue.run("run-1") is None and queue.events("run-1") == []
+    assert queue.run("run-2")["status"] == RUNNING
@@ -0,0 +1,88 @@
+"""
+Tests for the LLM response cache
+"""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from mindmesh.caching.llm_cache import LLMResponseCache, prompt_entities
+from mindmesh.caching.single_flight import SingleFlight
+from mindmesh.memory.embeddings import hashed_ngram_embedding
+
+
+async def embed(text: str) -> np.ndarray:
+    return hashed_ngram_embedding(text)
+
+
+def make_cache(**kwargs) -> LLMResponseCache:
+    options = {"semantic_threshold": 0.8, "embed": embed, "flights": SingleFlight(), **kwargs}
+    return LLMResponseCache(**options)
+
+
+async def remember(cache: LLMResponseCache, goal: str, response: str) -> None:
+    await cache.store("t1", "intent_router", f"Classify: {goal}", "gpt", 0.0, response, semantic_text=goal)
+
+
+async def recall(cache: LLMResponseCache, goal: str):
+    return await cache.lookup("t1", "intent_router", f"Classify: {goal}", "gpt", 0.0, semantic_text=goal)
+
+
+def test_entities_cover_dates_times_names_and_negation():
+    assert prompt_entities("Meet Alice on Monday at 3pm") == {"alice", "monday", "3pm"}
+    assert prompt_entities("Do not email bob@example.com") >= {"not", "bob@example.com"}
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_with_different_day_is_not_reused():
+    cache = make_cache()
+    await remember(cache, "Schedule the team sync on Monday", "monday")
+
+    # The n-gram embeddings of these are close enough to pass the threshold
+    assert float(hashed_ngram_embedding("Schedule the team sync on Monday")
+                 @ hashed_ngram_embedding("Schedule the team sync on Tuesday")) >= 0.8
+    assert await recall(cache, "Schedule the team sync on Tuesday") is None
+    assert cache.semantic_rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_with_same_entities_is_reused():
+    cache = make_cache()
+    await remember(cache, "Schedule the team sync on Monday", "monday")
+
+    hit = await recall(cache, "Schedule a team sync on Monday")
+
+    assert hit is not None and hit.tier == "semantic" and hit.response == "monday"
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_degrades_to_exact_only():
+    calls: List[str] = []
+
+    async def broken(text: str) -> np.ndarray:
+        calls.append(text)
+        raise RuntimeError("embedding backend down")
+
+    cache = make_cache(embed=broken)
+    await remember(cache, "Schedule the team sync on Monday", "monday")
+
+    assert (await recall(cache, "Schedule the team sync on Monday")).tier == "exact"
+    assert await recall(cache, "Schedule a team sync on Monday") is None
+    assert cache.embedding_errors == 1 and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_call_caches_the_answer():
+    cache = make_cache()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "answer", 0.01
+
+    first = await cache.get_or_call("t1", "planner", "Plan the offsite", "gpt", 0.0, call)
+    second = await cache.get_or_call("t1", "planner", "plan the offsite.", "gpt", 0.0, call)
+
+    assert (first.tier, second.tier) == ("miss", "exact")
+    assert len(calls) == 1
@@ -0,0 +1,98 @@
+"""
+Tests for parallel graph stages and their merge rules
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from mindmesh.graphs.parallel import ParallelStage
+from mindmesh.graphs.run_control import PAUSED, RunInterrupted
+from mindmesh.state import MindMeshState, merge_dicts, sum_counters
+
+
+def test_sum_counters_adds_each_branch_on_top_of_the_base():
+    base = {"llm_cost": 1.0, "llm_calls": 2, "model": "a"}
+    planning = {"llm_cost": 1.5, "llm_calls": 3, "model": "a"}
+    retrieval = {"llm_cost": 1.25, "llm_calls": 3, "cache_hits": 1, "model": "b"}
+
+    merged = sum_counters(base, [planning, retrieval])
+
+    assert merged == {"llm_cost": 1.75, "llm_calls": 4, "cache_hits": 1, "model": "b"}
+
+
+def test_sum_counters_recurses_into_nested_counters():
+    merged = sum_counters({"tokens": {"in": 10}}, [{"tokens": {"in": 15}}, {"tokens": {"in": 12, "out": 4}}])
+
+    assert merged == {"tokens": {"in": 17, "out": 4}}
+
+
+def test_merge_dicts_keeps_nested_keys_of_every_branch():
+    base = {"llm_cache": {}}
+    merged = merge_dicts(base, [{"llm_cache": {"planner": "miss"}}, {"llm_cache": {"memory_reader": "exact"}}])
+
+    assert merged == {"llm_cache": {"planner": "miss", "memory_reader": "exact"}}
+
+
+def charging(node: str, cost: float):
+    async def node_fn(state: MindMeshState) -> Dict[str, Any]:
+        cost_tracking = dict(state.cost_tracking or {})
+        cost_tracking["llm_cost"] = cost_tracking.get("llm_cost", 0.0) + cost
+        return {"cost_tracking": cost_tracking, "current_step": node}
+    return node_fn
+
+
+@pytest.mark.asyncio
+async def test_stage_sums_costs_and_reports_every_node():
+    finished: List[Tuple[str, str, Any]] = []
+    stage = ParallelStage(
+        {
+            "planning": [("intent_router", charging("intent_router", 0.5)), ("planner", charging("planner", 1.0))],
+            "retrieval": [("memory_reader", charging("memory_reader", 0.25))],
+        },
+        after_node=lambda branch, node, update, config: finished.append((branch, node, update["current_step"])),
+    )
+    state = MindMeshState(goal_text="plan the offsite", cost_tracking={"llm_cost": 2.0})
+
+    update = await stage(state, {"configurable": {"thread_id": "run"}})
+
+    assert update["cost_tracking"] == {"llm_cost": 3.75}
+    assert sorted(finished) == [
+        ("planning", "intent_router", "intent_router"),
+        ("planning", "planner", "planner"),
+        ("retrieval", "memory_reader", "memory_reader"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pause_between_branch_nodes_stops_the_stage():
+    ran: List[str] = []
+    requested: Dict[str, str] = {}
+
+    def node(name: str, delay: float = 0.0):
+        async def node_fn(state: MindMeshState) -> Dict[str, Any]:
+            await asyncio.sleep(delay)
+            ran.append(name)
+            return {}
+        return node_fn
+
+    async def request_pause(state: MindMeshState) -> Dict[str, Any]:
+        requested["run"] = PAUSED
+        return {}
+
+    def before_node(node_name: str, config: Dict[str, Any]) -> None:
+        if requested.get(config["configurable"]["thread_id"]):
+            raise RunInterrupted(config["configurable"]["thread_id"], PAUSED)
+
+    stage = ParallelStage(
+        {
+            "planning": [("intent_router", node("intent_router", 0.02)), ("planner", node("planner"))],
+            "retrieval": [("memory_reader", request_pause)],
+        },
+        before_node=before_node,
+    )
+
+    with pytest.raises(RunInterrupted):
+        await stage(MindMeshState(goal_text="plan the offsite"), {"configurable": {"thread_id": "run"}})
+    assert ran == ["intent_router"]
@@ -0,0 +1,147 @@
+"""
+Tests for pausing, resuming and cancelling runs at node boundaries
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from mindmesh.graphs.run_control import (
+    CANCELLED,
+    COMPLETED,
+    PAUSED,
+    RUNNING,
+    RunControls,
+    RunInterrupted,
+)
+
+NODES = [
+    "intent_router", "planner", "memory_reader", "tool_router", "guardrails",
+    "executor", "reflector", "scheduler", "audit_logger",
+]
+
+
+@pytest.mark.asyncio
+async def test_a_pause_request_stops_the_run_at_its_next_check():
+    controls = RunControls()
+    control = controls.open("run-1")
+    control.attach(RUNNING)
+
+    assert controls.pause("run-1")
+    with pytest.raises(RunInterrupted) as interrupted:
+        controls.check("run-1")
+    assert interrupted.value.status == PAUSED
+
+    control.finish(PAUSED)
+    assert not controls.pause("run-1")
+    # Resuming reopens the run without the request
+    controls.open("run-1").attach(RUNNING)
+    controls.check("run-1")
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_running_run_cancels_the_task_driving_it():
+    controls = RunControls()
+    started = asyncio.Event()
+
+    async def drive() -> None:
+        controls.open("run-1").attach(RUNNING)
+        started.set()
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(drive())
+    await started.wait()
+
+    assert controls.cancel("run-1")
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert controls.get("run-1").requested == CANCELLED
+    assert not controls.pause("run-1")
+
+
+def test_a_suspended_run_is_cancelled_at_once_and_a_finished_one_not_at_all():
+    controls = RunControls()
+    controls.open("paused").finish(PAUSED)
+    controls.open("done").finish(COMPLETED)
+
+    assert controls.cancel("paused")
+    assert controls.status("paused") == CANCELLED
+    assert not controls.cancel("done")
+    assert controls.stats()["cancel_requests"] == 1
+
+
+class Step:
+    """A graph node that records that it ran, optionally holding until released"""
+
+    def __init__(self, name: str, ran: List[str], update: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.ran = ran
+        self.update = update or {}
+        self.entered = asyncio.Event()
+        self.release: Optional[asyncio.Event] = None
+
+    async def __call__(self, state: Any) -> Dict[str, Any]:
+        self.ran.append(self.name)
+        self.entered.set()
+        if self.release is not None:
+            await self.release.wait()
+        return {"current_step": self.name, **self.update}
+
+
+@pytest.fixture
+def graph(tmp_path):
+    main_graph = pytest.importorskip("mindmesh.graphs.main_graph")
+    from mindmesh.checkpointing.saver import DurableCheckpointSaver
+    from mindmesh.checkpointing.sqlite import SQLiteCheckpointStore
+    from mindmesh.graphs.approvals import ApprovalStore
+    from mindmesh.graphs.run_scheduler import RunScheduler
+
+    ran: List[str] = []
+    steps = {name: Step(name, ran) for name in NODES}
+    steps["guardrails"].update = {"guardrails_status": "approved"}
+    # Checkpoints at the end of every step, so a paused run has one to resume from
+    checkpointer = DurableCheckpointSaver(store=SQLiteCheckpointStore(str(tmp_path / "checkpoints.db")))
+    graph = main_graph.MindMeshGraph(
+        checkpointer=checkpointer, nodes=steps, parallel=False,
+        scheduler=RunScheduler(max_concurrent=1), controls=RunControls(), approvals=ApprovalStore(),
+    )
+    graph.ran, graph.steps = ran, steps
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_paused_run_stops_before_its_next_node_and_resumes_after_the_last_one(graph):
+    graph.steps["planner"].release = asyncio.Event()
+    run = asyncio.create_task(graph.run("plan the offsite", run_id="run-1", tenant_id="t1"))
+    await graph.steps["planner"].entered.wait()
+
+    assert graph.pause("run-1")
+    graph.steps["planner"].release.set()
+    paused = await run
+
+    # The node running when the pause was asked finished and was checkpointed
+    assert (paused["status"], paused["current_step"]) == (PAUSED, "planner")
+    assert graph.ran == ["intent_router", "planner"]
+    assert graph.resumable("run-1")
+
+    await graph.resume("run-1")
+
+    assert graph.ran == NODES
+    assert graph.controls.status("run-1") == COMPLETED
+    assert not graph.resumable("run-1")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_stops_inside_its_node_and_frees_its_slot(graph):
+    graph.steps["executor"].release = asyncio.Event()
+    run = asyncio.create_task(graph.run("email the client", run_id="run-1", tenant_id="t1"))
+    await graph.steps["executor"].entered.wait()
+
+    assert graph.cancel("run-1")
+    cancelled = await asyncio.wait_for(run, timeout=5)
+
+    assert cancelled["status"] == CANCELLED
+    assert graph.ran == NODES[:NODES.index("executor") + 1]
+    assert graph.scheduler.stats()["running"] == 0
+    assert not graph.resumable("run-1")
@@ -0,0 +1,72 @@
+"""
+Tests for fair admission of runs across tenants
+"""
+
+import asyncio
+from typing import List, Sequence, Tuple
+
+import pytest
+
+from mindmesh.graphs.run_scheduler import RunScheduler
+
+
+async def admission_order(scheduler: RunScheduler, submissions: Sequence[Tuple[str, str]]) -> List[str]:
+    """Labels of the submitted (tenant, label) runs in the order they got the scheduler's one slot"""
+    release = asyncio.Event()
+    order: List[str] = []
+
+    async def run(label: str) -> None:
+        order.append(label)
+
+    tasks = [asyncio.create_task(scheduler.submit(release.wait, "busy"))]
+    for tenant, label in submissions:
+        tasks.append(asyncio.create_task(scheduler.submit(lambda label=label: run(label), tenant)))
+    while scheduler.waiting < len(submissions):
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_a_tenants_first_run_is_admitted_ahead_of_another_tenants_backlog():
+    submissions = [("a", f"a{n}") for n in range(1, 5)] + [("b", "b1")]
+
+    order = await admission_order(RunScheduler(max_concurrent=1), submissions)
+
+    assert order == ["a1", "b1", "a2", "a3", "a4"]
+
+
+@pytest.mark.asyncio
+async def test_contended_slots_are_shared_by_weight_in_submission_order():
+    scheduler = RunScheduler(max_concurrent=1)
+    scheduler.set_weight("a", 2)
+    submissions = [("a", f"a{n}") for n in range(1, 7)] + [("b", f"b{n}") for n in range(1, 4)]
+
+    order = await admission_order(scheduler, submissions)
+
+    assert order == ["a1", "a2", "b1", "a3", "a4", "b2", "a5", "a6", "b3"]
+    assert scheduler.stats()["queued_runs"] == 9
+
+
+@pytest.mark.asyncio
+async def test_a_run_cancelled_while_queued_gives_up_its_turn():
+    scheduler = RunScheduler(max_concurrent=1)
+    release = asyncio.Event()
+    order: List[str] = []
+
+    async def run(label: str) -> None:
+        order.append(label)
+
+    busy = asyncio.create_task(scheduler.submit(release.wait, "busy"))
+    cancelled = asyncio.create_task(scheduler.submit(lambda: run("a1"), "a"))
+    queued = asyncio.create_task(scheduler.submit(lambda: run("b1"), "b"))
+    while scheduler.waiting < 2:
+        await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(busy, queued)
+
+    assert order == ["b1"]
+    assert cancelled.cancelled()
+    assert (scheduler.abandoned, scheduler.stats()["running"], scheduler.stats()["queued"]) == (1, 0, 0)
@@ -0,0 +1,134 @@
+"""
+Tests for run workers and following their runs through the queue
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from mindmesh.graphs.run_control import COMPLETED, FAILED, PAUSED
+from mindmesh.streaming.events import RunEventBroker
+from mindmesh.workers.client import enqueue_resume, enqueue_run, follow_events, run_queue_stats
+from mindmesh.workers.sqlite import SQLiteJobQueue
+from mindmesh.workers.worker import RunWorker
+
+
+class StubGraph:
+    """Publishes events like MindMeshGraph; "wait" goals run until paused, "fail" goals raise"""
+
+    def __init__(self, events: RunEventBroker):
+        self.events = events
+        self.paused: Dict[str, bool] = {}
+        self.resumed: List[Tuple[str, Optional[str]]] = []
+
+    async def run(self, goal_text: str, autonomy_level: str = "L1", **kwargs) -> Dict[str, Any]:
+        run_id = kwargs["run_id"]
+        self.events.open(run_id, kwargs.get("tenant_id"))
+        self.paused[run_id] = False
+        self.events.publish(run_id, "run.started", {"run_id": run_id})
+        self.events.publish(run_id, "run.update", {"run_id": run_id, "current_step": "planner"})
+        if goal_text == "fail":
+            self.events.publish(run_id, "run.failed", {"run_id": run_id, "error": "boom"})
+            raise RuntimeError("boom")
+        while goal_text == "wait" and not self.paused[run_id]:
+            await asyncio.sleep(0.01)
+        status = PAUSED if goal_text == "wait" else COMPLETED
+        self.events.publish(run_id, f"run.{status}", {"run_id": run_id, "status": status})
+        return {"run_id": run_id, "status": status}
+
+    async def resume(self, run_id: str, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        self.resumed.append((run_id, tenant_id))
+        self.events.open(run_id, tenant_id)
+        self.events.publish(run_id, "run.completed", {"run_id": run_id, "status": COMPLETED})
+        return {"run_id": run_id, "status": COMPLETED}
+
+    def pause(self, run_id: str) -> bool:
+        if run_id not in self.paused:
+            return False
+        self.paused[run_id] = True
+        return True
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "run_queue.db"))
+    yield queue
+    queue.close()
+
+
+async def serving(worker: RunWorker, until: Callable[[], bool]) -> None:
+    stop = asyncio.Event()
+    serve = asyncio.create_task(worker.serve(stop))
+    for _ in range(500):
+        if until():
+            break
+        await asyncio.sleep(0.01)
+    stop.set()
+    await asyncio.wait_for(serve, timeout=5)
+
+
+def make_worker(queue: SQLiteJobQueue) -> RunWorker:
+    events = RunEventBroker()
+    return RunWorker(queue, StubGraph(events), poll_interval=0.01, retry_backoff=0.0, events=events)
+
+
+@pytest.mark.asyncio
+async def test_worker_records_run_events_for_followers(queue):
+    run_id, _ = enqueue_run(queue, "plan the offsite", tenant_id="t1")
+
+    await serving(make_worker(queue), lambda: queue.run(run_id)["status"] == COMPLETED)
+
+    events: List[Dict[str, Any]] = [event async for event in follow_events(queue, run_id, poll_seconds=0.01)]
+    assert [event["type"] for event in events] == ["run.started", "run.update", "run.completed"]
+    assert [event["id"] for event in events] == [1, 2, 3]
+    assert queue.run(run_id)["current_step"] == "planner"
+
+
+@pytest.mark.asyncio
+async def test_pause_requested_through_the_queue_reaches_the_worker(queue):
+    run_id, _ = enqueue_run(queue, "wait", tenant_id="t1")
+    queue.request(run_id, PAUSED)
+
+    await serving(make_worker(queue), lambda: queue.run(run_id)["status"] == PAUSED)
+
+    assert queue.run(run_id)["requested"] is None
+    assert queue.events(run_id)[-1]["type"] == "run.paused"
+
+
+@pytest.mark.asyncio
+async def test_paused_run_resumes_in_a_worker_under_its_tenant(queue):
+    run_id, _ = enqueue_run(queue, "wait", tenant_id="t1")
+    queue.request(run_id, PAUSED)
+    worker = make_worker(queue)
+    await serving(worker, lambda: queue.run(run_id)["status"] == PAUSED)
+
+    assert enqueue_resume(queue, run_id, (PAUSED,)) is not None
+    assert enqueue_resume(queue, run_id, (PAUSED,)) is None
+    await serving(worker, lambda: queue.run(run_id)["status"] == COMPLETED)
+
+    assert worker.graph.resumed == [(run_id, "t1")]
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_is_retried_before_the_run_fails(queue):
+    job_id = queue.enqueue("run-1", "t1", {"goal_text": "fail", "kwargs": {"run_id": "run-1"}}, max_attempts=2)
+
+    await serving(make_worker(queue), lambda: queue.get(job_id)["state"] == FAILED)
+
+    attempt = ["run.started", "run.update", "run.failed"]
+    assert [event["type"] for event in queue.events("run-1")] == attempt + ["run.retrying"] + attempt
+    assert queue.events("run-1")[3]["data"]["attempt"] == 1
+    assert queue.run("run-1")["status"] == FAILED
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_carry_the_engine_stats_of_the_worker_process(queue):
+    events = RunEventBroker()
+    worker = RunWorker(queue, StubGraph(events), events=events, engine_stats=lambda: {"llm_cache": {"hits": 3}})
+
+    await serving(worker, lambda: bool(queue.workers(0)))
+
+    stats = run_queue_stats(queue)
+    assert stats["workers"] == 1
+    assert stats["live_workers"][0]["engine"] == {"llm_cache": {"hits": 3}}
@@ -0,0 +1,83 @@
+"""
+Tests for serving and refreshing summaries by content version
+"""
+
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from mindmesh.memory.context_packer import TokenCounter
+from mindmesh.memory.summary_store import SummaryResolver, SummaryStore
+
+FACTS = [f"Fact {n}: the client renewed contract {n} for another year at the same rate" for n in range(6)]
+
+
+class StubLLM:
+    """Answers every prompt with a numbered summary and records the prompts"""
+
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    async def ainvoke(self, prompt: str) -> SimpleNamespace:
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"summary {len(self.prompts)}", response_metadata={})
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    store = SummaryStore(str(tmp_path / "summaries.db"))
+    yield SummaryResolver(store, TokenCounter(encoding="estimate"), model="stub", max_tokens=40, llm=StubLLM())
+    store.close()
+
+
+async def resolve(resolver: SummaryResolver, facts: List[str]):
+    """Resolve an entity with these facts and refresh it as a run would"""
+    summary = resolver.resolve("t1", "entity", [{"id": "acme", "facts": facts}])["acme"]
+    if resolver.schedule("t1", "entity", "acme", "Acme", summary):
+        await resolver.drain()
+    return summary
+
+
+@pytest.mark.asyncio
+async def test_summary_is_served_until_the_content_version_changes(resolver):
+    assert (await resolve(resolver, FACTS[:4])).status == "missing"
+
+    served = await resolve(resolver, list(reversed(FACTS[:4])))
+
+    # The version hashes the set of parts, so their order does not matter
+    assert (served.status, served.text) == ("fresh", "summary 1")
+    assert resolver.llm.prompts[0].startswith("Summarize")
+
+
+@pytest.mark.asyncio
+async def test_added_parts_are_folded_into_the_summary(resolver):
+    await resolve(resolver, FACTS[:4])
+
+    stale = await resolve(resolver, FACTS[:5])
+
+    assert (stale.status, stale.text) == ("stale", f"summary 1 {FACTS[4]}")
+    assert resolver.llm.prompts[1].startswith("Update the summary")
+    assert FACTS[4] in resolver.llm.prompts[1] and FACTS[0] not in resolver.llm.prompts[1]
+    assert (await resolve(resolver, FACTS[:5])).text == "summary 2"
+    assert (resolver.full_summaries, resolver.incremental_updates) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_changed_or_removed_parts_are_summarized_again(resolver):
+    await resolve(resolver, FACTS[:4])
+
+    changed = await resolve(resolver, FACTS[1:5])
+
+    assert changed.status == "missing"
+    assert resolver.llm.prompts[1].startswith("Summarize")
+    assert (await resolve(resolver, FACTS[1:5])).text == "summary 2"
+    assert (resolver.full_summaries, resolver.incremental_updates) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_short_content_is_shown_verbatim_without_a_summary(resolver):
+    short = await resolve(resolver, ["Founded in 1999"])
+
+    assert (short.status, short.text) == ("verbatim", "Founded in 1999")
+    assert resolver.llm.prompts == []
@@ -0,0 +1,122 @@
+"""
+Approvals Endpoints
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.auth import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.user import User
+from app.schemas.approval import ApprovalDecision, ApprovalDetail, ApprovalResponse
+from app.schemas.pagination import CursorPage
+from mindmesh.graphs.approvals import get_approval_store
+from mindmesh.workers import client as run_client
+
+router = APIRouter()
+
+
+async def _get_visible_approval(approval_id: str, tenant_id: Any) -> Dict[str, Any]:
+    """404 unless the approval exists and belongs to the tenant"""
+    approval = await asyncio.to_thread(get_approval_store().get, approval_id)
+    if approval is None or str(approval["tenant_id"]) != str(tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Approval not found",
+        )
+    return approval
+
+
+@router.get("/", response_model=CursorPage[ApprovalResponse])
+async def list_approvals(
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    state: Optional[str] = Query("pending", description="pending, approved, rejected, edited or cancelled"),
+    run_id: Optional[str] = None,
+    count: Literal["exact", "none"] = "exact",
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """List the tenant's approvals, newest first, with keyset pagination on (created_at, id)"""
+    tenant_id = str(current_user.tenant_id)
+
+    before = None
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor, str)
+        before = (cursor_created_at.isoformat(timespec="microseconds"), cursor_id)
+
+    approvals = await asyncio.to_thread(
+        get_approval_store().list, tenant_id, state, run_id, limit=size + 1, before=before
+    )
+    has_more = len(approvals) > size
+    approvals = approvals[:size]
+    next_cursor = None
+    if has_more:
+        last = approvals[-1]
+        next_cursor = encode_cursor(datetime.fromisoformat(last["created_at"]), last["id"])
+
+    # A single complete first page already knows its exact total
+    if not cursor and not has_more:
+        total = len(approvals)
+    elif count == "exact":
+        total = await asyncio.to_thread(get_approval_store().count, tenant_id, state, run_id)
+    else:
+        total = None
+
+    return {
+        "items": approvals,
+        "size": size,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": False,
+    }
+
+
+@router.get("/{approval_id}", response_model=ApprovalDetail)
+async def get_approval(
+    approval_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Get a specific approval and the state of its run"""
+    approval = await _get_visible_approval(approval_id, current_user.tenant_id)
+
+    run = await asyncio.to_thread(run_client.get_run_queue().run, approval["run_id"]) or {}
+    return {
+        **approval,
+        "run": {
+            "id": approval["run_id"],
+            "status": run.get("status"),
+            "current_step": run.get("current_step"),
+        },
+    }
+
+
+@router.post("/{approval_id}")
+async def decide_approval(
+    approval_id: str,
+    decision_in: ApprovalDecision,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Submit a decision; an approved run continues at the executor"""
+    await _get_visible_approval(approval_id, current_user.tenant_id)
+
+    # A worker continues the run; progress is reported on its event stream
+    try:
+        await asyncio.to_thread(
+            run_client.decide_approval,
+            run_client.get_run_queue(),
+            approval_id,
+            decision_in.decision,
+            decided_by=str(current_user.id),
+            comments=decision_in.comments,
+            payload=decision_in.payload,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+
+    return {"message": "Approval decision submitted successfully"}
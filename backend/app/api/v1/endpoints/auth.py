@@ -15,7 +15,7 @@ from app.core.auth import (
     create_access_token,
     create_refresh_token,
     get_current_user,
-    get_password_hash,
+    get_password_hash_async,
 )
 from app.schemas.auth import (
     Token,
@@ -45,8 +45,10 @@ async def login(
     access_token_expires = timedelta(minutes=30)
     refresh_token_expires = timedelta(days=7)
     
+    # The tenant claim keys the tenant's rate limit bucket
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "tid": str(user.tenant_id) if user.tenant_id else None},
+        expires_delta=access_token_expires,
     )
     refresh_token = create_refresh_token(
         data={"sub": user.email}, expires_delta=refresh_token_expires
@@ -74,7 +76,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     user = User(
         email=user_in.email,
         username=user_in.username,
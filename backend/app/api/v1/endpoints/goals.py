@@ -2,22 +2,28 @@
 Goals Endpoints
 """
 
-from typing import Any, List
+import asyncio
+from datetime import datetime
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.pagination import count_rows, decode_cursor, encode_cursor
 from app.schemas.goal import (
     GoalCreate,
     GoalUpdate,
     GoalResponse,
-    GoalList,
 )
+from app.schemas.goal_batch import GoalBatchRequest, GoalBatchResponse
+from app.schemas.pagination import CursorPage
+from app.services.goal_service import apply_goal_batch
 from app.models.user import User
 from app.models.goal import Goal
+from mindmesh.workers.client import enqueue_run, get_run_queue
 
 router = APIRouter()
 
@@ -48,25 +54,70 @@ async def create_goal(
     return goal
 
 
-@router.get("/", response_model=GoalList)
+@router.post("/batch", response_model=GoalBatchResponse)
+async def batch_goals(
+    batch_in: GoalBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """Create, update and delete goals in bulk within one transaction"""
+    return await apply_goal_batch(db, current_user, batch_in)
+
+
+@router.get("/", response_model=CursorPage[GoalResponse])
 async def list_goals(
-    skip: int = 0,
-    limit: int = 100,
-    status: str = None,
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    count: Literal["exact", "estimated", "none"] = "estimated",
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
-    """List user goals"""
+    """List user goals, newest first, with keyset pagination on (created_at, id)"""
     query = select(Goal).where(Goal.tenant_id == current_user.tenant_id)
     
     if status:
         query = query.where(Goal.status == status)
+    if priority:
+        query = query.where(Goal.priority == priority)
+    if due_after:
+        query = query.where(Goal.due_date >= due_after)
+    if due_before:
+        query = query.where(Goal.due_date <= due_before)
+    
+    # Seek past the last item of the previous page instead of OFFSET
+    page_query = query
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        page_query = page_query.where(
+            tuple_(Goal.created_at, Goal.id) < tuple_(cursor_created_at, cursor_id)
+        )
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
+    page_query = page_query.order_by(Goal.created_at.desc(), Goal.id.desc()).limit(size + 1)
+    result = await db.execute(page_query)
     goals = result.scalars().all()
     
-    return {"goals": goals, "total": len(goals)}
+    has_more = len(goals) > size
+    goals = goals[:size]
+    next_cursor = encode_cursor(goals[-1].created_at, goals[-1].id) if has_more else None
+    
+    # A single complete first page already knows its exact total
+    if not cursor and not has_more:
+        total, total_is_estimate = len(goals), False
+    else:
+        total = await count_rows(db, query, count)
+        total_is_estimate = count == "estimated"
+    
+    return {
+        "items": goals,
+        "size": size,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+    }
 
 
 @router.get("/{goal_id}", response_model=GoalResponse)
@@ -129,3 +180,31 @@ async def delete_goal(
     await db.commit()
     
     return {"message": "Goal deleted successfully"}
+
+
+@router.post("/{goal_id}/start")
+async def start_goal(
+    goal_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """Queue a run of the goal for the run workers"""
+    goal = await db.get(Goal, goal_id)
+    if not goal or goal.tenant_id != current_user.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found",
+        )
+    
+    # Progress is reported on the run's event stream
+    run_id, _ = await asyncio.to_thread(
+        enqueue_run,
+        get_run_queue(),
+        goal.text,
+        goal.autonomy_level,
+        constraints=goal.constraints,
+        tenant_id=str(goal.tenant_id),
+        user_id=str(current_user.id),
+    )
+    
+    return {"run_id": run_id, "message": "Goal execution started"}
@@ -0,0 +1,162 @@
+"""
+Runs Endpoints
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.auth import get_current_user
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from mindmesh.graphs.run_control import PAUSED
+from mindmesh.workers import client as run_client
+
+router = APIRouter()
+
+# Idle interval after which a keep-alive is sent to streaming clients
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+async def _ensure_run_visible(run_id: str, tenant_id: Any) -> Dict[str, Any]:
+    """404 unless the run is recorded in the run queue and belongs to the tenant"""
+    run = await asyncio.to_thread(run_client.get_run_queue().run, run_id)
+    if run is None or str(run["tenant_id"]) != str(tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Run not found",
+        )
+    return run
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Render an event as a Server-Sent Events frame"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/{run_id}/stream")
+async def stream_run(
+    run_id: str,
+    last_event_id: Optional[int] = Query(None, description="Resume after this event ID"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Stream run progress as Server-Sent Events"""
+    await _ensure_run_visible(run_id, current_user.tenant_id)
+
+    # EventSource sends Last-Event-ID on reconnect
+    resume_after = last_event_id
+    if resume_after is None and last_event_id_header and last_event_id_header.isdigit():
+        resume_after = int(last_event_id_header)
+
+    async def event_source():
+        # Runs execute in the workers, which record their events in the run queue
+        async for event in run_client.follow_events(
+            run_client.get_run_queue(),
+            run_id,
+            last_event_id=resume_after or 0,
+            heartbeat_seconds=STREAM_HEARTBEAT_SECONDS,
+        ):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield _format_sse(event)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{run_id}/ws")
+async def stream_run_ws(
+    websocket: WebSocket,
+    run_id: str,
+    token: str = Query(...),
+    last_event_id: int = Query(0),
+) -> None:
+    """Stream run progress over a WebSocket"""
+    # Browsers can't set headers on WebSockets, so the access token comes in the query
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user(
+                HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db
+            )
+            await _ensure_run_visible(run_id, user.tenant_id)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    await websocket.accept()
+    try:
+        async for event in run_client.follow_events(
+            run_client.get_run_queue(),
+            run_id,
+            last_event_id=last_event_id,
+            heartbeat_seconds=STREAM_HEARTBEAT_SECONDS,
+        ):
+            if event is None:
+                await websocket.send_json({"type": "ping"})
+            else:
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.post("/{run_id}/pause")
+async def pause_run(
+    run_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Pause a run before its next node; its state is kept for resuming"""
+    await _ensure_run_visible(run_id, current_user.tenant_id)
+
+    # The worker executing the run applies the request
+    if not await asyncio.to_thread(run_client.pause_run, run_client.get_run_queue(), run_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Run is not running",
+        )
+
+    return {"message": "Run paused successfully"}
+
+
+@router.post("/{run_id}/resume")
+async def resume_run(
+    run_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Continue a paused run from the node after the last one it finished"""
+    await _ensure_run_visible(run_id, current_user.tenant_id)
+
+    # A worker continues the run; progress is reported on its event stream
+    if await asyncio.to_thread(run_client.enqueue_resume, run_client.get_run_queue(), run_id, (PAUSED,)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Run is not paused",
+        )
+
+    return {"message": "Run resumed successfully"}
+
+
+@router.delete("/{run_id}")
+async def cancel_run(
+    run_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Cancel a run, stopping its in-flight LLM and tool calls"""
+    await _ensure_run_visible(run_id, current_user.tenant_id)
+
+    if not await asyncio.to_thread(run_client.cancel_run, run_client.get_run_queue(), run_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Run has already finished",
+        )
+
+    return {"message": "Run cancelled successfully"}
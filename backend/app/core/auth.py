@@ -5,7 +5,6 @@ MindMesh Authentication Module
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,25 +12,29 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.password_hashing import password_hasher, pwd_context
+from app.core.principal_cache import principal_cache
 from app.models.user import User
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token scheme
 security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+    """Verify a password against its hash (blocking; prefer password_hasher in async code)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash"""
+    """Generate password hash (blocking; prefer password_hasher in async code)"""
     return pwd_context.hash(password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash on the hashing pool"""
+    return await password_hasher.hash(password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -67,12 +70,17 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
     
     if not user.is_active:
         return None
     
+    # Transparently upgrade hashes created with outdated parameters
+    if new_hash:
+        user.hashed_password = new_hash
+    
     # Update last login
     user.last_login = datetime.utcnow()
     await db.commit()
@@ -109,9 +117,19 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # Serve the principal from cache when possible
+    user = None
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        user = await principal_cache.get(db, email)
+    
+    if user is None:
+        # Get user from database
+        epoch = principal_cache.epoch
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
+        
+        if user is not None and user.is_active and settings.PRINCIPAL_CACHE_ENABLED:
+            principal_cache.put(email, user, epoch)
     
     if user is None:
         raise credentials_exception
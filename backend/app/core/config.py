@@ -3,7 +3,7 @@ MindMesh Configuration Management
 """
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 
@@ -39,6 +39,12 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    
     # AI/ML
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4-turbo-preview"
@@ -94,6 +100,28 @@ class Settings(BaseSettings):
     RUN_TIMEOUT_SECONDS: int = 300
     COST_BUDGET_PER_GOAL: float = 5.00
     TELEMETRY_ENABLED: bool = True
+    SLOW_REQUEST_THRESHOLD_SECONDS: float = 1.0
+    # /metrics needs "Authorization: Bearer <METRICS_TOKEN>"; unset, it only answers loopback clients
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Principal cache
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Goals
+    GOAL_BATCH_MAX_OPERATIONS: int = 5000
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | redis
+    RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    # Credential endpoints only; /auth/me and token refresh use the default limit
+    RATE_LIMIT_ROUTE_LIMITS: Dict[str, int] = {"/api/v1/auth/login": 5, "/api/v1/auth/register": 5}
+    RATE_LIMIT_TENANT_REQUESTS: int = 1000
+    RATE_LIMIT_TENANT_OVERRIDES: Dict[str, int] = {}
+    RATE_LIMIT_MAX_KEYS: int = 100000
     
     # CORS
     ALLOWED_HOSTS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
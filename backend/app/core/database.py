@@ -3,6 +3,7 @@ MindMesh Database Configuration
 """
 
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
@@ -25,6 +26,22 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+# Composite indexes backing keyset pagination and list filters.
+# Each ends in (created_at DESC, id DESC) to match the list ordering.
+PERFORMANCE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_goals_tenant_created "
+    "ON goals (tenant_id, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_goals_tenant_status_created "
+    "ON goals (tenant_id, status, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_goals_tenant_priority_created "
+    "ON goals (tenant_id, priority, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_goals_tenant_due_date "
+    "ON goals (tenant_id, due_date) WHERE due_date IS NOT NULL",
+    # Lets semantic_search() serve ORDER BY distance LIMIT n from an index
+    "CREATE INDEX IF NOT EXISTS ix_documents_vector_hnsw "
+    "ON documents USING hnsw (vector vector_cosine_ops)",
+]
+
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -62,6 +79,10 @@ async def init_db():
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        
+        # Create performance indexes
+        for statement in PERFORMANCE_INDEXES:
+            await conn.execute(text(statement))
 
 
 async def close_db():
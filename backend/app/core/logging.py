@@ -5,7 +5,7 @@ MindMesh Logging Configuration
 import logging
 import sys
 from typing import Any, Dict
-from structlog import configure, get_logger
+from structlog import configure, get_logger as structlog_get_logger
 from structlog.stdlib import LoggerFactory
 from structlog.processors import (
     TimeStamper,
@@ -81,7 +81,7 @@ def setup_logging():
 
 def get_logger(name: str = None) -> Any:
     """Get a structured logger instance"""
-    return get_logger(name or "mindmesh")
+    return structlog_get_logger(name or "mindmesh")
 
 
 class RequestContextLogger:
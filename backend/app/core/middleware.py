@@ -2,154 +2,180 @@
 MindMesh Middleware Classes
 """
 
+import math
 import time
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from fastapi import Response
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
 from app.core.logging import get_logger, RequestContextLogger
+from app.core.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitResult,
+)
 
 logger = get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging all requests"""
+SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (
+        b"content-security-policy",
+        b"default-src 'self'; "
+        b"script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        b"style-src 'self' 'unsafe-inline'; "
+        b"img-src 'self' data: https:; "
+        b"font-src 'self' data:; "
+        b"connect-src 'self' ws: wss:;",
+    ),
+]
+
+
+def normalize_allowed_hosts(hosts: Iterable[str]) -> List[str]:
+    """Reduce origin-style entries (http://host:port) to bare host patterns"""
+    normalized = []
+    for host in hosts:
+        if "://" in host:
+            host = urlsplit(host).hostname or ""
+        else:
+            host = host.split(":")[0]
+        if host and host not in normalized:
+            normalized.append(host)
+    return normalized
+
+
+class RequestPipelineMiddleware:
+    """
+    Pure ASGI middleware fusing request IDs, timing, request/slow-request
+    logging, security headers and the trusted host check into one pass.
+
+    Headers are injected on ``http.response.start`` and body messages are
+    forwarded untouched, so streaming responses are never buffered. The
+    ``X-Response-Time`` header therefore measures time to first byte, while
+    the completion log line records the full duration.
+    """
     
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_hosts: Iterable[str] = ("*",),
+        slow_request_threshold: float = 1.0,
+    ):
+        self.app = app
+        self.allowed_hosts = normalize_allowed_hosts(allowed_hosts)
+        self.allow_any_host = "*" in self.allowed_hosts
+        self.slow_request_threshold = slow_request_threshold
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        
+        # Trusted host check
+        if not self.allow_any_host and not self._is_valid_host(headers.get("host", "")):
+            response = PlainTextResponse("Invalid host header", status_code=400)
+            await response(scope, receive, send)
+            return
+        
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
         
-        # Create request context logger
+        client = scope.get("client")
+        path = scope.get("path", "")
         request_logger = RequestContextLogger(logger).bind(
             request_id=request_id,
-            method=request.method,
-            url=str(request.url),
-            client_ip=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent"),
+            method=scope.get("method"),
+            path=path,
+            client_ip=client[0] if client else None,
+            user_agent=headers.get("user-agent"),
         )
-        
-        # Log request start
         request_logger.info("Request started")
         
-        # Track timing
-        start_time = time.time()
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - start_time
+                response_headers = list(message.get("headers", []))
+                response_headers.append((b"x-request-id", request_id.encode("latin-1")))
+                response_headers.append((b"x-response-time", f"{duration:.3f}s".encode("latin-1")))
+                response_headers.extend(SECURITY_HEADERS)
+                message = {**message, "headers": response_headers}
+            await send(message)
         
         try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log request completion
-            request_logger.bind(
-                status_code=response.status_code,
-                duration=duration,
-            ).info("Request completed")
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log request error
             request_logger.bind(
                 error=str(e),
-                duration=duration,
+                duration=time.perf_counter() - start_time,
             ).error("Request failed")
-            
             raise
-
-
-class ResponseTimeMiddleware(BaseHTTPMiddleware):
-    """Middleware for tracking response times"""
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
         
-        response = await call_next(request)
-        
-        duration = time.time() - start_time
-        
-        # Add response time header
-        response.headers["X-Response-Time"] = f"{duration:.3f}s"
+        duration = time.perf_counter() - start_time
+        request_logger.bind(
+            status_code=status_code,
+            duration=duration,
+        ).info("Request completed")
         
         # Log slow requests
-        if duration > 1.0:  # Log requests taking more than 1 second
-            logger.warning(
-                "Slow request detected",
-                method=request.method,
-                url=str(request.url),
-                duration=duration,
-            )
-        
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware for adding security headers"""
+        if duration > self.slow_request_threshold:
+            request_logger.warning("Slow request detected")
     
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self' ws: wss:;"
-        )
-        
-        return response
+    def _is_valid_host(self, host_header: str) -> bool:
+        """Match the Host header against the allowed host patterns"""
+        host = host_header.split(":")[0]
+        for pattern in self.allowed_hosts:
+            if host == pattern or (pattern.startswith("*") and host.endswith(pattern[1:])):
+                return True
+        return False
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """Middleware for tenant identification and scoping"""
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Extract tenant from subdomain or header
-        tenant_id = self._extract_tenant_id(request)
-        
-        if tenant_id:
-            # Add tenant context to request state
-            request.state.tenant_id = tenant_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            # Extract tenant from subdomain or header
+            tenant_id = self._extract_tenant_id(Headers(scope=scope))
+            
+            if tenant_id:
+                # Add tenant context to request state
+                scope.setdefault("state", {})["tenant_id"] = tenant_id
         
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
     
-    def _extract_tenant_id(self, request: Request) -> str:
-        """Extract tenant ID from request"""
+    def _extract_tenant_id(self, headers: Headers) -> Optional[str]:
+        """Extract tenant ID from request headers"""
         # Check for tenant header
-        tenant_header = request.headers.get("X-Tenant-ID")
+        tenant_header = headers.get("X-Tenant-ID")
         if tenant_header:
             return tenant_header
         
         # Check subdomain
-        host = request.headers.get("host", "")
+        host = headers.get("host", "")
         if "." in host:
             subdomain = host.split(".")[0]
             if subdomain != "www" and subdomain != "api":
@@ -158,52 +184,107 @@ class TenantMiddleware(BaseHTTPMiddleware):
         return None
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for rate limiting"""
+def authenticated_tenant_id(headers: Headers) -> Optional[str]:
+    """
+    Tenant of the principal a request authenticates as, from the signed
+    ``tid`` claim of its bearer access token. Headers such as X-Tenant-ID
+    are chosen by the client and must not decide whose quota it spends.
+    """
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != "access" or payload.get("tid") is None:
+        return None
+    return str(payload["tid"])
+
+
+class RateLimitMiddleware:
+    """
+    Middleware for rate limiting.
     
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        # In production, use Redis for rate limiting
-        self.rate_limits = {}
+    Each request is checked against its client bucket (per route group,
+    keyed by IP) and, for requests authenticated with an access token, the
+    tenant-wide bucket of the token's tenant. Both are charged together or
+    not at all, so a request the tenant bucket rejects does not use up the
+    client's allowance. CORS preflights are not counted. Counters live in
+    a RateLimitBackend so several workers can share them.
+    """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Get client identifier
-        client_id = self._get_client_id(request)
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        default_limit: int = 100,
+        window_seconds: int = 60,
+        route_limits: Optional[Dict[str, int]] = None,
+        tenant_limit: Optional[int] = None,
+        tenant_overrides: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.default_limit = default_limit
+        self.window_seconds = window_seconds
+        # Longest prefix wins
+        self.route_limits = sorted((route_limits or {}).items(), key=lambda item: -len(item[0]))
+        self.tenant_limit = tenant_limit
+        self.tenant_overrides = tenant_overrides or {}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        
+        result = await self._check_rate_limit(scope)
+        rate_limit_headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode("latin-1")),
+            (b"x-ratelimit-remaining", str(result.remaining).encode("latin-1")),
+            (b"x-ratelimit-reset", str(int(time.time() + result.reset_after)).encode("latin-1")),
+        ]
         
-        # Check rate limit
-        if not self._check_rate_limit(client_id):
-            return Response(
+        if not result.allowed:
+            response = Response(
                 content="Rate limit exceeded",
                 status_code=429,
-                headers={"Retry-After": "60"},
+                headers={"Retry-After": str(max(1, math.ceil(result.reset_after)))},
             )
+            response.raw_headers.extend(rate_limit_headers)
+            await response(scope, receive, send)
+            return
         
-        response = await call_next(request)
-        return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + rate_limit_headers}
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
     
-    def _get_client_id(self, request: Request) -> str:
+    def _get_client_id(self, scope: Scope) -> str:
         """Get client identifier for rate limiting"""
         # Use IP address as client identifier
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
-    def _check_rate_limit(self, client_id: str) -> bool:
-        """Check if client is within rate limits"""
-        # Simple in-memory rate limiting (use Redis in production)
-        current_time = time.time()
-        
-        if client_id not in self.rate_limits:
-            self.rate_limits[client_id] = []
-        
-        # Remove old requests (older than 1 minute)
-        self.rate_limits[client_id] = [
-            req_time for req_time in self.rate_limits[client_id]
-            if current_time - req_time < 60
-        ]
+    def _route_rule(self, path: str) -> Tuple[str, int]:
+        """Resolve the route group and its limit for a path"""
+        for prefix, limit in self.route_limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        return "*", self.default_limit
+    
+    async def _check_rate_limit(self, scope: Scope) -> RateLimitResult:
+        """Charge the client and tenant buckets together, returning the most restrictive result"""
+        route, limit = self._route_rule(scope.get("path", ""))
+        buckets = [(f"client:{self._get_client_id(scope)}:{route}", limit)]
         
-        # Check if within limit (100 requests per minute)
-        if len(self.rate_limits[client_id]) >= 100:
-            return False
+        tenant_id = authenticated_tenant_id(Headers(scope=scope))
+        tenant_limit = self.tenant_overrides.get(tenant_id, self.tenant_limit) if tenant_id else None
+        if tenant_limit:
+            buckets.append((f"tenant:{tenant_id}", tenant_limit))
         
-        # Add current request
-        self.rate_limits[client_id].append(current_time)
-        return True
+        # On a rejection the exhausted bucket is the one with nothing remaining
+        results = await self.backend.hit_many(buckets, self.window_seconds)
+        return min(results, key=lambda result: result.remaining)
@@ -0,0 +1,64 @@
+"""
+MindMesh Pagination Utilities
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+
+def encode_cursor(created_at: datetime, item_id: Any) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, id_type: type = int) -> Tuple[datetime, Any]:
+    """Decode a cursor produced by encode_cursor for items whose IDs are of id_type"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        # A tampered cursor must not reach the query with an ID of the wrong type
+        if type(item_id) is not id_type:
+            raise TypeError(f"Cursor ID is not {id_type.__name__}")
+        return datetime.fromisoformat(created_at), item_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: str) -> Optional[int]:
+    """
+    Count the rows matched by query.
+
+    ``exact`` runs ``SELECT count(*)``; ``estimated`` reads the planner's row
+    estimate from ``EXPLAIN`` and never touches the rows; ``none`` skips it.
+    """
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    
+    if mode == "exact":
+        result = await db.execute(count_query)
+        return result.scalar_one()
+    
+    if mode == "estimated":
+        # EXPLAIN cannot take bind parameters; literal rendering quotes the filter values
+        compiled = query.order_by(None).compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+        result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
+    return None
@@ -0,0 +1,133 @@
+"""
+MindMesh Password Hashing Service
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool so hashing never
+    blocks the event loop. bcrypt releases the GIL, so threads give real
+    parallelism up to the pool size.
+
+    At most ``max_workers`` hashes run at once; up to ``max_queue`` callers
+    wait for a slot for at most ``queue_timeout`` seconds, after which the
+    request is rejected with 503 rather than piling up.
+    """
+
+    def __init__(
+        self,
+        context: CryptContext,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+    ):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwhash")
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.upgraded = 0
+        self._total_wait = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, when the stored hash uses outdated parameters,
+        return a replacement hash computed in the same pool slot.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            self.upgraded += 1
+        return valid, new_hash
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        """Run a hashing call on the pool, waiting for a slot with a timeout"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        if self._slots.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise self._busy()
+
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise self._busy()
+        finally:
+            self.queued -= 1
+        self._total_wait += time.perf_counter() - start
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool and queue metrics"""
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": self.queued,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "upgraded": self.upgraded,
+            "average_wait_seconds": self._total_wait / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False)
+
+
+# Password hashing context; hashes with fewer rounds are upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,210 @@
+"""
+MindMesh Principal Cache
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction, make_transient_to_detached, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass
+class _CacheEntry:
+    """Cached column snapshot of an authenticated user"""
+    tenant_id: Optional[Any]
+    snapshot: Dict[str, Any]
+    expires_at: float
+
+
+class PrincipalCache:
+    """
+    Bounded TTL/LRU cache of authenticated principals keyed by token subject.
+
+    Entries hold a plain column snapshot rather than an ORM instance so that
+    every request gets its own copy merged into its own session. The cache is
+    per-process; other workers converge once their entries expire.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._tenant_index: Dict[Any, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so in-flight loads can't store stale rows
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def epoch(self) -> int:
+        """Current invalidation epoch"""
+        return self._epoch
+
+    async def get(self, db: AsyncSession, subject: str) -> Optional[User]:
+        """Return a session-bound user for the subject without querying the database"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                self._remove(subject)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            snapshot = copy.deepcopy(entry.snapshot)
+
+        # Rebuild as a clean detached instance and attach it without a SELECT
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    def put(self, subject: str, user: User, epoch: int) -> None:
+        """Store a freshly loaded user unless an invalidation happened meanwhile"""
+        snapshot = {
+            attr.key: copy.deepcopy(getattr(user, attr.key))
+            for attr in sa_inspect(User).column_attrs
+        }
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            if subject in self._entries:
+                self._remove(subject)
+            self._entries[subject] = _CacheEntry(
+                tenant_id=user.tenant_id,
+                snapshot=snapshot,
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            self._tenant_index.setdefault(user.tenant_id, set()).add(subject)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, subject: str) -> None:
+        """Drop a single principal"""
+        with self._lock:
+            self._epoch += 1
+            if subject in self._entries:
+                self._remove(subject)
+                self.invalidations += 1
+
+    def invalidate_tenant(self, tenant_id: Any) -> None:
+        """Drop every principal belonging to a tenant"""
+        with self._lock:
+            self._epoch += 1
+            for subject in list(self._tenant_index.get(tenant_id, ())):
+                self._remove(subject)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all principals"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tenant_index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, subject: str) -> None:
+        """Remove an entry and its tenant index reference (lock must be held)"""
+        entry = self._entries.pop(subject, None)
+        if entry is None:
+            return
+        subjects = self._tenant_index.get(entry.tenant_id)
+        if subjects is not None:
+            subjects.discard(subject)
+            if not subjects:
+                del self._tenant_index[entry.tenant_id]
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(email: str) -> None:
+    """Invalidation hook for code paths that bypass the ORM (bulk UPDATE/DELETE)"""
+    principal_cache.invalidate(email)
+
+
+def invalidate_tenant_principals(tenant_id: Any) -> None:
+    """Invalidation hook for tenant-wide changes such as suspension"""
+    principal_cache.invalidate_tenant(tenant_id)
+
+
+# Subjects whose rows changed in a session's transaction, invalidated once it commits
+_CHANGED_SUBJECTS = "principal_cache_changed_subjects"
+
+
+def _changed_subjects(target: User) -> Set[str]:
+    return object_session(target).info.setdefault(_CHANGED_SUBJECTS, set())
+
+
+@event.listens_for(User, "after_update")
+def _collect_on_update(mapper, connection, target: User) -> None:
+    """Note a changed user (deactivation, role, permissions) for invalidation at commit"""
+    subjects = _changed_subjects(target)
+    subjects.add(target.email)
+    # An email change re-keys the principal; drop the old subject as well
+    history = sa_inspect(target).attrs.email.history
+    subjects.update(history.deleted or ())
+
+
+@event.listens_for(User, "after_delete")
+def _collect_on_delete(mapper, connection, target: User) -> None:
+    """Note a deleted user for invalidation at commit"""
+    _changed_subjects(target).add(target.email)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """
+    Invalidate once the change is visible to other connections. Invalidating
+    at flush time would let a concurrent request reload the old row before
+    the commit and cache it for the full TTL.
+    """
+    for subject in session.info.pop(_CHANGED_SUBJECTS, ()):
+        principal_cache.invalidate(subject)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_on_rollback(session: Session, transaction: SessionTransaction) -> None:
+    """
+    Whatever is still collected when the outermost transaction ends was
+    rolled back and never reached the database. Savepoint rollbacks keep
+    the subjects: the enclosing transaction may still commit earlier changes.
+    """
+    if transaction.parent is None:
+        session.info.pop(_CHANGED_SUBJECTS, None)
@@ -0,0 +1,209 @@
+"""
+MindMesh Rate Limiting Backends
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a single rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+
+
+def _overlap(now: float, window: int) -> float:
+    """Share of the previous window still inside the trailing window"""
+    return (window - now % window) / window
+
+
+def _sliding_window(
+    now: float, window: int, limit: int, current: int, previous: int
+) -> Tuple[bool, float]:
+    """
+    Sliding-window counter estimate: the previous window's count is weighted
+    by how much of it still overlaps the trailing window.
+    """
+    estimated = previous * _overlap(now, window) + current
+    return estimated < limit, estimated
+
+
+def _result(allowed: bool, limit: int, estimated: float, now: float, window: int) -> RateLimitResult:
+    """Build a result with remaining capacity and seconds until the window rolls"""
+    used = estimated + 1 if allowed else estimated
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, limit - math.ceil(used)),
+        reset_after=window - (now % window),
+    )
+
+
+class RateLimitBackend(ABC):
+    """Storage interface for rate limit counters"""
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a request for key and report whether it is within limit per window seconds"""
+        return (await self.hit_many([(key, limit)], window))[0]
+
+    @abstractmethod
+    async def hit_many(self, buckets: Sequence[Tuple[str, int]], window: int) -> List[RateLimitResult]:
+        """
+        Record a request against every (key, limit) bucket, all or nothing:
+        when any bucket is over its limit none of them is charged.
+        """
+
+    async def close(self) -> None:
+        """Release backend resources"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process sliding-window counters with constant-time checks.
+
+    Keys are kept in least-recently-seen order so idle clients are evicted
+    from the front of the map, and the map never exceeds max_keys.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window_index, current_count, previous_count, expires_at]
+        self._counters: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self.evictions = 0
+
+    async def hit_many(self, buckets: Sequence[Tuple[str, int]], window: int) -> List[RateLimitResult]:
+        now = time.time()
+        index = int(now // window)
+        self._evict_idle(now)
+
+        counters = [self._counter(key, index) for key, _ in buckets]
+        checks = [
+            _sliding_window(now, window, limit, counter[1], counter[2])
+            for (_, limit), counter in zip(buckets, counters)
+        ]
+        allowed = all(ok for ok, _ in checks)
+        for counter in counters:
+            if allowed:
+                counter[1] += 1
+            counter[3] = now + 2 * window
+
+        return [
+            _result(allowed, limit, estimated, now, window)
+            for (_, limit), (_, estimated) in zip(buckets, checks)
+        ]
+
+    def _counter(self, key: str, index: int) -> List[Any]:
+        """A key's counter, rolled forward to the window index"""
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = [index, 0, 0, 0.0]
+            self._counters[key] = counter
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._counters.move_to_end(key)
+
+        # Roll the window forward
+        if counter[0] != index:
+            counter[2] = counter[1] if counter[0] == index - 1 else 0
+            counter[1] = 0
+            counter[0] = index
+        return counter
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop clients whose counters can no longer affect a decision"""
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[3] > now:
+                break
+            del self._counters[key]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend counters"""
+        return {"backend": "memory", "keys": len(self._counters), "evictions": self.evictions}
+
+
+# Checks every bucket and charges them only if all have capacity, in one atomic step.
+# KEYS: current and previous window counter of each bucket; ARGV: window, overlap, limits.
+# Estimates go back as strings, since Redis truncates Lua numbers to integers.
+_HIT_SCRIPT = """
+local window = tonumber(ARGV[1])
+local overlap = tonumber(ARGV[2])
+local allowed = 1
+local estimates = {}
+for i = 1, #KEYS / 2 do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local estimated = previous * overlap + current
+    if estimated >= tonumber(ARGV[2 + i]) then
+        allowed = 0
+    end
+    estimates[i] = tostring(estimated)
+end
+if allowed == 1 then
+    for i = 1, #KEYS / 2 do
+        redis.call('INCR', KEYS[2 * i - 1])
+        redis.call('EXPIRE', KEYS[2 * i - 1], 2 * window)
+    end
+end
+return {allowed, unpack(estimates)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Sliding-window counters shared across workers through Redis (or any
+    server with Lua scripting, such as KeyDB or Dragonfly). A request's
+    buckets are checked and charged by one script, so concurrent workers
+    never see a counter a rejected request bumped and rolled back.
+    """
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "ratelimit"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(url or settings.REDIS_URL, password=settings.REDIS_PASSWORD)
+        self.client = client
+        self.prefix = prefix
+        self._hit = client.register_script(_HIT_SCRIPT)
+
+    async def hit_many(self, buckets: Sequence[Tuple[str, int]], window: int) -> List[RateLimitResult]:
+        now = time.time()
+        index = int(now // window)
+        keys = []
+        for key, _ in buckets:
+            keys += [f"{self.prefix}:{key}:{index}", f"{self.prefix}:{key}:{index - 1}"]
+
+        allowed, *estimates = await self._hit(
+            keys=keys, args=[window, _overlap(now, window), *(limit for _, limit in buckets)]
+        )
+        return [
+            _result(bool(allowed), limit, float(estimated), now, window)
+            for (_, limit), estimated in zip(buckets, estimates)
+        ]
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend counters"""
+        return {"backend": "redis"}
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """Create the configured rate limit backend"""
+    name = name or settings.RATE_LIMIT_BACKEND
+    if name == "memory":
+        return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if name == "redis":
+        return RedisRateLimitBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
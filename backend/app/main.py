@@ -3,13 +3,15 @@ MindMesh - Personal Brain Agent System
 FastAPI Main Application
 """
 
+import asyncio
+import hmac
+import ipaddress
 import os
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -17,12 +19,17 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.config import settings
 from app.core.database import init_db
 from app.core.logging import setup_logging
+from app.core.password_hashing import password_hasher
+from app.core.principal_cache import principal_cache
 from app.api.v1.api import api_router
 from app.core.middleware import (
-    RequestLoggingMiddleware,
-    ResponseTimeMiddleware,
-    SecurityHeadersMiddleware,
+    RateLimitMiddleware,
+    RequestPipelineMiddleware,
+    TenantMiddleware,
 )
+from app.core.rate_limit import create_rate_limit_backend
+from mindmesh.graphs.approvals import get_approval_store
+from mindmesh.workers.client import get_run_queue, run_queue_stats
 
 
 @asynccontextmanager
@@ -33,7 +40,22 @@ async def lifespan(app: FastAPI):
     await init_db()
     yield
     # Shutdown
-    # Cleanup resources if needed
+    password_hasher.shutdown()
+
+
+def _authorize_metrics(request: Request) -> None:
+    """Metrics are for operators: METRICS_TOKEN as a bearer token, or a loopback client when it is unset"""
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    try:
+        loopback = request.client is not None and ipaddress.ip_address(request.client.host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics are only served to local clients")
 
 
 def create_application() -> FastAPI:
@@ -49,6 +71,25 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Middleware added last runs first: request pipeline, then CORS (so
+    # rate-limit rejections carry CORS headers and preflights are answered
+    # before any limit applies), then tenant identification and rate limiting
+
+    # Rate limiting
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(
+            RateLimitMiddleware,
+            backend=create_rate_limit_backend(),
+            default_limit=settings.RATE_LIMIT_REQUESTS,
+            window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+            route_limits=settings.RATE_LIMIT_ROUTE_LIMITS,
+            tenant_limit=settings.RATE_LIMIT_TENANT_REQUESTS,
+            tenant_overrides=settings.RATE_LIMIT_TENANT_OVERRIDES,
+        )
+    
+    # Tenant identification
+    app.add_middleware(TenantMiddleware)
+
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -58,11 +99,12 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Security middleware
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
-    app.add_middleware(SecurityHeadersMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(ResponseTimeMiddleware)
+    # Request pipeline (host check, request ID, timing, logging, security headers)
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        allowed_hosts=settings.ALLOWED_HOSTS,
+        slow_request_threshold=settings.SLOW_REQUEST_THRESHOLD_SECONDS,
+    )
 
     # Exception handlers
     @app.exception_handler(StarletteHTTPException)
@@ -107,6 +149,18 @@ def create_application() -> FastAPI:
             "environment": settings.ENVIRONMENT,
         }
 
+    # Metrics endpoint: the API's own stats and the shared run stores; each
+    # run worker reports its engine's stats with its heartbeats
+    @app.get("/metrics")
+    async def metrics(request: Request) -> Dict[str, Any]:
+        _authorize_metrics(request)
+        return {
+            "principal_cache": principal_cache.stats(),
+            "password_hashing": password_hasher.stats(),
+            "approvals": await asyncio.to_thread(get_approval_store().counts),
+            "run_queue": await asyncio.to_thread(run_queue_stats, get_run_queue()),
+        }
+
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
 
@@ -0,0 +1,50 @@
+"""
+Approval Schemas
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class ApprovalResponse(BaseModel):
+    """An approval request of a run waiting at the approval gate"""
+    id: str
+    run_id: str
+    state: str
+    payload: Dict[str, Any]
+    decision: Optional[str] = None
+    comments: Optional[str] = None
+    decided_by: Optional[str] = None
+    created_at: datetime
+    decided_at: Optional[datetime] = None
+    updated_at: datetime
+
+
+class ApprovalRun(BaseModel):
+    """The run an approval belongs to"""
+    id: str
+    status: Optional[str] = None
+    current_step: Optional[str] = None
+
+
+class ApprovalDetail(ApprovalResponse):
+    """An approval with the run it holds"""
+    run: ApprovalRun
+
+
+class ApprovalDecision(BaseModel):
+    """A reviewer's decision on a pending approval"""
+    decision: Literal["approve", "reject", "edit"]
+    comments: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Edited payload, required for edit; its tool_calls replace the planned ones",
+    )
+
+    @model_validator(mode="after")
+    def check_payload(self) -> "ApprovalDecision":
+        if self.decision == "edit" and self.payload is None:
+            raise ValueError("An edit decision needs the edited payload")
+        return self
@@ -0,0 +1,63 @@
+"""
+Goal Batch Schemas
+"""
+
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.schemas.goal import GoalCreate, GoalUpdate
+
+
+class GoalBatchCreate(BaseModel):
+    """Create operation"""
+    op: Literal["create"]
+    goal: GoalCreate
+
+
+class GoalBatchUpdate(BaseModel):
+    """Update operation"""
+    op: Literal["update"]
+    id: int
+    changes: GoalUpdate
+
+
+class GoalBatchDelete(BaseModel):
+    """Delete operation"""
+    op: Literal["delete"]
+    id: int
+
+
+GoalBatchOperation = Annotated[
+    Union[GoalBatchCreate, GoalBatchUpdate, GoalBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class GoalBatchRequest(BaseModel):
+    """Batch of goal operations applied in one transaction"""
+    operations: List[GoalBatchOperation] = Field(
+        min_length=1,
+        max_length=settings.GOAL_BATCH_MAX_OPERATIONS,
+    )
+    atomic: bool = Field(
+        default=False,
+        description="Apply nothing if any operation fails validation",
+    )
+
+
+class GoalBatchItemResult(BaseModel):
+    """Outcome of a single batch operation"""
+    index: int
+    op: str
+    status: Literal["ok", "error", "skipped"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class GoalBatchResponse(BaseModel):
+    """Per-item results of a batch"""
+    results: List[GoalBatchItemResult]
+    succeeded: int
+    failed: int
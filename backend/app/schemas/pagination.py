@@ -0,0 +1,19 @@
+"""
+Pagination Schemas
+"""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Keyset-paginated list response"""
+    
+    items: List[T]
+    size: int = Field(description="Requested page size")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, null on the last page")
+    total: Optional[int] = Field(default=None, description="Total matching items")
+    total_is_estimate: bool = Field(default=False, description="Whether total is a planner estimate")
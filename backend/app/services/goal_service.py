@@ -0,0 +1,215 @@
+"""
+Goal Management Service
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Update, bindparam, delete, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.goal import Goal
+from app.models.user import User
+from app.schemas.goal_batch import (
+    GoalBatchCreate,
+    GoalBatchDelete,
+    GoalBatchRequest,
+    GoalBatchUpdate,
+)
+
+
+def _result(index: int, op: str, status: str, goal_id: Any = None, error: str = None) -> Dict[str, Any]:
+    """Build a per-item batch result"""
+    return {"index": index, "op": op, "status": status, "id": goal_id, "error": error}
+
+
+async def apply_goal_batch(db: AsyncSession, current_user: User, batch: GoalBatchRequest) -> Dict[str, Any]:
+    """
+    Validate and apply a batch of goal operations with set-based statements.
+
+    Ownership of every referenced goal is checked with one query, then all
+    creates go out as a single INSERT ... RETURNING, updates as one
+    executemany UPDATE by primary key per set of changed columns, and
+    deletes as one DELETE. Everything runs in a single transaction. When
+    the database rejects a row, the batch is redone one operation at a
+    time so each still gets its own result.
+    """
+    tenant_id = current_user.tenant_id
+    results: List[Dict[str, Any]] = [None] * len(batch.operations)
+
+    creates: List[Tuple[int, Dict[str, Any]]] = []
+    updates: List[Tuple[int, GoalBatchUpdate]] = []
+    deletes: List[Tuple[int, GoalBatchDelete]] = []
+
+    # Bulk validation: existence/ownership in one round trip
+    referenced_ids = {
+        op.id for op in batch.operations if not isinstance(op, GoalBatchCreate)
+    }
+    existing_ids = set()
+    if referenced_ids:
+        result = await db.execute(
+            select(Goal.id).where(Goal.tenant_id == tenant_id, Goal.id.in_(referenced_ids))
+        )
+        existing_ids = set(result.scalars().all())
+
+    seen_ids = set()
+    for index, op in enumerate(batch.operations):
+        if isinstance(op, GoalBatchCreate):
+            goal_in = op.goal
+            creates.append((index, {
+                "tenant_id": tenant_id,
+                "created_by": current_user.id,
+                "text": goal_in.text,
+                "autonomy_level": goal_in.autonomy_level,
+                "constraints": goal_in.constraints,
+                "priority": goal_in.priority,
+                "due_date": goal_in.due_date,
+                "estimated_hours": goal_in.estimated_hours,
+                "metadata": goal_in.metadata,
+            }))
+            continue
+
+        if op.id not in existing_ids:
+            results[index] = _result(index, op.op, "error", op.id, "Goal not found")
+        elif op.id in seen_ids:
+            results[index] = _result(index, op.op, "error", op.id, "Goal referenced more than once in batch")
+        elif isinstance(op, GoalBatchUpdate):
+            updates.append((index, op))
+        else:
+            deletes.append((index, op))
+        seen_ids.add(op.id)
+
+    failed = sum(1 for r in results if r is not None)
+
+    if failed and batch.atomic:
+        return _skip_rest(batch, results, failed)
+
+    validated = list(results)
+    try:
+        await _apply_bulk(db, tenant_id, creates, updates, deletes, results)
+        await db.commit()
+    except DBAPIError:
+        # The database rejected a row, and a set-based statement cannot say which:
+        # redo the operations one by one, each in a savepoint, for per-item results
+        await db.rollback()
+        results = validated
+        await _apply_each(db, tenant_id, creates, updates, deletes, results)
+        failed = sum(1 for r in results if r["status"] == "error")
+        if failed and batch.atomic:
+            await db.rollback()
+            return _skip_rest(batch, [r if r["status"] == "error" else None for r in results], failed)
+        await db.commit()
+
+    return {
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+    }
+
+
+def _skip_rest(batch: GoalBatchRequest, results: List[Dict[str, Any]], failed: int) -> Dict[str, Any]:
+    """Results of an atomic batch that applies nothing: everything not failed is skipped"""
+    for index, op in enumerate(batch.operations):
+        if results[index] is None:
+            results[index] = _result(index, op.op, "skipped", getattr(op, "id", None))
+    return {"results": results, "succeeded": 0, "failed": failed}
+
+
+def _update_statement(tenant_id: Any, columns: Tuple[str, ...]) -> Update:
+    """UPDATE of the given columns of one goal, its id and values bound per parameter set"""
+    mapper_columns = Goal.__mapper__.columns
+    return (
+        update(Goal.__table__)
+        .where(Goal.__table__.c.id == bindparam("goal_id"), Goal.__table__.c.tenant_id == tenant_id)
+        .values({mapper_columns[key]: bindparam(f"new_{key}") for key in columns})
+    )
+
+
+async def _apply_bulk(
+    db: AsyncSession,
+    tenant_id: Any,
+    creates: List[Tuple[int, Dict[str, Any]]],
+    updates: List[Tuple[int, GoalBatchUpdate]],
+    deletes: List[Tuple[int, GoalBatchDelete]],
+    results: List[Dict[str, Any]],
+) -> None:
+    """Apply validated operations with one statement per kind of operation"""
+    # Creates: one multi-row INSERT ... RETURNING, ids in parameter order
+    if creates:
+        result = await db.execute(
+            insert(Goal).returning(Goal.id, sort_by_parameter_order=True),
+            [values for _, values in creates],
+        )
+        for (index, _), goal_id in zip(creates, result.scalars().all()):
+            results[index] = _result(index, "create", "ok", goal_id)
+
+    # Updates: one executemany UPDATE by primary key per set of changed
+    # columns (usually just one), whatever values each goal gets
+    update_groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+    for index, op in updates:
+        changes = op.changes.dict(exclude_unset=True)
+        if changes:
+            update_groups[tuple(sorted(changes))].append(
+                {"goal_id": op.id, **{f"new_{key}": value for key, value in changes.items()}}
+            )
+        results[index] = _result(index, "update", "ok", op.id)
+
+    if update_groups:
+        connection = await db.connection()
+        for columns, parameters in update_groups.items():
+            await connection.execute(_update_statement(tenant_id, columns), parameters)
+
+    # Deletes: one statement
+    if deletes:
+        await db.execute(
+            delete(Goal)
+            .where(Goal.tenant_id == tenant_id, Goal.id.in_([op.id for _, op in deletes]))
+            .execution_options(synchronize_session=False)
+        )
+        for index, op in deletes:
+            results[index] = _result(index, "delete", "ok", op.id)
+
+
+async def _apply_each(
+    db: AsyncSession,
+    tenant_id: Any,
+    creates: List[Tuple[int, Dict[str, Any]]],
+    updates: List[Tuple[int, GoalBatchUpdate]],
+    deletes: List[Tuple[int, GoalBatchDelete]],
+    results: List[Dict[str, Any]],
+) -> None:
+    """Apply validated operations one at a time, recording the database's verdict on each"""
+    operations = [(index, "create", values) for index, values in creates]
+    operations += [(index, "update", op) for index, op in updates]
+    operations += [(index, "delete", op) for index, op in deletes]
+
+    for index, kind, op in sorted(operations, key=lambda item: item[0]):
+        goal_id = None if kind == "create" else op.id
+        try:
+            async with db.begin_nested():
+                if kind == "create":
+                    goal_id = (await db.execute(insert(Goal).returning(Goal.id), [op])).scalar_one()
+                elif kind == "update":
+                    changes = op.changes.dict(exclude_unset=True)
+                    if changes:
+                        await (await db.connection()).execute(
+                            _update_statement(tenant_id, tuple(sorted(changes))),
+                            {"goal_id": op.id, **{f"new_{key}": value for key, value in changes.items()}},
+                        )
+                else:
+                    await db.execute(
+                        delete(Goal)
+                        .where(Goal.tenant_id == tenant_id, Goal.id == op.id)
+                        .execution_options(synchronize_session=False)
+                    )
+        except DBAPIError as e:
+            results[index] = _result(index, kind, "error", goal_id, _database_error(e))
+        else:
+            results[index] = _result(index, kind, "ok", goal_id)
+
+
+def _database_error(error: DBAPIError) -> str:
+    """First line of the driver's message, e.g. the violated constraint"""
+    message = str(error.orig).strip().splitlines()
+    return f"Rejected by the database: {message[0]}" if message else "Rejected by the database"
@@ -0,0 +1,12 @@
+"""
+MindMesh backend test configuration
+
+Tests run from backend/ (python -m pytest); this file puts backend/ on
+sys.path so the app package imports as it does under uvicorn, and fills
+in the secrets settings require when no .env provides them.
+"""
+
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+os.environ.setdefault("ENCRYPTION_KEY", "test-encryption-key")
@@ -0,0 +1,149 @@
+"""
+Tests for applying goal batches
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+pytest.importorskip("app.models.goal")
+pytest.importorskip("app.schemas.goal")
+
+from app.schemas.goal_batch import GoalBatchRequest  # noqa: E402
+from app.services.goal_service import apply_goal_batch  # noqa: E402
+
+REJECTED = "violates check constraint"
+
+
+class FakeResult:
+    def __init__(self, rows: List[Any]):
+        self.rows = rows
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def all(self) -> List[Any]:
+        return self.rows
+
+    def scalar_one(self) -> Any:
+        return self.rows[0]
+
+
+class FakeSession:
+    """
+    Stands in for the AsyncSession: goals 1 and 2 exist, and a statement
+    writing a goal text of REJECTED fails like a violated constraint
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.savepoints = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self._next_id = 100
+
+    async def execute(self, statement, parameters=None) -> FakeResult:
+        if statement.is_select:
+            return FakeResult([1, 2])
+        rows = parameters if isinstance(parameters, list) else [parameters or {}]
+        kind = "insert" if statement.is_insert else "update" if statement.is_update else "delete"
+        self.statements.append(f"{kind} x{len(rows)}")
+        if any(REJECTED in (row.get("text"), row.get("new_text")) for row in rows):
+            raise DBAPIError(kind, rows, Exception(f'new row for relation "goals" {REJECTED} "ck_goals_text"'))
+        ids = list(range(self._next_id, self._next_id + len(rows)))
+        self._next_id += len(rows)
+        return FakeResult(ids)
+
+    async def connection(self) -> "FakeSession":
+        return self
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+USER = SimpleNamespace(id=7, tenant_id="t1")
+
+
+def batch(*operations: Dict[str, Any], atomic: bool = False) -> GoalBatchRequest:
+    return GoalBatchRequest.model_validate({"operations": list(operations), "atomic": atomic})
+
+
+@pytest.mark.asyncio
+async def test_valid_batch_is_applied_with_one_statement_per_kind():
+    db = FakeSession()
+
+    response = await apply_goal_batch(db, USER, batch(
+        {"op": "create", "goal": {"text": "a"}},
+        {"op": "create", "goal": {"text": "b"}},
+        {"op": "update", "id": 1, "changes": {"text": "c"}},
+        {"op": "delete", "id": 2},
+    ))
+
+    assert [result["id"] for result in response["results"]] == [100, 101, 1, 2]
+    assert (response["succeeded"], response["failed"]) == (4, 0)
+    assert db.statements == ["insert x2", "update x1", "delete x1"]
+    assert (db.savepoints, db.commits) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_rejected_row_is_retried_alone_and_reports_its_own_error():
+    db = FakeSession()
+
+    response = await apply_goal_batch(db, USER, batch(
+        {"op": "create", "goal": {"text": "a"}},
+        {"op": "create", "goal": {"text": REJECTED}},
+        {"op": "update", "id": 1, "changes": {"text": REJECTED}},
+        {"op": "delete", "id": 2},
+        {"op": "delete", "id": 3},
+    ))
+
+    results = response["results"]
+    assert [result["status"] for result in results] == ["ok", "error", "error", "ok", "error"]
+    assert results[1]["error"].startswith("Rejected by the database: ") and "ck_goals_text" in results[1]["error"]
+    assert results[2]["id"] == 1
+    assert results[4]["error"] == "Goal not found"
+    assert (response["succeeded"], response["failed"]) == (2, 3)
+    # The bulk statements were rolled back, then each validated operation ran in a savepoint
+    assert (db.rollbacks, db.savepoints, db.commits) == (1, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_with_a_rejected_row_applies_nothing():
+    db = FakeSession()
+
+    response = await apply_goal_batch(db, USER, batch(
+        {"op": "create", "goal": {"text": "a"}},
+        {"op": "create", "goal": {"text": REJECTED}},
+        {"op": "delete", "id": 2},
+        atomic=True,
+    ))
+
+    assert [result["status"] for result in response["results"]] == ["skipped", "error", "skipped"]
+    assert (response["succeeded"], response["failed"]) == (0, 1)
+    assert (db.rollbacks, db.commits) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_failing_validation_touches_no_rows():
+    db = FakeSession()
+
+    response = await apply_goal_batch(db, USER, batch(
+        {"op": "update", "id": 1, "changes": {"text": "c"}},
+        {"op": "delete", "id": 1},
+        atomic=True,
+    ))
+
+    assert [result["status"] for result in response["results"]] == ["skipped", "error"]
+    assert response["results"][1]["error"] == "Goal referenced more than once in batch"
+    assert db.statements == [] and db.commits == 0
@@ -0,0 +1,39 @@
+"""
+Tests for keyset pagination cursors
+"""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def tampered(created_at: str, item_id) -> str:
+    raw = json.dumps([created_at, item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2024, 1, 15, 10, 30, 0, 123456)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_cursor(encode_cursor(created_at, "a1b2"), str) == (created_at, "a1b2")
+
+
+@pytest.mark.parametrize("cursor", [
+    tampered("2024-01-15T10:30:00", "42"),
+    tampered("2024-01-15T10:30:00", True),
+    tampered("2024-01-15T10:30:00", {"id": 1}),
+    tampered("not a date", 1),
+    tampered(12, 1),
+    base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+    "%%%",
+])
+def test_tampered_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
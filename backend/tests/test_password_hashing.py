@@ -0,0 +1,62 @@
+"""
+Tests for the password hashing pool
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.password_hashing import PasswordHasher
+
+
+class BlockingContext:
+    """Hashes once released, like bcrypt holding a pool thread"""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def hash(self, password: str) -> str:
+        self.released.wait(timeout=5)
+        return f"hashed:{password}"
+
+
+async def saturate(hasher: PasswordHasher, calls: int) -> list:
+    tasks = [asyncio.create_task(hasher.hash(f"pw{n}")) for n in range(calls)]
+    while hasher.in_flight + hasher.queued < calls:
+        await asyncio.sleep(0.01)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_503_at_once():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, max_workers=1, max_queue=1, queue_timeout=5)
+    tasks = await saturate(hasher, 2)
+
+    with pytest.raises(HTTPException) as error:
+        await hasher.hash("one too many")
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "1"}
+    context.released.set()
+    assert await asyncio.gather(*tasks) == ["hashed:pw0", "hashed:pw1"]
+    assert (hasher.stats()["rejected"], hasher.stats()["completed"]) == (1, 2)
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_waiting_longer_than_the_queue_timeout_is_rejected_with_503():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, max_workers=1, max_queue=4, queue_timeout=0.05)
+    tasks = await saturate(hasher, 1)
+
+    with pytest.raises(HTTPException) as error:
+        await hasher.hash("waits too long")
+
+    assert error.value.status_code == 503
+    assert hasher.stats()["queue_depth"] == 0
+    context.released.set()
+    await asyncio.gather(*tasks)
+    hasher.shutdown()
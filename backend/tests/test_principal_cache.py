@@ -0,0 +1,83 @@
+"""
+Tests for the principal cache and its invalidation at commit
+"""
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+User = pytest.importorskip("app.models.user").User
+
+from app.core import principal_cache as principal_cache_module  # noqa: E402
+from app.core.principal_cache import PrincipalCache, _collect_on_delete, _collect_on_update  # noqa: E402
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    monkeypatch.setattr(principal_cache_module, "principal_cache", cache)
+    return cache
+
+
+def cached(cache: PrincipalCache, user_id: int, email: str) -> User:
+    """A user as loaded by authentication, and cached under its email"""
+    user = User(id=user_id, email=email, tenant_id="t1")
+    cache.put(email, user, cache.epoch)
+    make_transient_to_detached(user)
+    return user
+
+
+def flush(session: Session, user: User, listener=_collect_on_update) -> None:
+    """What flushing the user's UPDATE (or DELETE) records in the session"""
+    session.add(user)
+    listener(None, None, user)
+    session.expunge(user)
+
+
+def test_changed_principals_are_invalidated_when_the_transaction_commits(cache):
+    deactivated = cached(cache, 1, "a@example.com")
+    deleted = cached(cache, 2, "b@example.com")
+    cached(cache, 3, "c@example.com")
+    session = Session()
+    session.begin()
+
+    flush(session, deactivated)
+    flush(session, deleted, _collect_on_delete)
+    assert cache.stats()["size"] == 3
+
+    session.commit()
+
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_an_email_change_drops_the_old_subject(cache):
+    user = cached(cache, 1, "old@example.com")
+    session = Session()
+    session.add(user)
+    user.email = "new@example.com"
+
+    flush(session, user)
+    session.commit()
+
+    assert cache.stats()["size"] == 0
+
+
+def test_rolled_back_changes_invalidate_nothing(cache):
+    user = cached(cache, 1, "a@example.com")
+    session = Session()
+    session.begin()
+    flush(session, user)
+
+    session.rollback()
+    session.commit()
+
+    assert cache.stats()["size"] == 1
+
+
+def test_a_load_racing_an_invalidation_is_not_cached(cache):
+    epoch = cache.epoch
+
+    cache.invalidate("a@example.com")
+    cache.put("a@example.com", User(id=1, email="a@example.com", tenant_id="t1"), epoch)
+
+    assert cache.stats()["size"] == 0
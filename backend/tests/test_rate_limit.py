@@ -0,0 +1,112 @@
+"""
+Tests for the rate limiting backends and middleware
+"""
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from fastapi.middleware.cors import CORSMiddleware
+from jose import jwt
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.config import settings
+from app.core.middleware import RateLimitMiddleware
+from app.core.rate_limit import InMemoryRateLimitBackend, RedisRateLimitBackend
+
+ORIGIN = "http://localhost:3000"
+
+
+def token(tenant_id: str, token_type: str = "access") -> str:
+    return jwt.encode({"sub": "user@example.com", "tid": tenant_id, "type": token_type},
+                      settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return InMemoryRateLimitBackend()
+    return RedisRateLimitBackend(FakeRedis(server=FakeServer()))
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_the_limit_are_rejected(backend):
+    results = [await backend.hit("client:a", 3, 60) for _ in range(5)]
+
+    assert [result.allowed for result in results] == [True, True, True, False, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    assert 0 < results[-1].reset_after <= 60
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_request_charges_no_bucket(backend):
+    assert all(result.allowed for result in await backend.hit_many([("client:a", 10), ("tenant:t", 1)], 60))
+
+    # The tenant is exhausted: the client's bucket must not be charged for the rejection
+    for _ in range(5):
+        assert not any(result.allowed for result in await backend.hit_many([("client:a", 10), ("tenant:t", 1)], 60))
+
+    assert (await backend.hit("client:a", 10, 60)).remaining == 8
+
+
+@pytest.mark.asyncio
+async def test_redis_counters_are_shared_by_workers():
+    server = FakeServer()
+    workers = [RedisRateLimitBackend(FakeRedis(server=server)) for _ in range(2)]
+
+    allowed = [(await workers[i % 2].hit("tenant:t", 4, 60)).allowed for i in range(6)]
+
+    assert allowed == [True, True, True, True, False, False]
+
+
+def make_client(**kwargs) -> TestClient:
+    async def endpoint(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[
+        Route("/api/v1/goals", endpoint, methods=["GET"]),
+        Route("/api/v1/auth/me", endpoint, methods=["GET"]),
+    ])
+    app = RateLimitMiddleware(app, backend=InMemoryRateLimitBackend(), window_seconds=60, **kwargs)
+    app = CORSMiddleware(app, allow_origins=[ORIGIN], allow_methods=["*"], allow_headers=["*"])
+    return TestClient(app)
+
+
+def test_rejection_carries_cors_headers_and_preflights_are_free():
+    client = make_client(default_limit=2)
+
+    for _ in range(5):
+        preflight = client.options("/api/v1/goals", headers={
+            "Origin": ORIGIN, "Access-Control-Request-Method": "GET",
+        })
+        assert preflight.status_code == 200
+
+    statuses = [client.get("/api/v1/goals", headers={"Origin": ORIGIN}) for _ in range(3)]
+
+    assert [response.status_code for response in statuses] == [200, 200, 429]
+    assert statuses[-1].headers["access-control-allow-origin"] == ORIGIN
+    assert statuses[-1].headers["retry-after"]
+
+
+def test_tenant_bucket_follows_the_token_not_the_header():
+    client = make_client(default_limit=100, tenant_limit=2)
+
+    # A client cannot move to another tenant's bucket by changing the header
+    headers = {"Authorization": f"Bearer {token('acme')}"}
+    responses = [
+        client.get("/api/v1/goals", headers={**headers, "X-Tenant-ID": f"spoofed-{i}"})
+        for i in range(3)
+    ]
+    assert [response.status_code for response in responses] == [200, 200, 429]
+
+    # Other tenants, and refresh tokens, do not count against it
+    assert client.get("/api/v1/goals", headers={"Authorization": f"Bearer {token('other')}"}).status_code == 200
+    assert client.get("/api/v1/goals", headers={"Authorization": f"Bearer {token('acme', 'refresh')}"}).status_code == 200
+
+
+def test_default_route_limits_leave_session_endpoints_alone():
+    client = make_client(default_limit=100, route_limits=settings.RATE_LIMIT_ROUTE_LIMITS)
+
+    assert all(client.get("/api/v1/auth/me").status_code == 200 for _ in range(10))
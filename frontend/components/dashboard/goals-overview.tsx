@@ -157,11 +157,13 @@ export function GoalsOverview() {
               </div>
             ))}
             
-            {goalsData && goalsData.total > goals.length && (
+            {goalsData?.next_cursor && (
               <div className="text-center pt-4">
                 <Button variant="outline" asChild>
                   <Link href="/goals">
-                    View all {goalsData.total} goals
+                    {goalsData.total === null
+                      ? 'View all goals'
+                      : `View all ${goalsData.total_is_estimate ? '~' : ''}${goalsData.total} goals`}
                   </Link>
                 </Button>
               </div>
@@ -8,11 +8,13 @@ export function useGoals() {
 
   // Get goals list
   const useGoalsList = (params?: {
-    page?: number
+    cursor?: string
     size?: number
     status?: string
     priority?: string
-    search?: string
+    due_after?: string
+    due_before?: string
+    count?: 'exact' | 'estimated' | 'none'
   }) => {
     return useQuery({
       queryKey: ['goals', params],
@@ -5,12 +5,13 @@ export interface ApiResponse<T = any> {
   success: boolean
 }
 
+// Keyset-paginated list; pass next_cursor back as `cursor` for the next page
 export interface PaginatedResponse<T> {
   items: T[]
-  total: number
-  page: number
   size: number
-  pages: number
+  next_cursor: string | null
+  total: number | null
+  total_is_estimate: boolean
 }
 
 // Authentication Types
@@ -307,7 +308,9 @@ export interface RunUpdateMessage {
   run_id: string
   status: string
   current_node: string
-  progress: number
+  // Absent on updates from nodes of a parallel stage, which carry their branch instead
+  progress?: number
+  branch?: string
   artifacts: Record<string, any>
 }
 
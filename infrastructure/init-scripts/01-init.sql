@@ -55,15 +55,23 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    -- Order by raw distance so a vector index can serve the LIMIT, compute
+    -- the distance once per row, and apply the threshold to the top matches
     RETURN QUERY
-    SELECT 
-        documents.id,
-        documents.content,
-        1 - (documents.vector <=> query_embedding) as similarity
-    FROM documents
-    WHERE 1 - (documents.vector <=> query_embedding) > match_threshold
-    ORDER BY documents.vector <=> query_embedding
-    LIMIT match_count;
+    SELECT
+        nearest.id,
+        nearest.content,
+        1 - nearest.distance as similarity
+    FROM (
+        SELECT
+            documents.id,
+            documents.content,
+            documents.vector <=> query_embedding as distance
+        FROM documents
+        ORDER BY documents.vector <=> query_embedding
+        LIMIT match_count
+    ) nearest
+    WHERE nearest.distance < 1 - match_threshold;
 END;
 $$;
 